@@ -32,7 +32,7 @@ from apigateway.biz.access_log.constants import ES_LOG_FIELDS, LOG_LINK_EXPIRE_S
 from apigateway.biz.access_log.data_scrubber import DataScrubber
 from apigateway.biz.access_log.log_search import LogSearchClient
 from apigateway.common.signature import SignatureGenerator, SignatureValidator
-from apigateway.core.models import Stage
+from apigateway.core.gateway_cache import gateway_cache
 from apigateway.utils.paginator import LimitOffsetPaginator
 from apigateway.utils.responses import OKJsonResponse
 
@@ -59,7 +59,7 @@ class LogTimeChartRetrieveApi(generics.RetrieveAPIView):
         slz.is_valid(raise_exception=True)
         data = slz.validated_data
 
-        stage_name = Stage.objects.get_name(request.gateway.id, data["stage_id"])
+        stage_name = gateway_cache.get_stage_name(request.gateway.id, data["stage_id"])
         if not stage_name:
             raise Http404
 
@@ -88,7 +88,7 @@ class SearchLogListApi(generics.ListAPIView):
         slz.is_valid(raise_exception=True)
         data = slz.validated_data
 
-        stage_name = Stage.objects.get_name(request.gateway.id, data["stage_id"])
+        stage_name = gateway_cache.get_stage_name(request.gateway.id, data["stage_id"])
         if not stage_name:
             raise Http404
 
@@ -17,11 +17,11 @@
 # to the current version of the project delivered to anyone in the future.
 #
 
-from django.db.models import Q
 from django.utils.decorators import method_decorator
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
 
+from apigateway.apps.search.indexes import GatewaySearchIndex
 from apigateway.common.contexts import GatewayAuthContext
 from apigateway.common.permissions import GatewayDisplayablePermission
 from apigateway.core.constants import GatewayStatusEnum
@@ -54,11 +54,12 @@ class GatewayListApi(generics.ListAPIView):
         # 根据网关名称、描述过滤
         keyword = slz.validated_data.get("keyword")
         if keyword:
-            queryset = queryset.filter(Q(name__icontains=keyword) | Q(description__icontains=keyword))
+            queryset = GatewaySearchIndex().filter(queryset, keyword)
 
         # 网关存在已发布的版本
         released_gateway_ids = Release.objects.all().values_list("gateway_id", flat=True).distinct()
         gateways = list(queryset.filter(id__in=released_gateway_ids))
+        search_scores = {gateway.id: getattr(gateway, "search_score", 0) for gateway in gateways}
 
         gateway_ids = [gateway.id for gateway in gateways]
 
@@ -70,8 +71,14 @@ class GatewayListApi(generics.ListAPIView):
             },
         )
 
-        # 需将官方 SDK 放在前面，但官方标记 is_official 不在 Gateway 表中，因此需要获取数据后，再排序分页
-        page = self.paginate_queryset(sorted(output_slz.data, key=lambda x: (-x["is_official"], x["name"])))
+        # 需将官方 SDK 放在前面，但官方标记 is_official 不在 Gateway 表中，因此需要获取数据后，再排序分页；
+        # 按关键字搜索时，同类网关按匹配度排序
+        page = self.paginate_queryset(
+            sorted(
+                output_slz.data,
+                key=lambda x: (-x["is_official"], -search_scores[x["id"]], x["name"]),
+            )
+        )
         return self.get_paginated_response(page)
 
 
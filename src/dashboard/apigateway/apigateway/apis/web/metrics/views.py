@@ -24,7 +24,8 @@ from rest_framework import generics, status
 
 from apigateway.apps.metrics.constants import DimensionEnum, MetricsEnum
 from apigateway.apps.metrics.prometheus.dimension import DimensionMetricsFactory
-from apigateway.core.models import Resource, Stage
+from apigateway.core.gateway_cache import gateway_cache
+from apigateway.core.models import Resource
 from apigateway.utils.responses import OKJsonResponse
 from apigateway.utils.time import SmartTimeRange
 
@@ -87,7 +88,7 @@ class QueryRangeApi(generics.ListAPIView):
 
         data = slz.validated_data
 
-        stage_name = Stage.objects.get_name(request.gateway.id, data["stage_id"])
+        stage_name = gateway_cache.get_stage_name(request.gateway.id, data["stage_id"])
         if not stage_name:
             raise Http404
 
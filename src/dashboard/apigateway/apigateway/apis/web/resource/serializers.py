@@ -57,8 +57,14 @@ class ResourceQueryInputSLZ(serializers.Serializer):
     order_by = serializers.ChoiceField(
         choices=["-id", "name", "-name", "path", "-path", "updated_time", "-updated_time"],
         allow_blank=True,
-        default="-updated_time",
-        help_text="排序字段",
+        required=False,
+        help_text="排序字段，未指定时，有关键字则按匹配度排序，否则按更新时间倒序",
+    )
+    after_id = serializers.IntegerField(
+        allow_null=True,
+        required=False,
+        min_value=1,
+        help_text="游标分页，上一页最后一个资源的 ID；指定时忽略 offset，适用于资源数量较多的网关",
     )
 
     def validate_label_ids(self, value):
@@ -70,6 +76,16 @@ class ResourceQueryInputSLZ(serializers.Serializer):
         except ValueError:
             raise serializers.ValidationError(_("标签 ID 请用逗号分割"))
 
+    def validate(self, data):
+        if "order_by" not in data:
+            # 游标分页需按字段排序，不支持按匹配度排序
+            data["order_by"] = "" if data.get("keyword") and not data.get("after_id") else "-updated_time"
+
+        if data.get("after_id") and not data.get("order_by") and data.get("keyword"):
+            raise serializers.ValidationError(_("按关键字匹配度排序时，不支持游标分页，请指定排序字段"))
+
+        return data
+
 
 class ResourceListOutputSLZ(serializers.ModelSerializer):
     path = serializers.CharField(source="path_display", read_only=True, help_text="前端请求路径")
@@ -117,12 +133,7 @@ class ResourceListOutputSLZ(serializers.ModelSerializer):
         }
 
     def get_backend(self, obj):
-        proxy = self.context["proxies"][obj.id]
-        backend = self.context["backends"][proxy.backend_id]
-        return {
-            "id": backend.id,
-            "name": backend.name,
-        }
+        return self.context["backends"].get(obj.id)
 
     def get_labels(self, obj):
         return self.context["labels"].get(obj.id, [])
@@ -651,6 +662,25 @@ class ResourceExportOutputSLZ(serializers.Serializer):
         return [binding.config for binding in self.context["resource_id_to_plugin_bindings"].get(obj.id, [])]
 
 
+class ResourceImportTaskOutputSLZ(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True, help_text="导入任务 ID")
+    status = serializers.CharField(read_only=True, help_text="任务状态，pending/running/success/failure")
+    total = serializers.IntegerField(read_only=True, help_text="待导入的资源数量")
+    processed = serializers.IntegerField(read_only=True, help_text="已导入的资源数量")
+    message = serializers.CharField(read_only=True, help_text="任务失败时的错误信息")
+    created_time = serializers.DateTimeField(read_only=True, help_text="创建时间")
+    updated_time = serializers.DateTimeField(read_only=True, help_text="更新时间")
+
+
+class ResourceExportTaskOutputSLZ(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True, help_text="导出任务 ID")
+    file_type = serializers.CharField(read_only=True, help_text="导出的文件类型，如 yaml/json")
+    status = serializers.CharField(read_only=True, help_text="任务状态，pending/running/success/failure")
+    message = serializers.CharField(read_only=True, help_text="任务失败时的错误信息")
+    created_time = serializers.DateTimeField(read_only=True, help_text="创建时间")
+    updated_time = serializers.DateTimeField(read_only=True, help_text="更新时间")
+
+
 class BackendPathCheckInputSLZ(serializers.Serializer):
     path = serializers.RegexField(
         PATH_PATTERN,
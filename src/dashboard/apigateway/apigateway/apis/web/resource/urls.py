@@ -22,8 +22,14 @@ from apigateway.apis.web.resource.views import (
     BackendPathCheckApi,
     ResourceBatchUpdateDestroyApi,
     ResourceExportApi,
+    ResourceExportTaskCreateApi,
+    ResourceExportTaskDownloadApi,
+    ResourceExportTaskRetrieveApi,
     ResourceImportApi,
     ResourceImportCheckApi,
+    ResourceImportTaskCreateApi,
+    ResourceImportTaskResumeApi,
+    ResourceImportTaskRetrieveApi,
     ResourceLabelUpdateApi,
     ResourceListCreateApi,
     ResourceRetrieveUpdateDestroyApi,
@@ -49,10 +55,39 @@ urlpatterns = [
             [
                 path("check/", ResourceImportCheckApi.as_view(), name="resource.import.check"),
                 path("", ResourceImportApi.as_view(), name="resource.import"),
+                path("tasks/", ResourceImportTaskCreateApi.as_view(), name="resource.import.task.create"),
+                path(
+                    "tasks/<int:id>/",
+                    ResourceImportTaskRetrieveApi.as_view(),
+                    name="resource.import.task.retrieve",
+                ),
+                path(
+                    "tasks/<int:id>/resume/",
+                    ResourceImportTaskResumeApi.as_view(),
+                    name="resource.import.task.resume",
+                ),
+            ]
+        ),
+    ),
+    path(
+        "export/",
+        include(
+            [
+                path("", ResourceExportApi.as_view(), name="resource.export"),
+                path("tasks/", ResourceExportTaskCreateApi.as_view(), name="resource.export.task.create"),
+                path(
+                    "tasks/<int:id>/",
+                    ResourceExportTaskRetrieveApi.as_view(),
+                    name="resource.export.task.retrieve",
+                ),
+                path(
+                    "tasks/<int:id>/download/",
+                    ResourceExportTaskDownloadApi.as_view(),
+                    name="resource.export.task.download",
+                ),
             ]
         ),
     ),
-    path("export/", ResourceExportApi.as_view(), name="resource.export"),
     # 资源后端路径校验
     path("backend-path/check/", BackendPathCheckApi.as_view(), name="resource.backend_path.check"),
     # 用于 ”免用户认证应用白名单“ 插件过滤资源
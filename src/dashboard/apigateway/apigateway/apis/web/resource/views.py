@@ -21,27 +21,28 @@ import re
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
+from blue_krill.async_utils.django_utils import apply_async_on_commit
 from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
 
-from apigateway.apis.web.constants import ExportTypeEnum
 from apigateway.apps.audit.constants import OpTypeEnum
 from apigateway.apps.label.models import APILabel
-from apigateway.apps.plugin.constants import PluginBindingScopeEnum
-from apigateway.apps.plugin.models import PluginBinding
+from apigateway.apps.support.constants import ResourceExportTaskStatusEnum, ResourceImportTaskStatusEnum
+from apigateway.apps.support.models import ResourceExportTask, ResourceImportTask
+from apigateway.apps.support.tasks import export_resources, import_resources
 from apigateway.biz.audit import Auditor
-from apigateway.biz.backend import BackendHandler
 from apigateway.biz.resource import ResourceHandler
+from apigateway.biz.resource.exporter import ResourcesExporter
 from apigateway.biz.resource.importer import ResourceDataConvertor, ResourceImportValidator, ResourcesImporter
-from apigateway.biz.resource.importer.swagger import ResourceSwaggerExporter
+from apigateway.biz.resource.listing import ResourceLister
 from apigateway.biz.resource.savers import ResourcesSaver
 from apigateway.biz.resource_doc.resource_doc import ResourceDocHandler
 from apigateway.biz.resource_label import ResourceLabelHandler
-from apigateway.biz.resource_version import ResourceVersionHandler
 from apigateway.common.contexts import ResourceAuthContext
+from apigateway.common.error_codes import error_codes
 from apigateway.core.constants import STAGE_VAR_PATTERN
 from apigateway.core.models import BackendConfig, Proxy, Resource, Stage
 from apigateway.utils.django import get_model_dict
@@ -54,9 +55,11 @@ from .serializers import (
     ResourceBatchUpdateInputSLZ,
     ResourceExportInputSLZ,
     ResourceExportOutputSLZ,
+    ResourceExportTaskOutputSLZ,
     ResourceImportCheckInputSLZ,
     ResourceImportCheckOutputSLZ,
     ResourceImportInputSLZ,
+    ResourceImportTaskOutputSLZ,
     ResourceInputSLZ,
     ResourceLabelUpdateInputSLZ,
     ResourceListOutputSLZ,
@@ -103,20 +106,27 @@ class ResourceListCreateApi(ResourceQuerySetMixin, generics.ListCreateAPIView):
             condition=slz.validated_data,
         )
 
-        page = self.paginate_queryset(queryset)
-        resource_ids = [resource.id for resource in page]
+        lister = ResourceLister(request.gateway.id)
+        queryset = lister.only_list_fields(queryset)
+
+        after_id = slz.validated_data.get("after_id")
+        if after_id:
+            # 游标分页，不使用 offset，避免资源较多时深度分页扫描过多数据
+            count = queryset.count()
+            queryset = lister.filter_after(queryset, slz.validated_data.get("order_by") or "-id", after_id)
+            page = list(queryset[: self.paginator.get_limit(request)])
+        else:
+            page = self.paginate_queryset(queryset)
 
         slz = ResourceListOutputSLZ(
             page,
             many=True,
-            context={
-                "labels": ResourceLabelHandler.get_labels(resource_ids),
-                "docs": ResourceDocHandler.get_docs(resource_ids),
-                "backends": BackendHandler.get_id_to_instance(request.gateway.id),
-                "proxies": {proxy.resource_id: proxy for proxy in Proxy.objects.filter(resource_id__in=resource_ids)},
-                "latest_version_created_time": ResourceVersionHandler.get_latest_created_time(request.gateway.id),
-            },
+            context=lister.get_context([resource.id for resource in page]),
         )
+
+        if after_id:
+            return OKJsonResponse(data={"count": count, "results": slz.data})
+
         return self.get_paginated_response(slz.data)
 
     @transaction.atomic
@@ -422,6 +432,85 @@ class ResourceImportApi(generics.CreateAPIView):
         return OKJsonResponse(status=status.HTTP_204_NO_CONTENT)
 
 
+class ResourceImportTaskCreateApi(generics.CreateAPIView):
+    @swagger_auto_schema(
+        operation_description="创建资源后台导入任务，用于导入资源数量较多的文档；资源分批保存，避免长时间锁定资源数据",
+        request_body=ResourceImportInputSLZ,
+        responses={status.HTTP_201_CREATED: ResourceImportTaskOutputSLZ()},
+        tags=["WebAPI.Resource"],
+    )
+    def post(self, request, *args, **kwargs):
+        slz = ResourceImportInputSLZ(
+            data=request.data,
+            context={
+                "stages": Stage.objects.filter(gateway=request.gateway),
+            },
+        )
+        slz.is_valid(raise_exception=True)
+
+        # 创建任务前校验全部资源，校验失败时直接返回错误，不创建任务
+        try:
+            importer = ResourcesImporter.from_resources(
+                gateway=request.gateway,
+                resources=slz.validated_data["resources"],
+                selected_resources=slz.validated_data.get("selected_resources"),
+                need_delete_unspecified_resources=False,
+                username=request.user.username,
+            )
+        except ValueError as err:
+            raise error_codes.INVALID_ARGUMENT.format(str(err), replace=True)
+
+        task = ResourceImportTask.objects.create(
+            gateway=request.gateway,
+            resources=slz.validated_data["resources"],
+            selected_resources=slz.validated_data.get("selected_resources"),
+            total=len(importer.get_selected_resource_data_list()),
+            created_by=request.user.username,
+        )
+        apply_async_on_commit(import_resources, args=[task.id])
+
+        return OKJsonResponse(status=status.HTTP_201_CREATED, data=ResourceImportTaskOutputSLZ(task).data)
+
+
+class ResourceImportTaskQuerySetMixin:
+    lookup_field = "id"
+
+    def get_queryset(self):
+        return ResourceImportTask.objects.filter(gateway=self.request.gateway)
+
+
+class ResourceImportTaskRetrieveApi(ResourceImportTaskQuerySetMixin, generics.RetrieveAPIView):
+    @swagger_auto_schema(
+        operation_description="获取资源后台导入任务的状态及进度",
+        responses={status.HTTP_200_OK: ResourceImportTaskOutputSLZ()},
+        tags=["WebAPI.Resource"],
+    )
+    def get(self, request, *args, **kwargs):
+        task = self.get_object()
+        return OKJsonResponse(data=ResourceImportTaskOutputSLZ(task).data)
+
+
+class ResourceImportTaskResumeApi(ResourceImportTaskQuerySetMixin, generics.CreateAPIView):
+    @swagger_auto_schema(
+        operation_description="继续执行失败或长时间未更新进度的资源后台导入任务，从已导入的资源之后继续导入",
+        responses={status.HTTP_200_OK: ResourceImportTaskOutputSLZ()},
+        tags=["WebAPI.Resource"],
+    )
+    def post(self, request, *args, **kwargs):
+        task = self.get_object()
+        if not task.is_resumable:
+            raise error_codes.FAILED_PRECONDITION.format(
+                _("仅支持继续执行失败或长时间未更新进度的导入任务。"), replace=True
+            )
+
+        task.status = ResourceImportTaskStatusEnum.PENDING.value
+        task.updated_by = request.user.username
+        task.save(update_fields=["status", "updated_by", "updated_time"])
+        apply_async_on_commit(import_resources, args=[task.id])
+
+        return OKJsonResponse(data=ResourceImportTaskOutputSLZ(task).data)
+
+
 class ResourceExportApi(generics.CreateAPIView):
     @swagger_auto_schema(
         operation_description="导出资源",
@@ -433,59 +522,79 @@ class ResourceExportApi(generics.CreateAPIView):
         slz = ResourceExportInputSLZ(data=request.data)
         slz.is_valid(raise_exception=True)
 
-        selected_resource_queryset = self._filter_selected_resources(
-            export_type=slz.validated_data["export_type"],
+        exporter = ResourcesExporter.from_export_params(
             gateway_id=request.gateway.id,
+            serializer_class=ResourceExportOutputSLZ,
+            export_type=slz.validated_data["export_type"],
             resource_filter_condition=slz.validated_data.get("resource_filter_condition", {}),
             resource_ids=slz.validated_data.get("resource_ids", []),
         )
-        selected_resource_ids = list(selected_resource_queryset.values_list("id", flat=True))
-
-        output_slz = ResourceExportOutputSLZ(
-            selected_resource_queryset,
-            many=True,
-            context={
-                "labels": ResourceLabelHandler.get_labels_by_gateway(request.gateway.id),
-                "backends": BackendHandler.get_id_to_instance(gateway_id=request.gateway.id),
-                "proxies": {
-                    proxy.resource_id: proxy for proxy in Proxy.objects.filter(resource_id__in=selected_resource_ids)
-                },
-                "resource_id_to_plugin_bindings": PluginBinding.objects.query_scope_id_to_bindings(
-                    gateway_id=request.gateway.id,
-                    scope_type=PluginBindingScopeEnum.RESOURCE,
-                    scope_ids=selected_resource_ids,
-                ),
-                "auth_configs": ResourceAuthContext().get_resource_id_to_auth_config(selected_resource_ids),
-            },
-        )
 
         file_type = slz.validated_data["file_type"]
-        exporter = ResourceSwaggerExporter()
-        content = exporter.to_swagger(output_slz.data, file_type=file_type)
 
         # 导出的文件名，需满足规范：bk_产品名_功能名_文件名.后缀
         export_filename = f"bk_apigw_resources_{self.request.gateway.name}.{file_type}"
 
-        return DownloadableResponse(content, filename=export_filename)
+        # 流式输出，资源及关联数据按批次加载，避免导出大网关时占用过多内存
+        return DownloadableResponse(exporter.iter_swagger(file_type), filename=export_filename)
+
+
+class ResourceExportTaskCreateApi(generics.CreateAPIView):
+    @swagger_auto_schema(
+        operation_description="创建资源异步导出任务，用于导出资源数量较多的网关",
+        request_body=ResourceExportInputSLZ,
+        responses={status.HTTP_201_CREATED: ResourceExportTaskOutputSLZ()},
+        tags=["WebAPI.Resource"],
+    )
+    def post(self, request, *args, **kwargs):
+        slz = ResourceExportInputSLZ(data=request.data)
+        slz.is_valid(raise_exception=True)
+
+        task = ResourceExportTask.objects.create(
+            gateway=request.gateway,
+            file_type=slz.validated_data["file_type"],
+            params={
+                "export_type": slz.validated_data["export_type"],
+                "resource_filter_condition": slz.validated_data.get("resource_filter_condition", {}),
+                "resource_ids": slz.validated_data.get("resource_ids", []),
+            },
+            created_by=request.user.username,
+        )
+        apply_async_on_commit(export_resources, args=[task.id])
 
-    def _filter_selected_resources(
-        self,
-        export_type: str,
-        gateway_id: int,
-        resource_filter_condition: Dict[str, Any],
-        resource_ids: List[int],
-    ):
-        """获取待导出的资源"""
-        if export_type == ExportTypeEnum.ALL.value:
-            return Resource.objects.filter(gateway_id=gateway_id)
+        return OKJsonResponse(status=status.HTTP_201_CREATED, data=ResourceExportTaskOutputSLZ(task).data)
 
-        if export_type == ExportTypeEnum.FILTERED.value:
-            return ResourceHandler.filter_by_resource_filter_condition(gateway_id, resource_filter_condition or {})
 
-        if export_type == ExportTypeEnum.SELECTED.value:
-            return Resource.objects.filter(gateway_id=gateway_id, id__in=resource_ids)
+class ResourceExportTaskQuerySetMixin:
+    lookup_field = "id"
+
+    def get_queryset(self):
+        return ResourceExportTask.objects.filter(gateway=self.request.gateway)
+
+
+class ResourceExportTaskRetrieveApi(ResourceExportTaskQuerySetMixin, generics.RetrieveAPIView):
+    @swagger_auto_schema(
+        operation_description="获取资源异步导出任务的状态",
+        responses={status.HTTP_200_OK: ResourceExportTaskOutputSLZ()},
+        tags=["WebAPI.Resource"],
+    )
+    def get(self, request, *args, **kwargs):
+        task = self.get_object()
+        return OKJsonResponse(data=ResourceExportTaskOutputSLZ(task).data)
+
+
+class ResourceExportTaskDownloadApi(ResourceExportTaskQuerySetMixin, generics.RetrieveAPIView):
+    @swagger_auto_schema(
+        operation_description="下载资源异步导出任务的导出结果",
+        responses={status.HTTP_200_OK: ""},
+        tags=["WebAPI.Resource"],
+    )
+    def get(self, request, *args, **kwargs):
+        task = self.get_object()
+        if task.status != ResourceExportTaskStatusEnum.SUCCESS.value:
+            raise error_codes.FAILED_PRECONDITION.format(_("导出任务未完成，请稍后再试。"), replace=True)
 
-        return Resource.objects.none()
+        return DownloadableResponse(task.iter_content(), filename=task.filename)
 
 
 class BackendPathCheckApi(ResourceQuerySetMixin, generics.RetrieveAPIView):
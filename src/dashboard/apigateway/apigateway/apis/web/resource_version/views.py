@@ -28,8 +28,8 @@ from apigateway.apps.support.models import ResourceDoc, ResourceDocVersion
 from apigateway.biz.backend import BackendHandler
 from apigateway.biz.plugin_binding import PluginBindingHandler
 from apigateway.biz.resource_version import ResourceDocVersionHandler, ResourceVersionHandler
-from apigateway.biz.resource_version_diff import ResourceDifferHandler
 from apigateway.biz.sdk.gateway_sdk import GatewaySDKHandler
+from apigateway.core.gateway_cache import gateway_cache
 from apigateway.core.models import Release, Resource, ResourceVersion
 from apigateway.utils.responses import OKJsonResponse
 
@@ -141,7 +141,7 @@ class ResourceVersionRetrieveApi(generics.RetrieveAPIView):
         resource_docs_updated_time = ResourceDocVersion.objects.get_doc_updated_time(request.gateway.id, instance.id)
 
         # 查询网关后端服务
-        resource_backends = BackendHandler.get_id_to_instance(request.gateway.id)
+        resource_backends = gateway_cache.get_backends(request.gateway.id)
 
         context = {
             "resource_doc_updated_time": resource_docs_updated_time,
@@ -216,30 +216,11 @@ class ResourceVersionDiffRetrieveApi(generics.RetrieveAPIView):
 
         data = slz.validated_data
 
-        source_resource_version_id = data.get("source_resource_version_id")
-        target_resource_version_id = data.get("target_resource_version_id")
-
-        # 如果source_resource_version_id为空，需要将source_resource_data置为空，相当于
-        # target_resource_data 和 空版本对比
-        source_resource_data = (
-            ResourceVersionHandler.get_data_by_id_or_new(request.gateway, source_resource_version_id)
-            if source_resource_version_id
-            else []
-        )
-
-        target_resource_data = ResourceVersionHandler.get_data_by_id_or_new(
-            request.gateway, target_resource_version_id
-        )
-
-        data = ResourceDifferHandler.diff_resource_version_data(
-            source_resource_data,
-            target_resource_data,
-            source_resource_doc_updated_time=ResourceDocVersion.objects.get_doc_updated_time(
-                request.gateway.id, data.get("source_resource_version_id")
-            ),
-            target_resource_doc_updated_time=ResourceDocVersion.objects.get_doc_updated_time(
-                request.gateway.id, data.get("target_resource_version_id")
-            ),
+        # 源版本为空时，相当于目标版本和空版本对比；目标版本为空时，与当前资源数据对比
+        data = ResourceVersionHandler.diff_resource_versions(
+            request.gateway,
+            data.get("source_resource_version_id"),
+            data.get("target_resource_version_id"),
         )
 
         return OKJsonResponse(
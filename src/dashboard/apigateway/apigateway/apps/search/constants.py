@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from blue_krill.data_types.enum import EnumField, StructuredEnum
+from django.utils.translation import gettext_lazy as _
+
+# 倒排索引的分词长度，关键字长度小于此值时，无法使用索引
+SEARCH_NGRAM_SIZE = 3
+
+# 重建索引时，每批处理的对象数量
+SEARCH_INDEX_BATCH_SIZE = 500
+
+# 增量更新索引时，回溯的时间(秒)，覆盖更新时间早于事务提交时间的数据
+SEARCH_INDEX_REFRESH_LOOKBACK_SECONDS = 600
+
+
+class SearchObjectTypeEnum(StructuredEnum):
+    RESOURCE = EnumField("resource", label=_("资源"))
+    GATEWAY = EnumField("gateway", label=_("网关"))
+    COMPONENT = EnumField("component", label=_("组件"))
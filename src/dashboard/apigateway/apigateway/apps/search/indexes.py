@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import datetime
+import operator
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import reduce
+from typing import ClassVar, Dict, List, Type
+
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, IntegerField, Max, Q, QuerySet, Value
+
+from apigateway.apps.search.constants import (
+    SEARCH_INDEX_BATCH_SIZE,
+    SEARCH_INDEX_REFRESH_LOOKBACK_SECONDS,
+    SearchObjectTypeEnum,
+)
+from apigateway.apps.search.models import BaseSearchIndexScope, BaseSearchToken, SearchIndexScope, SearchToken
+from apigateway.apps.search.tokenizer import tokenize
+from apigateway.core.models import Gateway, Resource
+
+
+class BaseSearchIndex:
+    """
+    搜索索引基类
+    - 子类需定义对象类型、索引字段及权重，并实现 get_queryset，获取索引范围内的源数据
+    - 索引仅用于搜索结果排序，过滤始终使用 icontains 匹配，索引未及时更新时，仅影响排序，不会遗漏匹配的对象
+    - 索引不在搜索时更新，由发布等变更流程及定时任务更新：根据源数据的数量、最近更新时间判断源数据是否有变化，
+      有变化时增量更新索引，因此源数据需有 updated_time 字段；更新时间未变化的变更（如 queryset.update），由定时全量重建覆盖
+    - 索引模型需与源数据在同一个数据库中
+    """
+
+    object_type: ClassVar[str]
+    # 索引字段及其权重，支持关联字段，如 system__name
+    fields: ClassVar[Dict[str, int]]
+
+    token_model: ClassVar[Type[BaseSearchToken]] = SearchToken
+    scope_model: ClassVar[Type[BaseSearchIndexScope]] = SearchIndexScope
+
+    def get_queryset(self, scope: str) -> QuerySet:
+        raise NotImplementedError
+
+    def list_scopes(self) -> List[str]:
+        """源数据的全部索引范围"""
+        raise NotImplementedError
+
+    def filter(self, queryset: QuerySet, keyword: str, scope: str = "") -> QuerySet:
+        """
+        根据关键字，对索引字段做 icontains 匹配过滤 queryset，并添加 search_score 用于排序，分值越高，匹配度越高
+        """
+        keyword_q = reduce(operator.or_, [Q(**{f"{field}__icontains": keyword}) for field in self.fields])
+        queryset = queryset.filter(keyword_q)
+
+        tokens = tokenize(keyword)
+        if not tokens:
+            # 关键字过短，无法使用索引
+            return queryset.annotate(search_score=Value(0, output_field=IntegerField()))
+
+        return queryset.annotate(search_score=self.token_model.objects.score_subquery(self.object_type, scope, tokens))
+
+    def refresh(self, scope: str = ""):
+        """源数据有变化时，增量更新索引"""
+        # 索引已是最新时，无需加锁
+        index_scope = self.scope_model.objects.filter(object_type=self.object_type, scope=scope).first()
+        if index_scope and self._is_up_to_date(index_scope, self._get_stats(scope)):
+            return
+
+        with self._lock_scope(scope) as index_scope:
+            self._refresh(scope, index_scope)
+
+    def rebuild(self, scope: str = ""):
+        """全量重建索引"""
+        with self._lock_scope(scope) as index_scope:
+            self.token_model.objects.delete_scope(self.object_type, scope)
+            self._refresh(scope, index_scope, full=True)
+
+    @property
+    def _db(self) -> str:
+        return router.db_for_write(self.token_model)
+
+    @contextmanager
+    def _lock_scope(self, scope: str):
+        """
+        在事务中锁定索引范围的构建状态，串行化同一索引范围的更新；
+        否则，并发的首次搜索会各自写入一份分词，导致分词重复、search_score 虚高
+        """
+        # 先在独立的事务中确保记录存在，并发创建时，唯一索引冲突说明记录已由其它请求创建
+        try:
+            with transaction.atomic(using=self._db):
+                self.scope_model.objects.using(self._db).get_or_create(object_type=self.object_type, scope=scope)
+        except IntegrityError:
+            pass
+
+        with transaction.atomic(using=self._db):
+            yield (
+                self.scope_model.objects.using(self._db)
+                .select_for_update()
+                .get(object_type=self.object_type, scope=scope)
+            )
+
+    def _refresh(self, scope: str, index_scope: BaseSearchIndexScope, full: bool = False):
+        queryset = self.get_queryset(scope)
+        stats = self._get_stats(scope)
+        if not full and self._is_up_to_date(index_scope, stats):
+            return
+
+        changed_queryset = queryset
+        if not full and index_scope.latest_updated_time:
+            # 长事务中，数据的更新时间早于事务提交时间，回溯一段时间，以包含上次更新索引后才提交的数据
+            changed_queryset = queryset.filter(
+                updated_time__gte=index_scope.latest_updated_time
+                - datetime.timedelta(seconds=SEARCH_INDEX_REFRESH_LOOKBACK_SECONDS)
+            )
+
+        self._index_queryset(scope, changed_queryset)
+        self.token_model.objects.delete_missing_objects(self.object_type, scope, queryset.values("id"))
+
+        index_scope.object_count = stats["object_count"]
+        index_scope.latest_updated_time = stats["latest_updated_time"]
+        index_scope.save(update_fields=["object_count", "latest_updated_time", "updated_time"])
+
+    def _get_stats(self, scope: str) -> dict:
+        return self.get_queryset(scope).aggregate(object_count=Count("id"), latest_updated_time=Max("updated_time"))
+
+    @staticmethod
+    def _is_up_to_date(index_scope: BaseSearchIndexScope, stats: dict) -> bool:
+        return (
+            index_scope.object_count == stats["object_count"]
+            and index_scope.latest_updated_time == stats["latest_updated_time"]
+        )
+
+    def _index_queryset(self, scope: str, queryset: QuerySet):
+        documents = {}
+        for item in queryset.values("id", *self.fields).iterator(chunk_size=SEARCH_INDEX_BATCH_SIZE):
+            documents[item["id"]] = self._build_document(item)
+            if len(documents) >= SEARCH_INDEX_BATCH_SIZE:
+                self.token_model.objects.replace_objects(self.object_type, scope, documents)
+                documents = {}
+
+        self.token_model.objects.replace_objects(self.object_type, scope, documents)
+
+    def _build_document(self, item: dict) -> Dict[str, int]:
+        """对象的分词及其权重，同一分词出现在多个字段时，权重累加"""
+        document: Dict[str, int] = defaultdict(int)
+        for field, weight in self.fields.items():
+            for token in tokenize(item[field] or ""):
+                document[token] += weight
+        return document
+
+
+class SearchIndexRegistry:
+    def __init__(self):
+        self._indexes: Dict[str, Type[BaseSearchIndex]] = {}
+
+    def register(self, index_class: Type[BaseSearchIndex]) -> Type[BaseSearchIndex]:
+        self._indexes[index_class.object_type] = index_class
+        return index_class
+
+    def get(self, object_type: str) -> BaseSearchIndex:
+        return self._indexes[object_type]()
+
+    def get_object_types(self) -> List[str]:
+        return list(self._indexes.keys())
+
+
+search_index_registry = SearchIndexRegistry()
+
+
+@search_index_registry.register
+class ResourceSearchIndex(BaseSearchIndex):
+    """网关资源，按网关划分索引范围，scope 为网关 ID"""
+
+    object_type = SearchObjectTypeEnum.RESOURCE.value
+    fields = {"name": 2, "path": 1}
+
+    def get_queryset(self, scope: str) -> QuerySet:
+        return Resource.objects.filter(gateway_id=int(scope))
+
+    def list_scopes(self) -> List[str]:
+        return [str(gateway_id) for gateway_id in Resource.objects.values_list("gateway_id", flat=True).distinct()]
+
+
+@search_index_registry.register
+class GatewaySearchIndex(BaseSearchIndex):
+    """网关，所有网关为同一索引范围"""
+
+    object_type = SearchObjectTypeEnum.GATEWAY.value
+    fields = {"name": 2, "description": 1}
+
+    def get_queryset(self, scope: str) -> QuerySet:
+        return Gateway.objects.all()
+
+    def list_scopes(self) -> List[str]:
+        return [""]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+重建搜索索引
+
+- 未指定 --scope 时，重建源数据的全部索引范围
+- 索引由发布流程及定时任务更新，此命令用于部署后预热，或修复异常的索引数据
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apigateway.apps.search.indexes import search_index_registry
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--object-type",
+            type=str,
+            dest="object_type",
+            required=True,
+            choices=search_index_registry.get_object_types(),
+            help="索引对象类型",
+        )
+        parser.add_argument("--scope", type=str, dest="scope", nargs="*", help="索引范围，如资源所属网关 ID")
+
+    def handle(self, object_type: str, scope: list, **options):
+        search_index = search_index_registry.get(object_type)
+
+        scopes = scope or search_index.list_scopes()
+        for scope_ in scopes:
+            search_index.rebuild(scope_)
+            logger.info("rebuild search index finished, object_type=%s, scope=%s", object_type, scope_)
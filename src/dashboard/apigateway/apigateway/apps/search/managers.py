@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from typing import Dict, Iterable, Set
+
+from django.db import models
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from apigateway.apps.search.constants import SEARCH_INDEX_BATCH_SIZE
+
+
+class SearchTokenManager(models.Manager):
+    def replace_objects(self, object_type: str, scope: str, documents: Dict[int, Dict[str, int]]):
+        """
+        替换对象的索引
+
+        :param documents: 对象 ID 到 {分词: 权重} 的映射
+        """
+        if not documents:
+            return
+
+        self.filter(object_type=object_type, scope=scope, object_id__in=documents.keys()).delete()
+        self.bulk_create(
+            [
+                self.model(object_type=object_type, scope=scope, object_id=object_id, token=token, weight=weight)
+                for object_id, tokens in documents.items()
+                for token, weight in tokens.items()
+            ],
+            batch_size=SEARCH_INDEX_BATCH_SIZE,
+        )
+
+    def delete_missing_objects(self, object_type: str, scope: str, object_ids: Iterable[int]):
+        """删除不在 object_ids 中的对象的索引，object_ids 可以是 queryset"""
+        self.filter(object_type=object_type, scope=scope).exclude(object_id__in=object_ids).delete()
+
+    def delete_scope(self, object_type: str, scope: str):
+        self.filter(object_type=object_type, scope=scope).delete()
+
+    def score_subquery(self, object_type: str, scope: str, tokens: Set[str], outer_ref: str = "pk"):
+        """对象匹配分词的权重之和，用于 annotate 排序"""
+        queryset = (
+            self.filter(object_type=object_type, scope=scope, token__in=tokens, object_id=OuterRef(outer_ref))
+            .values("object_id")
+            .annotate(score=Sum("weight"))
+            .values("score")[:1]
+        )
+        return Coalesce(Subquery(queryset, output_field=IntegerField()), 0)
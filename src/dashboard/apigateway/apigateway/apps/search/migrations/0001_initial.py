@@ -0,0 +1,45 @@
+# Generated by Django 3.2.18 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('resource', '资源'), ('gateway', '网关'), ('component', '组件')], max_length=32)),
+                ('scope', models.CharField(blank=True, default='', max_length=64)),
+                ('object_id', models.IntegerField()),
+                ('token', models.CharField(max_length=16)),
+                ('weight', models.IntegerField(default=1)),
+            ],
+            options={
+                'db_table': 'search_token',
+                'index_together': {('object_type', 'scope', 'token'), ('object_type', 'scope', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchIndexScope',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_time', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True, null=True)),
+                ('object_type', models.CharField(choices=[('resource', '资源'), ('gateway', '网关'), ('component', '组件')], max_length=32)),
+                ('scope', models.CharField(blank=True, default='', max_length=64)),
+                ('object_count', models.IntegerField(default=0)),
+                ('latest_updated_time', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'search_index_scope',
+                'unique_together': {('object_type', 'scope')},
+            },
+        ),
+    ]
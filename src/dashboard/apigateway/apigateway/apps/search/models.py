@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from django.db import models
+
+from apigateway.apps.search.constants import SearchObjectTypeEnum
+from apigateway.apps.search.managers import SearchTokenManager
+from apigateway.common.mixins.models import TimestampedModelMixin
+
+
+class BaseSearchToken(models.Model):
+    """
+    搜索倒排索引，每个对象的每个 n-gram 分词一条记录
+    - scope: 索引范围，如资源所属网关 ID、组件所属 board，搜索时仅在同一范围内匹配
+    - weight: 分词所在字段的权重之和，用于搜索结果排序
+
+    索引需与源数据在同一个数据库中，以便通过子查询过滤源数据，因此定义为抽象模型，由各数据库分别定义
+    """
+
+    object_type = models.CharField(max_length=32, choices=SearchObjectTypeEnum.get_choices())
+    scope = models.CharField(max_length=64, blank=True, default="")
+    object_id = models.IntegerField()
+    token = models.CharField(max_length=16)
+    weight = models.IntegerField(default=1)
+
+    objects = SearchTokenManager()
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}: {self.object_type}/{self.scope}/{self.object_id}/{self.token}>"
+
+    class Meta:
+        abstract = True
+        index_together = [
+            ("object_type", "scope", "token"),
+            ("object_type", "scope", "object_id"),
+        ]
+
+
+class BaseSearchIndexScope(TimestampedModelMixin):
+    """
+    索引范围的构建状态，记录构建索引时源数据的数量、最近更新时间，
+    用于判断源数据是否有变化，有变化时增量更新索引
+    """
+
+    object_type = models.CharField(max_length=32, choices=SearchObjectTypeEnum.get_choices())
+    scope = models.CharField(max_length=64, blank=True, default="")
+    object_count = models.IntegerField(default=0)
+    latest_updated_time = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}: {self.object_type}/{self.scope}>"
+
+    class Meta:
+        abstract = True
+        unique_together = ("object_type", "scope")
+
+
+class SearchToken(BaseSearchToken):
+    class Meta(BaseSearchToken.Meta):
+        db_table = "search_token"
+
+
+class SearchIndexScope(BaseSearchIndexScope):
+    class Meta(BaseSearchIndexScope.Meta):
+        db_table = "search_index_scope"
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+
+from celery import shared_task
+
+from apigateway.apps.search.indexes import search_index_registry
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apigateway.apps.search.tasks.refresh_search_indexes", ignore_result=True)
+def refresh_search_indexes():
+    """增量更新全部搜索索引"""
+    _update_search_indexes(rebuild=False)
+
+
+@shared_task(name="apigateway.apps.search.tasks.rebuild_search_indexes", ignore_result=True)
+def rebuild_search_indexes():
+    """全量重建全部搜索索引，覆盖更新时间未变化的数据变更，如：通过 queryset.update 更新的数据、组件所属系统名称的变更"""
+    _update_search_indexes(rebuild=True)
+
+
+def _update_search_indexes(rebuild: bool):
+    for object_type in search_index_registry.get_object_types():
+        search_index = search_index_registry.get(object_type)
+        for scope in search_index.list_scopes():
+            try:
+                if rebuild:
+                    search_index.rebuild(scope)
+                else:
+                    search_index.refresh(scope)
+            except Exception:
+                logger.exception("update search index failed, object_type=%s, scope=%s", object_type, scope)
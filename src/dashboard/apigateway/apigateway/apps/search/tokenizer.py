@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+将文本切分为 n-gram 分词，用于构建倒排索引；
+文本、关键字均转为小写，使索引匹配与 icontains 的语义一致
+"""
+from typing import Set
+
+from apigateway.apps.search.constants import SEARCH_NGRAM_SIZE
+
+
+def tokenize(text: str) -> Set[str]:
+    """将文本切分为 n-gram 分词；文本长度小于分词长度时返回空集合，表示无法使用索引"""
+    if not text:
+        return set()
+
+    text = text.lower()
+    return {text[i : i + SEARCH_NGRAM_SIZE] for i in range(len(text) - SEARCH_NGRAM_SIZE + 1)}
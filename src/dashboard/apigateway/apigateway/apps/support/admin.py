@@ -17,7 +17,14 @@
 #
 from django.contrib import admin
 
-from apigateway.apps.support.models import GatewaySDK, ReleasedResourceDoc, ResourceDoc, ResourceDocVersion
+from apigateway.apps.support.models import (
+    GatewaySDK,
+    ReleasedResourceDoc,
+    ResourceDoc,
+    ResourceDocVersion,
+    ResourceExportTask,
+    ResourceImportTask,
+)
 
 
 class ResourceDocAdmin(admin.ModelAdmin):
@@ -56,7 +63,21 @@ class APISDKAdmin(admin.ModelAdmin):
     raw_id_fields = ["resource_version"]
 
 
+class ResourceExportTaskAdmin(admin.ModelAdmin):
+    list_display = ["id", "gateway", "file_type", "status", "created_by", "created_time"]
+    list_filter = ["gateway", "status"]
+    exclude = ["content"]
+
+
+class ResourceImportTaskAdmin(admin.ModelAdmin):
+    list_display = ["id", "gateway", "status", "processed", "total", "created_by", "created_time"]
+    list_filter = ["gateway", "status"]
+    exclude = ["resources", "selected_resources"]
+
+
 admin.site.register(ResourceDoc, ResourceDocAdmin)
 admin.site.register(ResourceDocVersion, ResourceDocVersionAdmin)
 admin.site.register(GatewaySDK, APISDKAdmin)
 admin.site.register(ReleasedResourceDoc, ReleasedResourceDocAdmin)
+admin.site.register(ResourceExportTask, ResourceExportTaskAdmin)
+admin.site.register(ResourceImportTask, ResourceImportTaskAdmin)
@@ -43,3 +43,17 @@ class DocSourceEnum(StructuredEnum):
 class DocArchiveTypeEnum(StructuredEnum):
     TGZ = EnumField("tgz", label=_("tgz 归档文件"))
     ZIP = EnumField("zip", label=_("zip 归档文件"))
+
+
+class ResourceExportTaskStatusEnum(StructuredEnum):
+    PENDING = EnumField("pending", label=_("待执行"))
+    RUNNING = EnumField("running", label=_("执行中"))
+    SUCCESS = EnumField("success", label=_("成功"))
+    FAILURE = EnumField("failure", label=_("失败"))
+
+
+class ResourceImportTaskStatusEnum(StructuredEnum):
+    PENDING = EnumField("pending", label=_("待执行"))
+    RUNNING = EnumField("running", label=_("执行中"))
+    SUCCESS = EnumField("success", label=_("成功"))
+    FAILURE = EnumField("failure", label=_("失败"))
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.18 on 2026-10-19 14:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_gateway_member'),
+        ('support', '0017_auto_20230901_1716'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceExportTask',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_time', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True, null=True)),
+                ('created_by', models.CharField(blank=True, max_length=32, null=True)),
+                ('updated_by', models.CharField(blank=True, max_length=32, null=True)),
+                ('file_type', models.CharField(max_length=16)),
+                ('params', jsonfield.fields.JSONField(blank=True, default=dict, dump_kwargs={'indent': None})),
+                ('status', models.CharField(choices=[('pending', '待执行'), ('running', '执行中'), ('success', '成功'), ('failure', '失败')], default='pending', max_length=16)),
+                ('message', models.TextField(blank=True, default='')),
+                ('content', models.BinaryField(blank=True, null=True)),
+                ('gateway', models.ForeignKey(db_column='api_id', on_delete=django.db.models.deletion.CASCADE, to='core.gateway')),
+            ],
+            options={
+                'verbose_name': '资源导出任务',
+                'verbose_name_plural': '资源导出任务',
+                'db_table': 'support_resource_export_task',
+            },
+        ),
+    ]
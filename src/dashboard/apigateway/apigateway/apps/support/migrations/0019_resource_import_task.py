@@ -0,0 +1,38 @@
+# Generated by Django 3.2.18 on 2026-10-19 15:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_gateway_member'),
+        ('support', '0018_resource_export_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceImportTask',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_time', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True, null=True)),
+                ('created_by', models.CharField(blank=True, max_length=32, null=True)),
+                ('updated_by', models.CharField(blank=True, max_length=32, null=True)),
+                ('resources', jsonfield.fields.JSONField(blank=True, default=list, dump_kwargs={'indent': None})),
+                ('selected_resources', jsonfield.fields.JSONField(blank=True, dump_kwargs={'indent': None}, null=True)),
+                ('status', models.CharField(choices=[('pending', '待执行'), ('running', '执行中'), ('success', '成功'), ('failure', '失败')], default='pending', max_length=16)),
+                ('total', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('message', models.TextField(blank=True, default='')),
+                ('gateway', models.ForeignKey(db_column='api_id', on_delete=django.db.models.deletion.CASCADE, to='core.gateway')),
+            ],
+            options={
+                'verbose_name': '资源导入任务',
+                'verbose_name_plural': '资源导入任务',
+                'db_table': 'support_resource_import_task',
+            },
+        ),
+    ]
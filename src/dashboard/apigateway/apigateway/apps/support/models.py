@@ -16,14 +16,26 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import datetime
 import json
+import zlib
+from typing import Iterable, Iterator
 
+from django.conf import settings
 from django.db import models
 from django.db.transaction import atomic
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from jsonfield import JSONField
 
-from apigateway.apps.support.constants import DocLanguageEnum, DocSourceEnum, DocTypeEnum, ProgrammingLanguageEnum
+from apigateway.apps.support.constants import (
+    DocLanguageEnum,
+    DocSourceEnum,
+    DocTypeEnum,
+    ProgrammingLanguageEnum,
+    ResourceExportTaskStatusEnum,
+    ResourceImportTaskStatusEnum,
+)
 from apigateway.apps.support.managers import (
     APISDKManager,
     ReleasedResourceDocManager,
@@ -182,3 +194,110 @@ class GatewaySDK(ConfigModelMixin):
         self.is_public_latest = True
         self.is_recommended = True
         self.save(update_fields=["is_public_latest", "is_recommended"])
+
+
+class ResourceExportTask(TimestampedModelMixin, OperatorModelMixin):
+    """
+    资源异步导出任务，用于导出资源数量较多的网关
+
+    导出的文档经 zlib 压缩后存储，供用户下载
+    """
+
+    gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.CASCADE)
+    file_type = models.CharField(max_length=16)
+    # 导出参数，如 export_type, resource_filter_condition, resource_ids
+    params = JSONField(default=dict, dump_kwargs={"indent": None}, blank=True)
+    status = models.CharField(
+        max_length=16,
+        choices=ResourceExportTaskStatusEnum.get_choices(),
+        default=ResourceExportTaskStatusEnum.PENDING.value,
+    )
+    message = models.TextField(blank=True, default="")
+    content = models.BinaryField(null=True, blank=True)
+
+    def __str__(self):
+        return f"<ResourceExportTask: {self.id}/{self.status}>"
+
+    class Meta:
+        verbose_name = _("资源导出任务")
+        verbose_name_plural = _("资源导出任务")
+        db_table = "support_resource_export_task"
+
+    @property
+    def filename(self) -> str:
+        # 导出的文件名，需满足规范：bk_产品名_功能名_文件名.后缀
+        return f"bk_apigw_resources_{self.gateway.name}.{self.file_type}"
+
+    def set_content(self, chunks: Iterable[str]):
+        """逐块压缩导出的文档，内存中仅保留压缩后的数据"""
+        compressor = zlib.compressobj()
+        compressed = [compressor.compress(chunk.encode("utf-8")) for chunk in chunks]
+        compressed.append(compressor.flush())
+        self.content = b"".join(compressed)
+
+    def iter_content(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """逐块解压导出的文档，用于流式下载"""
+        if not self.content:
+            return
+
+        decompressor = zlib.decompressobj()
+        content = bytes(self.content)
+        for i in range(0, len(content), chunk_size):
+            data = decompressor.decompress(content[i : i + chunk_size])
+            if data:
+                yield data
+
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+class ResourceImportTask(TimestampedModelMixin, OperatorModelMixin):
+    """
+    资源后台导入任务，用于导入资源数量较多的文档
+
+    资源分批保存，processed 记录已保存的资源数量；导入失败后，可从已保存的资源之后继续导入
+    """
+
+    gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.CASCADE)
+    # 待导入的资源数据，由导入文档转换而来，格式同 ResourcesImporter.from_resources 的 resources 参数
+    resources = JSONField(default=list, dump_kwargs={"indent": None}, blank=True)
+    selected_resources = JSONField(null=True, blank=True, dump_kwargs={"indent": None})
+    status = models.CharField(
+        max_length=16,
+        choices=ResourceImportTaskStatusEnum.get_choices(),
+        default=ResourceImportTaskStatusEnum.PENDING.value,
+    )
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    message = models.TextField(blank=True, default="")
+
+    def __str__(self):
+        return f"<ResourceImportTask: {self.id}/{self.status}>"
+
+    class Meta:
+        verbose_name = _("资源导入任务")
+        verbose_name_plural = _("资源导入任务")
+        db_table = "support_resource_import_task"
+
+    @property
+    def is_resumable(self) -> bool:
+        """失败的任务，或执行中的 worker 异常退出、长时间未更新进度的任务，可继续执行"""
+        if self.status == ResourceImportTaskStatusEnum.FAILURE.value:
+            return True
+
+        return self.is_stale
+
+    @property
+    def is_stale(self) -> bool:
+        # 导入过程中，每批资源保存后均会更新进度，updated_time 长时间未变化，说明执行任务的 worker 已退出
+        if self.status not in [ResourceImportTaskStatusEnum.PENDING.value, ResourceImportTaskStatusEnum.RUNNING.value]:
+            return False
+
+        stale_time = timezone.now() - datetime.timedelta(seconds=settings.RESOURCE_IMPORT_TASK_STALE_TIMEOUT)
+        return bool(self.updated_time and self.updated_time < stale_time)
+
+    def update_progress(self, processed: int, total: int):
+        self.processed = processed
+        self.total = total
+        self.save(update_fields=["processed", "total", "updated_time"])
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from apigateway.apis.web.resource.serializers import ResourceExportOutputSLZ
+from apigateway.apps.support.constants import ResourceExportTaskStatusEnum, ResourceImportTaskStatusEnum
+from apigateway.apps.support.models import ResourceExportTask, ResourceImportTask
+from apigateway.biz.resource.exporter import ResourcesExporter
+from apigateway.biz.resource.importer import ResourcesImporter
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apigateway.apps.support.tasks.export_resources", ignore_result=True)
+def export_resources(task_id: int):
+    """异步导出资源，导出结果存储到任务中，供用户下载"""
+    task = ResourceExportTask.objects.filter(id=task_id).first()
+    if not task:
+        logger.warning("resource export task %s not found", task_id)
+        return
+
+    task.status = ResourceExportTaskStatusEnum.RUNNING.value
+    task.save(update_fields=["status", "updated_time"])
+
+    try:
+        exporter = ResourcesExporter.from_export_params(
+            gateway_id=task.gateway_id,
+            serializer_class=ResourceExportOutputSLZ,
+            export_type=task.params["export_type"],
+            resource_filter_condition=task.params.get("resource_filter_condition", {}),
+            resource_ids=task.params.get("resource_ids", []),
+        )
+        task.set_content(exporter.iter_swagger(task.file_type))
+    except Exception as err:
+        logger.exception("failed to export resources, task_id=%s", task_id)
+        task.status = ResourceExportTaskStatusEnum.FAILURE.value
+        task.message = str(err)
+        task.save(update_fields=["status", "message", "updated_time"])
+        return
+
+    task.status = ResourceExportTaskStatusEnum.SUCCESS.value
+    task.save(update_fields=["status", "content", "updated_time"])
+
+
+@shared_task(name="apigateway.apps.support.tasks.delete_old_resource_export_tasks", ignore_result=True)
+def delete_old_resource_export_tasks():
+    """清理过期的资源导出任务，导出的文档仅供用户短期内下载"""
+    deleted_end_time = timezone.now() - timedelta(days=settings.RESOURCE_EXPORT_TASK_RETENTION_DAYS)
+
+    deleted_count, _ = ResourceExportTask.objects.filter(created_time__lt=deleted_end_time).delete()
+
+    logger.info("deleted %s resource export tasks created before %s", deleted_count, deleted_end_time)
+
+
+@shared_task(name="apigateway.apps.support.tasks.import_resources", ignore_result=True)
+def import_resources(task_id: int):
+    """
+    后台导入资源，资源分批保存，并记录导入进度；
+    任务失败后重新执行时，从已保存的资源之后继续导入
+    """
+    task = ResourceImportTask.objects.filter(id=task_id).first()
+    if not task:
+        logger.warning("resource import task %s not found", task_id)
+        return
+
+    task.status = ResourceImportTaskStatusEnum.RUNNING.value
+    task.message = ""
+    task.save(update_fields=["status", "message", "updated_time"])
+
+    try:
+        # 导入前，重新校验全部资源；已保存的资源，将按 method + path 匹配为待更新的资源
+        importer = ResourcesImporter.from_resources(
+            gateway=task.gateway,
+            resources=task.resources,
+            selected_resources=task.selected_resources,
+            need_delete_unspecified_resources=False,
+            username=task.created_by or "",
+        )
+        task.update_progress(task.processed, len(importer.get_selected_resource_data_list()))
+        importer.import_resources(
+            chunk_size=settings.RESOURCE_IMPORT_CHUNK_SIZE,
+            start=task.processed,
+            progress_callback=task.update_progress,
+        )
+    except Exception as err:
+        logger.exception("failed to import resources, task_id=%s", task_id)
+        task.status = ResourceImportTaskStatusEnum.FAILURE.value
+        task.message = str(err)
+        task.save(update_fields=["status", "message", "updated_time"])
+        return
+
+    task.status = ResourceImportTaskStatusEnum.SUCCESS.value
+    task.save(update_fields=["status", "updated_time"])
@@ -22,6 +22,7 @@ from collections import defaultdict
 from typing import Any, Dict, List, Optional
 
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Count
 
 from apigateway.apps.monitor.models import AlarmStrategy
@@ -38,7 +39,18 @@ from apigateway.biz.stage import StageHandler
 from apigateway.common.contexts import GatewayAuthContext, GatewayFeatureFlagContext
 from apigateway.core.api_auth import APIAuthConfig
 from apigateway.core.constants import ContextScopeTypeEnum, GatewayTypeEnum
-from apigateway.core.models import Backend, BackendConfig, Context, Gateway, Release, Resource, SslCertificate, Stage
+from apigateway.core.gateway_cache import gateway_cache
+from apigateway.core.models import (
+    Backend,
+    BackendConfig,
+    Context,
+    Gateway,
+    GatewayMember,
+    Release,
+    Resource,
+    SslCertificate,
+    Stage,
+)
 from apigateway.utils.dict import deep_update
 
 
@@ -46,9 +58,8 @@ class GatewayHandler:
     @staticmethod
     def list_gateways_by_user(username: str) -> List[Gateway]:
         """获取用户有权限的的网关列表"""
-        # 使用 _maintainers 过滤的数据并不准确，需要根据其中人员列表二次过滤
-        queryset = Gateway.objects.filter(_maintainers__contains=username)
-        return [gateway for gateway in queryset if gateway.has_permission(username)]
+        # 通过网关成员表过滤，可使用 username 索引，避免对 _maintainers 做 LIKE 全表扫描
+        return list(Gateway.objects.filter(id__in=GatewayMember.objects.filter_gateway_ids(username)))
 
     @staticmethod
     def get_stages_with_release_status(gateway_ids: List[int]) -> Dict[int, list]:
@@ -242,6 +253,9 @@ class GatewayHandler:
 
         # delete gateway
         Gateway.objects.filter(id=gateway_id).delete()
+        # 事务提交前，其它请求可能重新缓存了旧数据，因此提交后再清理一次
+        gateway_cache.invalidate(gateway_id)
+        transaction.on_commit(lambda: gateway_cache.invalidate(gateway_id))
 
     @staticmethod
     def get_feature_flags(gateway_id: int) -> Dict[str, bool]:
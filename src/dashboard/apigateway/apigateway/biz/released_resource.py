@@ -16,12 +16,20 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import json
+import logging
+import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
 
 from apigateway.core.constants import StageStatusEnum
-from apigateway.core.models import Gateway, Release, ReleasedResource, Stage
+from apigateway.core.models import Gateway, Release, ReleasedResource, ResourceVersion, Stage
 from apigateway.core.utils import get_path_display, get_resource_doc_link
+from apigateway.utils import time as time_utils
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -96,14 +104,111 @@ def get_released_resource_data(gateway: Gateway, stage: Stage, resource_id: int)
 
 
 class ReleasedResourceHandler:
+    @staticmethod
+    def materialize_released_resources(gateway_id: int, resource_version: ResourceVersion) -> None:
+        """
+        保存已发布版本中的资源，并清理未发布版本的资源
+
+        不再发布的版本中，内容哈希与新版本一致的资源，直接将其归属更新为新版本，仅新增有变化的资源，
+        避免每次发布都重新写入全部资源的数据
+        """
+        started = time.perf_counter()
+
+        queryset = ReleasedResource.objects.filter(resource_version_id=resource_version.id)
+        data_index = resource_version.data_index
+        moved_count = created_count = 0
+        # 以资源数量判断版本的资源是否已完整保存，而非是否存在，避免此前部分保存的版本不再补全
+        if queryset.count() < len(data_index):
+            # 移动与新增资源在同一事务中，避免新增失败时，版本仅包含部分资源
+            with transaction.atomic():
+                existing_resource_ids = set(queryset.values_list("resource_id", flat=True))
+                moved_count = ReleasedResourceHandler._move_unchanged_released_resources(
+                    gateway_id, resource_version, existing_resource_ids
+                )
+
+                # 按实际已存在的资源计算待新增的资源，并发发布时，不依赖上一步的结果
+                existing_resource_ids = set(queryset.values_list("resource_id", flat=True))
+                resource_ids = {entry["id"] for entry in data_index} - existing_resource_ids
+                resource_to_add = [
+                    ReleasedResource(
+                        gateway_id=resource_version.gateway_id,
+                        resource_version_id=resource_version.id,
+                        resource_id=resource["id"],
+                        resource_name=resource["name"],
+                        resource_method=resource["method"],
+                        resource_path=resource["path"],
+                        data=resource,
+                    )
+                    for resource in resource_version.filter_resource_data(resource_ids)
+                ]
+                ReleasedResource.objects.bulk_create(
+                    resource_to_add, batch_size=settings.RELEASED_RESOURCE_CREATE_BATCH_SIZE
+                )
+                created_count = len(resource_to_add)
+
+        deleted_count = ReleasedResourceHandler.clear_unreleased_resource(gateway_id)
+
+        logger.info(
+            "materialize released resources, gateway_id=%s, resource_version_id=%s, "
+            "moved=%s, created=%s, deleted=%s, elapsed=%.3fs",
+            gateway_id,
+            resource_version.id,
+            moved_count,
+            created_count,
+            deleted_count,
+            time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def _move_unchanged_released_resources(
+        gateway_id: int, resource_version: ResourceVersion, existing_resource_ids: Set[int]
+    ) -> int:
+        """将不再发布的版本中，内容未变化的资源归属到新版本，新版本中已存在的资源除外，返回更新的资源数量"""
+        released_resource_version_ids = Release.objects.get_released_resource_version_ids(gateway_id)
+        # 不再发布的版本中最新的一个，一般为当前环境此前发布的版本
+        source_resource_version_id = (
+            ReleasedResource.objects.filter(gateway_id=gateway_id)
+            .exclude(resource_version_id__in=released_resource_version_ids)
+            .order_by("-resource_version_id")
+            .values_list("resource_version_id", flat=True)
+            .first()
+        )
+        if not source_resource_version_id:
+            return 0
+
+        source_resource_version = ResourceVersion.objects.filter(
+            gateway_id=gateway_id, id=source_resource_version_id
+        ).first()
+        if not source_resource_version:
+            return 0
+
+        source_resource_hashes = source_resource_version.get_resource_hashes()
+        unchanged_resource_ids = [
+            int(resource_id)
+            for resource_id, resource_hash in resource_version.get_resource_hashes().items()
+            if source_resource_hashes.get(resource_id) == resource_hash
+            and int(resource_id) not in existing_resource_ids
+        ]
+        if not unchanged_resource_ids:
+            return 0
+
+        return ReleasedResource.objects.filter(
+            gateway_id=gateway_id,
+            resource_version_id=source_resource_version_id,
+            resource_id__in=unchanged_resource_ids,
+        ).update(resource_version_id=resource_version.id, updated_time=time_utils.now_datetime())
+
     # TODO 待重构
     @staticmethod
-    def clear_unreleased_resource(gateway_id: int) -> None:
-        """清理未发布的资源，如已发布版本被新版本替换的情况"""
+    def clear_unreleased_resource(gateway_id: int) -> int:
+        """清理未发布的资源，如已发布版本被新版本替换的情况，返回删除的资源数量"""
         resource_version_ids = Release.objects.get_released_resource_version_ids(gateway_id)
-        ReleasedResource.objects.filter(gateway_id=gateway_id).exclude(
-            resource_version_id__in=resource_version_ids
-        ).delete()
+        deleted_count, _ = (
+            ReleasedResource.objects.filter(gateway_id=gateway_id)
+            .exclude(resource_version_id__in=resource_version_ids)
+            .delete()
+        )
+        return deleted_count
 
     # TODO 待重构
     @staticmethod
@@ -16,6 +16,7 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import logging
 from dataclasses import dataclass
 from typing import Optional
 
@@ -27,6 +28,7 @@ from rest_framework.exceptions import ValidationError
 from apigateway.apps.audit.constants import OpTypeEnum
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
+from apigateway.apps.search.indexes import ResourceSearchIndex
 from apigateway.apps.support.models import ReleasedResourceDoc, ResourceDocVersion
 from apigateway.biz.audit import Auditor
 from apigateway.biz.released_resource import ReleasedResourceHandler
@@ -43,13 +45,14 @@ from apigateway.core.models import (
     MicroGateway,
     MicroGatewayReleaseHistory,
     Release,
-    ReleasedResource,
     ReleaseHistory,
     ResourceVersion,
     Stage,
 )
 from apigateway.utils.django import get_model_dict
 
+logger = logging.getLogger(__name__)
+
 
 class ReleaseError(Exception):
     """发布失败"""
@@ -118,32 +121,41 @@ class BaseGatewayReleaser:
 
         # save release history
         history = self._save_release_history()
-        PublishEventReporter.report_config_validate_success_event(history)
 
-        instance = Release.objects.save_release(
-            gateway=self.gateway,
-            stage=self.stage,
-            resource_version=self.resource_version,
-            comment=self.comment,
-            username=self.username,
-        )
+        # 校验成功、创建发布任务事件，批量写入
+        with PublishEventReporter.buffered():
+            PublishEventReporter.report_config_validate_success_event(history)
 
-        # record audit log
-        Auditor.record_release_op_success(
-            op_type=OpTypeEnum.CREATE,
-            username=self.username,
-            gateway_id=self.gateway.id,
-            instance_id=instance.id,
-            instance_name=f"{self.stage.name}:{instance.resource_version.name}",
-            data_before={},
-            data_after=get_model_dict(instance),
-        )
+            instance = Release.objects.save_release(
+                gateway=self.gateway,
+                stage=self.stage,
+                resource_version=self.resource_version,
+                comment=self.comment,
+                username=self.username,
+            )
+
+            # record audit log
+            Auditor.record_release_op_success(
+                op_type=OpTypeEnum.CREATE,
+                username=self.username,
+                gateway_id=self.gateway.id,
+                instance_id=instance.id,
+                instance_name=f"{self.stage.name}:{instance.resource_version.name}",
+                data_before={},
+                data_after=get_model_dict(instance),
+            )
 
-        # 发布，仅对微网关生效
-        self._do_release(instance, history)
+            # 发布，仅对微网关生效
+            self._do_release(instance, history)
 
         self._post_release()
 
+        # 发布后更新资源搜索索引，避免首次搜索时再构建；索引仅用于搜索，更新失败不影响发布结果
+        try:
+            ResourceSearchIndex().refresh(str(self.gateway.id))
+        except Exception:
+            logger.exception("refresh resource search index failed, gateway_id=%s", self.gateway.id)
+
         return history
 
     def _pre_release(self):
@@ -242,8 +254,7 @@ class BaseGatewayReleaser:
         Stage.objects.filter(id=self.stage.id).update(status=StageStatusEnum.ACTIVE.value)
 
         # update_and_clear_released_resources
-        ReleasedResource.objects.save_released_resource(self.resource_version)
-        ReleasedResourceHandler.clear_unreleased_resource(self.gateway.id)
+        ReleasedResourceHandler.materialize_released_resources(self.gateway.id, self.resource_version)
 
         # update_and_clear_released_resource_docs()
         resource_doc_version = ResourceDocVersion.objects.get_by_resource_version_id(
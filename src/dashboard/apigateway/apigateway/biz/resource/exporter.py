@@ -0,0 +1,124 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+资源导出
+
+按批次加载待导出的资源及其关联数据，并流式生成 swagger 文档，避免导出大网关时一次性加载全部数据
+"""
+from typing import Any, Dict, Iterator, List, Type
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from apigateway.apis.web.constants import ExportTypeEnum
+from apigateway.apps.plugin.constants import PluginBindingScopeEnum
+from apigateway.apps.plugin.models import PluginBinding
+from apigateway.biz.resource_label import ResourceLabelHandler
+from apigateway.common.contexts import ResourceAuthContext
+from apigateway.core.gateway_cache import gateway_cache
+from apigateway.core.models import Proxy, Resource
+
+from .importer.swagger import ResourceSwaggerExporter
+from .resource import ResourceHandler
+
+# 每批加载的资源数量
+EXPORT_BATCH_SIZE = 500
+
+
+class ResourcesExporter:
+    def __init__(
+        self,
+        gateway_id: int,
+        queryset: QuerySet,
+        serializer_class: Type[serializers.Serializer],
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ):
+        """
+        :param queryset: 待导出的资源
+        :param serializer_class: 将资源转换为导出数据的 serializer，如 ResourceExportOutputSLZ
+        """
+        self.gateway_id = gateway_id
+        self.queryset = queryset
+        self.serializer_class = serializer_class
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_export_params(
+        cls,
+        gateway_id: int,
+        serializer_class: Type[serializers.Serializer],
+        export_type: str,
+        resource_filter_condition: Dict[str, Any],
+        resource_ids: List[int],
+    ) -> "ResourcesExporter":
+        return cls(
+            gateway_id,
+            cls.filter_selected_resources(gateway_id, export_type, resource_filter_condition, resource_ids),
+            serializer_class,
+        )
+
+    @staticmethod
+    def filter_selected_resources(
+        gateway_id: int,
+        export_type: str,
+        resource_filter_condition: Dict[str, Any],
+        resource_ids: List[int],
+    ) -> QuerySet:
+        """获取待导出的资源"""
+        if export_type == ExportTypeEnum.ALL.value:
+            return Resource.objects.filter(gateway_id=gateway_id)
+
+        if export_type == ExportTypeEnum.FILTERED.value:
+            return ResourceHandler.filter_by_resource_filter_condition(gateway_id, resource_filter_condition or {})
+
+        if export_type == ExportTypeEnum.SELECTED.value:
+            return Resource.objects.filter(gateway_id=gateway_id, id__in=resource_ids)
+
+        return Resource.objects.none()
+
+    def iter_swagger(self, file_type: str) -> Iterator[str]:
+        """流式生成 swagger 文档"""
+        return ResourceSwaggerExporter().iter_swagger(self.iter_resources(), file_type=file_type)
+
+    def iter_resources(self) -> Iterator[Dict[str, Any]]:
+        """按 path 排序，分批获取资源的导出数据，相同 path 的资源相邻"""
+        # 仅预先加载资源 ID 及 path，资源及关联数据按批次加载；
+        # 在 Python 中按 path 精确排序，数据库排序规则不区分大小写时（如 MySQL），/Users 与 /users 可能交错排列
+        resource_ids = [resource_id for _, resource_id in sorted(self.queryset.values_list("path", "id"))]
+        backends = gateway_cache.get_backends(self.gateway_id)
+
+        for i in range(0, len(resource_ids), self.batch_size):
+            batch_ids = resource_ids[i : i + self.batch_size]
+            resource_map = Resource.objects.in_bulk(batch_ids)
+            resources = [resource_map[resource_id] for resource_id in batch_ids if resource_id in resource_map]
+
+            slz = self.serializer_class(resources, many=True, context=self._get_context(batch_ids, backends))
+            yield from slz.data
+
+    def _get_context(self, resource_ids: List[int], backends: Dict[int, Any]) -> Dict[str, Any]:
+        return {
+            "labels": ResourceLabelHandler.get_labels(resource_ids),
+            "backends": backends,
+            "proxies": {proxy.resource_id: proxy for proxy in Proxy.objects.filter(resource_id__in=resource_ids)},
+            "resource_id_to_plugin_bindings": PluginBinding.objects.query_scope_id_to_bindings(
+                gateway_id=self.gateway_id,
+                scope_type=PluginBindingScopeEnum.RESOURCE,
+                scope_ids=resource_ids,
+            ),
+            "auth_configs": ResourceAuthContext().get_resource_id_to_auth_config(resource_ids),
+        }
@@ -17,9 +17,10 @@
 #
 import logging
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from django.conf import settings
+from django.db import transaction
 from django.utils.translation import gettext as _
 from pydantic import parse_obj_as
 
@@ -420,28 +421,53 @@ class ResourcesImporter:
             username=username,
         )
 
-    def import_resources(self):
-        # 1. 删除未指定资源，即已创建的资源中，未被选中的资源
-        if self.need_delete_unspecified_resources:
-            self._deleted_resources = self._delete_unspecified_resources()
+    def import_resources(
+        self,
+        chunk_size: Optional[int] = None,
+        start: int = 0,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        导入资源
+
+        :param chunk_size: 分批保存资源时，每批的资源数量；为空表示一次保存全部资源。
+            分批保存时，每批资源在独立的事务中保存，避免导入大量资源时长时间持有资源、代理、标签等数据的行锁
+        :param start: 从第 start 个资源开始保存，用于导入失败后继续导入，此前的资源已保存
+        :param progress_callback: 每批资源保存后回调，参数为已保存的资源数量、资源总数
+        """
+        with transaction.atomic():
+            # 1. 删除未指定资源，即已创建的资源中，未被选中的资源
+            if self.need_delete_unspecified_resources:
+                self._deleted_resources = self._delete_unspecified_resources()
+
+            # 2. 创建不存在的网关标签
+            self._create_not_exist_labels()
+
+            # 3. 补全标签 ID 数据
+            self._complete_label_ids()
 
-        # 2. 创建不存在的网关标签
-        self._create_not_exist_labels()
+            # 4. [legacy upstreams] 创建或更新 backend，并替换资源对应的 backend
+            self._sync_legacy_upstreams_to_backend_and_replace_resource_backend()
 
-        # 3. 补全标签 ID 数据
-        self._complete_label_ids()
+        total = len(self.resource_data_list)
+        chunk_size = chunk_size or total or 1
+        for offset in range(start, total, chunk_size):
+            resource_data_list = self.resource_data_list[offset : offset + chunk_size]
+            with transaction.atomic():
+                self._import_resource_chunk(resource_data_list)
 
-        # 4. [legacy upstreams] 创建或更新 backend，并替换资源对应的 backend
-        self._sync_legacy_upstreams_to_backend_and_replace_resource_backend()
+            if progress_callback:
+                progress_callback(min(offset + chunk_size, total), total)
 
+    def _import_resource_chunk(self, resource_data_list: List[ResourceData]):
         # 5. 创建或更新资源
-        self._create_or_update_resources()
+        self._create_or_update_resources(resource_data_list)
 
         # 6. [legacy transform-headers] 将 transform-headers 转换为 bk-header-rewrite 插件，并绑定到资源
-        self._sync_legacy_transform_headers_to_plugins()
+        self._sync_legacy_transform_headers_to_plugins(resource_data_list)
 
         # 7. 导入插件
-        self._sync_plugins()
+        self._sync_plugins(resource_data_list)
 
     def get_selected_resource_data_list(self) -> List[ResourceData]:
         return self.resource_data_list
@@ -491,17 +517,17 @@ class ResourcesImporter:
         for resource_data in self.resource_data_list:
             resource_data.label_ids = [labels[name] for name in resource_data.metadata.get("labels", [])]
 
-    def _create_or_update_resources(self) -> List[Resource]:
+    def _create_or_update_resources(self, resource_data_list: Optional[List[ResourceData]] = None) -> List[Resource]:
         saver = ResourcesSaver(
             gateway=self.gateway,
-            resource_data_list=self.resource_data_list,
+            resource_data_list=self.resource_data_list if resource_data_list is None else resource_data_list,
             username=self.username,
         )
         return saver.save()
 
-    def _sync_plugins(self):
+    def _sync_plugins(self, resource_data_list: Optional[List[ResourceData]] = None):
         scope_id_to_plugin_configs: Dict[int, List[PluginConfigData]] = {}
-        for resource_data in self.resource_data_list:
+        for resource_data in self.resource_data_list if resource_data_list is None else resource_data_list:
             if resource_data.plugin_configs is None:
                 continue
 
@@ -522,7 +548,11 @@ class ResourcesImporter:
         synchronizer = LegacyUpstreamToBackendSynchronizer(self.gateway, self.resource_data_list, self.username)
         synchronizer.sync_backends_and_replace_resource_backend()
 
-    def _sync_legacy_transform_headers_to_plugins(self):
+    def _sync_legacy_transform_headers_to_plugins(self, resource_data_list: Optional[List[ResourceData]] = None):
         """根据 backend_config 中的 legacy_transform_headers 创建 bk-header-rewrite 插件，并绑定到资源"""
-        synchronizer = LegacyTransformHeadersToPluginSynchronizer(self.gateway, self.resource_data_list, self.username)
+        synchronizer = LegacyTransformHeadersToPluginSynchronizer(
+            self.gateway,
+            self.resource_data_list if resource_data_list is None else resource_data_list,
+            self.username,
+        )
         synchronizer.sync_plugins()
@@ -16,11 +16,13 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import itertools
 import json
 import logging
 import pkgutil
+import textwrap
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import jsonschema
 
@@ -251,7 +253,66 @@ class ResourceSwaggerExporter:
         self.description = description
 
     def to_swagger(self, resources: list, file_type: str = "") -> str:
-        content = {
+        content = self._generate_header()
+        content["paths"] = self._generate_paths(resources)
+
+        if file_type == SwaggerFormatEnum.JSON.value:
+            return json.dumps(content, indent=4)
+
+        return yaml_dumps(content)
+
+    def iter_swagger(self, resources: Iterable[Dict], file_type: str = "") -> Iterator[str]:
+        """
+        流式生成 swagger 文档，逐个 path 输出，不在内存中构造完整文档；
+        生成的文档与 to_swagger 等价
+
+        :param resources: 资源数据，需按 path 排序（区分大小写），相同 path 的资源须相邻
+        """
+        header = self._generate_header()
+        grouped_paths = (
+            (path, self._generate_path_item(group))
+            for path, group in itertools.groupby(resources, key=lambda resource: resource["path"])
+        )
+
+        if file_type == SwaggerFormatEnum.JSON.value:
+            return self._iter_json(header, grouped_paths)
+
+        return self._iter_yaml(header, grouped_paths)
+
+    def _iter_json(self, header: Dict[str, Any], paths: Iterator) -> Iterator[str]:
+        # 与 json.dumps(content, indent=4) 的输出格式保持一致
+        yield "{"
+        for key, value in header.items():
+            yield f"\n    {json.dumps(key)}: {self._indent_json(value, 4)},"
+
+        yield '\n    "paths": {'
+        is_empty = True
+        for path, path_item in paths:
+            yield f"{'' if is_empty else ','}\n        {json.dumps(path)}: {self._indent_json(path_item, 8)}"
+            is_empty = False
+
+        yield "}\n}" if is_empty else "\n    }\n}"
+
+    def _indent_json(self, value: Any, indent: int) -> str:
+        # json 字符串中的换行已被转义，因此，可直接按行缩进
+        return json.dumps(value, indent=4).replace("\n", "\n" + " " * indent)
+
+    def _iter_yaml(self, header: Dict[str, Any], paths: Iterator) -> Iterator[str]:
+        yield yaml_dumps(header)
+
+        is_empty = True
+        for path, path_item in paths:
+            if is_empty:
+                yield "paths:\n"
+                is_empty = False
+
+            yield textwrap.indent(yaml_dumps({path: path_item}), "  ")
+
+        if is_empty:
+            yield "paths: {}\n"
+
+    def _generate_header(self) -> Dict[str, Any]:
+        return {
             "swagger": "2.0",
             "basePath": "/",
             "info": {
@@ -260,20 +321,19 @@ class ResourceSwaggerExporter:
                 "description": self.description,
             },
             "schemes": ["http"],
-            "paths": self._generate_paths(resources),
         }
 
-        if file_type == SwaggerFormatEnum.JSON.value:
-            return json.dumps(content, indent=4)
-
-        return yaml_dumps(content)
-
     def _generate_paths(self, resources: List[Dict]) -> Dict[str, Any]:
         paths: Dict[str, Any] = {}
         for resource in resources:
-            path = resource["path"]
-            paths.setdefault(path, {})
+            paths.setdefault(resource["path"], {}).update(self._generate_path_item([resource]))
 
+        return paths
+
+    def _generate_path_item(self, resources: Iterable[Dict]) -> Dict[str, Any]:
+        """生成同一 path 下各请求方法的 operation"""
+        path_item: Dict[str, Any] = {}
+        for resource in resources:
             method = self._adapt_method(resource["method"])
             operation = {
                 "operationId": resource["name"],
@@ -287,9 +347,9 @@ class ResourceSwaggerExporter:
             if self.include_bk_apigateway_resource:
                 self._generate_bk_apigateway_resource(operation, resource)
 
-            paths[path][method] = operation
+            path_item[method] = operation
 
-        return paths
+        return path_item
 
     def _generate_bk_apigateway_resource(self, operation: Dict[str, Any], resource: Dict[str, Any]):
         backend = resource.get("backend", {})
@@ -0,0 +1,106 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+资源列表查询
+
+- 一页资源及其关联数据（标签、文档、后端服务、最新版本时间），以固定数量的查询获取，不随分页大小、网关资源数增长
+- 关联数据只查询列表展示所需的字段
+- 支持基于游标（上一页最后一个资源 ID）的分页，避免大网关深度分页时 OFFSET 扫描过多数据
+"""
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Q, QuerySet
+
+from apigateway.biz.resource_doc.resource_doc import ResourceDocHandler
+from apigateway.biz.resource_label import ResourceLabelHandler
+from apigateway.biz.resource_version import ResourceVersionHandler
+from apigateway.core.models import Proxy, Resource
+
+# 资源列表展示所需的字段
+RESOURCE_LIST_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "description_en",
+    "method",
+    "path",
+    "match_subpath",
+    "created_time",
+    "updated_time",
+]
+
+
+class ResourceLister:
+    def __init__(self, gateway_id: int):
+        self.gateway_id = gateway_id
+
+    def only_list_fields(self, queryset: QuerySet) -> QuerySet:
+        """仅查询资源列表展示所需的字段"""
+        return queryset.only(*RESOURCE_LIST_FIELDS)
+
+    def filter_after(self, queryset: QuerySet, order_by: str, after_id: Optional[int]) -> QuerySet:
+        """
+        游标分页：按 order_by 排序（以资源 ID 作为次级排序，保证顺序稳定），并返回排在资源 after_id 之后的资源
+
+        :param order_by: 排序字段，如 -updated_time
+        :param after_id: 上一页最后一个资源的 ID，为空时从第一个资源开始
+        """
+        field = order_by.lstrip("-")
+        descending = order_by.startswith("-")
+        id_ordering = "-id" if descending else "id"
+
+        queryset = queryset.order_by(order_by) if field == "id" else queryset.order_by(order_by, id_ordering)
+        if after_id is None:
+            return queryset
+
+        lookup = "lt" if descending else "gt"
+        if field == "id":
+            return queryset.filter(**{f"id__{lookup}": after_id})
+
+        anchor = Resource.objects.filter(gateway_id=self.gateway_id, id=after_id).values(field).first()
+        if anchor is None:
+            # 游标对应的资源已被删除，无法定位下一页
+            return queryset.none()
+
+        value = anchor[field]
+        return queryset.filter(Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"id__{lookup}": after_id}))
+
+    def get_context(self, resource_ids: List[int]) -> Dict[str, Any]:
+        """获取一页资源的关联数据，用于 ResourceListOutputSLZ"""
+        return {
+            "labels": ResourceLabelHandler.get_labels(resource_ids),
+            "docs": ResourceDocHandler.get_docs(resource_ids),
+            "backends": self.get_backends(resource_ids),
+            "latest_version_created_time": ResourceVersionHandler.get_latest_created_time(self.gateway_id),
+        }
+
+    def get_backends(self, resource_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """获取资源对应的后端服务，仅查询当前页资源关联的后端服务，而非网关下所有后端服务"""
+        if not resource_ids:
+            return {}
+
+        queryset = Proxy.objects.filter(resource_id__in=resource_ids, backend__isnull=False).values(
+            "resource_id", "backend_id", "backend__name"
+        )
+        return {
+            proxy["resource_id"]: {
+                "id": proxy["backend_id"],
+                "name": proxy["backend__name"],
+            }
+            for proxy in queryset
+        }
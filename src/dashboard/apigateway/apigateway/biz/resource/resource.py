@@ -22,11 +22,10 @@ import json
 import operator
 from typing import Any, Dict, List, Optional
 
-from django.db.models import Q
-
 from apigateway.apps.label.models import APILabel, ResourceLabel
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
+from apigateway.apps.search.indexes import ResourceSearchIndex
 from apigateway.apps.support.models import ResourceDoc
 from apigateway.common.contexts import ResourceAuthContext
 from apigateway.core.constants import ContextScopeTypeEnum
@@ -178,11 +177,13 @@ class ResourceHandler:
             queryset = queryset.filter(id__in=resource_ids)
 
         if condition.get("keyword"):
-            keyword = condition.get("keyword")
-            queryset = queryset.filter(Q(path__icontains=keyword) | Q(name__icontains=keyword))
+            queryset = ResourceSearchIndex().filter(queryset, condition["keyword"], scope=str(gateway_id))
 
         if condition.get("order_by"):
             queryset = queryset.order_by(condition["order_by"])
+        elif condition.get("keyword"):
+            # 未指定排序字段时，按关键字匹配度排序
+            queryset = queryset.order_by("-search_score", "-updated_time")
 
         return queryset
 
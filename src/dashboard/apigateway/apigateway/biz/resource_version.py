@@ -19,7 +19,7 @@
 import datetime
 import json
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from cachetools import TTLCache, cached
 from django.utils.translation import gettext as _
@@ -37,25 +37,41 @@ from apigateway.biz.proxy import ProxyHandler
 from apigateway.biz.resource import ResourceHandler
 from apigateway.biz.resource_doc import ResourceDocHandler
 from apigateway.biz.resource_label import ResourceLabelHandler
+from apigateway.biz.resource_version_diff import ResourceDifferHandler
 from apigateway.biz.stage_resource_disabled import StageResourceDisabledHandler
 from apigateway.common.constants import CACHE_MAXSIZE, CACHE_TIME_24_HOURS
 from apigateway.core.constants import STAGE_VAR_PATTERN, ContextScopeTypeEnum, ProxyTypeEnum, ResourceVersionSchemaEnum
-from apigateway.core.models import Gateway, Proxy, Release, Resource, ResourceVersion, Stage
+from apigateway.core.models import Context, Gateway, Proxy, Release, Resource, ResourceVersion, Stage
 from apigateway.utils import time as time_utils
 
 
 class ResourceVersionHandler:
     @staticmethod
-    def make_version(gateway: Gateway):
+    def make_version(gateway: Gateway, base_resource_version: Optional[ResourceVersion] = None):
+        """
+        生成当前资源列表的版本数据
+
+        指定基准版本时，代理配置、资源上下文与基准版本一致的资源，复用基准版本中的快照，
+        仅重新生成变更资源的代理配置、资源上下文快照
+        """
         resource_queryset = Resource.objects.filter(gateway_id=gateway.id).all()
         resource_ids = list(resource_queryset.values_list("id", flat=True))
 
-        proxy_map = ProxyHandler.get_resource_id_to_snapshot(resource_ids)
+        unchanged_resource_map = ResourceVersionHandler._get_unchanged_resource_map(
+            resource_ids, base_resource_version
+        )
+        changed_resource_ids = [
+            resource_id for resource_id in resource_ids if resource_id not in unchanged_resource_map
+        ]
 
+        proxy_map = ProxyHandler.get_resource_id_to_snapshot(changed_resource_ids)
         context_map = ContextHandler.filter_id_type_snapshot_map(
             scope_type=ContextScopeTypeEnum.RESOURCE.value,
-            scope_ids=resource_ids,
+            scope_ids=changed_resource_ids,
         )
+        for resource_id, resource in unchanged_resource_map.items():
+            proxy_map[resource_id] = resource["proxy"]
+            context_map[resource_id] = resource["contexts"]
         disabled_stage_map = {
             resource_id: [stage["name"] for stage in stages]
             for resource_id, stages in StageResourceDisabledHandler.filter_disabled_stages_by_gateway(gateway).items()
@@ -89,6 +105,75 @@ class ResourceVersionHandler:
             for r in resource_queryset
         ]
 
+    @staticmethod
+    def _get_unchanged_resource_map(
+        resource_ids: List[int], base_resource_version: Optional[ResourceVersion]
+    ) -> Dict[int, dict]:
+        """
+        获取代理配置、资源上下文与基准版本中快照一致的资源在基准版本中的数据
+
+        按数据内容而非更新时间判断：导入等长事务中，更新时间早于事务提交时间，
+        若事务在基准版本生成后才提交，按更新时间判断会遗漏变更
+        """
+        if not (base_resource_version and base_resource_version.is_schema_v2):
+            return {}
+
+        resource_id_set = set(resource_ids)
+        base_resource_map = {
+            resource["id"]: resource for resource in base_resource_version.data if resource["id"] in resource_id_set
+        }
+        if not base_resource_map:
+            return {}
+
+        proxy_map = {
+            proxy["resource_id"]: proxy
+            for proxy in Proxy.objects.filter(resource_id__in=base_resource_map.keys()).values(
+                "id", "resource_id", "type", "backend_id", "schema_id", "_config"
+            )
+        }
+        context_map: Dict[int, Dict[str, dict]] = defaultdict(dict)
+        for context in Context.objects.filter(
+            scope_type=ContextScopeTypeEnum.RESOURCE.value,
+            scope_id__in=base_resource_map.keys(),
+        ).values("id", "scope_id", "type", "schema_id", "_config"):
+            context_map[context["scope_id"]][context["type"]] = context
+
+        unchanged_resource_map = {}
+        for resource_id, resource in base_resource_map.items():
+            if not ResourceVersionHandler._is_snapshot_unchanged(
+                resource.get("proxy"), proxy_map.get(resource_id), ["id", "type", "backend_id"]
+            ):
+                continue
+
+            contexts = resource.get("contexts") or {}
+            if contexts.keys() != context_map[resource_id].keys():
+                continue
+
+            if all(
+                ResourceVersionHandler._is_snapshot_unchanged(
+                    snapshot, context_map[resource_id][type_], ["id", "type"]
+                )
+                for type_, snapshot in contexts.items()
+            ):
+                unchanged_resource_map[resource_id] = resource
+
+        return unchanged_resource_map
+
+    @staticmethod
+    def _is_snapshot_unchanged(snapshot: Optional[dict], row: Optional[dict], fields: List[str]) -> bool:
+        """代理配置、资源上下文的快照，与数据库中的记录是否一致"""
+        if not (snapshot and row):
+            return False
+
+        if any(snapshot.get(field) != row[field] for field in fields):
+            return False
+
+        if (snapshot.get("schema") or {}).get("id") != row["schema_id"]:
+            return False
+
+        config = json.loads(row["_config"]) if row["_config"] else {}
+        return json.loads(snapshot["config"]) == config
+
     @staticmethod
     def get_data_by_id_or_new(gateway: Gateway, resource_version_id: Optional[int]) -> list:
         """
@@ -99,6 +184,68 @@ class ResourceVersionHandler:
 
         return ResourceVersionHandler.make_version(gateway)
 
+    @staticmethod
+    def diff_resource_versions(
+        gateway: Gateway,
+        source_resource_version_id: Optional[int],
+        target_resource_version_id: Optional[int],
+    ) -> dict:
+        """
+        对比资源版本，源版本为空时，与空版本对比；目标版本为空时，与当前资源列表生成的版本数据对比
+        """
+        if target_resource_version_id:
+            # 已创建的版本及其文档版本不会再变化，对比结果可缓存
+            return ResourceVersionHandler._diff_created_resource_versions(
+                gateway.id, source_resource_version_id, target_resource_version_id
+            )
+
+        source_data, source_resource_hashes, source_doc_updated_time = ResourceVersionHandler._get_diff_data(
+            gateway.id, source_resource_version_id
+        )
+        return ResourceDifferHandler.diff_resource_version_data(
+            source_data,
+            ResourceVersionHandler.make_version(gateway),
+            source_resource_doc_updated_time=source_doc_updated_time,
+            target_resource_doc_updated_time=ResourceDocVersion.objects.get_doc_updated_time(gateway.id, None),
+            source_resource_hashes=source_resource_hashes,
+        )
+
+    # 注意：返回缓存中的对象，调用方不可修改
+    @staticmethod
+    @cached(cache=TTLCache(maxsize=100, ttl=CACHE_TIME_24_HOURS))
+    def _diff_created_resource_versions(
+        gateway_id: int,
+        source_resource_version_id: Optional[int],
+        target_resource_version_id: int,
+    ) -> dict:
+        source_data, source_resource_hashes, source_doc_updated_time = ResourceVersionHandler._get_diff_data(
+            gateway_id, source_resource_version_id
+        )
+        target_data, target_resource_hashes, target_doc_updated_time = ResourceVersionHandler._get_diff_data(
+            gateway_id, target_resource_version_id
+        )
+        return ResourceDifferHandler.diff_resource_version_data(
+            source_data,
+            target_data,
+            source_resource_doc_updated_time=source_doc_updated_time,
+            target_resource_doc_updated_time=target_doc_updated_time,
+            source_resource_hashes=source_resource_hashes,
+            target_resource_hashes=target_resource_hashes,
+        )
+
+    @staticmethod
+    def _get_diff_data(gateway_id: int, resource_version_id: Optional[int]) -> Tuple[list, Dict[str, str], dict]:
+        """获取版本对比所需的版本数据、资源内容哈希、文档更新时间"""
+        if not resource_version_id:
+            return [], {}, {}
+
+        resource_version = ResourceVersion.objects.get(gateway_id=gateway_id, id=resource_version_id)
+        return (
+            resource_version.data,
+            resource_version.get_resource_hashes(),
+            ResourceDocVersion.objects.get_doc_updated_time(gateway_id, resource_version_id),
+        )
+
     @staticmethod
     def delete_by_gateway_id(gateway_id: int):
         # delete gateway release
@@ -113,7 +260,9 @@ class ResourceVersionHandler:
 
         data.update(
             {
-                "data": ResourceVersionHandler.make_version(gateway),
+                "data": ResourceVersionHandler.make_version(
+                    gateway, ResourceVersion.objects.get_latest_version(gateway.id)
+                ),
                 "gateway": gateway,
                 "version": data.get("version"),
                 "created_time": now,
@@ -204,7 +353,7 @@ class ResourceVersionHandler:
         # 版本中资源数量是否发生变化
         # some resource could be deleted
         resource_count = Resource.objects.filter(gateway_id=gateway_id).count()
-        if resource_count != len(latest_version.data):
+        if resource_count != len(latest_version.get_resource_hashes()):
             return True
 
         return False
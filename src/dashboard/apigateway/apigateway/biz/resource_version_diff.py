@@ -21,6 +21,8 @@ from typing import Any, Dict, List, Optional, Text, Tuple, Union
 from pydantic import BaseModel, Field, Json, validator
 from typing_extensions import Literal
 
+from apigateway.core.utils import get_resource_data_hashes
+
 
 class DiffMixin:
     def diff(self, target: BaseModel) -> Tuple[Optional[dict], Optional[dict]]:
@@ -158,7 +160,21 @@ class ResourceDifferHandler(BaseModel, DiffMixin):
         target_data: list,
         source_resource_doc_updated_time: dict,
         target_resource_doc_updated_time: dict,
+        source_resource_hashes: Optional[Dict[str, str]] = None,
+        target_resource_hashes: Optional[Dict[str, str]] = None,
     ) -> dict:
+        """
+        对比两个版本的资源数据
+
+        资源内容哈希、文档更新时间均一致的资源，视为无变化，不再解析、对比资源数据；
+        未提供内容哈希时，根据版本数据实时计算
+        """
+        # 需在添加文档更新时间前计算，与版本创建时记录的哈希保持一致
+        if source_resource_hashes is None:
+            source_resource_hashes = get_resource_data_hashes(source_data)
+        if target_resource_hashes is None:
+            target_resource_hashes = get_resource_data_hashes(target_data)
+
         source_key_to_value_map = {}
         target_data_map = {}
         for item in source_data:
@@ -177,14 +193,23 @@ class ResourceDifferHandler(BaseModel, DiffMixin):
         resource_update = []
 
         for resource_id, source_resource_data_raw in source_key_to_value_map.items():
-            source_resource_differ = ResourceDifferHandler.parse_obj(source_resource_data_raw)
             target_resource_data = target_data_map.pop(resource_id, None)
 
             # 目标版本中资源不存在，资源被删除
             if not target_resource_data:
-                resource_delete.append(source_resource_differ.dict())
+                resource_delete.append(ResourceDifferHandler.parse_obj(source_resource_data_raw).dict())
                 continue
 
+            # 资源内容哈希、文档更新时间均未变化，忽略此资源
+            source_resource_hash = source_resource_hashes.get(str(resource_id))
+            if (
+                source_resource_hash
+                and source_resource_hash == target_resource_hashes.get(str(resource_id))
+                and source_resource_data_raw["doc_updated_time"] == target_resource_data["doc_updated_time"]
+            ):
+                continue
+
+            source_resource_differ = ResourceDifferHandler.parse_obj(source_resource_data_raw)
             target_resource_differ = ResourceDifferHandler.parse_obj(target_resource_data)
             source_diff_value, target_diff_value = source_resource_differ.diff(target_resource_differ)
 
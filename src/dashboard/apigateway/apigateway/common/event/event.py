@@ -15,17 +15,76 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import Optional
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
 
 from apigateway.core.constants import PublishEventNameTypeEnum, PublishEventStatusTypeEnum, PublishSourceEnum
 from apigateway.core.models import PublishEvent, ReleaseHistory
 
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class PublishEventBuffer:
+    """发布事件缓冲区，暂存发布流程中上报的事件，flush 时通过 bulk_create 批量写入"""
+
+    def __init__(self):
+        self._events: List[PublishEvent] = []
+
+    def __len__(self):
+        return len(self._events)
+
+    def add(self, event: PublishEvent):
+        self._events.append(event)
+
+    def flush(self) -> int:
+        """写入暂存的事件，返回写入的事件数量"""
+        if not self._events:
+            return 0
+
+        events, self._events = self._events, []
+        PublishEvent.objects.bulk_create(events)
+        return len(events)
+
 
 class PublishEventReporter:
     """
     发布事件上报
     """
 
+    @classmethod
+    @contextmanager
+    def buffered(cls):
+        """上下文中上报的事件暂存到缓冲区，退出上下文时（包括异常退出）批量写入
+
+        - 可通过 yield 的缓冲区在流程的关键节点（如：耗时较长的下发操作前）主动 flush，确保进度及时可见
+        - 嵌套使用时，复用外层的缓冲区；内层正常退出时即写入，确保内层流程（如：同步发布时，下发前的事件）进度及时可见，
+          异常退出时由最外层负责写入
+        """
+        buffer = getattr(_local, "buffer", None)
+        if buffer is not None:
+            yield buffer
+            buffer.flush()
+            return
+
+        buffer = _local.buffer = PublishEventBuffer()
+        try:
+            yield buffer
+        except Exception:
+            _local.buffer = None
+            # 流程失败时，已上报的事件仍需写入，便于排查；写入失败不应掩盖流程本身的异常
+            try:
+                buffer.flush()
+            except Exception:
+                logger.exception("flush publish events failed")
+            raise
+
+        _local.buffer = None
+        buffer.flush()
+
     @classmethod
     def _report_event(
         cls,
@@ -40,7 +99,7 @@ class PublishEventReporter:
         if publish.source == PublishSourceEnum.CLI_SYNC.value:
             return None
 
-        return PublishEvent.objects.create(
+        event = PublishEvent(
             gateway=publish.gateway,
             stage=publish.stage,
             step=PublishEventNameTypeEnum.get_event_step(name.value),
@@ -50,6 +109,14 @@ class PublishEventReporter:
             status=status.value,
         )
 
+        buffer = getattr(_local, "buffer", None)
+        if buffer is not None:
+            buffer.add(event)
+        else:
+            event.save()
+
+        return event
+
     @classmethod
     def report_config_validate_doing_event(cls, publish: Optional[ReleaseHistory]):
         """
@@ -119,23 +186,31 @@ class PublishEventReporter:
         cls._report_event(publish, name, status, detail)
 
     @classmethod
-    def report_distribute_configuration_success_event(cls, publish: Optional[ReleaseHistory]):
+    def report_distribute_configuration_success_event(
+        cls, publish: Optional[ReleaseHistory], profile: Optional[dict] = None
+    ):
         """
         dashboard 下发配置成功事件上报
+
+        :param profile: 下发过程中各步骤的统计数据，如耗时、DB 查询次数等，便于分析发布慢的原因
         """
         name = PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION
         status = PublishEventStatusTypeEnum.SUCCESS
-        detail = None
+        detail = {"profile": profile} if profile else None
 
         cls._report_event(publish, name, status, detail)
 
     @classmethod
-    def report_distribute_configuration_failure_event(cls, publish: Optional[ReleaseHistory], msg: str):
+    def report_distribute_configuration_failure_event(
+        cls, publish: Optional[ReleaseHistory], msg: str, profile: Optional[dict] = None
+    ):
         """
         dashboard 下发配置失败事件上报
         """
         name = PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION
         status = PublishEventStatusTypeEnum.FAILURE
-        detail = {"err_msg": msg}
+        detail: Dict[str, Any] = {"err_msg": msg}
+        if profile:
+            detail["profile"] = profile
 
         cls._report_event(publish, name, status, detail)
@@ -17,13 +17,11 @@
 # to the current version of the project delivered to anyone in the future.
 #
 from django.http import Http404
-from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext_lazy
 from rest_framework import permissions
 
 from apigateway.core.constants import GatewayStatusEnum
-from apigateway.core.models import Gateway, GatewayRelatedApp
-from apigateway.utils.django import get_object_or_None
+from apigateway.core.gateway_cache import gateway_cache
 
 
 class GatewayPermission(permissions.BasePermission):
@@ -59,8 +57,11 @@ class GatewayPermission(permissions.BasePermission):
         if lookup_url_kwarg not in view.kwargs:
             return None
 
-        filter_kwargs = {"id": view.kwargs[lookup_url_kwarg]}
-        return get_object_or_404(Gateway, **filter_kwargs)
+        cached_gateway = gateway_cache.get_by_id(view.kwargs[lookup_url_kwarg])
+        if not cached_gateway:
+            raise Http404
+
+        return cached_gateway.gateway
 
 
 class GatewayRelatedAppPermission(permissions.BasePermission):
@@ -71,35 +72,38 @@ class GatewayRelatedAppPermission(permissions.BasePermission):
     message = gettext_lazy("应用无操作网关权限")
 
     def has_permission(self, request, view):
-        gateway_obj = self.get_gateway_object(view)
+        cached_gateway = self.get_cached_gateway(view)
 
         # 通过 view 属性 allow_gateway_not_exist，控制是否允许网关为 None
-        if not gateway_obj and getattr(view, "allow_gateway_not_exist", False):
+        if not cached_gateway and getattr(view, "allow_gateway_not_exist", False):
             return True
 
-        if not gateway_obj:
+        if not cached_gateway:
             raise Http404
 
-        request.gateway = gateway_obj
+        request.gateway = cached_gateway.gateway
 
         # 跳过网关权限校验
         if getattr(view, "gateway_permission_exempt", False):
             return True
 
-        return GatewayRelatedApp.objects.filter(gateway=request.gateway, bk_app_code=request.app.app_code).exists()
+        return request.app.app_code in cached_gateway.related_app_codes
 
     def get_gateway_object(self, view):
         """
         根据路径参数 gateway_name 获取网关对象
         若 gateway_name 不在路径参数中，或网关不存在，返回 None
         """
+        cached_gateway = self.get_cached_gateway(view)
+        return cached_gateway and cached_gateway.gateway
+
+    def get_cached_gateway(self, view):
         lookup_url_kwarg = "gateway_name"
 
         if lookup_url_kwarg not in view.kwargs:
             return None
 
-        filter_kwargs = {"name": view.kwargs[lookup_url_kwarg]}
-        return get_object_or_None(Gateway, **filter_kwargs)
+        return gateway_cache.get_by_name(view.kwargs[lookup_url_kwarg])
 
 
 class GatewayDisplayablePermission(permissions.BasePermission):
@@ -125,9 +129,12 @@ class GatewayDisplayablePermission(permissions.BasePermission):
         if lookup_url_kwarg not in view.kwargs:
             return None
 
-        gateway_name = view.kwargs[lookup_url_kwarg]
-        return Gateway.objects.filter(
-            status=GatewayStatusEnum.ACTIVE.value,
-            is_public=True,
-            name=gateway_name,
-        ).first()
+        cached_gateway = gateway_cache.get_by_name(view.kwargs[lookup_url_kwarg])
+        if not cached_gateway:
+            return None
+
+        gateway = cached_gateway.gateway
+        if gateway.status != GatewayStatusEnum.ACTIVE.value or not gateway.is_public:
+            return None
+
+        return gateway
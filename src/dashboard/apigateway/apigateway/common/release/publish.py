@@ -83,38 +83,43 @@ def _trigger_rolling_publish(
 ):
     """触发网关滚动更新"""
 
-    for release in release_list:
-        if source is PublishSourceEnum.CLI_SYNC:
-            release_history = ReleaseHistory()
-            # make it as default
-            release_history.source = PublishSourceEnum.CLI_SYNC.value
-            publish_id = NO_NEED_REPORT_EVENT_PUBLISH_ID
-        else:
-            # 如果不是手动同步就需要生成发布历史
-            release_history = _save_release_history(release, source, author)
-
-            publish_id = release_history.pk
-
-        # 发布 check
-        ok, msg = _is_gateway_ok_for_releasing(release, source)
-        if not ok:
-            logger.warning(msg)
-            PublishEventReporter.report_config_validate_fail_event(release_history, msg)
-            continue
-
-        PublishEventReporter.report_config_validate_success_event(release_history)
-        PublishEventReporter.report_create_publish_task_doing_event(release_history)
-
-        # 开始发布
-        if is_sync:
-            return rolling_update_release(gateway_id=release.gateway.pk, publish_id=publish_id, release_id=release.pk)
-
-        delay_on_commit(
-            rolling_update_release,
-            gateway_id=release.gateway_id,
-            publish_id=publish_id,
-            release_id=release.pk,
-        )
+    # 多个环境的校验、创建任务事件，批量写入
+    with PublishEventReporter.buffered() as event_buffer:
+        for release in release_list:
+            if source is PublishSourceEnum.CLI_SYNC:
+                release_history = ReleaseHistory()
+                # make it as default
+                release_history.source = PublishSourceEnum.CLI_SYNC.value
+                publish_id = NO_NEED_REPORT_EVENT_PUBLISH_ID
+            else:
+                # 如果不是手动同步就需要生成发布历史
+                release_history = _save_release_history(release, source, author)
+
+                publish_id = release_history.pk
+
+            # 发布 check
+            ok, msg = _is_gateway_ok_for_releasing(release, source)
+            if not ok:
+                logger.warning(msg)
+                PublishEventReporter.report_config_validate_fail_event(release_history, msg)
+                continue
+
+            PublishEventReporter.report_config_validate_success_event(release_history)
+            PublishEventReporter.report_create_publish_task_doing_event(release_history)
+
+            # 开始发布
+            if is_sync:
+                event_buffer.flush()
+                return rolling_update_release(
+                    gateway_id=release.gateway.pk, publish_id=publish_id, release_id=release.pk
+                )
+
+            delay_on_commit(
+                rolling_update_release,
+                gateway_id=release.gateway_id,
+                publish_id=publish_id,
+                release_id=release.pk,
+            )
     return True
 
 
@@ -126,24 +131,26 @@ def _trigger_revoke_publish_for_disable(
 ):
     """触发撤销发布"""
 
-    for release in release_list:
-        # 创建发布历史
-        release_history = _save_release_history(release, source, author)
-        # 发布 check
-        ok, msg = _is_gateway_ok_for_releasing(release, source)
-        # 上报发布配置校验事件
-        if not ok:
-            logging.warning(msg)
-            PublishEventReporter.report_config_validate_fail_event(release_history, msg)
-            continue
-
-        PublishEventReporter.report_config_validate_success_event(release_history)
-        PublishEventReporter.report_create_publish_task_doing_event(release_history)
-
-        # 开始发布
-        if is_sync:
-            return revoke_release(release_id=release.id, publish_id=release_history.id)
-        delay_on_commit(revoke_release, release_id=release.id, publish_id=release_history.id)
+    with PublishEventReporter.buffered() as event_buffer:
+        for release in release_list:
+            # 创建发布历史
+            release_history = _save_release_history(release, source, author)
+            # 发布 check
+            ok, msg = _is_gateway_ok_for_releasing(release, source)
+            # 上报发布配置校验事件
+            if not ok:
+                logging.warning(msg)
+                PublishEventReporter.report_config_validate_fail_event(release_history, msg)
+                continue
+
+            PublishEventReporter.report_config_validate_success_event(release_history)
+            PublishEventReporter.report_create_publish_task_doing_event(release_history)
+
+            # 开始发布
+            if is_sync:
+                event_buffer.flush()
+                return revoke_release(release_id=release.id, publish_id=release_history.id)
+            delay_on_commit(revoke_release, release_id=release.id, publish_id=release_history.id)
     return None
 
 
@@ -34,6 +34,7 @@ CELERY_IMPORTS = (
     "apigateway.apps.permission.tasks",
     "apigateway.legacy_esb.tasks",
     "apigateway.apps.esb.component.tasks",
+    "apigateway.apps.esb.status.tasks",
     "apigateway.controller.tasks",
 )
 
@@ -46,6 +47,18 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apigateway.controller.clean_task.delete_old_publish_events",
         "schedule": crontab(day_of_week="*", hour=0, minute=0),
     },
+    "apigateway.apps.search.tasks.refresh_search_indexes": {
+        "task": "apigateway.apps.search.tasks.refresh_search_indexes",
+        "schedule": crontab(minute="*/5"),
+    },
+    "apigateway.apps.search.tasks.rebuild_search_indexes": {
+        "task": "apigateway.apps.search.tasks.rebuild_search_indexes",
+        "schedule": crontab(minute=40, hour=2),
+    },
+    "apigateway.apps.support.tasks.delete_old_resource_export_tasks": {
+        "task": "apigateway.apps.support.tasks.delete_old_resource_export_tasks",
+        "schedule": crontab(minute=20, hour=1),
+    },
     "apigateway.apps.permission.tasks.alert_app_permission_expiring_soon": {
         "task": "apigateway.apps.permission.tasks.alert_app_permission_expiring_soon",
         "schedule": crontab(minute=30, hour=14),
@@ -115,6 +115,7 @@ INSTALLED_APPS = [
     "apigateway.apps.audit",
     "apigateway.apps.metrics",
     "apigateway.apps.support",
+    "apigateway.apps.search",
     "django_prometheus",
     "bkpaas_auth",
     "apigateway.account",
@@ -534,6 +535,8 @@ if DASHBOARD_FE_URL and DASHBOARD_FE_URL not in CORS_ORIGIN_REGEX_WHITELIST:
     CORS_ORIGIN_REGEX_WHITELIST.append(DASHBOARD_FE_URL)
 
 GATEWAY_DEFAULT_CREATOR = env.str("GATEWAY_DEFAULT_CREATOR", "admin")
+# 网关数据 (网关、关联应用、环境、后端服务) 的进程内缓存时间(秒)，为 0 时不缓存
+GATEWAY_CACHE_TTL = env.int("GATEWAY_CACHE_TTL", 10)
 DEFAULT_USER_AUTH_TYPE = "default"
 
 APIGW_MANAGERS = env.list("APIGW_MANAGERS", default=["admin"])
@@ -721,6 +724,9 @@ PROMETHEUS_DEFAULT_LABELS = [
 RELEASED_RESOURCE_CREATE_BATCH_SIZE = env.int("RELEASED_RESOURCE_CREATE_BATCH_SIZE", 50)
 RELEASED_RESOURCE_DOC_CREATE_BATCH_SIZE = env.int("RELEASED_RESOURCE_DOC_CREATE_BATCH_SIZE", 50)
 
+# 资源版本数据压缩存储，各资源数据分别压缩，支持按资源读取；关闭后，新版本数据以 JSON 格式存储
+RESOURCE_VERSION_COMPRESSED_STORAGE_ENABLED = env.bool("RESOURCE_VERSION_COMPRESSED_STORAGE_ENABLED", True)
+
 # 网关资源数量限制
 MAX_STAGE_COUNT_PER_GATEWAY = env.int("MAX_STAGE_COUNT_PER_GATEWAY", 20)
 API_GATEWAY_RESOURCE_LIMITS = {
@@ -745,6 +751,13 @@ for k, v in env.dict("MAX_RESOURCE_COUNT_PER_GATEWAY_WHITELIST", default={}).ite
 # 网关下对象的最大数量
 MAX_LABEL_COUNT_PER_GATEWAY = env.int("MAX_LABEL_COUNT_PER_GATEWAY", 100)
 
+# 后台导入资源时，每批保存的资源数量，每批资源在独立的事务中保存
+RESOURCE_IMPORT_CHUNK_SIZE = env.int("RESOURCE_IMPORT_CHUNK_SIZE", 100)
+# 后台导入任务未结束，且超过此时间(秒)未更新进度时，视为执行任务的 worker 已退出，允许继续执行
+RESOURCE_IMPORT_TASK_STALE_TIMEOUT = env.int("RESOURCE_IMPORT_TASK_STALE_TIMEOUT", 1800)
+# 资源导出任务（含导出的文档）的保留天数，过期后清理
+RESOURCE_EXPORT_TASK_RETENTION_DAYS = env.int("RESOURCE_EXPORT_TASK_RETENTION_DAYS", 7)
+
 # 管理端支持的最大超时时间
 MAX_BACKEND_TIMEOUT_IN_SECOND = env.int("MAX_BACKEND_TIMEOUT_IN_SECOND", 600)
 
@@ -889,6 +902,24 @@ BK_ESB_ACCESS_LOG_CONFIG = {
 # ==============================================================================
 ESB_DEFAULT_BOARD = "default"
 
+# ESB 状态页数据预聚合，开启后，后台任务按分钟、小时预聚合各系统的请求统计数据，状态页优先读取预聚合数据
+ESB_STATUS_ROLLUP_CONFIG = {
+    "enabled": env.bool("BK_ESB_STATUS_ROLLUP_ENABLED", False),
+    # 日志写入 ES 存在延迟，仅聚合结束时间早于当前时间该秒数的时间段
+    "delay_seconds": env.int("BK_ESB_STATUS_ROLLUP_DELAY_SECONDS", 120),
+    "minute_retention_seconds": env.int("BK_ESB_STATUS_ROLLUP_MINUTE_RETENTION_SECONDS", 3600 * 26),
+    "hour_retention_seconds": env.int("BK_ESB_STATUS_ROLLUP_HOUR_RETENTION_SECONDS", 3600 * 24 * 8),
+}
+if ESB_STATUS_ROLLUP_CONFIG["enabled"]:
+    CELERY_BEAT_SCHEDULE.update(
+        {
+            "apigateway.apps.esb.status.tasks.rollup_esb_system_stats": {
+                "task": "apigateway.apps.esb.status.tasks.rollup_esb_system_stats",
+                "schedule": crontab(minute="*"),
+            },
+        }
+    )
+
 ESB_MANAGERS = env.list("ESB_MANAGERS", default=APIGW_MANAGERS)
 
 # ESB 组件对应网关的名称
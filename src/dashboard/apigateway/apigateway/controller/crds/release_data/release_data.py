@@ -17,15 +17,17 @@
 #
 import json
 import logging
-from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from django.utils.functional import cached_property
 
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
 from apigateway.biz.gateway_jwt import GatewayJWTHandler
+from apigateway.common.constants import CACHE_TIME_5_MINUTES
 from apigateway.common.contexts import GatewayAuthContext
 from apigateway.common.plugin.plugin_convertors import PluginConvertorFactory
 from apigateway.controller.crds.release_data.base import PluginData
@@ -38,6 +40,9 @@ from apigateway.core.models import BackendConfig, Context, Gateway, Release, Res
 
 logger = logging.getLogger(__name__)
 
+# 版本数据可能很大，仅缓存最近发布的少量版本
+RESOURCE_VERSION_CACHE_MAXSIZE = 16
+
 
 @dataclass
 class ReleaseData:
@@ -84,6 +89,10 @@ class ReleaseData:
             return None
         return json.loads(rate_limit["config"])
 
+    @cached_property
+    def resource_version_data(self) -> List[Dict[str, Any]]:
+        return get_resource_version_data(self.resource_version)
+
     @cached_property
     def jwt_private_key(self) -> str:
         return GatewayJWTHandler.get_private_key(self.gateway.pk)
@@ -93,15 +102,13 @@ class ReleaseData:
         return GatewayAuthContext().get_config(self.gateway.pk)
 
     def get_stage_plugins(self) -> List[PluginData]:
-        plugins: List[PluginData] = []
-
         # 插件
         stage_id_to_plugin_bindings = PluginBinding.objects.query_scope_id_to_bindings(
             gateway_id=self.gateway.pk,
             scope_type=PluginBindingScopeEnum.STAGE,
             scope_ids=[self.stage.pk],
         )
-        plugins.extend(
+        return _deduplicate_plugins(
             [
                 PluginData(
                     type_code=binding.get_type(),
@@ -112,28 +119,19 @@ class ReleaseData:
             ]
         )
 
-        # 如果环境，同时绑定了同一类型的访问策略、插件，那么只使用插件配置
-        name_to_plugins = {plugin.name: plugin for plugin in plugins}
-        return list(name_to_plugins.values())
-
     def get_resource_plugins(self, resource_id: int) -> List[PluginData]:
-        plugins = self._resources_plugins.get(resource_id, [])
-
-        # 如果资源，同时绑定了同一类型的访问策略、插件，那么只使用插件配置
-        name_to_plugins = {plugin.name: plugin for plugin in plugins}
-        return list(name_to_plugins.values())
+        return self._resources_plugins.get(resource_id, [])
 
     @cached_property
     def _resources_plugins(self) -> Dict[int, List[PluginData]]:
-        resource_id_to_plugins: Dict[int, List[PluginData]] = defaultdict(list)
-
+        """按资源 ID 索引的插件配置，每次发布仅转换一次"""
         # 插件
         resource_id_to_plugin_bindings = PluginBinding.objects.query_scope_id_to_bindings(
             gateway_id=self.gateway.pk,
             scope_type=PluginBindingScopeEnum.RESOURCE,
         )
-        for resource_id, bindings in resource_id_to_plugin_bindings.items():
-            resource_id_to_plugins[resource_id].extend(
+        return {
+            resource_id: _deduplicate_plugins(
                 [
                     PluginData(
                         type_code=binding.get_type(),
@@ -143,8 +141,8 @@ class ReleaseData:
                     for binding in bindings
                 ]
             )
-
-        return resource_id_to_plugins
+            for resource_id, bindings in resource_id_to_plugin_bindings.items()
+        }
 
     def get_resources_upstream(self, resource_proxy: Dict[str, Any], backend_id: int):
         return resource_proxy.get("upstreams")
@@ -176,36 +174,69 @@ class ReleaseDataV2(ReleaseData):
     def stage_backend_config(self) -> Dict[str, Any]:
         return self._stage_backend.config
 
-    def get_resources_upstream(self, resource_proxy: Dict[str, Any], backend_id: int) -> Dict[str, Any]:
-        return (
-            BackendConfig.objects.filter(
-                backend_id=backend_id,
-                gateway_id=self.gateway.pk,
-                stage_id=self.stage.pk,
+    @cached_property
+    def _stage_backend_id_to_config(self) -> Dict[int, Dict[str, Any]]:
+        """环境下所有后端服务的配置，一次查询，避免每个资源查询一次"""
+        return dict(
+            BackendConfig.objects.filter(gateway_id=self.gateway.pk, stage_id=self.stage.pk).values_list(
+                "backend_id", "config"
             )
-            .values_list("config", flat=True)
-            .first()
         )
 
+    def get_resources_upstream(self, resource_proxy: Dict[str, Any], backend_id: int) -> Dict[str, Any]:
+        return self._stage_backend_id_to_config.get(backend_id)
+
     def get_upstream_host(self, upstream: Dict[str, Any]) -> str:
         return upstream["scheme"] + "://" + upstream["host"]
 
-    @property
+    @cached_property
     def _resources_plugins(self) -> Dict[int, List[PluginData]]:
-        resource_id_to_plugins: Dict[int, List[PluginData]] = defaultdict(list)
+        return get_resource_version_plugins(self.resource_version)
 
-        # 插件
-        resource_configs = self.resource_version.data
-        for resource in resource_configs:
-            resource_id_to_plugins[resource["id"]].extend(
-                [
-                    PluginData(
-                        type_code=binding["type"],
-                        config=PluginConvertorFactory.get_convertor(binding["type"]).convert(binding["config"]),
-                        binding_scope_type=PluginBindingScopeEnum.RESOURCE.value,
-                    )
-                    for binding in resource.get("plugins", [])
-                ]
+
+def resource_version_cache_key(resource_version: ResourceVersion):
+    # 数据库回滚后，版本 ID 可能被复用，因此同时以原始数据作为 key，字符串、bytes 的哈希值会被缓存，开销很小
+    compressed_data = resource_version.compressed_data
+    return hashkey(
+        resource_version.pk,
+        resource_version._data,
+        bytes(compressed_data) if compressed_data is not None else None,
+    )
+
+
+@cached(
+    cache=TTLCache(maxsize=RESOURCE_VERSION_CACHE_MAXSIZE, ttl=CACHE_TIME_5_MINUTES), key=resource_version_cache_key
+)
+def get_resource_version_data(resource_version: ResourceVersion) -> List[Dict[str, Any]]:
+    """获取解析后的版本数据；版本数据不可变，同一版本发布到多个环境时，只解析一次，调用方不应修改返回的数据"""
+    return resource_version.data
+
+
+def _deduplicate_plugins(plugins: List[PluginData]) -> List[PluginData]:
+    # 如果环境或资源，同时绑定了同一类型的访问策略、插件，那么只使用插件配置
+    name_to_plugins = {plugin.name: plugin for plugin in plugins}
+    return list(name_to_plugins.values())
+
+
+@cached(
+    cache=TTLCache(maxsize=RESOURCE_VERSION_CACHE_MAXSIZE, ttl=CACHE_TIME_5_MINUTES), key=resource_version_cache_key
+)
+def get_resource_version_plugins(resource_version: ResourceVersion) -> Dict[int, List[PluginData]]:
+    """获取版本中按资源 ID 索引的插件配置
+
+    版本中的插件配置不可变，同一版本发布到多个环境时，复用已转换的插件配置
+    """
+    resource_id_to_plugins: Dict[int, List[PluginData]] = {}
+    for resource in get_resource_version_data(resource_version):
+        plugins = [
+            PluginData(
+                type_code=binding["type"],
+                config=PluginConvertorFactory.get_convertor(binding["type"]).convert(binding["config"]),
+                binding_scope_type=PluginBindingScopeEnum.RESOURCE.value,
             )
+            for binding in resource.get("plugins", [])
+        ]
+        if plugins:
+            resource_id_to_plugins[resource["id"]] = _deduplicate_plugins(plugins)
 
-        return resource_id_to_plugins
+    return resource_id_to_plugins
@@ -16,16 +16,23 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import json
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Union
 
+from cachetools import TTLCache
 from django.utils.functional import cached_property
 
+from apigateway.common.constants import CACHE_TIME_5_MINUTES
 from apigateway.controller.crds.constants import (
     ResourceRewriteHeadersStrategyEnum,
     UpstreamSchemeEnum,
     UpstreamTypeEnum,
 )
-from apigateway.controller.crds.release_data.release_data import ReleaseData
+from apigateway.controller.crds.release_data.release_data import (
+    RESOURCE_VERSION_CACHE_MAXSIZE,
+    ReleaseData,
+    resource_version_cache_key,
+)
 from apigateway.controller.crds.v1beta1.convertors.base import BaseConvertor, UrlInfo
 from apigateway.controller.crds.v1beta1.models.base import PluginConfig, TimeoutConfig, Upstream, UpstreamNode
 from apigateway.controller.crds.v1beta1.models.gateway_resource import (
@@ -39,6 +46,18 @@ from apigateway.core.models import MicroGateway
 from apigateway.utils.time import now_str
 
 
+@dataclass
+class SharedResourceParts:
+    """资源转换结果中与环境无关的部分，同一版本发布到多个环境时复用"""
+
+    proxy_config: Dict[str, Any]
+    plugins: List[PluginConfig]
+
+
+# resource version => {resource_id: SharedResourceParts}
+_shared_resource_parts_cache: TTLCache = TTLCache(maxsize=RESOURCE_VERSION_CACHE_MAXSIZE, ttl=CACHE_TIME_5_MINUTES)
+
+
 class HttpResourceConvertor(BaseConvertor):
     def __init__(
         self,
@@ -62,10 +81,32 @@ class HttpResourceConvertor(BaseConvertor):
 
         raise NameError("stage service not found in registry")
 
+    @cached_property
+    def _shared_resource_parts(self) -> Dict[int, SharedResourceParts]:
+        resource_version = self._release_data.resource_version
+        # schema v1 版本中不包含资源插件，插件数据需实时查询，不能跨发布复用
+        if not resource_version.is_schema_v2:
+            return {}
+
+        key = resource_version_cache_key(resource_version)
+        parts = _shared_resource_parts_cache.get(key)
+        if parts is None:
+            parts = _shared_resource_parts_cache[key] = {}
+        return parts
+
+    def _get_shared_resource_parts(self, resource: Dict[str, Any]) -> SharedResourceParts:
+        parts = self._shared_resource_parts.get(resource["id"])
+        if parts is None:
+            parts = self._shared_resource_parts[resource["id"]] = SharedResourceParts(
+                proxy_config=json.loads(resource["proxy"]["config"]),
+                plugins=self._convert_http_resource_plugins(resource),
+            )
+        return parts
+
     def convert(self) -> List[BkGatewayResource]:
         resources: List[BkGatewayResource] = []
         if not self._revoke_flag:
-            for resource in self._release_data.resource_version.data:
+            for resource in self._release_data.resource_version_data:
                 crd = self._convert_http_resource(resource)
                 if crd:
                     resources.append(crd)
@@ -81,7 +122,9 @@ class HttpResourceConvertor(BaseConvertor):
         if self._release_data.stage.name in resource["disabled_stages"]:
             return None
 
-        resource_proxy = json.loads(resource["proxy"]["config"])
+        # 与环境无关的部分（代理配置、插件）在多个环境间复用，仅重新计算上游、超时等环境相关的配置
+        shared_parts = self._get_shared_resource_parts(resource)
+        resource_proxy = shared_parts.proxy_config
 
         backend_id = resource["proxy"].get("backend_id", 0)
 
@@ -108,7 +151,7 @@ class HttpResourceConvertor(BaseConvertor):
                 rewrite=self._convert_http_resource_rewrite(resource_proxy),
                 service=service_name,
                 upstream=upstream,
-                plugins=self._convert_http_resource_plugins(resource),
+                plugins=shared_parts.plugins,
             ),
         )
 
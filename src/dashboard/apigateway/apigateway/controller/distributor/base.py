@@ -22,6 +22,9 @@ from apigateway.core.models import MicroGateway, Release
 
 
 class BaseDistributor(ABC):
+    # 最近一次发布/撤销过程中各步骤的统计数据，如耗时、DB 查询次数、数据大小等，未统计时为 None
+    profile: Optional[dict] = None
+
     @abstractmethod
     def distribute(
         self,
@@ -81,6 +81,7 @@ class CombineDistributor(BaseDistributor):
         def do_distribute(distributor: BaseDistributor, gateway: MicroGateway):
             nonlocal is_success, err_msg
             is_success, err_msg = distributor.distribute(release, gateway, release_task_id, publish_id=publish_id)
+            self.profile = distributor.profile
 
         self.foreach_distributor(release.stage, micro_gateway, do_distribute)
         return is_success, err_msg
@@ -98,6 +99,7 @@ class CombineDistributor(BaseDistributor):
         def do_revoke(distributor: BaseDistributor, gateway: MicroGateway):
             nonlocal is_success, err_msg
             is_success, err_msg = distributor.revoke(release, gateway, release_task_id, publish_id=publish_id)
+            self.profile = distributor.profile
 
         self.foreach_distributor(release.stage, micro_gateway, do_revoke)
         return is_success, err_msg
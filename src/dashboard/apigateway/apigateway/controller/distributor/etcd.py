@@ -81,14 +81,17 @@ class EtcdDistributor(BaseDistributor):
             resources = list(convertor.get_kubernetes_resources())
 
             # step 2: 将 kubernetes 资源同步到 etcd
-            with procedure_logger.step(f"sync resources(count={len(resources)}) to etcd"):
+            with procedure_logger.step("sync resources to etcd", count=len(resources)) as step_stat:
                 fail_resources = registry.sync_resources_by_key_prefix(resources)
+                step_stat.context.update(registry.stats.to_dict())
                 if fail_resources:
                     raise SyncFail(fail_resources)
         except Exception as e:
             fail_msg = f"distribute to etcd failed: {type(e).__name__}: {str(e)}"
             procedure_logger.exception(fail_msg)
             return False, fail_msg
+        finally:
+            self.profile = procedure_logger.get_profile()
 
         return True, ""
 
@@ -130,20 +133,23 @@ class EtcdDistributor(BaseDistributor):
         )
 
         try:
-            with procedure_logger.step(f"delete resources from etcd by key_prefix({registry.key_prefix})"):
+            with procedure_logger.step("delete resources from etcd by key_prefix", key_prefix=registry.key_prefix):
                 registry.delete_resources_by_key_prefix()
 
                 # 删除资源后需要同步虚拟路由到 etcd
                 convertor.convert()
                 resources = list(convertor.get_kubernetes_resources())
-                with procedure_logger.step(f"sync version resources(count={len(resources)}) to etcd"):
+                with procedure_logger.step("sync version resources to etcd", count=len(resources)) as step_stat:
                     fail_resources = registry.sync_resources_by_key_prefix(resources)
+                    step_stat.context.update(registry.stats.to_dict())
                     if fail_resources:
                         raise SyncFail(fail_resources)
         except Exception as e:
             fail_msg = f"revoke resources from etcd failed: {type(e).__name__}: {str(e)}"
             procedure_logger.exception(fail_msg)
             return False, fail_msg
+        finally:
+            self.profile = procedure_logger.get_profile()
 
         procedure_logger.info("revoke resources from etcd succeeded")
         return True, ""
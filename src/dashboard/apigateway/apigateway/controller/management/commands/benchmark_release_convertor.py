@@ -0,0 +1,197 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+构造指定数量资源、插件的模拟网关，执行发布转换流程（CustomResourceConvertor + DictRegistry），统计各步骤耗时及吞吐量
+
+模拟数据在事务中创建，执行结束后回滚，不会残留在 DB 中
+"""
+import logging
+import uuid
+from typing import List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apigateway.apps.plugin.constants import PluginBindingScopeEnum, PluginTypeCodeEnum
+from apigateway.apps.plugin.models import PluginBinding, PluginConfig, PluginType
+from apigateway.biz.gateway import GatewayHandler
+from apigateway.biz.gateway_jwt import GatewayJWTHandler
+from apigateway.biz.resource.savers import BULK_BATCH_SIZE, ResourcesSaver
+from apigateway.biz.resource_version import ResourceVersionHandler
+from apigateway.biz.stage import StageHandler
+from apigateway.controller.crds.v1beta1.convertor import CustomResourceConvertor
+from apigateway.controller.registry.dict import DictRegistry
+from apigateway.core.constants import DEFAULT_BACKEND_NAME, GatewayStatusEnum, StageStatusEnum
+from apigateway.core.models import Backend, BackendConfig, Gateway, MicroGateway, Release
+from apigateway.utils.procedure_logger import ProcedureLogger
+from apigateway.utils.yaml import yaml_dumps
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_USERNAME = "admin"
+
+
+class Command(BaseCommand):
+    help = "benchmark the release convertor with a synthetic gateway"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resources", type=int, default=1000, help="模拟网关的资源数量")
+        parser.add_argument("--plugins", type=int, default=100, help="绑定插件的资源数量，每个资源绑定一个插件")
+        parser.add_argument("--rounds", type=int, default=3, help="转换执行的轮数，首轮为冷缓存，后续为热缓存")
+
+    def handle(self, resources: int, plugins: int, rounds: int, **options):
+        if resources <= 0 or rounds <= 0:
+            raise CommandError("resources and rounds should be greater than 0")
+
+        try:
+            micro_gateway = MicroGateway.objects.get_default_shared_gateway()
+        except MicroGateway.DoesNotExist:
+            raise CommandError(f"default shared micro-gateway {settings.DEFAULT_MICRO_GATEWAY_ID} not found")
+
+        with transaction.atomic():
+            release = self._make_release(resources, min(plugins, resources))
+            for round_ in range(1, rounds + 1):
+                self._run_round(round_, release, micro_gateway)
+
+            # 回滚模拟数据
+            transaction.set_rollback(True)
+
+    def _run_round(self, round_: int, release: Release, micro_gateway: MicroGateway):
+        procedure_logger = ProcedureLogger(f"benchmark-release-convertor round {round_}", logger=logger)
+        # 重新获取 release，防止 ORM 对象上的缓存影响统计
+        release = Release.objects.get(id=release.id)
+
+        with procedure_logger.step("convert to kubernetes resources") as step_stat:
+            convertor = CustomResourceConvertor(release=release, micro_gateway=micro_gateway)
+            convertor.convert()
+            kubernetes_resources = list(convertor.get_kubernetes_resources())
+            step_stat.context["count"] = len(kubernetes_resources)
+
+        # DictRegistry 不做序列化，单独统计与 EtcdRegistry 相同的 yaml 序列化耗时及数据大小
+        with procedure_logger.step("encode resources to yaml") as step_stat:
+            step_stat.context["payload_size"] = sum(
+                len(yaml_dumps(resource.dict(by_alias=True)).encode("utf-8")) for resource in kubernetes_resources
+            )
+
+        registry = DictRegistry(key_prefix=f"/benchmark/{uuid.uuid4().hex}")
+        with procedure_logger.step("sync resources to registry") as step_stat:
+            registry.sync_resources_by_key_prefix(kubernetes_resources)
+            step_stat.context.update(registry.stats.to_dict())
+
+        self._print_round(round_, procedure_logger, len(kubernetes_resources))
+
+    def _print_round(self, round_: int, procedure_logger: ProcedureLogger, resource_count: int):
+        total_duration = sum(stat.duration for stat in procedure_logger.step_stats)
+        self.stdout.write(f"round {round_}:")
+        for stat in procedure_logger.step_stats:
+            self.stdout.write(
+                f"  {stat.step}: duration={stat.duration:.6f}s, queries={stat.query_count}, context={stat.context}"
+            )
+
+        throughput = resource_count / total_duration if total_duration else 0
+        self.stdout.write(
+            f"  total: duration={total_duration:.6f}s, kubernetes resources={resource_count}, "
+            f"throughput={throughput:.2f} resources/s"
+        )
+
+    def _make_release(self, resource_count: int, plugin_count: int) -> Release:
+        """创建模拟网关、资源、插件绑定，并生成版本、发布到默认环境"""
+        gateway = Gateway.objects.create(
+            name=f"benchmark-{uuid.uuid4().hex[:8]}",
+            maintainers=[BENCHMARK_USERNAME],
+            status=GatewayStatusEnum.ACTIVE.value,
+            is_public=False,
+            created_by=BENCHMARK_USERNAME,
+            updated_by=BENCHMARK_USERNAME,
+        )
+        GatewayHandler.save_auth_config(gateway.id, user_auth_type=settings.DEFAULT_USER_AUTH_TYPE)
+        GatewayJWTHandler.create_jwt(gateway)
+
+        stage = StageHandler.create_default(gateway, created_by=BENCHMARK_USERNAME)
+        stage.status = StageStatusEnum.ACTIVE.value
+        stage.save(update_fields=["status"])
+
+        backend = Backend.objects.get(gateway=gateway, name=DEFAULT_BACKEND_NAME)
+        BackendConfig.objects.filter(gateway=gateway, backend=backend).update(
+            config={
+                "type": "node",
+                "timeout": 30,
+                "loadbalance": "roundrobin",
+                "hosts": [{"scheme": "http", "host": "backend.example.com", "weight": 100}],
+            }
+        )
+
+        saved_resources = ResourcesSaver.from_resources(
+            gateway,
+            [
+                {
+                    "name": f"benchmark_resource_{i}",
+                    "method": "GET",
+                    "path": f"/benchmark/{i}/",
+                    "auth_config": {},
+                    "backend": backend,
+                    "backend_config": {"method": "GET", "path": f"/backend/{i}/"},
+                }
+                for i in range(resource_count)
+            ],
+            username=BENCHMARK_USERNAME,
+        ).save()
+        self._bind_plugins(gateway, [resource.id for resource in saved_resources[:plugin_count]])
+
+        resource_version = ResourceVersionHandler.create_resource_version(
+            gateway, {"version": "1.0.0", "name": f"{gateway.name}_1.0.0"}, username=BENCHMARK_USERNAME
+        )
+        return Release.objects.save_release(gateway, stage, resource_version, "benchmark", BENCHMARK_USERNAME)
+
+    def _bind_plugins(self, gateway: Gateway, resource_ids: List[int]):
+        if not resource_ids:
+            return
+
+        plugin_type = PluginType.objects.filter(code=PluginTypeCodeEnum.BK_HEADER_REWRITE.value).first()
+        if not plugin_type:
+            raise CommandError(f"plugin type {PluginTypeCodeEnum.BK_HEADER_REWRITE.value} not found")
+
+        plugin_configs = [
+            PluginConfig(
+                gateway=gateway,
+                name=f"benchmark-header-rewrite-{resource_id}",
+                type=plugin_type,
+                yaml=yaml_dumps({"set": [{"key": "X-Benchmark-Resource", "value": str(resource_id)}], "remove": []}),
+            )
+            for resource_id in resource_ids
+        ]
+        PluginConfig.objects.bulk_create(plugin_configs, batch_size=BULK_BATCH_SIZE)
+
+        # bulk_create 在部分 DB 中不会返回 ID，因此按名称重新获取插件配置
+        name_to_config = {
+            config.name: config
+            for config in PluginConfig.objects.filter(gateway=gateway, name__startswith="benchmark-header-rewrite-")
+        }
+        PluginBinding.objects.bulk_create(
+            [
+                PluginBinding(
+                    gateway=gateway,
+                    scope_type=PluginBindingScopeEnum.RESOURCE.value,
+                    scope_id=resource_id,
+                    config=name_to_config[f"benchmark-header-rewrite-{resource_id}"],
+                )
+                for resource_id in resource_ids
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
@@ -19,8 +19,17 @@ import uuid
 from logging import Logger
 from typing import Optional
 
+from prometheus_client import Histogram
+
 from apigateway.core.models import Gateway, MicroGateway, Stage
-from apigateway.utils.procedure_logger import ProcedureLogger
+from apigateway.utils.procedure_logger import ProcedureLogger, ProcedureStepStat
+
+release_procedure_step_duration_seconds = Histogram(
+    "apigateway_release_procedure_step_duration_seconds",
+    "Duration of the steps in gateway release procedures",
+    ["procedure", "step", "success"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
 
 
 class ReleaseProcedureLogger(ProcedureLogger):
@@ -46,6 +55,14 @@ class ReleaseProcedureLogger(ProcedureLogger):
         self.release_task_id = release_task_id or str(uuid.uuid4())
         self._publish_id = publish_id
 
+    def on_step_finished(self, stat: ProcedureStepStat):
+        # step 名称作为指标标签，不应包含资源数量等动态内容，此类内容应放在 step 的 context 中
+        release_procedure_step_duration_seconds.labels(
+            procedure=self.name,
+            step=stat.step,
+            success=str(stat.success).lower(),
+        ).observe(stat.duration)
+
     @property
     def _message_prefix(self):
         parts = []
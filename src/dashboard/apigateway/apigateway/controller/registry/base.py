@@ -17,6 +17,7 @@
 #
 import logging
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import ClassVar, Iterable, List, Type
 
 from apigateway.controller.crds.base import KubernetesResource
@@ -24,6 +25,31 @@ from apigateway.controller.crds.base import KubernetesResource
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RegistryStats:
+    """注册中心写入统计，用于分析发布过程的耗时"""
+
+    # 写入的资源数量
+    applied_count: int = 0
+    # 删除的资源数量
+    deleted_count: int = 0
+    # 写入数据的字节数
+    payload_size: int = 0
+    # 资源序列化耗时
+    encode_duration: float = 0.0
+    # 资源写入耗时，如 etcd 请求
+    write_duration: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "applied_count": self.applied_count,
+            "deleted_count": self.deleted_count,
+            "payload_size": self.payload_size,
+            "encode_duration": round(self.encode_duration, 6),
+            "write_duration": round(self.write_duration, 6),
+        }
+
+
 class Registry(ABC):
     """配置注册中心，本质上是一个 KV 结构的存储，可以同时存储多种类型的资源，并可以进行迭代，修改和查询等操作"""
 
@@ -35,6 +61,7 @@ class Registry(ABC):
         """
         # key_prefix 应以 / 结尾，防止筛选数据出现错误；如 key_prefix 为 /foo 时，不应该过滤出 /foo2 的数据
         self.key_prefix = key_prefix if key_prefix.endswith("/") else f"{key_prefix}/"
+        self.stats = RegistryStats()
 
     @abstractmethod
     def apply_resource(self, resource: KubernetesResource) -> bool:
@@ -36,6 +36,7 @@ class DictRegistry(Registry):
 
     def apply_resource(self, resource: KubernetesResource) -> bool:
         self._registry_dict[self._get_key(resource.kind, resource.metadata.name)] = deepcopy(resource)
+        self.stats.applied_count += 1
         return True
 
     def sync_resources_by_key_prefix(self, resources: Iterable[KubernetesResource]) -> List[KubernetesResource]:
@@ -16,6 +16,7 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import logging
+import time
 from typing import ClassVar, Dict, Iterable, List, Optional, Type
 
 import etcd3
@@ -43,8 +44,15 @@ class EtcdRegistry(Registry):
         self._etcd_client = etcd_client or get_etcd_client()
 
     def apply_resource(self, resource: KubernetesResource) -> bool:
+        begin_time = time.perf_counter()
         payload = yaml_dumps(resource.dict(by_alias=True))
+        encoded_time = time.perf_counter()
         self._etcd_client.put(self._get_key(resource.kind, resource.metadata.name), payload)
+
+        self.stats.applied_count += 1
+        self.stats.payload_size += len(payload.encode("utf-8"))
+        self.stats.encode_duration += encoded_time - begin_time
+        self.stats.write_duration += time.perf_counter() - encoded_time
         return True
 
     def sync_resources_by_key_prefix(self, resources: List[KubernetesResource]) -> List[KubernetesResource]:
@@ -99,4 +107,5 @@ class EtcdRegistry(Registry):
         return None
 
     def _delete_by_key(self, key: str) -> bool:
+        self.stats.deleted_count += 1
         return self._etcd_client.delete(key)
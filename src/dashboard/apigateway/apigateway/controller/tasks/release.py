@@ -49,10 +49,13 @@ def _release_gateway(
     # 表明发布已开始
     release_history_qs.update(status=ReleaseStatusEnum.RELEASING.value)
     # add publish event
-    PublishEventReporter.report_create_publish_task_success_event(latest_micro_gateway_release_history.release_history)
-    PublishEventReporter.report_distribute_configuration_doing_event(
-        latest_micro_gateway_release_history.release_history
-    )
+    with PublishEventReporter.buffered():
+        PublishEventReporter.report_create_publish_task_success_event(
+            latest_micro_gateway_release_history.release_history
+        )
+        PublishEventReporter.report_distribute_configuration_doing_event(
+            latest_micro_gateway_release_history.release_history
+        )
     try:
         is_success, fail_msg = distributor.distribute(
             release=release,
@@ -63,11 +66,12 @@ def _release_gateway(
         if is_success:
             PublishEventReporter.report_distribute_configuration_success_event(
                 latest_micro_gateway_release_history.release_history,
+                profile=distributor.profile,
             )
 
         else:
             PublishEventReporter.report_distribute_configuration_failure_event(
-                latest_micro_gateway_release_history.release_history, fail_msg
+                latest_micro_gateway_release_history.release_history, fail_msg, profile=distributor.profile
             )
             return False
     except Exception as err:
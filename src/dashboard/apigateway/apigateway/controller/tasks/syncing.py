@@ -42,26 +42,28 @@ def rolling_update_release(gateway_id: int, publish_id: int, release_id: int):
     if release_history:
         release_history.stage = release.stage
 
-    PublishEventReporter.report_create_publish_task_success_event(release_history)
+    # 下发前的事件批量写入；下发耗时较长，事件需在下发前写入，确保发布进度可见
+    with PublishEventReporter.buffered():
+        PublishEventReporter.report_create_publish_task_success_event(release_history)
 
-    logger.info("rolling_update_release[gateway_id=%d] begin", gateway_id)
+        logger.info("rolling_update_release[gateway_id=%d] begin", gateway_id)
 
-    shared_gateway = MicroGateway.objects.get_default_shared_gateway()
-    distributor = CombineDistributor()
+        shared_gateway = MicroGateway.objects.get_default_shared_gateway()
+        distributor = CombineDistributor()
 
-    release_task_id = str(uuid.uuid4())
+        release_task_id = str(uuid.uuid4())
 
-    procedure_logger = ReleaseProcedureLogger(
-        "rolling_update_release",
-        logger=logger,
-        gateway=release.gateway,
-        stage=release.stage,
-        micro_gateway=shared_gateway,
-        release_task_id=release_task_id,
-        publish_id=publish_id,
-    )
+        procedure_logger = ReleaseProcedureLogger(
+            "rolling_update_release",
+            logger=logger,
+            gateway=release.gateway,
+            stage=release.stage,
+            micro_gateway=shared_gateway,
+            release_task_id=release_task_id,
+            publish_id=publish_id,
+        )
 
-    PublishEventReporter.report_distribute_configuration_doing_event(release_history)
+        PublishEventReporter.report_distribute_configuration_doing_event(release_history)
 
     procedure_logger.info("distribute begin")
     is_success, err_msg = distributor.distribute(
@@ -73,10 +75,14 @@ def rolling_update_release(gateway_id: int, publish_id: int, release_id: int):
     if not is_success:
         msg = f"distribute failed: {err_msg}"
         if not is_cli_sync:
-            PublishEventReporter.report_distribute_configuration_failure_event(release_history, err_msg)
+            PublishEventReporter.report_distribute_configuration_failure_event(
+                release_history, err_msg, profile=distributor.profile
+            )
         procedure_logger.info(msg)
     else:
-        PublishEventReporter.report_distribute_configuration_success_event(release_history)
+        PublishEventReporter.report_distribute_configuration_success_event(
+            release_history, profile=distributor.profile
+        )
         procedure_logger.info("distribute succeeded")
 
     return is_success
@@ -99,17 +105,18 @@ def revoke_release(release_id: int, publish_id: int):
 
     release_history = ReleaseHistory.objects.get(id=publish_id)
 
-    PublishEventReporter.report_create_publish_task_success_event(release_history)
+    with PublishEventReporter.buffered():
+        PublishEventReporter.report_create_publish_task_success_event(release_history)
 
-    procedure_logger = ReleaseProcedureLogger(
-        "revoke_release",
-        logger=logger,
-        gateway=release.gateway,
-        stage=release.stage,
-        micro_gateway=shared_gateway,
-        publish_id=release_history.pk,
-    )
-    PublishEventReporter.report_distribute_configuration_doing_event(release_history)
+        procedure_logger = ReleaseProcedureLogger(
+            "revoke_release",
+            logger=logger,
+            gateway=release.gateway,
+            stage=release.stage,
+            micro_gateway=shared_gateway,
+            publish_id=release_history.pk,
+        )
+        PublishEventReporter.report_distribute_configuration_doing_event(release_history)
 
     procedure_logger.info("revoke begin")
 
@@ -118,9 +125,13 @@ def revoke_release(release_id: int, publish_id: int):
     )
     if not is_success:
         msg = f"revoke failed: {err_msg}"
-        PublishEventReporter.report_distribute_configuration_failure_event(release_history, err_msg)
+        PublishEventReporter.report_distribute_configuration_failure_event(
+            release_history, err_msg, profile=distributor.profile
+        )
         procedure_logger.info(msg)
     else:
-        PublishEventReporter.report_distribute_configuration_success_event(release_history)
+        PublishEventReporter.report_distribute_configuration_success_event(
+            release_history, profile=distributor.profile
+        )
         procedure_logger.info("revoke succeeded")
     return is_success
@@ -91,6 +91,11 @@ class SSLCertificateBindingScopeTypeEnum(StructuredEnum):
     BACKEND_SERVICE_DISCOVERY_CONFIG = EnumField("backend_service_discovery_config", _("后端服务发现配置"))
 
 
+class GatewayMemberRoleEnum(StructuredEnum):
+    MAINTAINER = EnumField("maintainer", _("维护者"))
+    DEVELOPER = EnumField("developer", _("开发者"))
+
+
 class GatewayTypeEnum(StructuredEnum):
     SUPER_OFFICIAL_API = EnumField(0, "超级官方API")
     OFFICIAL_API = EnumField(1, "官方云API")
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+网关数据的进程内短时缓存
+
+开放接口、Web 接口中，权限类、视图会多次按网关 ID/名称查询网关、关联应用、环境、后端服务，
+此处缓存这些数据，供同一请求及短时间内的后续请求复用
+- 缓存中包含权限校验所需的维护者、关联应用，需跨进程及时失效：网关数据变更时，递增 Redis 中该网关的缓存版本号，
+  各进程读取缓存前校验版本号，版本号变化时重新加载
+- Redis 不可用时，不使用缓存，直接查询数据库
+"""
+import copy
+import logging
+import threading
+from typing import Dict, FrozenSet, Optional
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils.functional import cached_property
+
+from apigateway.common.constants import CACHE_MAXSIZE
+from apigateway.core.models import Backend, Gateway, GatewayRelatedApp, Stage
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
+
+logger = logging.getLogger(__name__)
+
+
+class CachedGateway:
+    """网关及其关联数据，关联数据在首次访问时加载"""
+
+    def __init__(self, gateway: Gateway):
+        self._gateway = gateway
+
+    @property
+    def id(self) -> int:
+        return self._gateway.id
+
+    @property
+    def name(self) -> str:
+        return self._gateway.name
+
+    @property
+    def gateway(self) -> Gateway:
+        # 返回副本，避免请求中修改网关对象，影响缓存中的数据
+        return copy.copy(self._gateway)
+
+    @cached_property
+    def related_app_codes(self) -> FrozenSet[str]:
+        return frozenset(GatewayRelatedApp.objects.filter(gateway_id=self.id).values_list("bk_app_code", flat=True))
+
+    @cached_property
+    def stage_id_to_name(self) -> Dict[int, str]:
+        return dict(Stage.objects.filter(gateway_id=self.id).values_list("id", "name"))
+
+    @cached_property
+    def backends(self) -> Dict[int, Backend]:
+        return {backend.id: backend for backend in Backend.objects.filter(gateway_id=self.id)}
+
+
+class GatewayCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self._enabled = ttl > 0
+        self._ttl = max(ttl, 1)
+        self._lock = threading.RLock()
+        # 网关 ID 到 (缓存版本号, 网关缓存) 的映射
+        self._id_to_gateway: TTLCache = TTLCache(maxsize=maxsize, ttl=self._ttl)
+        self._name_to_id: TTLCache = TTLCache(maxsize=maxsize, ttl=self._ttl)
+        self._redis_client = None
+
+    def get_by_id(self, gateway_id: int) -> Optional[CachedGateway]:
+        # 先读取版本号，再查询数据库，加载期间网关数据变更时，版本号已变化，下次访问将重新加载
+        version = self._get_version(gateway_id)
+        if version is not None:
+            with self._lock:
+                cached = self._id_to_gateway.get(gateway_id)
+
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+        return self._load(Gateway.objects.filter(id=gateway_id).first(), version)
+
+    def get_by_name(self, name: str) -> Optional[CachedGateway]:
+        with self._lock:
+            gateway_id = self._name_to_id.get(name)
+
+        if gateway_id is not None:
+            cached_gateway = self.get_by_id(gateway_id)
+            # 网关名称不可修改，此处校验以防网关被删除后，ID 对应了其它网关
+            if cached_gateway and cached_gateway.name == name:
+                return cached_gateway
+
+        gateway_id = Gateway.objects.filter(name=name).values_list("id", flat=True).first()
+        if gateway_id is None:
+            return None
+
+        cached_gateway = self.get_by_id(gateway_id)
+        return cached_gateway if cached_gateway and cached_gateway.name == name else None
+
+    def get_stage_name(self, gateway_id: int, stage_id: int) -> Optional[str]:
+        cached_gateway = self.get_by_id(gateway_id)
+        if cached_gateway is None:
+            return None
+        return cached_gateway.stage_id_to_name.get(stage_id)
+
+    def get_backends(self, gateway_id: int) -> Dict[int, Backend]:
+        cached_gateway = self.get_by_id(gateway_id)
+        return dict(cached_gateway.backends) if cached_gateway else {}
+
+    def invalidate(self, gateway_id: int):
+        """清理当前进程中的缓存，并递增缓存版本号，使其它进程中的缓存失效"""
+        with self._lock:
+            cached = self._id_to_gateway.pop(gateway_id, None)
+            if cached is not None:
+                self._name_to_id.pop(cached[1].name, None)
+
+        if not self._enabled:
+            return
+
+        client = self._get_redis_client()
+        if client is None:
+            return
+
+        key = self._get_version_key(gateway_id)
+        try:
+            pipe = client.pipeline()
+            pipe.incr(key)
+            # 版本号的过期时间需长于缓存时间，否则版本号过期后，可能与缓存中的旧版本号重新一致
+            pipe.expire(key, self._ttl * 2)
+            pipe.execute()
+        except Exception:
+            logger.exception("incr gateway cache version failed, gateway_id=%s", gateway_id)
+            self._redis_client = None
+
+    def clear(self):
+        with self._lock:
+            self._id_to_gateway.clear()
+            self._name_to_id.clear()
+
+    def _load(self, gateway: Optional[Gateway], version: Optional[bytes]) -> Optional[CachedGateway]:
+        # 网关不存在时不缓存，网关创建后可立即访问
+        if gateway is None:
+            return None
+
+        cached_gateway = CachedGateway(gateway)
+        if version is None:
+            return cached_gateway
+
+        with self._lock:
+            self._id_to_gateway[gateway.id] = (version, cached_gateway)
+            self._name_to_id[gateway.name] = gateway.id
+
+        return cached_gateway
+
+    def _get_version(self, gateway_id: int) -> Optional[bytes]:
+        """获取网关的缓存版本号，返回 None 表示不可使用缓存"""
+        if not self._enabled:
+            return None
+
+        client = self._get_redis_client()
+        if client is None:
+            return None
+
+        try:
+            return client.get(self._get_version_key(gateway_id)) or b"0"
+        except Exception:
+            logger.exception("get gateway cache version failed, gateway_id=%s", gateway_id)
+            self._redis_client = None
+            return None
+
+    def _get_redis_client(self):
+        # 复用客户端，避免 get_default_redis_client 每次调用时 ping
+        if self._redis_client is None:
+            self._redis_client = get_default_redis_client()
+        return self._redis_client
+
+    @staticmethod
+    def _get_version_key(gateway_id: int) -> str:
+        return get_redis_key(f"gateway_cache:version:{gateway_id}")
+
+
+gateway_cache = GatewayCache(maxsize=CACHE_MAXSIZE, ttl=settings.GATEWAY_CACHE_TTL)
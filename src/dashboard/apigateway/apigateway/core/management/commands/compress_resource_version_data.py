@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+将历史资源版本数据转换为压缩存储，并统计转换前后的存储大小、读取耗时；--dry-run 时仅统计，不修改数据
+"""
+import json
+import time
+from collections import defaultdict
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+
+from apigateway.core.models import ResourceVersion
+from apigateway.core.utils import compress_resource_version_data, decompress_resource_data, get_resource_data_hashes
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-id", type=int, dest="gateway_id")
+        parser.add_argument("--all", dest="_all", action="store_true")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=100, help="batch size")
+        parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="dry run")
+
+    def handle(self, gateway_id: int, _all: bool, batch_size: int, dry_run: bool, **options) -> None:
+        queryset = ResourceVersion.objects.filter(compressed_data__isnull=True)
+        if not _all:
+            if not gateway_id:
+                return
+            queryset = queryset.filter(gateway_id=gateway_id)
+
+        resource_version_ids = list(queryset.order_by("id").values_list("id", flat=True))
+
+        stats: Dict[str, float] = defaultdict(float)
+        for i in range(0, len(resource_version_ids), batch_size):
+            for resource_version in ResourceVersion.objects.filter(id__in=resource_version_ids[i : i + batch_size]):
+                self._compress_resource_version(resource_version, dry_run, stats)
+
+        self._print_stats(stats)
+
+    def _compress_resource_version(
+        self, resource_version: ResourceVersion, dry_run: bool, stats: Dict[str, float]
+    ) -> None:
+        started = time.perf_counter()
+        data = json.loads(resource_version._data)
+        stats["json_read_seconds"] += time.perf_counter() - started
+
+        compressed_data, index = compress_resource_version_data(data)
+        index_data = json.dumps(index)
+
+        started = time.perf_counter()
+        for entry in index:
+            decompress_resource_data(compressed_data, entry)
+        stats["compressed_read_seconds"] += time.perf_counter() - started
+
+        if index:
+            started = time.perf_counter()
+            decompress_resource_data(compressed_data, index[-1])
+            stats["compressed_single_read_seconds"] += time.perf_counter() - started
+
+        stats["count"] += 1
+        stats["resource_count"] += len(index)
+        stats["json_size"] += len(resource_version._data.encode("utf-8"))
+        stats["compressed_size"] += len(compressed_data) + len(index_data.encode("utf-8"))
+
+        if dry_run:
+            print(f"compress gateway[id={resource_version.gateway_id}] resource_version[id={resource_version.id}]")
+            return
+
+        resource_version.compressed_data = compressed_data
+        resource_version._data = index_data
+        if not resource_version.resource_hashes:
+            resource_version.resource_hashes = get_resource_data_hashes(data)
+        # 不更新 updated_time，版本数据内容未变化
+        resource_version.save(update_fields=["_data", "compressed_data", "resource_hashes"])
+
+    def _print_stats(self, stats: Dict[str, float]) -> None:
+        count = int(stats["count"])
+        if not count:
+            print("no resource version to compress")
+            return
+
+        json_size = stats["json_size"]
+        compressed_size = stats["compressed_size"]
+        print(f"resource versions: {count}, resources: {int(stats['resource_count'])}")
+        print(
+            f"size: json={json_size:.0f} bytes, compressed={compressed_size:.0f} bytes, "
+            f"ratio={compressed_size / json_size if json_size else 0:.2%}"
+        )
+        print(
+            f"read latency per version: json={stats['json_read_seconds'] / count * 1000:.3f}ms, "
+            f"compressed={stats['compressed_read_seconds'] / count * 1000:.3f}ms, "
+            f"compressed single resource={stats['compressed_single_read_seconds'] / count * 1000:.3f}ms"
+        )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+根据网关的维护者、开发者，重新同步网关成员表 (core_api_member)，用于成员数据异常时手动修复；
+首次回填由数据迁移 core.0040_gateway_member 完成
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apigateway.core.models import Gateway, GatewayMember
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-name", type=str, dest="gateway_name", help="仅同步指定的网关")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=500, help="每批处理的网关数量")
+
+    def handle(self, gateway_name: str, batch_size: int, **options):
+        queryset = Gateway.objects.only("id", "_maintainers", "_developers").order_by("id")
+        if gateway_name:
+            queryset = queryset.filter(name=gateway_name)
+
+        count = 0
+        for gateway in queryset.iterator(chunk_size=batch_size):
+            GatewayMember.objects.sync_members(gateway)
+            count += 1
+
+        logger.info("sync gateway members finished, total %s gateways", count)
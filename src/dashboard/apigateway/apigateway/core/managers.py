@@ -33,6 +33,7 @@ from apigateway.common.error_codes import error_codes
 from apigateway.common.exceptions import InstanceDeleteError
 from apigateway.core.constants import (
     DEFAULT_STAGE_NAME,
+    GatewayMemberRoleEnum,
     SSLCertificateBindingScopeTypeEnum,
     StageStatusEnum,
 )
@@ -41,6 +42,42 @@ from apigateway.utils.time import now_datetime
 # - managers.py 下面不能存在跨 models 的操作，每个 manager 只关心自己的逻辑 (避免循环引用)
 
 
+class GatewayMemberManager(models.Manager):
+    def filter_gateway_ids(self, username: str, role: str = GatewayMemberRoleEnum.MAINTAINER.value):
+        """用户以指定角色参与的网关 ID，返回 queryset，可直接用作子查询"""
+        return self.filter(username=username, role=role).values_list("gateway_id", flat=True)
+
+    def sync_members(self, gateway) -> None:
+        """
+        根据网关中的维护者、开发者，同步网关成员表
+        - 仅删除、新增有变化的成员，未变化的成员不做处理
+        """
+        expected = {
+            (username, role)
+            for role, usernames in [
+                (GatewayMemberRoleEnum.MAINTAINER.value, gateway.maintainers),
+                (GatewayMemberRoleEnum.DEVELOPER.value, gateway.developers),
+            ]
+            for username in usernames
+            if username
+        }
+
+        existing = {
+            (username, role): id_
+            for id_, username, role in self.filter(gateway=gateway).values_list("id", "username", "role")
+        }
+
+        to_delete_ids = [id_ for key, id_ in existing.items() if key not in expected]
+        if to_delete_ids:
+            self.filter(id__in=to_delete_ids).delete()
+
+        to_add = expected - existing.keys()
+        if to_add:
+            self.bulk_create(
+                [self.model(gateway=gateway, username=username, role=role) for username, role in sorted(to_add)]
+            )
+
+
 class StageManager(models.Manager):
     def get_names(self, gateway_id):
         return list(self.filter(gateway_id=gateway_id).values_list("name", flat=True))
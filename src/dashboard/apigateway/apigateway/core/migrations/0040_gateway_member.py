@@ -0,0 +1,51 @@
+# Generated by Django 3.2.18 on 2026-10-19 13:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def sync_gateway_members(apps, schema_editor):
+    """根据网关的维护者、开发者，回填网关成员表；不依赖当前代码中的模型，管理命令 sync_gateway_members 仅用于手动重新同步"""
+    Gateway = apps.get_model("core", "Gateway")
+    GatewayMember = apps.get_model("core", "GatewayMember")
+
+    members = []
+    for gateway in Gateway.objects.only("id", "_maintainers", "_developers").order_by("id").iterator(chunk_size=500):
+        expected = {
+            (username, role)
+            for role, usernames in [("maintainer", gateway._maintainers), ("developer", gateway._developers)]
+            for username in (usernames or "").split(";")
+            if username
+        }
+        members.extend(
+            GatewayMember(gateway_id=gateway.id, username=username, role=role) for username, role in sorted(expected)
+        )
+
+    GatewayMember.objects.bulk_create(members, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_auto_update_1_13'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GatewayMember',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_time', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True, null=True)),
+                ('username', models.CharField(max_length=64)),
+                ('role', models.CharField(choices=[('maintainer', '维护者'), ('developer', '开发者')], max_length=16)),
+                ('gateway', models.ForeignKey(db_column='api_id', on_delete=django.db.models.deletion.CASCADE, to='core.gateway')),
+            ],
+            options={
+                'db_table': 'core_api_member',
+                'unique_together': {('gateway', 'username', 'role')},
+                'index_together': {('username', 'role')},
+            },
+        ),
+        migrations.RunPython(sync_gateway_members, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.18 on 2026-10-19 15:29
+
+from django.db import migrations
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_gateway_member'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resourceversion',
+            name='resource_hashes',
+            field=jsonfield.fields.JSONField(blank=True, default=dict, dump_kwargs={'indent': None}),
+        ),
+    ]
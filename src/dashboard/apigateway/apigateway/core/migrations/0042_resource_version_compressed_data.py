@@ -0,0 +1,18 @@
+# Generated by Django 3.2.18 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_resource_version_resource_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resourceversion',
+            name='compressed_data',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
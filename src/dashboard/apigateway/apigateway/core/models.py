@@ -19,9 +19,10 @@
 import json
 import logging
 import uuid
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from jsonfield import JSONField
 
@@ -37,6 +38,7 @@ from apigateway.core.constants import (
     BackendUpstreamTypeEnum,
     ContextScopeTypeEnum,
     ContextTypeEnum,
+    GatewayMemberRoleEnum,
     GatewayStatusEnum,
     LoadBalanceTypeEnum,
     MicroGatewayStatusEnum,
@@ -51,7 +53,13 @@ from apigateway.core.constants import (
     SSLCertificateTypeEnum,
     StageStatusEnum,
 )
-from apigateway.core.utils import get_path_display
+from apigateway.core.utils import (
+    RESOURCE_VERSION_INDEX_FIELDS,
+    compress_resource_version_data,
+    decompress_resource_data,
+    get_path_display,
+    get_resource_data_hashes,
+)
 from apigateway.schema.models import Schema
 
 logger = logging.getLogger(__name__)
@@ -63,7 +71,38 @@ NOTE:
 """
 
 
-class Gateway(TimestampedModelMixin, OperatorModelMixin):
+class GatewayCacheInvalidationMixin:
+    """
+    网关及其关联数据 (关联应用、环境、后端服务) 变更时，清理网关缓存，见 apigateway.core.gateway_cache
+    - 仅覆盖 save/delete，通过 queryset.update/delete 变更数据时，需主动调用 gateway_cache.invalidate
+    """
+
+    # 关联网关的模型，由外键字段 gateway 提供；网关模型需覆盖 get_cached_gateway_id
+    gateway_id: int
+
+    def get_cached_gateway_id(self) -> int:
+        return self.gateway_id
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._invalidate_gateway_cache(self.get_cached_gateway_id())
+
+    def delete(self, *args, **kwargs):
+        gateway_id = self.get_cached_gateway_id()
+        result = super().delete(*args, **kwargs)
+        self._invalidate_gateway_cache(gateway_id)
+        return result
+
+    @staticmethod
+    def _invalidate_gateway_cache(gateway_id: int):
+        from apigateway.core.gateway_cache import gateway_cache
+
+        # 事务提交前，其它请求可能重新缓存了旧数据，因此提交后再清理一次
+        gateway_cache.invalidate(gateway_id)
+        transaction.on_commit(lambda: gateway_cache.invalidate(gateway_id))
+
+
+class Gateway(GatewayCacheInvalidationMixin, TimestampedModelMixin, OperatorModelMixin):
     """
     Gateway, a system
     the name is unique and will be part of the path in APIGateway
@@ -122,6 +161,17 @@ class Gateway(TimestampedModelMixin, OperatorModelMixin):
         """
         return username in self.maintainers
 
+    def get_cached_gateway_id(self) -> int:
+        return self.id
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # 维护者、开发者有变化时，同步网关成员表，以便按用户查询网关时可使用索引
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"_maintainers", "_developers"} & set(update_fields):
+            GatewayMember.objects.sync_members(self)
+
     @property
     def is_active(self):
         return self.status == GatewayStatusEnum.ACTIVE.value
@@ -131,7 +181,7 @@ class Gateway(TimestampedModelMixin, OperatorModelMixin):
         return self.is_public and self.is_active
 
 
-class Stage(TimestampedModelMixin, OperatorModelMixin):
+class Stage(GatewayCacheInvalidationMixin, TimestampedModelMixin, OperatorModelMixin):
     """
     The running environment of an API
     each stage context contains the env vars for path render
@@ -352,7 +402,7 @@ class StageItemConfig(TimestampedModelMixin, OperatorModelMixin):
 # ============================================ backend ============================================
 
 
-class Backend(TimestampedModelMixin, OperatorModelMixin):
+class Backend(GatewayCacheInvalidationMixin, TimestampedModelMixin, OperatorModelMixin):
     gateway = models.ForeignKey(Gateway, on_delete=models.PROTECT)
     type = models.CharField(
         max_length=20,
@@ -475,13 +525,19 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
     # todo: 1.14 删除
     title = models.CharField(max_length=128, blank=True, default="", null=True)
     comment = models.CharField(max_length=512, blank=True, null=True)
+    # 未压缩时，存储 JSON 格式的版本数据；压缩存储时，存储各资源的元数据及其在压缩数据中的偏移量，
+    # core-api 仅读取其中资源的 id、name，两种格式均可兼容
     _data = models.TextField(db_column="data")
+    # 压缩存储的版本数据，各资源数据分别压缩后依次拼接，为空表示版本数据未压缩
+    compressed_data = models.BinaryField(null=True, blank=True)
     # 用于不同数据格式解析版本数据兼容历史数据
     schema_version = models.CharField(
         max_length=32,
         choices=ResourceVersionSchemaEnum.get_choices(),
         default=ResourceVersionSchemaEnum.V1.value,
     )
+    # 版本中各资源数据的内容哈希，{resource_id: hash}，版本对比时据此跳过未变化的资源
+    resource_hashes = JSONField(default=dict, dump_kwargs={"indent": None}, blank=True)
 
     created_time = models.DateTimeField(null=True, blank=True)
 
@@ -489,11 +545,41 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
 
     @property
     def data(self) -> list:
-        return json.loads(self._data)
+        if self.compressed_data is None:
+            return json.loads(self._data)
+
+        compressed_data = bytes(self.compressed_data)
+        return [decompress_resource_data(compressed_data, entry) for entry in json.loads(self._data)]
 
     @data.setter
     def data(self, data: list):
-        self._data = json.dumps(data)
+        if settings.RESOURCE_VERSION_COMPRESSED_STORAGE_ENABLED:
+            self.compressed_data, index = compress_resource_version_data(data)
+            self._data = json.dumps(index)
+        else:
+            self.compressed_data = None
+            self._data = json.dumps(data)
+
+        self.resource_hashes = get_resource_data_hashes(data)
+
+    @property
+    def is_compressed(self) -> bool:
+        return self.compressed_data is not None
+
+    @property
+    def data_index(self) -> List[dict]:
+        """版本中各资源的元数据（id、name、method、path），压缩存储时无需解压版本数据"""
+        if self.compressed_data is None:
+            return [{field: resource.get(field) for field in RESOURCE_VERSION_INDEX_FIELDS} for resource in self.data]
+
+        return [{field: entry[field] for field in RESOURCE_VERSION_INDEX_FIELDS} for entry in json.loads(self._data)]
+
+    def get_resource_hashes(self) -> Dict[str, str]:
+        """获取版本中各资源数据的内容哈希，历史版本未记录时，根据版本数据实时计算"""
+        if self.resource_hashes:
+            return self.resource_hashes
+
+        return get_resource_data_hashes(self.data)
 
     @property
     def data_display(self) -> list:
@@ -507,13 +593,32 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
 
         return data
 
-    def get_resource_data(self, resource_id):
-        """获取资源数据"""
-        for resource_data in self.data:
-            if resource_data["id"] == resource_id:
-                return resource_data
+    def get_resource_data(self, resource_id) -> Optional[dict]:
+        """获取资源数据，压缩存储时仅解压此资源的数据"""
+        if self.compressed_data is None:
+            for resource_data in self.data:
+                if resource_data["id"] == resource_id:
+                    return resource_data
+            return None
+
+        for entry in json.loads(self._data):
+            if entry["id"] == resource_id:
+                return decompress_resource_data(bytes(self.compressed_data), entry)
         return None
 
+    def filter_resource_data(self, resource_ids: Iterable[int]) -> List[dict]:
+        """获取指定资源的数据，压缩存储时仅解压这些资源的数据"""
+        resource_ids = set(resource_ids)
+        if self.compressed_data is None:
+            return [resource_data for resource_data in self.data if resource_data["id"] in resource_ids]
+
+        compressed_data = bytes(self.compressed_data)
+        return [
+            decompress_resource_data(compressed_data, entry)
+            for entry in json.loads(self._data)
+            if entry["id"] in resource_ids
+        ]
+
     @property
     def object_display(self):
         if not self.version:
@@ -708,7 +813,7 @@ class JWT(TimestampedModelMixin, OperatorModelMixin):
         db_table = "core_jwt"
 
 
-class GatewayRelatedApp(TimestampedModelMixin):
+class GatewayRelatedApp(GatewayCacheInvalidationMixin, TimestampedModelMixin):
     """
     网关关联的蓝鲸应用
     - 应用可以通过 openapi 操作网关数据
@@ -724,6 +829,29 @@ class GatewayRelatedApp(TimestampedModelMixin):
         db_table = "core_api_related_app"
 
 
+class GatewayMember(TimestampedModelMixin):
+    """
+    网关成员，由网关的维护者、开发者同步而来
+    - 用于按用户查询网关，避免对 Gateway._maintainers 做 LIKE 全表扫描
+    - 数据以 Gateway._maintainers/_developers 为准，在 Gateway.save 时同步
+    """
+
+    # 成员随网关删除，不需要保护
+    gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.CASCADE)
+    username = models.CharField(max_length=64)
+    role = models.CharField(max_length=16, choices=GatewayMemberRoleEnum.get_choices())
+
+    objects = managers.GatewayMemberManager()
+
+    def __str__(self):
+        return f"<GatewayMember: {self.gateway_id}/{self.username}/{self.role}>"
+
+    class Meta:
+        db_table = "core_api_member"
+        unique_together = ("gateway", "username", "role")
+        index_together = ("username", "role")
+
+
 # ============================================ gateway instance ============================================
 
 
@@ -16,6 +16,11 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import hashlib
+import json
+import zlib
+from typing import Dict, List, Tuple
+
 from django.conf import settings
 
 
@@ -46,3 +51,50 @@ def get_resource_doc_link(api_name, stage_name, resource_name):
         stage_name=stage_name,
         resource_name=resource_name,
     )
+
+
+def get_resource_data_hash(resource_data: dict) -> str:
+    """
+    计算资源版本中单个资源数据的内容哈希
+    """
+    return hashlib.md5(json.dumps(resource_data, sort_keys=True).encode()).hexdigest()
+
+
+def get_resource_data_hashes(data: List[dict]) -> Dict[str, str]:
+    """
+    计算资源版本中各资源数据的内容哈希，key 为字符串类型的资源 ID，与 JSON 存储后的格式保持一致
+    """
+    return {str(resource_data["id"]): get_resource_data_hash(resource_data) for resource_data in data}
+
+
+# 资源版本压缩存储时，索引中保留的资源元数据字段
+RESOURCE_VERSION_INDEX_FIELDS = ["id", "name", "method", "path"]
+
+
+def compress_resource_version_data(data: List[dict]) -> Tuple[bytes, List[dict]]:
+    """
+    压缩资源版本数据，各资源数据分别压缩后依次拼接，以支持按资源解压
+
+    :return: 压缩后的数据，及各资源的元数据、压缩数据的偏移量和长度组成的索引
+    """
+    chunks = []
+    index = []
+    offset = 0
+    for resource_data in data:
+        chunk = zlib.compress(json.dumps(resource_data).encode("utf-8"))
+        entry = {field: resource_data.get(field) for field in RESOURCE_VERSION_INDEX_FIELDS}
+        entry.update({"offset": offset, "length": len(chunk)})
+
+        chunks.append(chunk)
+        index.append(entry)
+        offset += len(chunk)
+
+    return b"".join(chunks), index
+
+
+def decompress_resource_data(compressed_data: bytes, entry: dict) -> dict:
+    """
+    根据索引项，解压资源版本中单个资源的数据
+    """
+    offset = entry["offset"]
+    return json.loads(zlib.decompress(compressed_data[offset : offset + entry["length"]]))
@@ -20,3 +20,7 @@ from django.apps import AppConfig
 
 class BKCoreConfig(AppConfig):
     name = "apigateway.apps.esb.bkcore"
+
+    def ready(self):
+        # 注册组件搜索索引
+        from apigateway.apps.esb.bkcore import search  # noqa: F401
@@ -23,7 +23,7 @@ import operator
 from typing import Any, Dict, List, Optional, Tuple
 
 from django.db import models
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.utils.encoding import smart_str
 from django.utils.translation import gettext as _
 
@@ -104,15 +104,17 @@ class ESBChannelManager(models.Manager):
         keyword: Optional[str] = None,
         order_by: Optional[tuple] = None,
     ):
+        from apigateway.apps.esb.bkcore.search import ComponentSearchIndex
+
         qs = self.filter(board=board, is_active=True, is_public=True)
 
         if system_name:
             qs = qs.filter(system__name__iexact=system_name)
 
         if keyword:
-            qs = qs.filter(
-                Q(name__icontains=keyword) | Q(description__icontains=keyword) | Q(system__name__icontains=keyword)
-            )
+            # 通过搜索索引过滤，并按匹配度排序
+            qs = ComponentSearchIndex().filter(qs, keyword, scope=board)
+            order_by = ("-search_score", *(order_by or ()))
 
         if order_by:
             qs = qs.order_by(*order_by)
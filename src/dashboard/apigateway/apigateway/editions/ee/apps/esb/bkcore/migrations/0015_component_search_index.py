@@ -0,0 +1,46 @@
+# Generated by Django 3.2.18 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bkcore', '0014_apppermissionapplyrecord_gateway_apply_record_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComponentSearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('resource', '资源'), ('gateway', '网关'), ('component', '组件')], max_length=32)),
+                ('scope', models.CharField(blank=True, default='', max_length=64)),
+                ('object_id', models.IntegerField()),
+                ('token', models.CharField(max_length=16)),
+                ('weight', models.IntegerField(default=1)),
+            ],
+            options={
+                'db_table': 'esb_component_search_token',
+                'abstract': False,
+                'index_together': {('object_type', 'scope', 'object_id'), ('object_type', 'scope', 'token')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ComponentSearchIndexScope',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_time', models.DateTimeField(auto_now_add=True, null=True)),
+                ('updated_time', models.DateTimeField(auto_now=True, null=True)),
+                ('object_type', models.CharField(choices=[('resource', '资源'), ('gateway', '网关'), ('component', '组件')], max_length=32)),
+                ('scope', models.CharField(blank=True, default='', max_length=64)),
+                ('object_count', models.IntegerField(default=0)),
+                ('latest_updated_time', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'esb_component_search_index_scope',
+                'abstract': False,
+                'unique_together': {('object_type', 'scope')},
+            },
+        ),
+    ]
@@ -29,6 +29,7 @@ from apigateway.apps.esb.bkcore import managers
 from apigateway.apps.esb.constants import ComponentDocTypeEnum, DataTypeEnum, LanguageEnum
 from apigateway.apps.permission.constants import ApplyStatusEnum, PermissionApplyExpireDaysEnum, PermissionLevelEnum
 from apigateway.apps.permission.models import generate_expire_time
+from apigateway.apps.search.models import BaseSearchIndexScope, BaseSearchToken
 from apigateway.common.i18n.field import I18nProperty
 from apigateway.common.mixins.models import OperatorModelMixin, TimestampedModelMixin
 from apigateway.core.constants import ReleaseStatusEnum
@@ -462,3 +463,19 @@ class RealTimelineEvent(ModelWithBoard, TimestampedModelMixin):
             "data": self.data,
             "mts": int(self.ts_happened_at * 1000),
         }
+
+
+class ComponentSearchToken(BaseSearchToken):
+    """组件搜索索引"""
+
+    # 索引需与组件在同一个数据库中，统一将模型定义放到 bkcore
+
+    class Meta(BaseSearchToken.Meta):
+        db_table = "esb_component_search_token"
+
+
+class ComponentSearchIndexScope(BaseSearchIndexScope):
+    """组件搜索索引的构建状态"""
+
+    class Meta(BaseSearchIndexScope.Meta):
+        db_table = "esb_component_search_index_scope"
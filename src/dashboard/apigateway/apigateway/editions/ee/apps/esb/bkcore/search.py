@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from typing import List
+
+from django.db.models import QuerySet
+
+from apigateway.apps.esb.bkcore.models import ComponentSearchIndexScope, ComponentSearchToken, ESBChannel
+from apigateway.apps.search.constants import SearchObjectTypeEnum
+from apigateway.apps.search.indexes import BaseSearchIndex, search_index_registry
+
+
+@search_index_registry.register
+class ComponentSearchIndex(BaseSearchIndex):
+    """
+    组件，按 board 划分索引范围，scope 为 board
+    - 系统名称变更不会更新组件的 updated_time，组件发布时及定时任务会重建索引
+    """
+
+    object_type = SearchObjectTypeEnum.COMPONENT.value
+    fields = {"name": 3, "system__name": 2, "description": 1}
+
+    token_model = ComponentSearchToken
+    scope_model = ComponentSearchIndexScope
+
+    def get_queryset(self, scope: str) -> QuerySet:
+        return ESBChannel.objects.filter(board=scope)
+
+    def list_scopes(self) -> List[str]:
+        return list(ESBChannel.objects.values_list("board", flat=True).distinct())
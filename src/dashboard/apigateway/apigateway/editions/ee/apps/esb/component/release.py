@@ -24,6 +24,7 @@ from django.db import transaction
 from django.utils.translation import gettext as _
 
 from apigateway.apps.esb.bkcore.models import ComponentReleaseHistory
+from apigateway.apps.esb.bkcore.search import ComponentSearchIndex
 from apigateway.biz.releaser import release
 from apigateway.biz.resource_version import ResourceVersionHandler
 from apigateway.core.constants import ReleaseStatusEnum
@@ -100,6 +101,11 @@ class ComponentReleaser:
 
         self.release_history.save()
 
+        # 系统名称等变更不会更新组件的 updated_time，因此组件发布后，重建组件搜索索引
+        search_index = ComponentSearchIndex()
+        for board in search_index.list_scopes():
+            search_index.rebuild(board)
+
     def _prepare_version(self, gateway_id: int, history_id: int) -> str:
         """准备网关资源版本的版本号
 
@@ -78,6 +78,40 @@ class BaseSearchClient:
         }
         return self.search_esb_api_log(body=body)
 
+    def get_system_stats_histogram(self, mts_start, mts_end, time_interval, system_name=None):
+        """按时间间隔聚合各系统的请求数、错误数及耗时，用于生成预聚合数据"""
+        query_filter = [
+            {"term": {"type": "pyls-comp-api"}},
+            {"range": {self._es_time_field_name: {"gte": mts_start, "lte": mts_end}}},
+        ]
+        if system_name:
+            query_filter.append({"term": {"req_system_name": system_name}})
+
+        body = {
+            "size": 0,
+            "timeout": f"{settings.DEFAULT_ES_SEARCH_TIMEOUT}s",
+            "query": {"bool": {"filter": {"bool": {"must": query_filter}}}},
+            "aggs": {
+                "systems": {
+                    "terms": {
+                        "field": "req_system_name",
+                        "size": settings.DEFAULT_ES_AGGS_TERM_SIZE,
+                    },
+                    "aggs": {
+                        "requests_over_time": {
+                            "date_histogram": {"field": self._es_time_field_name, "interval": time_interval},
+                            "aggs": {
+                                "error_count": {"filter": {"exists": {"field": "req_exception"}}},
+                                "sum_resp_time": {"sum": {"field": "req_msecs_cost"}},
+                                "resp_time_outlier": {"percentiles": {"field": "req_msecs_cost", "percents": [95]}},
+                            },
+                        }
+                    },
+                }
+            },
+        }
+        return self.search_esb_api_log(body=body)
+
     def get_sys_events_timeline(self, last_db_ts_happened_at, time_interval_seconds, time_interval):
         term_filter = {
             "range": {self._es_time_field_name: {"gt": int((last_db_ts_happened_at + time_interval_seconds) * 1000)}}
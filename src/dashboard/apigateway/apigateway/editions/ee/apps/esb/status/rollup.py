@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+ESB 系统状态数据预聚合
+
+后台任务按分钟、小时预先聚合各系统的请求数、错误数、耗时，存储到 Redis；
+状态页查询时，已完结的时间段读取预聚合数据，仅最近未聚合的一小段时间实时查询 ES。
+预聚合数据不完整时（如任务未运行、Redis 不可用），回退到直接查询 ES。
+"""
+import logging
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils.functional import cached_property
+
+from apigateway.apps.esb.status.es_client import get_search_es_client
+from apigateway.apps.esb.status.utils import str_to_seconds
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_INTERVAL_MINUTE = 60
+ROLLUP_INTERVAL_HOUR = 3600
+
+# 标记 bucket 已完成聚合，用于区分“无请求”与“未聚合”
+ROLLUP_MARKER_FIELD = "__rollup__"
+
+# 单次任务最多补齐的 bucket 数量
+ROLLUP_BACKFILL_BUCKETS = {
+    ROLLUP_INTERVAL_MINUTE: 30,
+    ROLLUP_INTERVAL_HOUR: 3,
+}
+
+
+@dataclass
+class SystemStats:
+    """一个时间段内，单个系统的请求统计"""
+
+    count: int = 0
+    error_count: int = 0
+    sum_msecs: float = 0
+    # 各 bucket 的 perc95 按请求数加权累计，合并多个 bucket 后的 perc95 为近似值
+    sum_perc95: float = 0
+
+    @property
+    def avg_resp_time(self) -> Optional[float]:
+        return self.sum_msecs / self.count if self.count else None
+
+    @property
+    def perc95_resp_time(self) -> Optional[float]:
+        return self.sum_perc95 / self.count if self.count else None
+
+    def merge(self, other: "SystemStats"):
+        self.count += other.count
+        self.error_count += other.error_count
+        self.sum_msecs += other.sum_msecs
+        self.sum_perc95 += other.sum_perc95
+
+    def encode(self) -> str:
+        return f"{self.count},{self.error_count},{self.sum_msecs:.0f},{self.sum_perc95:.0f}"
+
+    @classmethod
+    def decode(cls, value: str) -> "SystemStats":
+        count, error_count, sum_msecs, sum_perc95 = value.split(",")
+        return cls(int(count), int(error_count), float(sum_msecs), float(sum_perc95))
+
+    @classmethod
+    def from_bucket_data(cls, bucket_data: dict) -> "SystemStats":
+        """根据 ES 聚合结果中的 bucket 生成统计数据"""
+        count = bucket_data["doc_count"]
+        if not count:
+            return cls()
+
+        if "sum_resp_time" in bucket_data:
+            sum_msecs = bucket_data["sum_resp_time"]["value"] or 0
+        else:
+            sum_msecs = (bucket_data["avg_resp_time"]["value"] or 0) * count
+
+        perc95 = bucket_data["resp_time_outlier"]["values"].get("95.0")
+        perc95 = perc95 if isinstance(perc95, (int, float)) and not math.isnan(perc95) else 0
+
+        return cls(count, bucket_data["error_count"]["doc_count"], sum_msecs, perc95 * count)
+
+    def to_bucket_data(self, key) -> dict:
+        """转换为 ES 聚合结果中 bucket 的格式，以复用 ES 结果的处理逻辑"""
+        return {
+            "key": key,
+            "doc_count": self.count,
+            "error_count": {"doc_count": self.error_count},
+            "avg_resp_time": {"value": self.avg_resp_time},
+            "resp_time_outlier": {"values": {"95.0": self.perc95_resp_time}},
+        }
+
+
+class SystemStatsRollupStore:
+    """预聚合数据存储，每个 bucket 对应一个 Redis hash，field 为系统名，value 为编码后的统计数据"""
+
+    def __init__(self, interval: int, client=None):
+        self.interval = interval
+        self.client = client or get_default_redis_client()
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    @property
+    def retention_seconds(self) -> int:
+        if self.interval == ROLLUP_INTERVAL_HOUR:
+            return settings.ESB_STATUS_ROLLUP_CONFIG["hour_retention_seconds"]
+        return settings.ESB_STATUS_ROLLUP_CONFIG["minute_retention_seconds"]
+
+    def _get_key(self, bucket_ts: int) -> str:
+        return get_redis_key(f"esb_status_rollup:{self.interval}:{bucket_ts}")
+
+    def save(self, bucket_ts: int, stats: Dict[str, SystemStats]):
+        key = self._get_key(bucket_ts)
+        mapping = {system_name: s.encode() for system_name, s in stats.items()}
+        mapping[ROLLUP_MARKER_FIELD] = "1"
+
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.retention_seconds)
+        pipe.execute()
+
+    def get_missing(self, bucket_ts_list: List[int]) -> List[int]:
+        pipe = self.client.pipeline()
+        for bucket_ts in bucket_ts_list:
+            pipe.exists(self._get_key(bucket_ts))
+        return [bucket_ts for bucket_ts, exists in zip(bucket_ts_list, pipe.execute()) if not exists]
+
+    def load(self, bucket_ts_list: List[int]) -> Optional[Dict[int, Dict[str, SystemStats]]]:
+        """加载多个 bucket 的数据，任一 bucket 未聚合时返回 None"""
+        pipe = self.client.pipeline()
+        for bucket_ts in bucket_ts_list:
+            pipe.hgetall(self._get_key(bucket_ts))
+
+        result = {}
+        for bucket_ts, values in zip(bucket_ts_list, pipe.execute()):
+            if not values:
+                return None
+
+            result[bucket_ts] = {
+                field.decode(): SystemStats.decode(value.decode())
+                for field, value in values.items()
+                if field.decode() != ROLLUP_MARKER_FIELD
+            }
+        return result
+
+
+def get_covered_end(interval: int, now: float) -> int:
+    """已完结、可预聚合的最后一个 bucket 的结束时间"""
+    delay_seconds = settings.ESB_STATUS_ROLLUP_CONFIG["delay_seconds"]
+    return int(now - delay_seconds) // interval * interval
+
+
+def rollup_system_stats(interval: int, now: Optional[float] = None):
+    """聚合最近已完结、但尚未聚合的 bucket"""
+    store = SystemStatsRollupStore(interval)
+    if not store.available:
+        logger.warning("redis is unavailable, skip rollup of esb system stats")
+        return
+
+    covered_end = get_covered_end(interval, now or time.time())
+    bucket_ts_list = [covered_end - interval * i for i in range(ROLLUP_BACKFILL_BUCKETS[interval], 0, -1)]
+    missing = store.get_missing(bucket_ts_list)
+    if not missing:
+        return
+
+    data = get_search_es_client().get_system_stats_histogram(
+        mts_start=missing[0] * 1000,
+        mts_end=covered_end * 1000 - 1,
+        time_interval=f"{interval}s",
+    )
+
+    buckets: Dict[int, Dict[str, SystemStats]] = {bucket_ts: {} for bucket_ts in missing}
+    for system_data in data.get("aggregations", {}).get("systems", {}).get("buckets", []):
+        for bucket_data in system_data["requests_over_time"]["buckets"]:
+            bucket_ts = bucket_data["key"] // 1000
+            if bucket_ts in buckets and bucket_data["doc_count"]:
+                buckets[bucket_ts][system_data["key"]] = SystemStats.from_bucket_data(bucket_data)
+
+    for bucket_ts, stats in buckets.items():
+        store.save(bucket_ts, stats)
+
+
+def _ceil(ts: float, interval: int) -> int:
+    return int(math.ceil(ts / interval)) * interval
+
+
+def _to_es_data(system_buckets: Dict[str, dict]) -> dict:
+    return {"aggregations": {"systems": {"buckets": list(system_buckets.values())}}}
+
+
+class SystemStatsRollupReader:
+    """读取预聚合数据，并实时查询 ES 补齐最近未聚合的时间段，返回与 ES 聚合结果相同结构的数据
+
+    预聚合数据不可用时，各方法返回 None，由调用方回退到直接查询 ES
+    """
+
+    def __init__(self, now: Optional[float] = None):
+        self.now = now or time.time()
+        self.enabled = settings.ESB_STATUS_ROLLUP_CONFIG["enabled"]
+
+    @property
+    def available(self) -> bool:
+        # 未启用时不创建存储，避免获取 Redis 客户端时的 ping 等开销
+        return self.enabled and self.minute_store.available
+
+    @cached_property
+    def minute_store(self) -> SystemStatsRollupStore:
+        return SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+
+    @cached_property
+    def hour_store(self) -> SystemStatsRollupStore:
+        # 复用分钟存储的客户端，避免再次获取客户端
+        return SystemStatsRollupStore(ROLLUP_INTERVAL_HOUR, client=self.minute_store.client)
+
+    def get_system_stats(self, time_since: str, system_name: Optional[str] = None) -> Optional[dict]:
+        if not self.available:
+            return None
+
+        start = _ceil(self.now - str_to_seconds(time_since), ROLLUP_INTERVAL_MINUTE)
+        minute_end = max(start, get_covered_end(ROLLUP_INTERVAL_MINUTE, self.now))
+        hour_start = _ceil(start, ROLLUP_INTERVAL_HOUR)
+        hour_end = min(get_covered_end(ROLLUP_INTERVAL_HOUR, self.now), minute_end)
+
+        hours: List[int] = []
+        if hour_start < hour_end:
+            hours = list(range(hour_start, hour_end, ROLLUP_INTERVAL_HOUR))
+            minutes = list(range(start, hour_start, ROLLUP_INTERVAL_MINUTE)) + list(
+                range(hour_end, minute_end, ROLLUP_INTERVAL_MINUTE)
+            )
+        else:
+            minutes = list(range(start, minute_end, ROLLUP_INTERVAL_MINUTE))
+
+        rollups = self.minute_store.load(minutes)
+        hour_rollups = self.hour_store.load(hours)
+        if rollups is None or hour_rollups is None:
+            return None
+        rollups.update(hour_rollups)
+
+        totals: Dict[str, SystemStats] = defaultdict(SystemStats)
+        for stats in rollups.values():
+            for name, s in stats.items():
+                totals[name].merge(s)
+
+        tail = get_search_es_client().get_system_stats(
+            system_name=system_name,
+            mts_start=minute_end * 1000,
+            mts_end=int(self.now * 1000),
+        )
+        for bucket_data in tail.get("aggregations", {}).get("systems", {}).get("buckets", []):
+            totals[bucket_data["key"]].merge(SystemStats.from_bucket_data(bucket_data))
+
+        return _to_es_data(
+            {
+                name: s.to_bucket_data(name)
+                for name, s in totals.items()
+                if s.count and (not system_name or name == system_name)
+            }
+        )
+
+    def _get_minute_histogram(
+        self, start: float, end: float, interval: int, system_name: Optional[str] = None
+    ) -> Optional[Dict[str, Dict[int, SystemStats]]]:
+        """按 interval 聚合 [start, end] 时间段内各系统的统计数据，interval 须为分钟的整数倍"""
+        minute_start = _ceil(start, ROLLUP_INTERVAL_MINUTE)
+        minute_end = max(
+            minute_start,
+            min(
+                get_covered_end(ROLLUP_INTERVAL_MINUTE, self.now),
+                int(end) // ROLLUP_INTERVAL_MINUTE * ROLLUP_INTERVAL_MINUTE,
+            ),
+        )
+
+        rollups = self.minute_store.load(list(range(minute_start, minute_end, ROLLUP_INTERVAL_MINUTE)))
+        if rollups is None:
+            return None
+
+        result: Dict[str, Dict[int, SystemStats]] = defaultdict(lambda: defaultdict(SystemStats))
+        for bucket_ts, stats in rollups.items():
+            key = bucket_ts // interval * interval * 1000
+            for name, s in stats.items():
+                if not system_name or name == system_name:
+                    result[name][key].merge(s)
+
+        if minute_end < end:
+            tail = get_search_es_client().get_system_stats_histogram(
+                mts_start=minute_end * 1000,
+                mts_end=int(end * 1000),
+                time_interval=f"{interval}s",
+                system_name=system_name,
+            )
+            for system_data in tail.get("aggregations", {}).get("systems", {}).get("buckets", []):
+                for bucket_data in system_data["requests_over_time"]["buckets"]:
+                    if bucket_data["doc_count"]:
+                        result[system_data["key"]][bucket_data["key"]].merge(SystemStats.from_bucket_data(bucket_data))
+
+        return result
+
+    def get_sys_events_timeline(self, last_db_ts_happened_at: float, time_interval_seconds: int) -> Optional[dict]:
+        if not self.available or time_interval_seconds % ROLLUP_INTERVAL_MINUTE:
+            return None
+
+        histogram = self._get_minute_histogram(
+            last_db_ts_happened_at + time_interval_seconds, self.now, time_interval_seconds
+        )
+        if histogram is None:
+            return None
+
+        return _to_es_data(
+            {
+                name: {
+                    "key": name,
+                    "requests_over_time": {"buckets": [s.to_bucket_data(key) for key, s in sorted(buckets.items())]},
+                }
+                for name, buckets in histogram.items()
+            }
+        )
+
+    def get_sys_date_histogram(self, mts_start, mts_end, system_name: str, time_interval: str) -> Optional[dict]:
+        if not self.available or not mts_start:
+            return None
+
+        interval = str_to_seconds(time_interval)
+        if interval % ROLLUP_INTERVAL_MINUTE:
+            return None
+
+        start, end = int(mts_start) / 1000, int(mts_end) / 1000
+        histogram = self._get_minute_histogram(start, end, interval, system_name)
+        if histogram is None:
+            return None
+
+        buckets = histogram.get(system_name)
+        if not buckets:
+            return _to_es_data({})
+
+        total = SystemStats()
+        for s in buckets.values():
+            total.merge(s)
+
+        # 与 ES 的 min_doc_count=0、extended_bounds.max 一致，从首个有数据的 bucket 开始补齐空 bucket
+        step = interval * 1000
+        serial_data = [
+            buckets.get(key, SystemStats()).to_bucket_data(key)
+            for key in range(min(buckets), int(end) // interval * step + 1, step)
+        ]
+
+        system_data = total.to_bucket_data(system_name)
+        system_data["requests_over_time"] = {"buckets": serial_data}
+        return _to_es_data({system_name: system_data})
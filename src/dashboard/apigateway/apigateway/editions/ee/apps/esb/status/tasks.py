@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+
+from celery import shared_task
+
+from apigateway.apps.esb.status.rollup import ROLLUP_INTERVAL_HOUR, ROLLUP_INTERVAL_MINUTE, rollup_system_stats
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="apigateway.apps.esb.status.tasks.rollup_esb_system_stats", ignore_result=True)
+def rollup_esb_system_stats():
+    """预聚合 ESB 各系统的请求统计数据，供状态页查询"""
+    for interval in [ROLLUP_INTERVAL_MINUTE, ROLLUP_INTERVAL_HOUR]:
+        try:
+            rollup_system_stats(interval)
+        except Exception:
+            logger.exception("failed to rollup esb system stats, interval=%s", interval)
@@ -23,6 +23,7 @@ from rest_framework.views import APIView
 
 from apigateway.apps.esb.bkcore.models import RealTimelineEvent
 from apigateway.apps.esb.status.es_client import get_search_es_client
+from apigateway.apps.esb.status.rollup import SystemStatsRollupReader
 from apigateway.apps.esb.status.utils import get_system_basic_info, str_percentage, str_to_seconds
 from apigateway.utils.responses import OKJsonResponse
 
@@ -59,12 +60,14 @@ class SysEventsTimeline(APIView):
         last_db_ts_happened_at = db_events[0].ts_happened_at if db_events else ts_started_from
         db_events = [e.as_dict() for e in db_events]
 
-        es_client = get_search_es_client()
-        data = es_client.get_sys_events_timeline(
-            last_db_ts_happened_at,
-            self.time_interval_seconds,
-            self.time_interval,
-        )
+        data = SystemStatsRollupReader().get_sys_events_timeline(last_db_ts_happened_at, self.time_interval_seconds)
+        if data is None:
+            es_client = get_search_es_client()
+            data = es_client.get_sys_events_timeline(
+                last_db_ts_happened_at,
+                self.time_interval_seconds,
+                self.time_interval,
+            )
 
         system_aggregations_data = self._parse_aggregations_data(data)
         init_system_in_dropped = self._get_init_system_in_dropped(db_events)
@@ -233,13 +236,15 @@ class SysDateHistogramView(APIView):
         mts_end = request.GET.get("mts_end", int(time.time() * 1000))
         time_interval = request.GET.get("time_interval", "1m")
 
-        es_client = get_search_es_client()
-        data = es_client.get_sys_date_histogram(
-            mts_start,
-            mts_end,
-            system_name,
-            time_interval,
-        )
+        data = SystemStatsRollupReader().get_sys_date_histogram(mts_start, mts_end, system_name, time_interval)
+        if data is None:
+            es_client = get_search_es_client()
+            data = es_client.get_sys_date_histogram(
+                mts_start,
+                mts_end,
+                system_name,
+                time_interval,
+            )
 
         result = []
         for bucket_data in data["aggregations"]["systems"]["buckets"]:
@@ -333,13 +338,19 @@ class SysErrorsView(APIView):
 
 
 def es_get_system_stats(time_since=None, system_name=None, mts_start=None, mts_end=None):
-    es_client = get_search_es_client()
-    data = es_client.get_system_stats(
-        time_since=time_since,
-        system_name=system_name,
-        mts_start=mts_start,
-        mts_end=mts_end,
-    )
+    data = None
+    if not (mts_start and mts_end):
+        # 按最近一段时间查询时，优先使用预聚合数据
+        data = SystemStatsRollupReader().get_system_stats(time_since, system_name=system_name)
+
+    if data is None:
+        es_client = get_search_es_client()
+        data = es_client.get_system_stats(
+            time_since=time_since,
+            system_name=system_name,
+            mts_start=mts_start,
+            mts_end=mts_end,
+        )
     result = []
     if "aggregations" in data:
         result = [process_bucket_data(bucket_data) for bucket_data in data["aggregations"]["systems"]["buckets"]]
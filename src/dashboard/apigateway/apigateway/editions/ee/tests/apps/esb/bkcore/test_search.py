@@ -0,0 +1,52 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.apps.esb.bkcore.models import ComponentSystem, ESBChannel
+from apigateway.apps.esb.bkcore.search import ComponentSearchIndex
+
+pytestmark = pytest.mark.django_db
+
+
+class TestComponentSearchIndex:
+    def test_filter_public_components(self, unique_id):
+        board = unique_id[:32]
+        system = G(ComponentSystem, board=board, name="CMDB")
+        c1 = G(ESBChannel, board=board, system=system, name="search_host", description="查询主机", path="/a/")
+        c2 = G(ESBChannel, board=board, system=system, name="get_biz", description="search biz host", path="/b/")
+        G(ESBChannel, board=board, system=system, name="other", description="other", path="/c/", is_public=False)
+        ComponentSearchIndex().rebuild(board)
+
+        result = list(ESBChannel.objects.filter_public_components(board, keyword="host", order_by=("name",)))
+        assert result == [c1, c2]
+
+        result = list(ESBChannel.objects.filter_public_components(board, keyword="cmdb", order_by=("name",)))
+        assert result == [c2, c1]
+
+        assert list(ESBChannel.objects.filter_public_components(board, keyword="not-exist")) == []
+
+        # 系统名称变更后，索引未重建前，仍可按新名称匹配到组件
+        ComponentSystem.objects.filter(id=system.id).update(name="CMSI")
+        result = list(ESBChannel.objects.filter_public_components(board, keyword="cmsi", order_by=("name",)))
+        assert result == [c2, c1]
+
+    def test_list_scopes(self, unique_id):
+        board = unique_id[:32]
+        G(ESBChannel, board=board)
+        assert board in ComponentSearchIndex().list_scopes()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+
+from apigateway.apps.esb.status.rollup import (
+    ROLLUP_INTERVAL_HOUR,
+    ROLLUP_INTERVAL_MINUTE,
+    SystemStats,
+    SystemStatsRollupReader,
+    SystemStatsRollupStore,
+    rollup_system_stats,
+)
+
+NOW = 1700000000
+
+
+@pytest.fixture(autouse=True)
+def rollup_config(settings):
+    settings.ESB_STATUS_ROLLUP_CONFIG = {
+        "enabled": True,
+        "delay_seconds": 120,
+        "minute_retention_seconds": 3600,
+        "hour_retention_seconds": 3600,
+    }
+
+
+def make_bucket_data(key, count, error_count=0, avg=10, perc95=20):
+    return {
+        "key": key,
+        "doc_count": count,
+        "error_count": {"doc_count": error_count},
+        "avg_resp_time": {"value": avg},
+        "sum_resp_time": {"value": avg * count},
+        "resp_time_outlier": {"values": {"95.0": perc95}},
+    }
+
+
+class TestSystemStats:
+    def test_encode_decode(self):
+        stats = SystemStats(count=10, error_count=1, sum_msecs=100, sum_perc95=300)
+        assert SystemStats.decode(stats.encode()) == stats
+
+    def test_merge(self):
+        stats = SystemStats.from_bucket_data(make_bucket_data("a", 10, 1, avg=10, perc95=20))
+        stats.merge(SystemStats.from_bucket_data(make_bucket_data("a", 30, 0, avg=30, perc95=40)))
+
+        assert stats.count == 40
+        assert stats.error_count == 1
+        assert stats.avg_resp_time == 25
+        assert stats.perc95_resp_time == 35
+
+    def test_from_empty_bucket_data(self):
+        bucket_data = make_bucket_data("a", 0)
+        bucket_data["resp_time_outlier"]["values"]["95.0"] = "NaN"
+
+        assert SystemStats.from_bucket_data(bucket_data) == SystemStats()
+        assert SystemStats().to_bucket_data("a")["avg_resp_time"]["value"] is None
+
+
+class TestSystemStatsRollupStore:
+    def test_save_and_load(self):
+        store = SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+        store.save(60, {"CC": SystemStats(1, 0, 10, 10)})
+        store.save(120, {})
+
+        assert store.get_missing([60, 120, 180]) == [180]
+        assert store.load([60, 120, 180]) is None
+        assert store.load([60, 120]) == {60: {"CC": SystemStats(1, 0, 10, 10)}, 120: {}}
+
+
+def test_rollup_system_stats(mocker):
+    covered_end = (NOW - 120) // 60 * 60
+    mock_client = mocker.MagicMock(
+        **{
+            "get_system_stats_histogram.return_value": {
+                "aggregations": {
+                    "systems": {
+                        "buckets": [
+                            {
+                                "key": "CC",
+                                "requests_over_time": {
+                                    "buckets": [make_bucket_data((covered_end - 60) * 1000, 5, 1)],
+                                },
+                            }
+                        ]
+                    }
+                }
+            }
+        }
+    )
+    mocker.patch("apigateway.apps.esb.status.rollup.get_search_es_client", return_value=mock_client)
+
+    rollup_system_stats(ROLLUP_INTERVAL_MINUTE, now=NOW)
+
+    store = SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+    data = store.load(list(range(covered_end - 30 * 60, covered_end, 60)))
+    assert data[covered_end - 60]["CC"].count == 5
+    assert data[covered_end - 120] == {}
+    mock_client.get_system_stats_histogram.assert_called_once_with(
+        mts_start=(covered_end - 30 * 60) * 1000,
+        mts_end=covered_end * 1000 - 1,
+        time_interval="60s",
+    )
+
+    # all buckets are rolled up, skip querying es
+    mock_client.reset_mock()
+    rollup_system_stats(ROLLUP_INTERVAL_MINUTE, now=NOW)
+    mock_client.get_system_stats_histogram.assert_not_called()
+
+
+class TestSystemStatsRollupReader:
+    def test_disabled(self, mocker, settings):
+        settings.ESB_STATUS_ROLLUP_CONFIG["enabled"] = False
+        mock_get_redis_client = mocker.patch("apigateway.apps.esb.status.rollup.get_default_redis_client")
+
+        reader = SystemStatsRollupReader(now=NOW)
+        assert reader.get_system_stats("1h") is None
+        assert reader.get_sys_events_timeline(NOW - 3600, 300) is None
+        # 未启用时，不获取 Redis 客户端
+        mock_get_redis_client.assert_not_called()
+
+    def test_missing_rollup(self, mocker):
+        mock_get_client = mocker.patch("apigateway.apps.esb.status.rollup.get_search_es_client")
+
+        assert SystemStatsRollupReader(now=NOW).get_system_stats("1h") is None
+        mock_get_client.assert_not_called()
+
+    def test_get_system_stats(self, mocker):
+        minute_store = SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+        hour_store = SystemStatsRollupStore(ROLLUP_INTERVAL_HOUR)
+        start = (NOW - 3 * 3600 + 59) // 60 * 60
+        hour_start = (start + 3599) // 3600 * 3600
+        hour_end = (NOW - 120) // 3600 * 3600
+        minute_end = (NOW - 120) // 60 * 60
+
+        for ts in list(range(start, hour_start, 60)) + list(range(hour_end, minute_end, 60)):
+            minute_store.save(ts, {"CC": SystemStats(1, 0, 10, 10)})
+        for ts in range(hour_start, hour_end, 3600):
+            hour_store.save(ts, {"CC": SystemStats(100, 1, 1000, 2000), "JOB": SystemStats(10, 0, 100, 100)})
+
+        mock_client = mocker.MagicMock(
+            **{
+                "get_system_stats.return_value": {
+                    "aggregations": {"systems": {"buckets": [make_bucket_data("JOB", 2, 2)]}},
+                }
+            }
+        )
+        mocker.patch("apigateway.apps.esb.status.rollup.get_search_es_client", return_value=mock_client)
+
+        data = SystemStatsRollupReader(now=NOW).get_system_stats("3h")
+
+        buckets = {b["key"]: b for b in data["aggregations"]["systems"]["buckets"]}
+        hours = len(range(hour_start, hour_end, 3600))
+        minutes = len(range(start, hour_start, 60)) + len(range(hour_end, minute_end, 60))
+        assert buckets["CC"]["doc_count"] == 100 * hours + minutes
+        assert buckets["CC"]["error_count"]["doc_count"] == hours
+        assert buckets["JOB"]["doc_count"] == 10 * hours + 2
+        assert buckets["JOB"]["error_count"]["doc_count"] == 2
+        mock_client.get_system_stats.assert_called_once_with(
+            system_name=None,
+            mts_start=minute_end * 1000,
+            mts_end=NOW * 1000,
+        )
+
+    def test_get_sys_events_timeline(self, mocker):
+        minute_store = SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+        minute_end = (NOW - 120) // 60 * 60
+        start = minute_end - 600
+        for ts in range(start, minute_end, 60):
+            minute_store.save(ts, {"CC": SystemStats(1, 1, 10, 10)})
+
+        mock_client = mocker.MagicMock(
+            **{"get_system_stats_histogram.return_value": {"aggregations": {"systems": {"buckets": []}}}}
+        )
+        mocker.patch("apigateway.apps.esb.status.rollup.get_search_es_client", return_value=mock_client)
+
+        data = SystemStatsRollupReader(now=NOW).get_sys_events_timeline(start - 300, 300)
+
+        buckets = data["aggregations"]["systems"]["buckets"][0]["requests_over_time"]["buckets"]
+        assert sum(b["doc_count"] for b in buckets) == 10
+        assert all(b["key"] % 300000 == 0 for b in buckets)
+        assert mock_client.get_system_stats_histogram.call_args[1]["mts_start"] == minute_end * 1000
+
+    def test_get_sys_date_histogram(self, mocker):
+        minute_store = SystemStatsRollupStore(ROLLUP_INTERVAL_MINUTE)
+        end = (NOW - 3600) // 60 * 60
+        start = end - 600
+        for ts in range(start, end, 60):
+            minute_store.save(ts, {"CC": SystemStats(2, 1, 20, 20)} if ts != start + 60 else {})
+        mock_get_client = mocker.patch("apigateway.apps.esb.status.rollup.get_search_es_client")
+
+        data = SystemStatsRollupReader(now=NOW).get_sys_date_histogram(start * 1000, end * 1000, "CC", "1m")
+
+        system_data = data["aggregations"]["systems"]["buckets"][0]
+        assert system_data["doc_count"] == 18
+        serial_data = system_data["requests_over_time"]["buckets"]
+        assert len(serial_data) == 11
+        assert serial_data[1]["doc_count"] == 0
+        assert serial_data[0]["avg_resp_time"]["value"] == 10
+        mock_get_client.assert_not_called()
@@ -69,7 +69,7 @@ class TestResourceVersionListCreateApi:
     def test_create(self, request_view, fake_gateway, fake_resource, mocker):
         mocker.patch(
             "apigateway.biz.resource_version.ResourceVersionHandler.make_version",
-            return_value=[{"name": "test"}],
+            return_value=[{"id": 1, "name": "test"}],
         )
 
         resp = request_view(
@@ -16,19 +16,28 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import datetime
 import json
 
 import pytest
 from ddf import G
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from apigateway.apis.web.resource.views import (
     BackendHostIsEmpty,
     BackendPathCheckApi,
 )
 from apigateway.apps.label.models import APILabel, ResourceLabel
+from apigateway.apps.search.indexes import ResourceSearchIndex
+from apigateway.apps.support.constants import ResourceExportTaskStatusEnum, ResourceImportTaskStatusEnum
+from apigateway.apps.support.models import ResourceExportTask, ResourceImportTask
+from apigateway.apps.support.tasks import export_resources, import_resources
 from apigateway.biz.resource import ResourceHandler
 from apigateway.common.contexts import ResourceAuthContext
 from apigateway.core import constants
+from apigateway.core.gateway_cache import gateway_cache
 from apigateway.core.models import Backend, BackendConfig, Context, Proxy, Resource, Stage
 
 
@@ -70,6 +79,79 @@ class TestResourceListCreateApi:
         assert resp.status_code == 200
         assert len(result["data"]["results"]) == expected
 
+    def test_list_keyword_order(self, request_view, fake_gateway, fake_backend):
+        resource_1 = G(Resource, gateway=fake_gateway, path="/users/", method="GET", name="get_user")
+        resource_2 = G(Resource, gateway=fake_gateway, path="/users/", method="GET", name="echo")
+        G(Proxy, resource=resource_1, backend=fake_backend)
+        G(Proxy, resource=resource_2, backend=fake_backend)
+        ResourceSearchIndex().refresh(str(fake_gateway.id))
+
+        def list_resource_ids(data):
+            resp = request_view(
+                method="GET",
+                view_name="resource.list_create",
+                path_params={"gateway_id": fake_gateway.id},
+                data=data,
+            )
+            assert resp.status_code == 200
+            return [resource["id"] for resource in resp.json()["data"]["results"]]
+
+        # 未指定排序字段时，按关键字匹配度排序，名称匹配的权重更高
+        assert list_resource_ids({"keyword": "user"}) == [resource_1.id, resource_2.id]
+        assert list_resource_ids({"keyword": "user", "order_by": "-updated_time"}) == [resource_2.id, resource_1.id]
+
+    def test_list_num_queries(self, request_view, fake_gateway, fake_backend):
+        def list_resources():
+            gateway_cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                resp = request_view(
+                    method="GET",
+                    view_name="resource.list_create",
+                    path_params={"gateway_id": fake_gateway.id},
+                    data={"limit": 20},
+                )
+            assert resp.status_code == 200
+            return resp.json()["data"]["results"], len(ctx.captured_queries)
+
+        for i in range(2):
+            G(Proxy, resource=G(Resource, gateway=fake_gateway, path=f"/a{i}/"), backend=fake_backend)
+        results, num_queries = list_resources()
+        assert len(results) == 2
+
+        for i in range(10):
+            G(Proxy, resource=G(Resource, gateway=fake_gateway, path=f"/b{i}/"), backend=fake_backend)
+        results, more_num_queries = list_resources()
+        assert len(results) == 12
+        assert results[0]["backend"] == {"id": fake_backend.id, "name": fake_backend.name}
+
+        # 查询次数不随资源数量增长
+        assert more_num_queries == num_queries
+
+    def test_list_after_id(self, request_view, fake_gateway, fake_backend):
+        for i in range(5):
+            G(Proxy, resource=G(Resource, gateway=fake_gateway, name=f"r{i}", path=f"/r{i}/"), backend=fake_backend)
+
+        ids = []
+        data = {"order_by": "name", "limit": 2}
+        while True:
+            resp = request_view(
+                method="GET",
+                view_name="resource.list_create",
+                path_params={"gateway_id": fake_gateway.id},
+                data=data,
+            )
+            result = resp.json()
+            assert resp.status_code == 200
+            assert result["data"]["count"] == 5
+
+            page = [resource["name"] for resource in result["data"]["results"]]
+            if not page:
+                break
+            ids.extend(page)
+            data["after_id"] = result["data"]["results"][-1]["id"]
+
+        assert ids == ["r0", "r1", "r2", "r3", "r4"]
+
     @pytest.mark.parametrize(
         "data",
         [
@@ -533,6 +615,137 @@ class TestResourceImportApi:
         assert Resource.objects.filter(gateway=fake_gateway).count() == expected
 
 
+class TestResourceImportTaskApi:
+    @pytest.fixture
+    def import_data(self):
+        return {
+            "content": json.dumps(
+                {
+                    "swagger": "2.0",
+                    "basePath": "/",
+                    "info": {"version": "0.1", "title": "API Gateway Swagger"},
+                    "schemes": ["http"],
+                    "paths": {
+                        f"/import/r{i}/": {
+                            "get": {
+                                "operationId": f"import_r{i}",
+                                "description": "test",
+                                "x-bk-apigateway-resource": {
+                                    "backend": {
+                                        "name": "default",
+                                        "type": "HTTP",
+                                        "path": "/hello/",
+                                        "method": "get",
+                                        "timeout": 30,
+                                    },
+                                },
+                            },
+                        }
+                        for i in range(3)
+                    },
+                }
+            ),
+        }
+
+    def test_create(self, mocker, settings, request_view, fake_gateway, import_data):
+        settings.RESOURCE_IMPORT_CHUNK_SIZE = 2
+        mock_apply_async = mocker.patch("apigateway.apis.web.resource.views.apply_async_on_commit")
+        G(Backend, gateway=fake_gateway, name="default")
+
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.create",
+            path_params={"gateway_id": fake_gateway.id},
+            data=import_data,
+        )
+        result = resp.json()
+
+        assert resp.status_code == 201
+        assert result["data"]["total"] == 3
+        assert result["data"]["processed"] == 0
+        mock_apply_async.assert_called_once_with(import_resources, args=[result["data"]["id"]])
+
+        import_resources(result["data"]["id"])
+        task = ResourceImportTask.objects.get(id=result["data"]["id"])
+        assert task.status == ResourceImportTaskStatusEnum.SUCCESS.value
+        assert task.processed == 3
+        assert Resource.objects.filter(gateway=fake_gateway).count() == 3
+
+    def test_create__invalid(self, mocker, request_view, fake_gateway, import_data):
+        mock_apply_async = mocker.patch("apigateway.apis.web.resource.views.apply_async_on_commit")
+
+        # 后端服务 default 不存在
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.create",
+            path_params={"gateway_id": fake_gateway.id},
+            data=import_data,
+        )
+
+        assert resp.status_code == 400
+        assert not ResourceImportTask.objects.filter(gateway=fake_gateway).exists()
+        mock_apply_async.assert_not_called()
+
+    def test_retrieve(self, request_view, fake_gateway):
+        task = G(ResourceImportTask, gateway=fake_gateway, total=10, processed=5)
+
+        resp = request_view(
+            method="GET",
+            view_name="resource.import.task.retrieve",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        result = resp.json()
+
+        assert resp.status_code == 200
+        assert result["data"]["processed"] == 5
+        assert result["data"]["total"] == 10
+
+    def test_resume(self, mocker, request_view, fake_gateway):
+        mock_apply_async = mocker.patch("apigateway.apis.web.resource.views.apply_async_on_commit")
+        task = G(ResourceImportTask, gateway=fake_gateway, status=ResourceImportTaskStatusEnum.SUCCESS.value)
+
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.resume",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 400
+
+        task.status = ResourceImportTaskStatusEnum.FAILURE.value
+        task.save()
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.resume",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["data"]["status"] == ResourceImportTaskStatusEnum.PENDING.value
+        mock_apply_async.assert_called_once_with(import_resources, args=[task.id])
+
+    def test_resume_stale_running(self, mocker, settings, request_view, fake_gateway):
+        settings.RESOURCE_IMPORT_TASK_STALE_TIMEOUT = 1800
+        mock_apply_async = mocker.patch("apigateway.apis.web.resource.views.apply_async_on_commit")
+        task = G(ResourceImportTask, gateway=fake_gateway, status=ResourceImportTaskStatusEnum.RUNNING.value)
+
+        # 执行中的任务，不可继续执行
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.resume",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 400
+
+        # worker 异常退出，任务长时间未更新进度，可继续执行
+        ResourceImportTask.objects.filter(id=task.id).update(updated_time=timezone.now() - datetime.timedelta(hours=1))
+        resp = request_view(
+            method="POST",
+            view_name="resource.import.task.resume",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 200
+        mock_apply_async.assert_called_once_with(import_resources, args=[task.id])
+
+
 class TestResourceExportApi:
     @pytest.mark.parametrize(
         "data",
@@ -555,6 +768,61 @@ class TestResourceExportApi:
         )
 
         assert resp.status_code == 200
+        content = b"".join(resp.streaming_content).decode("utf-8")
+        assert "paths" in content
+
+
+class TestResourceExportTaskApi:
+    def test_create(self, mocker, request_view, fake_gateway):
+        mock_apply_async = mocker.patch("apigateway.apis.web.resource.views.apply_async_on_commit")
+
+        resp = request_view(
+            method="POST",
+            view_name="resource.export.task.create",
+            path_params={"gateway_id": fake_gateway.id},
+            data={"export_type": "selected", "file_type": "json", "resource_ids": [1]},
+        )
+        result = resp.json()
+
+        assert resp.status_code == 201
+        assert result["data"]["status"] == ResourceExportTaskStatusEnum.PENDING.value
+        task = ResourceExportTask.objects.get(id=result["data"]["id"])
+        assert task.params == {"export_type": "selected", "resource_filter_condition": {}, "resource_ids": [1]}
+        mock_apply_async.assert_called_once_with(export_resources, args=[task.id])
+
+    def test_retrieve(self, request_view, fake_gateway):
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="json")
+
+        resp = request_view(
+            method="GET",
+            view_name="resource.export.task.retrieve",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+
+        assert resp.status_code == 200
+        assert resp.json()["data"]["id"] == task.id
+
+    def test_download(self, request_view, fake_gateway):
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="json")
+
+        resp = request_view(
+            method="GET",
+            view_name="resource.export.task.download",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 400
+
+        task.set_content(['{"paths": {}}'])
+        task.status = ResourceExportTaskStatusEnum.SUCCESS.value
+        task.save()
+
+        resp = request_view(
+            method="GET",
+            view_name="resource.export.task.download",
+            path_params={"gateway_id": fake_gateway.id, "id": task.id},
+        )
+        assert resp.status_code == 200
+        assert b"".join(resp.streaming_content) == b'{"paths": {}}'
 
 
 class TestBackendPathCheckApi:
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.apps.search.constants import SearchObjectTypeEnum
+from apigateway.apps.search.management.commands.rebuild_search_index import Command
+from apigateway.apps.search.models import SearchToken
+from apigateway.core.models import Resource
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCommand:
+    def test_handle(self, fake_gateway):
+        resource = G(Resource, gateway=fake_gateway, name="get_user")
+
+        Command().handle(object_type=SearchObjectTypeEnum.RESOURCE.value, scope=[str(fake_gateway.id)])
+        assert SearchToken.objects.filter(object_id=resource.id, token="get").exists()
+
+        SearchToken.objects.all().delete()
+        Command().handle(object_type=SearchObjectTypeEnum.RESOURCE.value, scope=None)
+        assert SearchToken.objects.filter(object_id=resource.id, token="get").exists()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import datetime
+
+import pytest
+from ddf import G
+
+from apigateway.apps.search.constants import SearchObjectTypeEnum
+from apigateway.apps.search.indexes import GatewaySearchIndex, ResourceSearchIndex, search_index_registry
+from apigateway.apps.search.models import SearchIndexScope, SearchToken
+from apigateway.core.models import Gateway, Resource
+
+pytestmark = pytest.mark.django_db
+
+
+class TestResourceSearchIndex:
+    def _search(self, gateway, keyword):
+        queryset = Resource.objects.filter(gateway=gateway)
+        return list(
+            ResourceSearchIndex().filter(queryset, keyword, scope=str(gateway.id)).order_by("-search_score", "id")
+        )
+
+    def test_filter(self, fake_gateway):
+        r1 = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+        r2 = G(Resource, gateway=fake_gateway, name="list_app", path="/users/apps/")
+        r3 = G(Resource, gateway=fake_gateway, name="echo", path="/echo/")
+        ResourceSearchIndex().refresh(str(fake_gateway.id))
+
+        # 名称匹配的权重更高
+        assert self._search(fake_gateway, "USER") == [r1, r2]
+        assert self._search(fake_gateway, "echo") == [r3]
+        assert self._search(fake_gateway, "not-exist") == []
+
+        # 关键字未出现在任一字段中时，不匹配
+        assert self._search(fake_gateway, "echo/") == [r3]
+        assert self._search(fake_gateway, "ech_user") == []
+
+        # 关键字过短，使用 icontains 匹配
+        assert self._search(fake_gateway, "ec") == [r3]
+
+    def test_filter__index_outdated(self, fake_gateway):
+        r1 = G(Resource, gateway=fake_gateway, name="list_app", path="/users/apps/")
+        ResourceSearchIndex().refresh(str(fake_gateway.id))
+
+        # 索引未更新时，仍可匹配到资源，仅影响排序
+        r2 = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+        Resource.objects.filter(id=r1.id).update(name="list_user")
+        assert set(self._search(fake_gateway, "user")) == {r1, r2}
+        assert self._search(fake_gateway, "get_user") == [r2]
+
+    def test_refresh(self, fake_gateway):
+        scope = str(fake_gateway.id)
+        index = ResourceSearchIndex()
+
+        resource = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+        index.refresh(scope)
+        index_scope = SearchIndexScope.objects.get(object_type=SearchObjectTypeEnum.RESOURCE.value, scope=scope)
+        assert index_scope.object_count == 1
+        assert SearchToken.objects.filter(object_id=resource.id, token="get").exists()
+
+        # 更新资源，updated_time 变化后，增量更新索引
+        resource.name = "echo"
+        resource.updated_time = resource.updated_time + datetime.timedelta(seconds=1)
+        Resource.objects.bulk_update([resource], fields=["name", "updated_time"])
+        index.refresh(scope)
+        assert SearchToken.objects.filter(object_id=resource.id, token="ech").exists()
+        assert not SearchToken.objects.filter(object_id=resource.id, token="get").exists()
+
+        # 删除资源后，删除对应索引
+        resource.delete()
+        index.refresh(scope)
+        assert not SearchToken.objects.filter(scope=scope).exists()
+
+    def test_refresh__concurrent(self, mocker, fake_gateway):
+        scope = str(fake_gateway.id)
+        index = ResourceSearchIndex()
+
+        G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+        index.refresh(scope)
+        token_count = SearchToken.objects.filter(scope=scope).count()
+
+        # 并发请求加锁前判断索引需更新，获得锁时索引已由其它请求更新，不再重复写入分词
+        mocker.patch.object(
+            ResourceSearchIndex, "_is_up_to_date", side_effect=[False, ResourceSearchIndex._is_up_to_date]
+        )
+        index.refresh(scope)
+        assert SearchToken.objects.filter(scope=scope).count() == token_count
+
+    def test_rebuild(self, fake_gateway):
+        scope = str(fake_gateway.id)
+        resource = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+        G(SearchToken, object_type=SearchObjectTypeEnum.RESOURCE.value, scope=scope, object_id=0, token="xyz")
+
+        ResourceSearchIndex().rebuild(scope)
+        assert set(SearchToken.objects.filter(scope=scope).values_list("object_id", flat=True)) == {resource.id}
+
+    def test_list_scopes(self, fake_gateway):
+        G(Resource, gateway=fake_gateway)
+        assert str(fake_gateway.id) in ResourceSearchIndex().list_scopes()
+
+
+class TestGatewaySearchIndex:
+    def test_filter(self, unique_id):
+        gateway_1 = G(Gateway, name=f"{unique_id}-a", description="")
+        gateway_2 = G(Gateway, name=f"{unique_id}-b", description=f"{unique_id} desc")
+        GatewaySearchIndex().refresh("")
+
+        result = list(GatewaySearchIndex().filter(Gateway.objects.all(), unique_id).order_by("-search_score", "id"))
+        assert result == [gateway_2, gateway_1]
+
+
+class TestSearchIndexRegistry:
+    def test_get(self):
+        assert isinstance(search_index_registry.get(SearchObjectTypeEnum.RESOURCE.value), ResourceSearchIndex)
+        assert SearchObjectTypeEnum.GATEWAY.value in search_index_registry.get_object_types()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+from ddf import G
+
+from apigateway.apps.search.constants import SearchObjectTypeEnum
+from apigateway.apps.search.indexes import ResourceSearchIndex
+from apigateway.apps.search.models import SearchToken
+from apigateway.apps.search.tasks import rebuild_search_indexes, refresh_search_indexes
+from apigateway.core.models import Resource
+
+pytestmark = pytest.mark.django_db
+
+
+def test_refresh_search_indexes(fake_gateway):
+    resource = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+
+    refresh_search_indexes()
+    assert SearchToken.objects.filter(
+        object_type=SearchObjectTypeEnum.RESOURCE.value, object_id=resource.id, token="use"
+    ).exists()
+
+
+def test_refresh_search_indexes__error(mocker, fake_gateway):
+    G(Resource, gateway=fake_gateway)
+    mocked_refresh = mocker.patch.object(ResourceSearchIndex, "refresh", side_effect=Exception("error"))
+
+    # 单个索引范围更新失败，不影响其它索引范围
+    refresh_search_indexes()
+    assert mocked_refresh.call_count == len(ResourceSearchIndex().list_scopes())
+
+
+def test_rebuild_search_indexes(fake_gateway):
+    scope = str(fake_gateway.id)
+    resource = G(Resource, gateway=fake_gateway, name="get_user", path="/users/")
+    ResourceSearchIndex().refresh(scope)
+
+    # 通过 queryset.update 更新的资源，updated_time 未变化，仅全量重建可更新索引
+    Resource.objects.filter(id=resource.id).update(name="echo")
+    rebuild_search_indexes()
+    assert SearchToken.objects.filter(scope=scope, object_id=resource.id, token="ech").exists()
+    assert not SearchToken.objects.filter(scope=scope, object_id=resource.id, token="get").exists()
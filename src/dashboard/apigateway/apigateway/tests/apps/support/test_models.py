@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import datetime
+
+import pytest
+from ddf import G
+from django.utils import timezone
+
+from apigateway.apps.support.constants import ResourceImportTaskStatusEnum
+from apigateway.apps.support.models import ResourceExportTask, ResourceImportTask
+
+
+class TestResourceExportTask:
+    def test_content(self, fake_gateway):
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="yaml")
+        assert list(task.iter_content()) == []
+
+        task.set_content(["foo: ", "bar\n", "中文" * 10000])
+        task.save()
+
+        task.refresh_from_db()
+        assert b"".join(task.iter_content(chunk_size=16)) == ("foo: bar\n" + "中文" * 10000).encode("utf-8")
+        assert task.filename == f"bk_apigw_resources_{fake_gateway.name}.yaml"
+
+
+class TestResourceImportTask:
+    @pytest.mark.parametrize(
+        "status, updated_seconds_ago, expected",
+        [
+            (ResourceImportTaskStatusEnum.FAILURE.value, 0, True),
+            (ResourceImportTaskStatusEnum.SUCCESS.value, 3600, False),
+            (ResourceImportTaskStatusEnum.RUNNING.value, 0, False),
+            (ResourceImportTaskStatusEnum.RUNNING.value, 3600, True),
+            (ResourceImportTaskStatusEnum.PENDING.value, 3600, True),
+        ],
+    )
+    def test_is_resumable(self, settings, fake_gateway, status, updated_seconds_ago, expected):
+        settings.RESOURCE_IMPORT_TASK_STALE_TIMEOUT = 1800
+        task = G(ResourceImportTask, gateway=fake_gateway, status=status)
+        ResourceImportTask.objects.filter(id=task.id).update(
+            updated_time=timezone.now() - datetime.timedelta(seconds=updated_seconds_ago)
+        )
+
+        task.refresh_from_db()
+        assert task.is_resumable is expected
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+from datetime import timedelta
+
+import pytest
+from ddf import G
+from django.utils import timezone
+
+from apigateway.apps.support.constants import ResourceExportTaskStatusEnum, ResourceImportTaskStatusEnum
+from apigateway.apps.support.models import ResourceExportTask, ResourceImportTask
+from apigateway.apps.support.tasks import delete_old_resource_export_tasks, export_resources, import_resources
+from apigateway.core.models import Backend, Resource
+from apigateway.utils.yaml import yaml_loads
+
+
+class TestExportResources:
+    def test_success(self, fake_resource):
+        task = G(
+            ResourceExportTask,
+            gateway=fake_resource.gateway,
+            file_type="yaml",
+            params={"export_type": "all"},
+        )
+
+        export_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceExportTaskStatusEnum.SUCCESS.value
+        content = yaml_loads(b"".join(task.iter_content()).decode("utf-8"))
+        assert list(content["paths"]) == [fake_resource.path]
+
+    def test_failure(self, mocker, fake_gateway):
+        mocker.patch(
+            "apigateway.apps.support.tasks.ResourcesExporter.iter_swagger",
+            side_effect=ValueError("unsupported proxy_type"),
+        )
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="json", params={"export_type": "all"})
+
+        export_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceExportTaskStatusEnum.FAILURE.value
+        assert task.message == "unsupported proxy_type"
+
+    def test_failure__invalid_params(self, mocker, fake_gateway):
+        mocker.patch(
+            "apigateway.apps.support.tasks.ResourcesExporter.from_export_params",
+            side_effect=ValueError("invalid export params"),
+        )
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="json", params={"export_type": "filtered"})
+
+        export_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceExportTaskStatusEnum.FAILURE.value
+        assert task.message == "invalid export params"
+
+    def test_not_found(self):
+        export_resources(0)
+
+
+class TestDeleteOldResourceExportTasks:
+    def test_delete(self, settings, fake_gateway):
+        settings.RESOURCE_EXPORT_TASK_RETENTION_DAYS = 7
+        old_task = G(ResourceExportTask, gateway=fake_gateway, file_type="yaml")
+        ResourceExportTask.objects.filter(id=old_task.id).update(created_time=timezone.now() - timedelta(days=8))
+        task = G(ResourceExportTask, gateway=fake_gateway, file_type="yaml")
+
+        delete_old_resource_export_tasks()
+
+        assert list(ResourceExportTask.objects.filter(gateway=fake_gateway)) == [task]
+
+
+class TestImportResources:
+    @pytest.fixture
+    def fake_resources(self):
+        return [
+            {
+                "name": f"test{i}",
+                "method": "GET",
+                "path": f"/test{i}",
+                "backend_name": "foo",
+                "backend_config": {
+                    "method": "GET",
+                    "path": "/backend/test",
+                },
+            }
+            for i in range(3)
+        ]
+
+    def test_success(self, settings, fake_gateway, fake_resources):
+        settings.RESOURCE_IMPORT_CHUNK_SIZE = 2
+        G(Backend, gateway=fake_gateway, name="foo")
+        task = G(ResourceImportTask, gateway=fake_gateway, resources=fake_resources, selected_resources=None)
+
+        import_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceImportTaskStatusEnum.SUCCESS.value
+        assert (task.processed, task.total) == (3, 3)
+        assert Resource.objects.filter(gateway=fake_gateway).count() == 3
+
+    def test_resume(self, settings, fake_gateway, fake_resources):
+        settings.RESOURCE_IMPORT_CHUNK_SIZE = 1
+        G(Backend, gateway=fake_gateway, name="foo")
+        task = G(
+            ResourceImportTask,
+            gateway=fake_gateway,
+            resources=fake_resources,
+            selected_resources=None,
+            status=ResourceImportTaskStatusEnum.FAILURE.value,
+            processed=2,
+        )
+
+        import_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceImportTaskStatusEnum.SUCCESS.value
+        assert task.processed == 3
+        # 已导入的资源不再重复导入
+        assert list(Resource.objects.filter(gateway=fake_gateway).values_list("name", flat=True)) == ["test2"]
+
+    def test_failure(self, fake_gateway, fake_resources):
+        task = G(ResourceImportTask, gateway=fake_gateway, resources=fake_resources, selected_resources=None)
+
+        # 后端服务 foo 不存在
+        import_resources(task.id)
+
+        task.refresh_from_db()
+        assert task.status == ResourceImportTaskStatusEnum.FAILURE.value
+        assert task.message
+        assert task.processed == 0
+
+    def test_not_found(self):
+        import_resources(0)
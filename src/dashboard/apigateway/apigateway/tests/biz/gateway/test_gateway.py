@@ -60,6 +60,10 @@ class TestGatewayHandler:
         gateways = GatewayHandler.list_gateways_by_user("not_exist_user")
         assert len(gateways) == 0
 
+        # 用户名为其它维护者的子串时，不应匹配
+        gateways = GatewayHandler.list_gateways_by_user("admin")
+        assert len(gateways) == 0
+
     def test_get_stages_with_release_status(self, fake_gateway):
         Gateway.objects.filter(id=fake_gateway.id).update(status=GatewayStatusEnum.ACTIVE.value)
         stage_1 = G(Stage, gateway=fake_gateway, status=StageStatusEnum.ACTIVE.value)
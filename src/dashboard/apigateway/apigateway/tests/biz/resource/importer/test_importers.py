@@ -403,6 +403,34 @@ class TestResourcesImporter:
         assert resource_2_id not in resource_ids
         assert resource_1.id in resource_ids
 
+    def test_import_resources__chunked(self, fake_gateway, fake_resource_data):
+        G(Backend, gateway=fake_gateway, name="default")
+
+        resource_data_list = [
+            fake_resource_data.copy(update={"name": f"foo{i}", "path": f"/foo{i}"}, deep=True) for i in range(5)
+        ]
+        importer = ResourcesImporter(fake_gateway, resource_data_list)
+
+        progress = []
+        # 从第 2 个资源开始导入，模拟此前的资源已导入
+        importer.import_resources(
+            chunk_size=2,
+            start=2,
+            progress_callback=lambda processed, total: progress.append((processed, total)),
+        )
+
+        assert progress == [(4, 5), (5, 5)]
+        assert set(Resource.objects.filter(gateway=fake_gateway).values_list("name", flat=True)) == {
+            "foo2",
+            "foo3",
+            "foo4",
+        }
+
+    def test_import_resources__empty(self, fake_gateway):
+        importer = ResourcesImporter(fake_gateway, [])
+        importer.import_resources(chunk_size=10)
+        assert not Resource.objects.filter(gateway=fake_gateway).exists()
+
     @pytest.mark.parametrize(
         "selected_resources, expected",
         [
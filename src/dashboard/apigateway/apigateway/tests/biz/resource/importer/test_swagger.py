@@ -955,6 +955,21 @@ class TestResourceSwaggerExporter:
         content = exporter.to_swagger([fake_resource_dict], "yaml")
         assert yaml_loads(content)["paths"]
 
+    @pytest.mark.parametrize("file_type", ["json", "yaml"])
+    def test_iter_swagger(self, fake_resource_dict, file_type):
+        resources = [
+            fake_resource_dict,
+            dict(fake_resource_dict, method="GET", name="list_users", description="line1\nline2"),
+            dict(fake_resource_dict, path="/users/{id}", name="get_user", labels=["testing", "yes"]),
+        ]
+        exporter = ResourceSwaggerExporter()
+
+        content = "".join(exporter.iter_swagger(resources, file_type))
+        assert content == exporter.to_swagger(resources, file_type)
+
+        content = "".join(exporter.iter_swagger([], file_type))
+        assert content == exporter.to_swagger([], file_type)
+
     def test_generate_paths(self, fake_resource_dict):
         exporter = ResourceSwaggerExporter()
         paths = exporter._generate_paths([fake_resource_dict])
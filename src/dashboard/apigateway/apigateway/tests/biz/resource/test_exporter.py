@@ -0,0 +1,119 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+
+import pytest
+from ddf import G
+
+from apigateway.apis.web.resource.serializers import ResourceExportOutputSLZ
+from apigateway.biz.resource import ResourceHandler
+from apigateway.biz.resource.exporter import ResourcesExporter
+from apigateway.core.models import Proxy, Resource
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def fake_resources(fake_resource):
+    proxy = Proxy.objects.get(resource=fake_resource)
+    resources = [fake_resource]
+    for path, method in [("/b/", "GET"), ("/a/", "POST"), ("/a/", "GET")]:
+        resource = G(Resource, gateway=fake_resource.gateway, path=path, method=method)
+        G(Proxy, type=proxy.type, resource=resource, backend=proxy.backend, _config=proxy._config, schema=proxy.schema)
+        ResourceHandler.save_auth_config(resource.id, ResourceHandler.get_default_auth_config())
+        resources.append(resource)
+    return resources
+
+
+class TestResourcesExporter:
+    def test_iter_resources(self, fake_gateway, fake_resources):
+        exporter = ResourcesExporter(
+            fake_gateway.id,
+            Resource.objects.filter(gateway=fake_gateway),
+            ResourceExportOutputSLZ,
+            batch_size=1,
+        )
+
+        resources = list(exporter.iter_resources())
+        assert len(resources) == 4
+        # 按 path 排序，相同 path 的资源相邻
+        assert [resource["path"] for resource in resources] == sorted(r.path for r in fake_resources)
+        assert resources[0]["backend"]["name"] == fake_resources[0].proxy_set.get().backend.name
+
+    def test_iter_swagger(self, fake_gateway, fake_resources):
+        exporter = ResourcesExporter(
+            fake_gateway.id,
+            Resource.objects.filter(gateway=fake_gateway),
+            ResourceExportOutputSLZ,
+            batch_size=2,
+        )
+
+        content = json.loads("".join(exporter.iter_swagger("json")))
+        assert set(content["paths"]) == {r.path for r in fake_resources}
+        assert set(content["paths"]["/a/"]) == {"get", "post"}
+
+    def test_iter_swagger__case_sensitive_paths(self, fake_gateway, fake_resources):
+        proxy = Proxy.objects.get(resource=fake_resources[0])
+        for path, method in [("/users/", "GET"), ("/Users/", "GET"), ("/users/", "POST")]:
+            resource = G(Resource, gateway=fake_gateway, path=path, method=method)
+            G(
+                Proxy,
+                type=proxy.type,
+                resource=resource,
+                backend=proxy.backend,
+                _config=proxy._config,
+                schema=proxy.schema,
+            )
+            ResourceHandler.save_auth_config(resource.id, ResourceHandler.get_default_auth_config())
+
+        exporter = ResourcesExporter(
+            fake_gateway.id,
+            Resource.objects.filter(gateway=fake_gateway),
+            ResourceExportOutputSLZ,
+            batch_size=1,
+        )
+
+        # 仅大小写不同的 path，分别导出，同一 path 不会重复出现
+        def no_duplicate_keys(pairs):
+            keys = [key for key, _ in pairs]
+            assert len(keys) == len(set(keys))
+            return dict(pairs)
+
+        content = json.loads("".join(exporter.iter_swagger("json")), object_pairs_hook=no_duplicate_keys)
+        assert set(content["paths"]["/users/"]) == {"get", "post"}
+        assert set(content["paths"]["/Users/"]) == {"get"}
+
+    @pytest.mark.parametrize(
+        "export_type, resource_filter_condition, expected",
+        [
+            ("all", {}, 4),
+            ("filtered", {"path": "/a/"}, 2),
+            ("selected", {}, 1),
+            ("unknown", {}, 0),
+        ],
+    )
+    def test_filter_selected_resources(
+        self, fake_gateway, fake_resources, export_type, resource_filter_condition, expected
+    ):
+        queryset = ResourcesExporter.filter_selected_resources(
+            fake_gateway.id,
+            export_type,
+            resource_filter_condition,
+            [fake_resources[0].id],
+        )
+        assert queryset.count() == expected
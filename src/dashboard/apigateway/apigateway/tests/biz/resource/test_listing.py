@@ -0,0 +1,84 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.apps.label.models import APILabel, ResourceLabel
+from apigateway.apps.support.models import ResourceDoc
+from apigateway.biz.resource.listing import ResourceLister
+from apigateway.core.models import Backend, Proxy, Resource
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def fake_resources(fake_gateway):
+    backend = G(Backend, gateway=fake_gateway, name="backend-1")
+    resources = []
+    for i in range(5):
+        resource = G(Resource, gateway=fake_gateway, name=f"r{i}", path=f"/r{i}/", method="GET")
+        G(Proxy, resource=resource, backend=backend)
+        resources.append(resource)
+    return resources
+
+
+class TestResourceLister:
+    def test_get_context(self, fake_gateway, fake_resources, django_assert_num_queries):
+        resource = fake_resources[0]
+        label = G(APILabel, gateway=fake_gateway, name="label-1")
+        G(ResourceLabel, resource=resource, api_label=label)
+        doc = G(ResourceDoc, gateway=fake_gateway, resource_id=resource.id, language="zh")
+
+        lister = ResourceLister(fake_gateway.id)
+        resource_ids = [r.id for r in fake_resources]
+        # 关联数据的查询次数固定，不随资源数量增长
+        with django_assert_num_queries(4):
+            context = lister.get_context(resource_ids)
+
+        assert context["labels"][resource.id] == [{"id": label.id, "name": "label-1"}]
+        assert context["docs"][resource.id] == [{"id": doc.id, "language": "zh"}]
+        assert context["backends"][resource.id]["name"] == "backend-1"
+        assert set(context["backends"]) == set(resource_ids)
+        assert "latest_version_created_time" in context
+
+    def test_get_backends(self, fake_gateway):
+        assert ResourceLister(fake_gateway.id).get_backends([]) == {}
+
+    @pytest.mark.parametrize("order_by", ["-id", "name", "-name", "path", "-updated_time"])
+    def test_filter_after(self, fake_gateway, fake_resources, order_by):
+        lister = ResourceLister(fake_gateway.id)
+        queryset = Resource.objects.filter(gateway=fake_gateway)
+        expected = [r.id for r in lister.filter_after(queryset, order_by, None)]
+        assert len(expected) == 5
+
+        # 逐页获取，与不分页时的顺序一致
+        ids = []
+        after_id = None
+        while True:
+            page = [r.id for r in lister.filter_after(queryset, order_by, after_id)[:2]]
+            if not page:
+                break
+            ids.extend(page)
+            after_id = page[-1]
+
+        assert ids == expected
+
+    def test_filter_after_deleted(self, fake_gateway, fake_resources):
+        lister = ResourceLister(fake_gateway.id)
+        queryset = Resource.objects.filter(gateway=fake_gateway)
+        assert list(lister.filter_after(queryset, "name", 0)) == []
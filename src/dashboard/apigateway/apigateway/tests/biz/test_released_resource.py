@@ -117,6 +117,94 @@ class TestReleasedResourceHandler:
         assert ReleasedResource.objects.filter(resource_version_id=rv1.id).exists()
         assert not ReleasedResource.objects.filter(resource_version_id=rv2.id).exists()
 
+    def test_materialize_released_resources(self, fake_gateway, fake_stage):
+        def make_resource_version(data):
+            resource_version = G(ResourceVersion, gateway=fake_gateway)
+            resource_version.data = data
+            resource_version.save()
+            return resource_version
+
+        rv1 = make_resource_version(
+            [
+                {"id": 1, "name": "r1", "method": "GET", "path": "/r1"},
+                {"id": 2, "name": "r2", "method": "GET", "path": "/r2"},
+            ]
+        )
+        release = G(Release, gateway=fake_gateway, stage=fake_stage, resource_version=rv1)
+        ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, rv1)
+        assert ReleasedResource.objects.filter(resource_version_id=rv1.id).count() == 2
+        unchanged_released_resource = ReleasedResource.objects.get(resource_version_id=rv1.id, resource_id=1)
+
+        rv2 = make_resource_version(
+            [
+                {"id": 1, "name": "r1", "method": "GET", "path": "/r1"},
+                {"id": 2, "name": "r2", "method": "POST", "path": "/r2"},
+                {"id": 3, "name": "r3", "method": "GET", "path": "/r3"},
+            ]
+        )
+        release.resource_version = rv2
+        release.save()
+        ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, rv2)
+
+        assert not ReleasedResource.objects.filter(resource_version_id=rv1.id).exists()
+        released_resources = {r.resource_id: r for r in ReleasedResource.objects.filter(resource_version_id=rv2.id)}
+        assert set(released_resources.keys()) == {1, 2, 3}
+        # 内容未变化的资源，复用原记录
+        assert released_resources[1].id == unchanged_released_resource.id
+        assert released_resources[2].resource_method == "POST"
+        assert released_resources[2].data == {"id": 2, "name": "r2", "method": "POST", "path": "/r2"}
+
+    def test_materialize_released_resources__create_failed(self, mocker, fake_gateway, fake_stage):
+        rv1 = G(ResourceVersion, gateway=fake_gateway)
+        rv1.data = [
+            {"id": 1, "name": "r1", "method": "GET", "path": "/r1"},
+            {"id": 2, "name": "r2", "method": "GET", "path": "/r2"},
+        ]
+        rv1.save()
+        release = G(Release, gateway=fake_gateway, stage=fake_stage, resource_version=rv1)
+        ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, rv1)
+
+        rv2 = G(ResourceVersion, gateway=fake_gateway)
+        rv2.data = [
+            {"id": 1, "name": "r1", "method": "GET", "path": "/r1"},
+            {"id": 2, "name": "r2", "method": "POST", "path": "/r2"},
+        ]
+        rv2.save()
+        release.resource_version = rv2
+        release.save()
+
+        # 新增资源失败时，已移动的资源一并回滚，版本中不会仅包含部分资源
+        mocker.patch.object(ReleasedResource.objects, "bulk_create", side_effect=Exception("error"))
+        with pytest.raises(Exception):
+            ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, rv2)
+        assert ReleasedResource.objects.filter(resource_version_id=rv1.id).count() == 2
+        assert not ReleasedResource.objects.filter(resource_version_id=rv2.id).exists()
+
+        # 重新保存时，补全版本中的全部资源
+        mocker.stopall()
+        ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, rv2)
+        assert set(
+            ReleasedResource.objects.filter(resource_version_id=rv2.id).values_list("resource_id", flat=True)
+        ) == {1, 2}
+
+    def test_materialize_released_resources__partial(self, fake_gateway, fake_stage):
+        resource_version = G(ResourceVersion, gateway=fake_gateway)
+        resource_version.data = [
+            {"id": 1, "name": "r1", "method": "GET", "path": "/r1"},
+            {"id": 2, "name": "r2", "method": "GET", "path": "/r2"},
+        ]
+        resource_version.save()
+        G(Release, gateway=fake_gateway, stage=fake_stage, resource_version=resource_version)
+        G(ReleasedResource, gateway=fake_gateway, resource_version_id=resource_version.id, resource_id=1, data={})
+
+        # 版本中已存在部分资源时，补全缺失的资源
+        ReleasedResourceHandler.materialize_released_resources(fake_gateway.id, resource_version)
+        assert sorted(
+            ReleasedResource.objects.filter(resource_version_id=resource_version.id).values_list(
+                "resource_id", flat=True
+            )
+        ) == [1, 2]
+
     def test_get_stage_release(self, fake_gateway):
         stage_prod = G(Stage, gateway=fake_gateway, name="prod", status=1)
         stage_test = G(Stage, gateway=fake_gateway, name="test", status=1)
@@ -115,6 +115,26 @@ class TestBaseGatewayReleaser:
         mock_release.assert_called()
         # mock_post_release.assert_called()
 
+    def test_release__refresh_search_index_failed(self, mocker, fake_gateway):
+        release_data = get_release_data(fake_gateway)
+        releaser = BaseGatewayReleaser.from_data(
+            fake_gateway,
+            release_data["stage_id"],
+            release_data["resource_version_id"],
+            release_data.get("comment", ""),
+            user_credentials=UserCredentials(
+                credentials="access_token",
+            ),
+        )
+        mocker.patch.object(releaser, "_validate", return_value=None)
+        mocker.patch.object(releaser, "_do_release")
+        mock_post_release = mocker.patch.object(releaser, "_post_release")
+        mocker.patch("apigateway.biz.releaser.ResourceSearchIndex.refresh", side_effect=ValueError)
+
+        # 搜索索引更新失败，不影响发布
+        assert releaser.release()
+        mock_post_release.assert_called_once()
+
     @pytest.mark.parametrize(
         "vars, mock_used_stage_vars, will_error",
         [
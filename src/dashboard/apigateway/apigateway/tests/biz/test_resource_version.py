@@ -23,9 +23,12 @@ import pytest
 from django_dynamic_fixture import G
 
 from apigateway.apps.support.models import ResourceDoc, ResourceDocVersion
+from apigateway.biz.proxy import ProxyHandler
 from apigateway.biz.resource import ResourceHandler
 from apigateway.biz.resource_version import ResourceDocVersionHandler, ResourceVersionHandler
-from apigateway.core.models import Gateway, Resource, ResourceVersion, Stage
+from apigateway.core.constants import ContextScopeTypeEnum
+from apigateway.core.models import Context, Gateway, Proxy, Resource, ResourceVersion, Stage
+from apigateway.core.utils import get_resource_data_hashes
 from apigateway.utils.time import now_datetime
 
 
@@ -57,12 +60,72 @@ class TestResourceVersionHandler:
             separators=(",", ":"),
         )
 
+    def test_make_version__incremental(self, mocker, fake_gateway, fake_resource):
+        base_resource_version = ResourceVersionHandler.create_resource_version(
+            fake_gateway, {"version": "1.0.0"}, "admin"
+        )
+        spy = mocker.spy(ProxyHandler, "get_resource_id_to_snapshot")
+
+        # 资源未变更，复用基准版本中的快照
+        data = ResourceVersionHandler.make_version(fake_gateway, base_resource_version)
+        spy.assert_called_once_with([])
+        assert data == ResourceVersionHandler.make_version(fake_gateway)
+
+        # 代理配置变更，重新生成快照
+        proxy = Proxy.objects.get(resource=fake_resource)
+        proxy.config = dict(proxy.config, timeout=10)
+        proxy.save()
+
+        spy.reset_mock()
+        data = ResourceVersionHandler.make_version(fake_gateway, base_resource_version)
+        spy.assert_called_once_with([fake_resource.id])
+        assert json.loads(data[0]["proxy"]["config"])["timeout"] == 10
+
+    def test_make_version__incremental_committed_after_base(self, fake_gateway, fake_resource):
+        base_resource_version = ResourceVersionHandler.create_resource_version(
+            fake_gateway, {"version": "1.0.0"}, "admin"
+        )
+
+        # 模拟长事务：变更的更新时间早于基准版本的创建时间，但在基准版本生成后才提交
+        context = Context.objects.get(scope_type=ContextScopeTypeEnum.RESOURCE.value, scope_id=fake_resource.id)
+        config = dict(context.config, resource_perm_required=False)
+        Context.objects.filter(id=context.id).update(
+            _config=json.dumps(config),
+            updated_time=base_resource_version.created_time - datetime.timedelta(minutes=1),
+        )
+
+        data = ResourceVersionHandler.make_version(fake_gateway, base_resource_version)
+        assert json.loads(data[0]["contexts"]["resource_auth"]["config"]) == config
+
     def test_create_resource_version(self, fake_resource):
         gateway = fake_resource.gateway
 
         ResourceVersionHandler.create_resource_version(gateway, {"comment": "test", "version": "1.1.0"}, "admin")
         assert ResourceVersion.objects.filter(gateway=gateway).count() == 1
 
+        resource_version = ResourceVersion.objects.get(gateway=gateway)
+        assert resource_version.resource_hashes == get_resource_data_hashes(resource_version.data)
+        assert list(resource_version.resource_hashes.keys()) == [str(fake_resource.id)]
+
+    def test_diff_resource_versions(self, mocker, fake_resource):
+        gateway = fake_resource.gateway
+        resource_version = ResourceVersionHandler.create_resource_version(gateway, {"version": "1.0.0"}, "admin")
+
+        # 与当前资源数据对比，资源无变化
+        result = ResourceVersionHandler.diff_resource_versions(gateway, resource_version.id, None)
+        assert result == {"add": [], "delete": [], "update": []}
+
+        # 与空版本对比
+        result = ResourceVersionHandler.diff_resource_versions(gateway, None, resource_version.id)
+        assert [resource["id"] for resource in result["add"]] == [fake_resource.id]
+
+        # 已创建版本间的对比结果被缓存
+        mock_diff = mocker.patch(
+            "apigateway.biz.resource_version.ResourceDifferHandler.diff_resource_version_data",
+        )
+        assert ResourceVersionHandler.diff_resource_versions(gateway, None, resource_version.id) == result
+        mock_diff.assert_not_called()
+
     @pytest.mark.parametrize(
         "gateway_id, stage_name, mocked_released_resource_version_ids, mocked_resources, expected",
         [
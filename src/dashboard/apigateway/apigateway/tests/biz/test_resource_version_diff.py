@@ -31,6 +31,7 @@ from apigateway.biz.resource_version_diff import (
     ResourceMockProxy,
     ResourcePluginConfig,
 )
+from apigateway.core.utils import get_resource_data_hashes
 
 
 class Group(BaseModel, DiffMixin):
@@ -433,3 +434,39 @@ class TestResourceDifferHandler:
                 }
             ],
         }
+
+    @patch("apigateway.biz.resource_version_diff.ResourceDifferHandler.parse_obj")
+    def test_diff_resource_version_data__skip_unchanged(self, mock_parse_obj):
+        class ResourceDifferMock(BaseModel, DiffMixin):
+            id: int
+            name: str
+            method: str
+            path: str
+
+        mock_parse_obj.side_effect = lambda x: ResourceDifferMock.parse_obj(x)
+
+        source_data = [
+            {"id": 1, "name": "n1", "method": "GET", "path": "/p1"},
+            {"id": 2, "name": "n2", "method": "GET", "path": "/p2"},
+            {"id": 3, "name": "n3", "method": "GET", "path": "/p3"},
+        ]
+        target_data = [
+            {"id": 1, "name": "n1", "method": "GET", "path": "/p1"},
+            {"id": 2, "name": "n2", "method": "GET", "path": "/p2"},
+            {"id": 3, "name": "nn", "method": "GET", "path": "/p3"},
+        ]
+
+        result = ResourceDifferHandler.diff_resource_version_data(
+            source_data,
+            target_data,
+            {},
+            {2: {"zh": "1970-01-01 12:30:50 +8000"}},
+            source_resource_hashes=get_resource_data_hashes(source_data),
+            target_resource_hashes=get_resource_data_hashes(target_data),
+        )
+
+        # 资源 1 内容、文档均未变化，不解析资源数据
+        assert mock_parse_obj.call_count == 4
+        assert result["add"] == []
+        assert result["delete"] == []
+        assert [item["target"]["id"] for item in result["update"]] == [3]
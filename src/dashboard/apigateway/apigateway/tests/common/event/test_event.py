@@ -16,6 +16,8 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import pytest
+
 from apigateway.common.event.event import PublishEventReporter
 from apigateway.core.constants import PublishEventNameTypeEnum, PublishEventStatusTypeEnum
 from apigateway.core.models import PublishEvent
@@ -69,3 +71,78 @@ class TestPublishEventReporter:
         assert result.name == PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION.value
         assert result.status == PublishEventStatusTypeEnum.FAILURE.value
         assert result.detail == {"err_msg": msg}
+
+    def test_report_distribute_configuration_event_with_profile(self, fake_release_history):
+        profile = {"steps": [{"step": "convert to kubernetes resources", "duration": 0.1, "query_count": 3}]}
+
+        PublishEventReporter.report_distribute_configuration_success_event(fake_release_history, profile=profile)
+        result = PublishEvent.objects.filter(publish_id=fake_release_history.id).last()
+        assert result.detail == {"profile": profile}
+
+        PublishEventReporter.report_distribute_configuration_failure_event(
+            fake_release_history, "error", profile=profile
+        )
+        result = PublishEvent.objects.filter(publish_id=fake_release_history.id).last()
+        assert result.detail == {"err_msg": "error", "profile": profile}
+
+    def test_buffered(self, mocker, fake_release_history):
+        bulk_create = mocker.spy(PublishEvent.objects, "bulk_create")
+
+        with PublishEventReporter.buffered() as event_buffer:
+            PublishEventReporter.report_config_validate_success_event(fake_release_history)
+
+            PublishEventReporter.report_create_publish_task_doing_event(fake_release_history)
+            assert len(event_buffer) == 2
+            assert not PublishEvent.objects.filter(publish_id=fake_release_history.id).exists()
+
+        bulk_create.assert_called_once()
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 2
+
+        # 退出上下文后，恢复为直接写入
+        PublishEventReporter.report_create_publish_task_success_event(fake_release_history)
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 3
+
+    def test_buffered__nested(self, fake_release_history):
+        with PublishEventReporter.buffered() as event_buffer:
+            PublishEventReporter.report_config_validate_success_event(fake_release_history)
+
+            # 嵌套时复用外层缓冲区，内层退出时即写入
+            with PublishEventReporter.buffered() as inner_buffer:
+                assert inner_buffer is event_buffer
+                PublishEventReporter.report_create_publish_task_doing_event(fake_release_history)
+                assert not PublishEvent.objects.filter(publish_id=fake_release_history.id).exists()
+
+            assert len(event_buffer) == 0
+            assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 2
+
+            PublishEventReporter.report_create_publish_task_success_event(fake_release_history)
+            assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 2
+
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 3
+
+    def test_buffered__nested_error(self, fake_release_history):
+        with pytest.raises(ValueError), PublishEventReporter.buffered():
+            PublishEventReporter.report_config_validate_success_event(fake_release_history)
+
+            with PublishEventReporter.buffered():
+                PublishEventReporter.report_create_publish_task_doing_event(fake_release_history)
+                raise ValueError("error")
+
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 2
+
+    def test_buffered__flush(self, fake_release_history):
+        with PublishEventReporter.buffered() as event_buffer:
+            PublishEventReporter.report_config_validate_success_event(fake_release_history)
+            assert event_buffer.flush() == 1
+            assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 1
+
+            PublishEventReporter.report_create_publish_task_doing_event(fake_release_history)
+
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 2
+
+    def test_buffered__error(self, fake_release_history):
+        with pytest.raises(ValueError), PublishEventReporter.buffered():
+            PublishEventReporter.report_config_validate_success_event(fake_release_history)
+            raise ValueError("error")
+
+        assert PublishEvent.objects.filter(publish_id=fake_release_history.id).count() == 1
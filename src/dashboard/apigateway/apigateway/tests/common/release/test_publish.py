@@ -25,13 +25,21 @@ from apigateway.common.release.publish import (
     _trigger_revoke_publish_for_disable,
     _trigger_rolling_publish,
 )
-from apigateway.core.constants import GatewayStatusEnum, PublishSourceEnum, StageStatusEnum
+from apigateway.core.constants import (
+    GatewayStatusEnum,
+    PublishEventNameTypeEnum,
+    PublishEventStatusTypeEnum,
+    PublishSourceEnum,
+    StageStatusEnum,
+)
+from apigateway.core.models import PublishEvent
 
 
 class TestTriggerGatewayPublish:
     @pytest.fixture(autouse=True)
     def setup(self, mocker):
         self.distributor = mocker.MagicMock()
+        self.distributor.profile = None
         mocker.patch("apigateway.controller.tasks.syncing.CombineDistributor", return_value=self.distributor)
 
     def test__is_gateway_ok_for_releasing_with_none_release(self):
@@ -79,6 +87,27 @@ class TestTriggerGatewayPublish:
         _trigger_rolling_publish(source, "test", release_list, True)
         self.distributor.distribute.assert_called()
 
+    def test__trigger_rolling_publish__sync_events_written_before_distribute(self, fake_shared_gateway, fake_release):
+        fake_shared_gateway.id = settings.DEFAULT_MICRO_GATEWAY_ID
+        fake_shared_gateway.save()
+
+        def distribute(release, **kwargs):
+            # 下发耗时较长，下发前上报的事件需已写入
+            events = PublishEvent.objects.filter(gateway=release.gateway).values_list("name", "status")
+            assert (
+                PublishEventNameTypeEnum.GENERATE_TASK.value,
+                PublishEventStatusTypeEnum.SUCCESS.value,
+            ) in events
+            assert (
+                PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION.value,
+                PublishEventStatusTypeEnum.DOING.value,
+            ) in events
+            return True, ""
+
+        self.distributor.distribute.side_effect = distribute
+        _trigger_rolling_publish(PublishSourceEnum.BACKEND_UPDATE, "test", [fake_release], True)
+        self.distributor.distribute.assert_called()
+
     def test__trigger_revoke_publish_for_disable_with_valid_release(self, fake_shared_gateway, fake_release):
         fake_shared_gateway.id = settings.DEFAULT_MICRO_GATEWAY_ID
         fake_shared_gateway.save()
@@ -19,10 +19,13 @@
 from unittest import mock
 
 import pytest
+from ddf import G
 from django.http import Http404
 from rest_framework import viewsets
 
 from apigateway.common.permissions import GatewayRelatedAppPermission
+from apigateway.core.gateway_cache import CachedGateway
+from apigateway.core.models import GatewayRelatedApp
 from apigateway.utils.responses import OKJsonResponse
 
 pytestmark = pytest.mark.django_db
@@ -58,11 +61,11 @@ class TestGatewayRelatedAppPermission:
     ):
         permission = GatewayRelatedAppPermission()
 
-        mocker.patch.object(permission, "get_gateway_object", return_value=fake_gateway if mock_gateway else None)
-        mocker.patch(
-            "apigateway.common.permissions.permissions.GatewayRelatedApp.objects.filter",
-            return_value=mocker.MagicMock(exists=mocker.MagicMock(return_value=mock_allow_manage)),
+        mocker.patch.object(
+            permission, "get_cached_gateway", return_value=CachedGateway(fake_gateway) if mock_gateway else None
         )
+        if mock_allow_manage:
+            G(GatewayRelatedApp, gateway=fake_gateway, bk_app_code="test")
         fake_request.app = mock.MagicMock(app_code="test")
 
         view = self.APINameViewSet.as_view({"get": "retrieve"})
@@ -45,6 +45,7 @@ from apigateway.core.constants import (
     PublishEventStatusTypeEnum,
     ResourceVersionSchemaEnum,
 )
+from apigateway.core.gateway_cache import gateway_cache
 from apigateway.core.models import (
     Backend,
     BackendConfig,
@@ -596,6 +597,12 @@ def mock_rest_framework_settings(settings):
     settings.REST_FRAMEWORK.update({"DATETIME_FORMAT": "%Y-%m-%d %H:%M:%S"})
 
 
+@pytest.fixture(autouse=True)
+def clear_gateway_cache():
+    # 测试数据库回滚后，网关 ID 可能被复用，需清理进程内的网关缓存
+    gateway_cache.clear()
+
+
 @shared_task(name="testing.mock")
 def celery_mock_task_for_testing(celery_task_mocker=None, *args, **kwargs):
     if celery_task_mocker:
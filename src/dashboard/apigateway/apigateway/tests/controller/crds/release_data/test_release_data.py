@@ -21,6 +21,8 @@ from ddf import G
 
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
+from apigateway.controller.crds.release_data.release_data import ReleaseDataV2
+from apigateway.core.models import Release
 
 
 class TestReleaseData:
@@ -86,3 +88,32 @@ class TestReleaseData:
         plugins = self.release_data.get_resource_plugins(edge_resource_overwrite_stage.pk)
         assert len(plugins) == 1
         assert plugins[0].config == {"rates": {"__default": [{"period": 60, "tokens": 100}]}}
+
+
+class TestReleaseDataV2:
+    def test_get_resource_plugins(self, mocker, fake_gateway, fake_stage, fake_resource_version_v2):
+        data = fake_resource_version_v2.data
+        data[0]["plugins"] = [
+            {"id": 1, "type": "bk-rate-limit", "name": "rate-limit", "config": {"rates": {}}},
+            {"id": 2, "type": "bk-cors", "name": "cors", "config": {"allow_origins": "*"}},
+        ]
+        fake_resource_version_v2.data = data
+        fake_resource_version_v2.save()
+        resource_id = data[0]["id"]
+
+        convert = mocker.patch(
+            "apigateway.common.plugin.plugin_convertors.DefaultPluginConvertor.convert",
+            side_effect=lambda config: config,
+        )
+
+        release_data = ReleaseDataV2(
+            G(Release, gateway=fake_gateway, stage=fake_stage, resource_version=fake_resource_version_v2)
+        )
+        plugins = release_data.get_resource_plugins(resource_id)
+        assert [p.type_code for p in plugins] == ["bk-rate-limit", "bk-cors"]
+        assert release_data.get_resource_plugins(0) == []
+
+        # 同一版本发布到其它环境时，复用已转换的插件配置
+        release_data = ReleaseDataV2(G(Release, gateway=fake_gateway, resource_version=fake_resource_version_v2))
+        assert release_data.get_resource_plugins(resource_id) == plugins
+        assert convert.call_count == 1
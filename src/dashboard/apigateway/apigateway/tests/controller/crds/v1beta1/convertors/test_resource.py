@@ -20,7 +20,10 @@ from ddf import G
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
 from apigateway.controller.crds.constants import ResourceRewriteHeadersStrategyEnum
+from apigateway.controller.crds.release_data.release_data import ReleaseDataV2
+from apigateway.controller.crds.v1beta1.convertors.resource import HttpResourceConvertor
 from apigateway.controller.crds.v1beta1.models.gateway_resource import BkGatewayResource
+from apigateway.core.models import BackendConfig, Release, Stage
 
 
 class TestHttpResourceConvertor:
@@ -174,3 +177,37 @@ class TestHttpResourceConvertor:
         assert spec.rewrite.headers["X-Del-By-Stage"] == ""
         assert spec.rewrite.headers["X-Set-By-Resource"] == edge_resource_overwrite_stage.name
         assert spec.rewrite.headers["X-Del-By-Resource"] == ""
+
+    def test_convert__share_parts_between_stages(
+        self, mocker, faker, fake_gateway, fake_stage, fake_backend, fake_resource_version_v2, micro_gateway
+    ):
+        other_stage = G(Stage, gateway=fake_gateway, status=1, name=faker.pystr())
+        G(
+            BackendConfig,
+            gateway=fake_gateway,
+            stage=other_stage,
+            backend=fake_backend,
+            config={
+                "type": "node",
+                "timeout": 30,
+                "loadbalance": "roundrobin",
+                "hosts": [{"scheme": "https", "host": "other.example.com", "weight": 100}],
+            },
+        )
+        mocker.patch.object(HttpResourceConvertor, "_default_stage_service_key", "default-service")
+        convert_plugins = mocker.spy(HttpResourceConvertor, "_convert_http_resource_plugins")
+
+        converted = {}
+        for stage in [fake_stage, other_stage]:
+            release = G(Release, gateway=fake_gateway, stage=stage, resource_version=fake_resource_version_v2)
+            convertor = HttpResourceConvertor(ReleaseDataV2(release), micro_gateway, [])
+            converted[stage.name] = convertor.convert()
+
+        # 插件等与环境无关的部分只转换一次，上游按环境分别生成
+        assert convert_plugins.call_count == 1
+        resource = converted[fake_stage.name][0]
+        other_resource = converted[other_stage.name][0]
+        assert resource.spec.plugins == other_resource.spec.plugins
+        assert resource.spec.upstream.nodes[0].host == "www.example.com"
+        assert other_resource.spec.upstream.nodes[0].host == "other.example.com"
+        assert other_resource.metadata.get_label("stage") == other_stage.name
@@ -59,6 +59,9 @@ class TestEtcdDistributor:
         for m in distributed_models:
             assert len(list(self.registry.iter_by_type(m))) > 0
 
+        steps = {step["step"]: step for step in distributor.profile["steps"]}
+        assert steps["sync resources to etcd"]["context"]["applied_count"] == self.registry.stats.applied_count
+
     @pytest.mark.parametrize(
         "include_gateway_global_config, ignored_models, revoked_models",
         [
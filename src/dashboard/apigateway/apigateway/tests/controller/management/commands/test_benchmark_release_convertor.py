@@ -0,0 +1,45 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apigateway.core.models import Gateway, Release
+
+
+class TestBenchmarkReleaseConvertor:
+    def test_handle(self, micro_gateway, fake_plugin_type_bk_header_rewrite):
+        gateway_count = Gateway.objects.count()
+
+        out = StringIO()
+        call_command("benchmark_release_convertor", resources=5, plugins=2, rounds=2, stdout=out)
+
+        output = out.getvalue()
+        assert "round 1:" in output
+        assert "round 2:" in output
+        assert "convert to kubernetes resources" in output
+        assert "throughput=" in output
+
+        # 模拟数据已回滚
+        assert Gateway.objects.count() == gateway_count
+        assert not Release.objects.filter(comment="benchmark").exists()
+
+    def test_handle__invalid_arguments(self, micro_gateway):
+        with pytest.raises(CommandError):
+            call_command("benchmark_release_convertor", resources=0, stdout=StringIO())
@@ -42,6 +42,8 @@ class TestEtcdRegistry:
         self.etcd_client.put.assert_called_once_with(
             f"/testing/{fake_custom_resource.kind}/{fake_custom_resource.metadata.name}", cr_yaml
         )
+        assert self.registry.stats.applied_count == 1
+        assert self.registry.stats.payload_size == len(cr_yaml.encode("utf-8"))
 
     def test_sync_resources_by_key_prefix(self, resource_type, mocker):
         resource_a = resource_type(metadata={"name": "a"}, value="to_be_removed")
@@ -65,6 +67,8 @@ class TestEtcdRegistry:
         ]
         self.etcd_client.put.assert_has_calls(calls)
         self.etcd_client.delete.assert_called_once_with(f"/testing/{resource_type.kind}/a")
+        assert self.registry.stats.applied_count == 2
+        assert self.registry.stats.deleted_count == 1
 
     def test_get_exist_keys_by_key_prefix(self, mocker, faker):
         key = faker.pystr()
@@ -37,6 +37,7 @@ class TestReleaseGaterwayByHelm:
     @pytest.fixture(autouse=True)
     def setup(self, mocker):
         self.distributor = mocker.MagicMock()
+        self.distributor.profile = None
         self.distributor_factory = mocker.patch("apigateway.controller.tasks.release.HelmDistributor")
         self.distributor_factory.return_value = self.distributor
 
@@ -93,6 +94,7 @@ class TestReleaseGatewayByRegistry:
     @pytest.fixture(autouse=True)
     def setup(self, mocker):
         self.distributor = mocker.MagicMock()
+        self.distributor.profile = None
         self.distributor_factory = mocker.patch(
             "apigateway.controller.tasks.release.EtcdDistributor", return_value=self.distributor
         )
@@ -29,6 +29,7 @@ class TestRollingUpdateRelease:
     @pytest.fixture(autouse=True)
     def setup(self, mocker):
         self.distributor = mocker.MagicMock()
+        self.distributor.profile = None
         mocker.patch("apigateway.controller.tasks.syncing.CombineDistributor", return_value=self.distributor)
 
     def test_for_edge_gateway(self, edge_gateway, edge_release, micro_gateway):
@@ -68,6 +69,7 @@ class TestRollingUpdateRelease:
 class TestRevokeRelease:
     def test_revoke(self, mocker, fake_release, fake_release_history, micro_gateway):
         self.distributor = mocker.MagicMock()
+        self.distributor.profile = None
         self.distributor.revoke.return_value = True, ""
         mocker.patch("apigateway.controller.tasks.syncing.CombineDistributor", return_value=self.distributor)
         mocker.patch(
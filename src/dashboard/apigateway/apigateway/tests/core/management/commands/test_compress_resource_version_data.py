@@ -0,0 +1,41 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+
+from ddf import G
+
+from apigateway.core.management.commands.compress_resource_version_data import Command
+from apigateway.core.models import ResourceVersion
+
+
+class TestCommand:
+    def test_handle(self, fake_gateway):
+        data = [{"id": 1, "name": "foo", "method": "GET", "path": "/foo"}]
+        resource_version = G(ResourceVersion, gateway=fake_gateway, _data=json.dumps(data))
+
+        command = Command()
+
+        command.handle(fake_gateway.id, _all=False, batch_size=10, dry_run=True)
+        resource_version.refresh_from_db()
+        assert not resource_version.is_compressed
+
+        command.handle(fake_gateway.id, _all=False, batch_size=10, dry_run=False)
+        resource_version.refresh_from_db()
+        assert resource_version.is_compressed
+        assert resource_version.data == data
+        assert list(resource_version.resource_hashes.keys()) == ["1"]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.core.management.commands.sync_gateway_members import Command
+from apigateway.core.models import Gateway, GatewayMember
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCommand:
+    def test_handle(self):
+        gateway_1 = G(Gateway, _maintainers="admin", _developers="dev")
+        gateway_2 = G(Gateway, _maintainers="admin")
+        GatewayMember.objects.all().delete()
+
+        Command().handle(gateway_name=gateway_1.name, batch_size=10)
+        assert GatewayMember.objects.filter(gateway=gateway_1).count() == 2
+        assert not GatewayMember.objects.filter(gateway=gateway_2).exists()
+
+        Command().handle(gateway_name=None, batch_size=1)
+        assert GatewayMember.objects.filter(gateway=gateway_2).count() == 1
+        assert GatewayMember.objects.filter(gateway=gateway_1).count() == 2
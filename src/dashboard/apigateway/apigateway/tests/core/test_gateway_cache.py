@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.core.gateway_cache import GatewayCache, gateway_cache
+from apigateway.core.models import Backend, Gateway, GatewayRelatedApp, Stage
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCachedGateway:
+    def test_gateway(self, fake_gateway):
+        cached_gateway = gateway_cache.get_by_id(fake_gateway.id)
+
+        gateway = cached_gateway.gateway
+        gateway.name = "changed"
+        assert cached_gateway.gateway.name == fake_gateway.name
+
+    def test_related_data(self, fake_gateway):
+        stage = G(Stage, gateway=fake_gateway)
+        backend = G(Backend, gateway=fake_gateway)
+        G(GatewayRelatedApp, gateway=fake_gateway, bk_app_code="test")
+
+        cached_gateway = gateway_cache.get_by_id(fake_gateway.id)
+        assert cached_gateway.related_app_codes == {"test"}
+        assert cached_gateway.stage_id_to_name == {stage.id: stage.name}
+        assert cached_gateway.backends == {backend.id: backend}
+
+
+class TestGatewayCache:
+    def test_get_by_id(self, fake_gateway, django_assert_num_queries):
+        assert gateway_cache.get_by_id(0) is None
+
+        assert gateway_cache.get_by_id(fake_gateway.id).gateway == fake_gateway
+        with django_assert_num_queries(0):
+            assert gateway_cache.get_by_id(fake_gateway.id).gateway == fake_gateway
+
+    def test_get_by_name(self, fake_gateway, django_assert_num_queries):
+        assert gateway_cache.get_by_name("not-exist") is None
+
+        assert gateway_cache.get_by_name(fake_gateway.name).gateway == fake_gateway
+        with django_assert_num_queries(0):
+            assert gateway_cache.get_by_name(fake_gateway.name).id == fake_gateway.id
+            assert gateway_cache.get_by_id(fake_gateway.id).name == fake_gateway.name
+
+    def test_disabled(self, fake_gateway, django_assert_num_queries):
+        cache = GatewayCache(maxsize=10, ttl=0)
+        assert cache.get_by_id(fake_gateway.id).gateway == fake_gateway
+        with django_assert_num_queries(1):
+            cache.get_by_id(fake_gateway.id)
+
+    def test_invalidate_on_save(self, fake_gateway):
+        assert gateway_cache.get_by_id(fake_gateway.id).gateway.description == fake_gateway.description
+
+        fake_gateway.description = "changed"
+        fake_gateway.save()
+        assert gateway_cache.get_by_id(fake_gateway.id).gateway.description == "changed"
+
+        stage = G(Stage, gateway=fake_gateway)
+        assert gateway_cache.get_stage_name(fake_gateway.id, stage.id) == stage.name
+        stage.delete()
+        assert gateway_cache.get_stage_name(fake_gateway.id, stage.id) is None
+
+        backend = G(Backend, gateway=fake_gateway)
+        assert gateway_cache.get_backends(fake_gateway.id) == {backend.id: backend}
+
+        G(GatewayRelatedApp, gateway=fake_gateway, bk_app_code="test")
+        assert gateway_cache.get_by_id(fake_gateway.id).related_app_codes == {"test"}
+
+    def test_invalidate_across_processes(self, fake_gateway):
+        # 模拟两个进程中的缓存
+        cache_1 = GatewayCache(maxsize=10, ttl=10)
+        cache_2 = GatewayCache(maxsize=10, ttl=10)
+        assert cache_1.get_by_id(fake_gateway.id).gateway._maintainers == fake_gateway._maintainers
+        assert cache_2.get_by_name(fake_gateway.name).gateway._maintainers == fake_gateway._maintainers
+
+        Gateway.objects.filter(id=fake_gateway.id).update(_maintainers="changed")
+        cache_1.invalidate(fake_gateway.id)
+
+        assert cache_2.get_by_id(fake_gateway.id).gateway._maintainers == "changed"
+        assert cache_2.get_by_name(fake_gateway.name).gateway._maintainers == "changed"
+
+    def test_redis_unavailable(self, mocker, fake_gateway, django_assert_num_queries):
+        mocker.patch("apigateway.core.gateway_cache.get_default_redis_client", return_value=None)
+
+        cache = GatewayCache(maxsize=10, ttl=10)
+        assert cache.get_by_id(fake_gateway.id).gateway == fake_gateway
+        with django_assert_num_queries(1):
+            cache.get_by_id(fake_gateway.id)
+
+    def test_get_backends(self, fake_gateway):
+        assert gateway_cache.get_backends(0) == {}
+
+        gateway = G(Gateway)
+        backend = G(Backend, gateway=gateway)
+        backends = gateway_cache.get_backends(gateway.id)
+        assert backends == {backend.id: backend}
+
+        backends.clear()
+        assert gateway_cache.get_backends(gateway.id) == {backend.id: backend}
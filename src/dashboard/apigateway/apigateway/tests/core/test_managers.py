@@ -27,11 +27,13 @@ from apigateway.biz.stage import StageHandler
 from apigateway.common.exceptions import InstanceDeleteError
 from apigateway.core import constants
 from apigateway.core.constants import (
+    GatewayMemberRoleEnum,
     SSLCertificateBindingScopeTypeEnum,
     StageStatusEnum,
 )
 from apigateway.core.models import (
     Gateway,
+    GatewayMember,
     MicroGateway,
     Release,
     ReleasedResource,
@@ -48,6 +50,51 @@ from apigateway.tests.utils.testing import dummy_time
 pytestmark = pytest.mark.django_db
 
 
+class TestGatewayMemberManager:
+    def _get_members(self, gateway):
+        return set(GatewayMember.objects.filter(gateway=gateway).values_list("username", "role"))
+
+    def test_sync_members(self):
+        gateway = G(Gateway, _maintainers="admin;admin2", _developers="dev")
+        assert self._get_members(gateway) == {
+            ("admin", GatewayMemberRoleEnum.MAINTAINER.value),
+            ("admin2", GatewayMemberRoleEnum.MAINTAINER.value),
+            ("dev", GatewayMemberRoleEnum.DEVELOPER.value),
+        }
+        admin_member_id = GatewayMember.objects.get(gateway=gateway, username="admin").id
+
+        gateway.maintainers = ["admin", "admin3"]
+        gateway.developers = []
+        gateway.save()
+        assert self._get_members(gateway) == {
+            ("admin", GatewayMemberRoleEnum.MAINTAINER.value),
+            ("admin3", GatewayMemberRoleEnum.MAINTAINER.value),
+        }
+        # 未变化的成员不会被重建
+        assert GatewayMember.objects.get(gateway=gateway, username="admin").id == admin_member_id
+
+    def test_sync_members_skip_unrelated_update_fields(self):
+        gateway = G(Gateway, _maintainers="admin")
+
+        gateway._maintainers = "admin2"
+        gateway.save(update_fields=["status"])
+        assert self._get_members(gateway) == {("admin", GatewayMemberRoleEnum.MAINTAINER.value)}
+
+        gateway.save(update_fields=["_maintainers"])
+        assert self._get_members(gateway) == {("admin2", GatewayMemberRoleEnum.MAINTAINER.value)}
+
+    def test_filter_gateway_ids(self):
+        gateway_1 = G(Gateway, _maintainers="admin", _developers="dev")
+        gateway_2 = G(Gateway, _maintainers="admin2;dev")
+
+        assert set(GatewayMember.objects.filter_gateway_ids("admin")) == {gateway_1.id}
+        assert set(GatewayMember.objects.filter_gateway_ids("dev")) == {gateway_2.id}
+        assert set(GatewayMember.objects.filter_gateway_ids("dev", role=GatewayMemberRoleEnum.DEVELOPER.value)) == {
+            gateway_1.id
+        }
+        assert not GatewayMember.objects.filter_gateway_ids("admin1").exists()
+
+
 class TestStageManager:
     @pytest.fixture(autouse=True)
     def setup_fixtures(self):
@@ -16,6 +16,8 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import json
+
 import pytest
 from django_dynamic_fixture import G
 
@@ -46,3 +48,48 @@ class TestResource:
         snapshot = ResourceHandler.snapshot(fake_resource, as_dict=True)
         assert snapshot
         assert isinstance(snapshot, dict)
+
+
+class TestResourceVersion:
+    @pytest.fixture
+    def resource_version_data(self):
+        return [
+            {"id": 1, "name": "foo", "method": "GET", "path": "/foo", "proxy": {"type": "mock"}},
+            {"id": 2, "name": "bar", "method": "POST", "path": "/bar", "proxy": {"type": "http"}},
+        ]
+
+    def test_data__compressed(self, settings, fake_gateway, resource_version_data):
+        settings.RESOURCE_VERSION_COMPRESSED_STORAGE_ENABLED = True
+
+        resource_version = G(models.ResourceVersion, gateway=fake_gateway)
+        resource_version.data = resource_version_data
+        resource_version.save()
+        resource_version = models.ResourceVersion.objects.get(id=resource_version.id)
+
+        assert resource_version.is_compressed
+        assert resource_version.data == resource_version_data
+        # core-api 依赖 data 字段中资源的 id、name
+        assert [(r["id"], r["name"]) for r in json.loads(resource_version._data)] == [(1, "foo"), (2, "bar")]
+        assert resource_version.data_index == [
+            {"id": 1, "name": "foo", "method": "GET", "path": "/foo"},
+            {"id": 2, "name": "bar", "method": "POST", "path": "/bar"},
+        ]
+        assert resource_version.get_resource_data(2) == resource_version_data[1]
+        assert resource_version.get_resource_data(3) is None
+        assert set(resource_version.resource_hashes.keys()) == {"1", "2"}
+
+    def test_data__not_compressed(self, settings, fake_gateway, resource_version_data):
+        settings.RESOURCE_VERSION_COMPRESSED_STORAGE_ENABLED = False
+
+        resource_version = G(models.ResourceVersion, gateway=fake_gateway)
+        resource_version.data = resource_version_data
+        resource_version.save()
+        assert not resource_version.is_compressed
+        assert json.loads(resource_version._data) == resource_version_data
+
+        # 历史版本，仅有 JSON 格式的版本数据
+        resource_version = G(models.ResourceVersion, gateway=fake_gateway, _data=json.dumps(resource_version_data))
+        resource_version = models.ResourceVersion.objects.get(id=resource_version.id)
+        assert resource_version.data == resource_version_data
+        assert resource_version.data_index[1] == {"id": 2, "name": "bar", "method": "POST", "path": "/bar"}
+        assert resource_version.get_resource_data(1) == resource_version_data[0]
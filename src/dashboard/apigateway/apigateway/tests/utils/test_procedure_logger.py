@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+
+from apigateway.core.models import Gateway
+from apigateway.utils.procedure_logger import ProcedureLogger
+
+
+class TestProcedureLogger:
+    def test_step(self, fake_gateway):
+        procedure_logger = ProcedureLogger("testing")
+
+        with procedure_logger.step("query", count=1) as step_stat:
+            list(Gateway.objects.filter(id=fake_gateway.id))
+            list(Gateway.objects.filter(name=fake_gateway.name))
+            step_stat.context["payload_size"] = 10
+
+        with procedure_logger.step("ignore error", raise_exception=False):
+            raise ValueError("error")
+
+        with pytest.raises(ValueError), procedure_logger.step("raise error"):
+            raise ValueError("error")
+
+        query_stat, ignore_error_stat, raise_error_stat = procedure_logger.step_stats
+        assert query_stat.step == "query"
+        assert query_stat.success
+        assert query_stat.query_count == 2
+        assert query_stat.context == {"count": 1, "payload_size": 10}
+        assert query_stat.duration > 0
+        assert not ignore_error_stat.success
+        assert not raise_error_stat.success
+
+        profile = procedure_logger.get_profile()
+        assert [step["step"] for step in profile["steps"]] == ["query", "ignore error", "raise error"]
+        assert profile["steps"][0]["query_count"] == 2
@@ -17,35 +17,95 @@
 #
 import time
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from logging import Logger, getLogger
+from typing import Any, Dict, List
+
+from django.db import connection
 
 logger = getLogger(__name__)
 
 
+@dataclass
+class ProcedureStepStat:
+    """流程中单个步骤的统计数据
+
+    context 中可记录步骤相关的指标，如资源数量、数据大小等，步骤执行过程中可继续补充
+    """
+
+    step: str
+    duration: float = 0.0
+    query_count: int = 0
+    success: bool = True
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+class _QueryCounter:
+    """统计 DB 查询次数，用作 connection.execute_wrapper"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
 class ProcedureLogger:
     """打印复杂流程的日志，并在日志中添加一些公共内容"""
 
     def __init__(self, name: str, logger: Logger = logger):
         self.name = name
         self.logger = logger
+        self.step_stats: List[ProcedureStepStat] = []
 
     @contextmanager
     def step(self, step: str, raise_exception=True, **context):
+        """记录步骤的开始、结束，并统计步骤的耗时、DB 查询次数
+
+        :param context: 步骤相关的指标，将记录到步骤统计数据中；步骤内可通过 yield 的统计对象继续补充
+        """
         self.logger.info("%s, step %s start", self._message_prefix, step)
 
-        begin_time = time.time()
+        stat = ProcedureStepStat(step=step, context=dict(context))
+        query_counter = _QueryCounter()
+        begin_time = time.perf_counter()
         try:
-            yield
+            with connection.execute_wrapper(query_counter):
+                yield stat
+            self._finish_step(stat, begin_time, query_counter.count)
             self.logger.info(
-                "%s, step %s finished, duration %.6fs", self._message_prefix, step, time.time() - begin_time
+                "%s, step %s finished, duration %.6fs, queries %d, context %s",
+                self._message_prefix,
+                step,
+                stat.duration,
+                stat.query_count,
+                stat.context,
             )
         except Exception as e:
+            stat.success = False
+            self._finish_step(stat, begin_time, query_counter.count)
             if raise_exception:
                 self.logger.exception("%s, step %s error", self._message_prefix, step)
                 raise
 
             self.logger.info("%s, step %s error: %s, ignore error", self._message_prefix, step, e)
 
+    def _finish_step(self, stat: ProcedureStepStat, begin_time: float, query_count: int):
+        stat.duration = time.perf_counter() - begin_time
+        stat.query_count = query_count
+        self.step_stats.append(stat)
+        self.on_step_finished(stat)
+
+    def on_step_finished(self, stat: ProcedureStepStat):
+        """步骤结束时的回调，子类可用于上报指标"""
+
+    def get_profile(self) -> Dict[str, Any]:
+        """获取流程中各步骤的统计数据，嵌套的步骤会被分别记录，按结束的先后排列"""
+        return {
+            "steps": [dict(asdict(stat), duration=round(stat.duration, 6)) for stat in self.step_stats],
+        }
+
     def exception(self, message: str):
         self.logger.exception("%s, %s", self._message_prefix, message)
 
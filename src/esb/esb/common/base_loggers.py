@@ -22,6 +22,7 @@ import json
 
 from common.base_utils import datetime_format
 from common.log import logger, logger_api
+from common.request_payload import RequestPayload
 
 
 class BasicRequestLogger:
@@ -36,9 +37,13 @@ class BasicRequestLogger:
         else:
             kwargs = request.g.kwargs
 
+        req_params = None
         if request.g.system_name == "CMSI" and request.g.component_alias_name == "send_mail":
             kwargs = copy.copy(kwargs)
             kwargs.pop("attachments", None)
+        elif "kwargs_copy" in request.g:
+            # 原始请求参数即请求解析结果，未被修改时，复用其 JSON 编码
+            req_params = RequestPayload.from_request(request).dumps(kwargs)
 
         msecs_cost = (request.g.ts_request_end - request.g.ts_request_start) * 1000
         if isinstance(response, dict):
@@ -57,7 +62,7 @@ class BasicRequestLogger:
                 "req_system_name": request.g.system_name,
                 "req_component_name": request.g.component_alias_name,
                 "req_client_ip": request.g.client_ip,
-                "req_params": json.dumps(kwargs),
+                "req_params": req_params if req_params is not None else json.dumps(kwargs),
                 "req_use_test_env": request.g.use_test_env,
                 "req_status": request.g.component_status,
                 "req_message": message,
@@ -29,8 +29,8 @@ import yaml
 from django.utils.encoding import force_bytes, force_text, smart_bytes, smart_text
 from past.builtins import basestring
 
-from common.errors import error_codes
 from common.log import logger
+from common.request_payload import RequestPayload
 
 EMPTY_VALUES = (None, "", [], (), {})  # type: ignore
 
@@ -230,21 +230,8 @@ def get_client_real_ip(request):
 
 
 def get_request_params(request):
-    # "GET"方法
-    if request.method == "GET":
-        return dict(list(request.GET.items()))
-
-    # "POST"方法
-    if request.body and request.body.strip().startswith(force_bytes("{")):
-        try:
-            return json.loads(request.body)
-        except Exception:
-            logger.exception("request.body should be a json: %s", request.body)
-            raise error_codes.COMMON_ERROR.format_prompt(
-                "Request JSON string is wrong in format, which cannot be analyzed.", replace=True
-            )
-
-    return dict(list(request.POST.items()))
+    """获取请求参数的副本，请求体仅在首次获取时解析"""
+    return RequestPayload.from_request(request).get_params()
 
 
 def datetime_format(dt):
@@ -60,3 +60,12 @@ class FunctionControllerCodeEnum(Enum):
 
     SKIP_USER_AUTH = "user_auth::skip_user_auth"
     JWT_KEY = "jwt::private_public_key"
+    RATE_LIMIT_RULES = "rate_limit::rules"
+
+
+class SharedCacheNamespaceEnum(Enum):
+
+    APP_SECURE_INFO = "app_secure_info"
+    APP_SECRETS = "app_secrets"
+    COMPONENT_PERMISSION = "component_permission"
+    SKIP_USER_AUTH = "skip_user_auth"
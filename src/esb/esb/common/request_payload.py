@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+请求参数，每个请求仅解析一次请求体，供 channel、validator、CompRequest 及 logger 共享
+"""
+import copy
+import json
+import re
+from builtins import object
+from types import MappingProxyType
+
+from common.errors import error_codes
+from common.log import logger
+
+# 请求体以 "{" 开头（允许前置空白）时，按 JSON 解析；使用正则匹配，避免 strip 复制整个请求体
+RE_JSON_BODY = re.compile(br"^\s*\{")
+
+
+class RequestPayload(object):
+    """
+    请求参数
+
+    - params：解析后的请求参数，只读视图，各处共享；视图仅保护第一层参数，不可修改其中嵌套的 dict、list，
+      需修改时，请使用 get_params() 获取深拷贝的副本
+    - 去除指定参数后的只读视图，及其编码结果，按需生成并缓存；解析结果不会被修改，因此缓存始终有效
+    """
+
+    ATTR_NAME = "_esb_request_payload"
+
+    def __init__(self, request):
+        self.request = request
+        self._params = None
+        self._cache = {}
+
+    @classmethod
+    def from_request(cls, request):
+        """获取请求的 payload，同一请求仅创建一次"""
+        payload = vars(request).get(cls.ATTR_NAME)
+        if payload is None:
+            payload = cls(request)
+            setattr(request, cls.ATTR_NAME, payload)
+        return payload
+
+    @property
+    def is_json(self):
+        return self.request.method != "GET" and bool(self.request.body and RE_JSON_BODY.match(self.request.body))
+
+    @property
+    def params(self):
+        if self._params is None:
+            self._params = MappingProxyType(self._parse())
+        return self._params
+
+    def get_params(self):
+        """获取请求参数的副本，嵌套的 dict、list 一并复制，副本可修改"""
+        return copy.deepcopy(dict(self.params))
+
+    def get_params_without(self, keys):
+        """获取去除指定参数后的只读视图"""
+        cache_key = ("params_without", tuple(keys))
+        if cache_key not in self._cache:
+            excluded = set(keys)
+            self._cache[cache_key] = MappingProxyType(
+                {key: value for key, value in self.params.items() if key not in excluded}
+            )
+        return self._cache[cache_key]
+
+    def encode_without(self, keys, ctype="form"):
+        """
+        获取去除指定参数后的原始请求参数
+
+        :param ctype: form，GET 请求及表单请求返回 urlencode 编码的字符串，JSON 请求返回字典；json，返回 JSON 字符串
+        """
+        if ctype == "form" and self.is_json:
+            # 返回的字典可能被调用方修改，每次均返回深拷贝的副本
+            return copy.deepcopy(dict(self.get_params_without(keys)))
+
+        cache_key = ("encoded_without", tuple(keys), ctype)
+        if cache_key not in self._cache:
+            self._cache[cache_key] = self._encode_without(keys, ctype)
+        return self._cache[cache_key]
+
+    def dumps(self, params=None):
+        """
+        请求参数的 JSON 编码
+
+        :param params: 待编码的参数，如请求参数的副本；与请求参数不一致（已被修改）时，编码 params，不使用缓存的编码
+        """
+        if params is not None and params != self.params:
+            return json.dumps(params)
+
+        if "dumps" not in self._cache:
+            self._cache["dumps"] = json.dumps(dict(self.params))
+        return self._cache["dumps"]
+
+    def _parse(self):
+        # "GET"方法
+        if self.request.method == "GET":
+            return dict(list(self.request.GET.items()))
+
+        # "POST"方法
+        if self.is_json:
+            try:
+                return json.loads(self.request.body)
+            except Exception:
+                logger.exception("request.body should be a json: %s", self.request.body)
+                raise error_codes.COMMON_ERROR.format_prompt(
+                    "Request JSON string is wrong in format, which cannot be analyzed.", replace=True
+                )
+
+        return dict(list(self.request.POST.items()))
+
+    def _encode_without(self, keys, ctype):
+        if self.is_json:
+            return json.dumps(dict(self.get_params_without(keys)))
+
+        query = self.request.GET.copy() if self.request.method == "GET" else self.request.POST.copy()
+        for key in keys:
+            query.pop(key, None)
+        return query.urlencode() if ctype == "form" else json.dumps(dict(list(query.items())))
@@ -19,10 +19,11 @@
 
 from django import forms
 
-from common.constants import API_TYPE_OP
+from common.constants import API_TYPE_OP, SharedCacheNamespaceEnum
 from common.forms import BaseComponentForm, ListField
 from components.component import Component
 from esb.bkcore.models import AppComponentPermission
+from esb.utils.shared_cache import invalidate_shared_cache
 from .toolkit import configs
 
 
@@ -50,12 +51,16 @@ class AddAppComponentPerm(Component):
         data = self.form_data
         added_app_code = data["added_app_code"]
         for component_id in data["component_ids"]:
-            AppComponentPermission.objects.get_or_create(
+            _, created = AppComponentPermission.objects.get_or_create(
                 bk_app_code=added_app_code,
                 component_id=component_id,
                 defaults={
                     "expires": "2050-01-01 00:00:00+00:00",
                 },
             )
+            if created:
+                invalidate_shared_cache(
+                    SharedCacheNamespaceEnum.COMPONENT_PERMISSION.value, added_app_code, component_id
+                )
 
         self.response.payload = {"result": True, "message": "OK"}
@@ -20,13 +20,14 @@
 from builtins import object, range
 
 from django.conf import settings
-from thrift.protocol import TBinaryProtocol
 from thrift.transport import TSSLSocket, TTransport
 
 from common.bkerrors import bk_error_codes
 from common.errors import CommonAPIError, RequestThirdPartyException
 from common.log import logger
 from esb.outgoing import RequestHelperClient
+from esb.utils.thrift_codec import make_binary_protocol
+from esb.utils.thrift_pool import ThriftConnection, gse_thrift_connection_pool, is_broken_connection_error
 from lib.gse.cacheApi import CacheAPI
 from lib.gse.procServer import ProcService
 from . import configs
@@ -49,11 +50,14 @@ class BaseGSEClient(object):
         :param bool use_test_env: Use test env or not
         """
         self.thrift_client = None
+        self.connection = None
+        self.connection_ip = None
 
         self.use_test_env = use_test_env
         self.thrift_host = host
         self.thrift_port = port
         self.component = component
+        self.connection_pool = gse_thrift_connection_pool if settings.GSE_THRIFT_POOL_ENABLED else None
 
     def request(self, command, args=[], kwargs={}):
         self.connect()
@@ -63,27 +67,48 @@ class BaseGSEClient(object):
             raise CommandDoesNotExist()
 
         req_helper_client = RequestHelperClient(self.component)
-        try:
-            return req_helper_client.request(
-                self.thrift_client, action=command, args=args, kwargs=kwargs, is_response_parse=False
-            )
-        except RequestThirdPartyException as e:
-            raise e
-        except Exception:
-            logger.exception("%s access gse service fail.", bk_error_codes.REQUEST_GSE_ERROR.code)
-            raise CommonAPIError(
-                "An exception occurred while requesting GSE service, please contact the GSE developer to handle it."
-            )  # noqa
-        finally:
+        while True:
+            reused = self.connection.reused
+            try:
+                with self.thrift_host.track(self.connection_ip, self.use_test_env):
+                    response = req_helper_client.request(
+                        self.thrift_client, action=command, args=args, kwargs=kwargs, is_response_parse=False
+                    )
+            except RequestThirdPartyException as e:
+                # 请求出错的连接，其状态不确定，不再复用
+                self.close(discard=True)
+                if not (reused and is_broken_connection_error(e.raw_exc)):
+                    raise e
+
+                # 复用的连接在发送请求前已被对端关闭，请求未被处理，重建连接后重试；新建的连接不会再次重试
+                logger.warning("reused gse thrift connection is broken, reconnect and retry, command=%s", command)
+                self.connect(reuse=False)
+                continue
+            except Exception:
+                self.close(discard=True)
+                logger.exception("%s access gse service fail.", bk_error_codes.REQUEST_GSE_ERROR.code)
+                raise CommonAPIError(
+                    "An exception occurred while requesting GSE service, please contact the GSE developer to handle it."
+                )  # noqa
+
             self.close()
+            return response
+
+    def connect(self, reuse=True):
+        """获取连接，优先复用连接池中的空闲连接
 
-    def connect(self):
+        :param bool reuse: 是否复用连接池中的空闲连接
+        """
         self.close()
 
         for _ in range(self.MAX_CONNECT_RETRIES):
             ip = self.thrift_host.get_value(self.use_test_env)
+            connection = self._acquire_pooled_connection(ip, self.thrift_port) if reuse else None
+            if connection:
+                break
+
             try:
-                self.thrift_client = self.open_thrift_connect(ip, self.thrift_port)
+                connection = self.open_thrift_connect(ip, self.thrift_port)
             except Exception:
                 logger.exception(
                     "%s Cann't connect to GSE thrift server, host=%s:%s",
@@ -91,17 +116,41 @@ class BaseGSEClient(object):
                     ip,
                     self.thrift_port,
                 )
-                self.thrift_client = None
-                self.thrift_host.shift_host(use_test_env=self.use_test_env)
+                self.thrift_host.shift_host(use_test_env=self.use_test_env, host=ip)
                 continue
             break
         else:
             raise CommonAPIError("Fail to connect GSE service. Please check if GSE service is normal.")
 
-    def close(self):
-        if self.thrift_client:
-            self.transport.close()
-            self.thrift_client = None
+        self.connection = connection
+        self.connection_ip = ip
+        self.transport = connection.transport
+        self.thrift_client = connection.client
+
+    def close(self, discard=False):
+        """释放连接，启用连接池时，连接归还到连接池中以便复用
+
+        :param bool discard: 是否丢弃连接，丢弃的连接将被关闭，不再复用
+        """
+        if not self.connection:
+            return
+
+        if self.connection_pool and not discard:
+            self.connection_pool.release(self.connection)
+        else:
+            self.connection.close()
+
+        self.connection = None
+        self.thrift_client = None
+
+    def _get_connection_key(self, ip, port):
+        return (self.client_module.__name__, self.transport_class.__name__, ip, int(port))
+
+    def _acquire_pooled_connection(self, ip, port):
+        if not self.connection_pool:
+            return None
+
+        return self.connection_pool.acquire(self._get_connection_key(ip, port))
 
     def open_thrift_connect(self, ip, port):
         # 使用双向证书保证安全性
@@ -115,12 +164,12 @@ class BaseGSEClient(object):
         )
 
         socket.setTimeout(socket_timeout)
-        self.transport = self.transport_class(socket)
-        protocol = TBinaryProtocol.TBinaryProtocol(self.transport)
-        self.thrift_client = self.client_module.Client(protocol)
+        transport = self.transport_class(socket)
+        protocol = make_binary_protocol(transport, accelerated=settings.GSE_THRIFT_ACCELERATED_PROTOCOL_ENABLED)
+        client = self.client_module.Client(protocol)
 
-        self.transport.open()
-        return self.thrift_client
+        transport.open()
+        return ThriftConnection(self._get_connection_key(ip, port), socket, transport, client)
 
     def supports_command(self, cmd):
         """Determine if client supports given command"""
@@ -211,6 +211,55 @@ BK_ESB_GATEWAY_NAME = env.str("BK_ESB_GATEWAY_NAME", "bk-esb")
 # esb ssl root dir
 SSL_ROOT_DIR = env.str("BK_ESB_CERT_PATH", "/cert")
 
+# 频率控制，规则配置在功能开关 rate_limit::rules 中
+ESB_RATE_LIMIT_ENABLED = env.bool("BK_ESB_RATE_LIMIT_ENABLED", False)
+# 令牌桶存储，可选：local（进程内）、redis（多实例共享）
+ESB_RATE_LIMIT_BACKEND = env.str("BK_ESB_RATE_LIMIT_BACKEND", "local")
+ESB_RATE_LIMIT_REDIS_URL = env.str("BK_ESB_RATE_LIMIT_REDIS_URL", "")
+
+# 组件按需导入：根据组件清单，在组件首次被访问时才导入组件模块；清单不存在或已失效时，启动时导入全部组件并重新生成清单
+ESB_COMPONENTS_LAZY_LOAD = env.bool("BK_ESB_COMPONENTS_LAZY_LOAD", True)
+ESB_COMPONENTS_MANIFEST_PATH = env.str(
+    "BK_ESB_COMPONENTS_MANIFEST_PATH", os.path.join(BASE_DIR, "components", "manifest.json")
+)
+# worker 启动时预先导入全部组件，避免首个请求导入组件的耗时
+ESB_COMPONENTS_PREWARM = env.bool("BK_ESB_COMPONENTS_PREWARM", False)
+
+# SmartHost 多主机负载均衡策略，可选：failover（故障时切换）、round_robin（轮询）、least_outstanding（最少进行中请求）；
+# 默认 failover，与此前的行为一致，其它策略需显式开启
+SMART_HOST_BALANCE_STRATEGY = env.str("BK_ESB_SMART_HOST_BALANCE_STRATEGY", "failover")
+# 主机连续失败次数达到该值后，临时摘除主机，0 表示不摘除
+SMART_HOST_OUTLIER_CONSECUTIVE_FAILURES = env.int("BK_ESB_SMART_HOST_OUTLIER_CONSECUTIVE_FAILURES", 5)
+# 主机被摘除的冷却时间，单位：秒
+SMART_HOST_OUTLIER_EJECTION_SECONDS = env.int("BK_ESB_SMART_HOST_OUTLIER_EJECTION_SECONDS", 30)
+
+# 请求第三方系统的连接池，pool_connections 为缓存的主机连接池数量，pool_maxsize 为每个主机保持的最大连接数
+ESB_HTTP_POOL_CONNECTIONS = env.int("BK_ESB_HTTP_POOL_CONNECTIONS", 100)
+ESB_HTTP_POOL_MAXSIZE = env.int("BK_ESB_HTTP_POOL_MAXSIZE", 100)
+
+# 第三方系统响应的最大大小，单位：字节，0 表示不限制；超出时，组件返回请求第三方系统错误
+ESB_RESPONSE_MAX_SIZE = env.int("BK_ESB_RESPONSE_MAX_SIZE", 0)
+# 流式转发响应的组件，格式：系统名.组件名，多个以逗号分隔；组件需将第三方系统的响应原样返回
+ESB_STREAMING_RESPONSE_COMPONENTS = env.list("BK_ESB_STREAMING_RESPONSE_COMPONENTS", default=[])
+# 流式转发响应的最大大小，单位：字节，0 表示不限制
+ESB_STREAMING_RESPONSE_MAX_SIZE = env.int("BK_ESB_STREAMING_RESPONSE_MAX_SIZE", 100 * 1024 * 1024)
+ESB_STREAMING_RESPONSE_CHUNK_SIZE = 64 * 1024
+
+# 共享缓存：应用密钥、组件权限等查询结果，在进程内缓存之外，再缓存到 Redis，供多个 ESB 进程、实例共享
+ESB_SHARED_CACHE_ENABLED = env.bool("BK_ESB_SHARED_CACHE_ENABLED", False)
+ESB_SHARED_CACHE_REDIS_URL = env.str("BK_ESB_SHARED_CACHE_REDIS_URL", "")
+ESB_SHARED_CACHE_KEY_PREFIX = env.str("BK_ESB_SHARED_CACHE_KEY_PREFIX", "esb:shared_cache")
+# 缓存失效消息的发布订阅频道
+ESB_SHARED_CACHE_INVALIDATION_CHANNEL = env.str(
+    "BK_ESB_SHARED_CACHE_INVALIDATION_CHANNEL", "esb:shared_cache:invalidation"
+)
+# 空结果（如应用不存在、无权限）的缓存时间，单位：秒
+ESB_SHARED_CACHE_NEGATIVE_TTL = env.int("BK_ESB_SHARED_CACHE_NEGATIVE_TTL", 30)
+# 缓存未命中时，等待其它进程加载数据的最长时间，单位：秒
+ESB_SHARED_CACHE_LOCK_TIMEOUT = env.float("BK_ESB_SHARED_CACHE_LOCK_TIMEOUT", 3)
+ESB_SHARED_CACHE_LOCK_POLL_INTERVAL = 0.05
+ESB_SHARED_CACHE_RESUBSCRIBE_INTERVAL = 5
+
 # 缓存配置
 BK_TOKEN_CACHE_MAXSIZE = env.int("BK_TOKEN_CACHE_MAXSIZE", 2000)
 BK_TOKEN_CACHE_TTL_SECONDS = env.int("BK_TOKEN_CACHE_TTL_SECONDS", 60)
@@ -264,6 +313,13 @@ GSE_PROC_PORT = env.str("BK_GSE_PROC_PORT", "")
 GSE_CACHEAPI_HOST = env.str("BK_GSE_CACHEAPI_HOST", "")
 GSE_CACHEAPI_PORT = env.str("BK_GSE_CACHEAPI_PORT", "")
 
+# gse thrift 连接池，复用与 GSE ProcServer/CacheAPI 之间的 TLS 连接
+GSE_THRIFT_POOL_ENABLED = env.bool("BK_GSE_THRIFT_POOL_ENABLED", True)
+GSE_THRIFT_POOL_MAX_IDLE_PER_HOST = env.int("BK_GSE_THRIFT_POOL_MAX_IDLE_PER_HOST", 8)
+GSE_THRIFT_POOL_IDLE_TIMEOUT = env.int("BK_GSE_THRIFT_POOL_IDLE_TIMEOUT", 60)
+# gse thrift 请求使用 fastbinary 加速 binary 协议的编解码，fastbinary 不可用时自动回退到纯 Python 实现
+GSE_THRIFT_ACCELERATED_PROTOCOL_ENABLED = env.bool("BK_GSE_THRIFT_ACCELERATED_PROTOCOL_ENABLED", True)
+
 # host for gse process management service
 GSE_PMS_HOST = env.str("BK_GSE_PMS_URL", "")
 
@@ -21,8 +21,10 @@ from typing import List, Optional, Tuple
 from cachetools import TTLCache, cached
 from django.conf import settings
 
+from common.constants import SharedCacheNamespaceEnum
 from esb.bkcore.models import AppAccount
 from esb.paas2.models import App
+from esb.utils.shared_cache import shared_cached
 
 
 class AppSecureInfo:
@@ -31,7 +33,13 @@ class AppSecureInfo:
     """
 
     @classmethod
-    @cached(cache=TTLCache(maxsize=2000, ttl=300))
+    @shared_cached(
+        SharedCacheNamespaceEnum.APP_SECURE_INFO.value,
+        maxsize=2000,
+        ttl=300,
+        is_negative=lambda app_info: app_info is None,
+        encrypted=True,
+    )
     def get_by_app_code(cls, app_code: str) -> Optional[dict]:
         secure_key_list = []
 
@@ -51,11 +59,12 @@ class AppSecureInfo:
 
 class BKAuthHelper:
     @classmethod
-    @cached(
-        cache=TTLCache(
-            maxsize=settings.LIST_APP_SECRETS_CACHE_MAXSIZE,
-            ttl=settings.LIST_APP_SECRETS_CACHE_TTL,
-        )
+    @shared_cached(
+        SharedCacheNamespaceEnum.APP_SECRETS.value,
+        maxsize=settings.LIST_APP_SECRETS_CACHE_MAXSIZE,
+        ttl=settings.LIST_APP_SECRETS_CACHE_TTL,
+        is_negative=lambda result: not result[0],
+        encrypted=True,
     )
     def list_app_secrets(cls, app_code: str) -> Tuple[List[str], str]:
         # TODO: 待 bkauth 上线后删除此部分代码
@@ -72,7 +81,7 @@ class BKAuthHelper:
 
         result = ListAppSecrets().invoke(kwargs={"target_app_code": app_code})
         if not result["result"]:
-            # 请求 bkauth 成功，即缓存数据，因此，此处不要抛出异常
+            # 请求 bkauth 成功，即缓存数据（按空结果缓存），因此，此处不要抛出异常
             return [], f"bkauth: {result['message']}"
 
         app_secrets = [item["bk_app_secret"] for item in result["data"]]
@@ -29,6 +29,7 @@ from typing import Optional
 
 from django.conf import settings
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 
 from common.base_utils import FancyDict, get_client_ip, get_first_not_empty_value, get_request_params, str_bool
 from common.base_validators import ValidationError
@@ -48,11 +49,15 @@ from esb.component import CompRequest
 from esb.gateway.helpers import JWTClient, is_from_gateway_with_jwt
 from esb.response import format_resp_dict
 from esb.utils.base import PathVars, has_path_vars, preprocess_path_tmpl
+from esb.utils.rate_limit import get_rate_limiter
 
 
 class BaseChannel(object):
     """
     Base Channel class for handle django request, port a request to django
+
+    channel 对象按路由创建后在多个请求间复用，不应在对象上保存请求相关的状态，
+    请求相关的状态统一保存在 request 及每次请求新建的组件对象上
     """
 
     request_loggers = []  # type: ignore
@@ -87,26 +92,34 @@ class BaseChannel(object):
         :param channel_conf: channel perm_level config
         """
         self.comp_class = comp_class
-        self.comp = self.comp_class()
-        self.comp_conf = comp_conf
+        # 复制组件配置，避免修改调用方传入的配置
+        self.comp_conf = copy.deepcopy(comp_conf) if comp_conf else None
         self.channel_conf = channel_conf or {}
 
-        # 对于支持加载自定义配置的组件，调用 setup_conf 方法
-        if hasattr(self.comp, "setup_conf") and self.comp_conf:
-            self.comp.setup_conf(copy.deepcopy(self.comp_conf))
-
         self.path = path
         self.is_active = is_active
 
-        # 如果使用 += 会造成修改到原有默认变量的bug
-        self.request_loggers = self.request_loggers + (request_loggers or [])
-        self.request_validators = self.request_validators + (request_validators or [])
+        # 使用 tuple 保存，防止修改到原有默认变量
+        self.request_loggers = tuple(self.request_loggers) + tuple(request_loggers or [])
+        self.request_validators = tuple(self.request_validators) + tuple(request_validators or [])
 
     def set_request_validators(self, validators):
-        self.request_validators = validators
+        self.request_validators = tuple(validators)
 
     def append_request_validators(self, validators):
-        self.request_validators = self.request_validators + validators
+        self.request_validators = self.request_validators + tuple(validators)
+
+    def get_component(self):
+        """
+        Create a component object for the current request
+        """
+        comp = self.comp_class()
+
+        # 对于支持加载自定义配置的组件，调用 setup_conf 方法；
+        # setup_conf 将配置项设置为组件属性，每个请求使用独立的配置副本，组件原地修改嵌套的配置内容时，不影响其它请求
+        if self.comp_conf and hasattr(comp, "setup_conf"):
+            comp.setup_conf(copy.deepcopy(self.comp_conf))
+        return comp
 
     def request_id_generator_func(self, request):
         """
@@ -124,6 +137,19 @@ class BaseChannel(object):
             except ValidationError as e:
                 raise CommonAPIError(e.message)
 
+    def check_rate_limit(self, request):
+        """
+        Check access frequency of the app to the system and component, the request should be validated first
+        """
+        if not settings.ESB_RATE_LIMIT_ENABLED:
+            return
+
+        get_rate_limiter().check(
+            request.g.get("app_code") or "",
+            request.g.system_name,
+            request.g.component_name,
+        )
+
     def log_request(self, request, response):
         """
         Write request logs if needed
@@ -131,20 +157,20 @@ class BaseChannel(object):
         for req_logger in self.request_loggers:
             req_logger.write(request, response)
 
-    def patch_request_common(self, request):
+    def patch_request_common(self, request, comp):
         """
         Patch the incoming django request instance and set a lot of useful
         variables
         """
-        request.g.system_name = self.comp.sys_name
-        request.g.component_name = self.comp.get_component_name()
-        request.g.component_alias_name = self.comp.get_alias_name()
+        request.g.system_name = comp.sys_name
+        request.g.component_name = comp.get_component_name()
+        request.g.component_alias_name = comp.get_alias_name()
         request.g.client_ip = get_client_ip(request)
         request.g.request_id = self.request_id_generator_func(request)
         request.g.component_status = COMPONENT_STATUSES.EXECUTING
         request.g.channel_type = self.channel_type
         request.g.use_test_env = self.get_use_test_env(request)
-        request.g.api_type = self.comp.api_type
+        request.g.api_type = comp.api_type
         request.g.headers = self.get_headers(request)
         request.g.channel_conf = self.channel_conf
 
@@ -194,20 +220,21 @@ class BaseChannel(object):
 
         :param request: request object from django
         """
-        self.request = request
-        self.patch_request_common(self.request)
-        self.patch_request_apigw(self.request)
+        comp = self.get_component()
+        self.patch_request_common(request, comp)
+        self.patch_request_apigw(request)
 
         try:
             # Hook before request, before_handle_request may return response,
             # if it returns a response, do not call component then.
-            response = self.before_handle_request()
+            response = self.before_handle_request(request)
             if not response:
                 self.validate_request(request)
+                self.check_rate_limit(request)
 
-                self.comp.set_request(CompRequest(wsgi_request=request))
+                comp.set_request(CompRequest(wsgi_request=request))
 
-                response = self.comp.invoke()
+                response = comp.invoke()
         except APIError as e:
             response = e.code.as_dict()
             request.g.component_status = COMPONENT_STATUSES.ARGUMENT_ERROR
@@ -233,22 +260,20 @@ class BaseChannel(object):
             request.g.component_status = COMPONENT_STATUSES.EXCEPTION
         else:
             if response and (
-                isinstance(response, dict) and response.get("result") or isinstance(response, HttpResponse)
+                isinstance(response, dict) and response.get("result") or isinstance(response, HttpResponseBase)
             ):
                 request.g.component_status = COMPONENT_STATUSES.SUCCESS
             else:
                 request.g.component_status = COMPONENT_STATUSES.FAILURE
 
-        self.response = response
-        self.request.g.ts_request_end = time.time()
-        self.log_request(self.request, self.response)
+        request.g.ts_request_end = time.time()
+        self.log_request(request, response)
         # Hook after request
-        self.after_handle_request()
+        self.after_handle_request(request, response)
 
-        self.response = self.render_to_response(self.response, request)
-        return self.response
+        return self.render_to_response(response, request, comp)
 
-    def render_to_response(self, response, request):
+    def render_to_response(self, response, request, comp):
         # Turn dict response to django response
         if isinstance(response, dict):
             response["request_id"] = request.g.request_id
@@ -256,28 +281,28 @@ class BaseChannel(object):
 
             # jsonp request
             jsonp_callback = request.g.kwargs.get("callback")
-            if self._is_valid_jsonp_callback(jsonp_callback) and getattr(self.comp, "is_support_jsonp", False):
+            if self._is_valid_jsonp_callback(jsonp_callback) and getattr(comp, "is_support_jsonp", False):
                 return HttpResponse(
                     "%s(%s)" % (jsonp_callback, json.dumps(response)),
                     content_type="application/x-javascript; charset=utf-8",
                 )
             else:
                 return JsonResponse(response)
-        elif not isinstance(response, (HttpResponse, str)):
+        elif not isinstance(response, (HttpResponseBase, str)):
             return JsonResponse(response)
         return response
 
-    def before_handle_request(self):
+    def before_handle_request(self, request):
         """
         Called before request is handled by component,
         if it return a reponse dict, no more component will be called
         """
         pass
 
-    def after_handle_request(self):
+    def after_handle_request(self, request, response):
         """
         Called after request has been handled by component,
-        it may modify self.response object
+        it may modify the response object
         """
         pass
 
@@ -295,20 +320,20 @@ class ApiChannel(BaseChannel):
 
     channel_type = "api"
 
-    def before_handle_request(self):
-        self.request.g.kwargs = FancyDict(get_request_params(self.request))
+    def before_handle_request(self, request):
+        request.g.kwargs = FancyDict(get_request_params(request))
         # request.g.kwargs 之后会被修改，为了保留最原始的请求参数，创建一个copy
-        self.request.g.kwargs_copy = copy.copy(self.request.g.kwargs)
-        self.request.g.request_type = "app"
+        request.g.kwargs_copy = copy.copy(request.g.kwargs)
+        request.g.request_type = "app"
 
-        if not self.request.g.get("app_code"):
-            self.request.g.app_code = get_first_not_empty_value(
-                self.request.g.authorization,
+        if not request.g.get("app_code"):
+            request.g.app_code = get_first_not_empty_value(
+                request.g.authorization,
                 keys=["bk_app_code", "app_code"],
                 default="",
             )
 
-    def after_handle_request(self):
+    def after_handle_request(self, request, response):
         pass
 
 
@@ -375,10 +400,12 @@ class BaseChannelManager(object):
             "GET": {
                 "/cc/add_plat_id/": {
                     "re_path": re_obj,
-                    "channel": esb_channel_obj,
+                    "channel_route": channel_route_obj,
                     "classes": {"api": None},
                     "comp_conf": {},
                     "channel_conf": {},
+                    "path": "/cc/add_plat_id/",
+                    "channels": {"api": channel_obj},
                 }
             }
         }
@@ -488,6 +515,9 @@ class BaseChannelManager(object):
                     "classes": value.get("channel_classes") or channel_classes,
                     "comp_conf": value.get("comp_conf"),
                     "channel_conf": value.get("channel_conf"),
+                    "path": path,
+                    # 按 channel_type 缓存该路由的 channel 对象，首次请求时创建，channel 表刷新后随之重建
+                    "channels": {},
                 }
                 preset_channels[method][path] = preset_channel
                 if has_path_vars(path):
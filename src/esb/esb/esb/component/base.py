@@ -18,18 +18,19 @@
 #
 
 import copy
-import json
 import os
 from builtins import object
 from importlib import import_module
 
-from django.utils.encoding import force_bytes
+from django.conf import settings
 
 from common.base_utils import FancyDict, smart_lower, str_bool
 from common.bkerrors import bk_error_codes
 from common.errors import APIError, error_codes
 from common.log import logger
+from common.request_payload import RequestPayload
 from esb.bkauth.models import AnonymousBKUser, BKUser
+from esb.component.manifest import MANIFEST_VERSION, compute_fingerprint, load_manifest, save_manifest
 from esb.outgoing import HttpClient
 from esb.response import CompResponse
 from esb.utils import fpath_to_module, is_py_file
@@ -307,32 +308,15 @@ class CompRequest(object):
             self.bk_language = self.headers.get("Blueking-Language", "en")
 
     def get_strict_clean_params(self):
-        params = copy.deepcopy(self.kwargs)
+        # 仅去除第一层的参数，浅拷贝即可，避免深拷贝大请求体的开销
+        params = copy.copy(self.kwargs)
         params = self._clean_normal_params(params)
         return params
 
     def get_clean_params(self, ctype="form"):
         if not self.wsgi_request:
             return ""
-        if self.wsgi_request.method == "GET":
-            return self._get_clean_raw_query(ctype)
-        else:
-            return self._get_clean_raw_body(ctype)
-
-    def _get_clean_raw_query(self, ctype):
-        query = self.wsgi_request.GET.copy()
-        query = self._clean_sensitive_params(query)
-        return query.urlencode() if ctype == "form" else json.dumps(dict(list(query.items())))
-
-    def _get_clean_raw_body(self, ctype):
-        if self.wsgi_request.body and self.wsgi_request.body.strip().startswith(force_bytes("{")):
-            body = json.loads(self.wsgi_request.body)
-            body = self._clean_sensitive_params(body)
-            return body if ctype == "form" else json.dumps(body)
-        else:
-            body = self.wsgi_request.POST.copy()
-            body = self._clean_sensitive_params(body)
-            return body.urlencode() if ctype == "form" else json.dumps(dict(list(body.items())))
+        return RequestPayload.from_request(self.wsgi_request).encode_without(self.SENSITIVE_PARAMS_KEY, ctype)
 
     def _clean_sensitive_params(self, params):
         for key in self.SENSITIVE_PARAMS_KEY:
@@ -360,6 +344,10 @@ class ComponentsManager(object):
     ):
         self.name_component_map = {}
         self.path_configs = {}
+        # 组件名称 -> 组件所在目录
+        self.name_path_map = {}
+        # 已登记但尚未导入的组件，组件名称 -> (模块, 类名, 组件配置)
+        self.lazy_components = {}
 
     def __str__(self):
         return "<ComponentsManager: path_configs=%s>" % self.path_configs
@@ -371,10 +359,15 @@ class ComponentsManager(object):
         :param dict config: 注册组件时的配置文件，比如组件的名称前缀等
         """
         comp_class.set_name_prefix(config.get("name_prefix", ""))
-        self.name_component_map[comp_class.get_name().lower()] = comp_class
+        name = comp_class.get_name().lower()
+        self.name_component_map[name] = comp_class
+        self.name_path_map[name] = config.get("path")
+        self.lazy_components.pop(name, None)
 
     def get_comp_by_name(self, name):
         ret = self.name_component_map.get(name)
+        if ret is None and name in self.lazy_components:
+            ret = self._load_lazy_component(name)
         return ret
 
     def register_by_module(self, module, config={}):
@@ -401,6 +394,69 @@ class ComponentsManager(object):
             self.path_configs[comp_config["path"]] = comp_config.copy()
             self.register_path(comp_config["path"])
 
+    def register_lazily(self, config_list, manifest_path):
+        """
+        根据组件清单登记组件，组件在首次被获取时才导入；清单不存在或已失效时，导入全部组件并重新生成清单
+        """
+        fingerprint = compute_fingerprint(self, config_list)
+        manifest = load_manifest(manifest_path, fingerprint)
+        if manifest is None:
+            manifest = self.build_manifest(config_list, fingerprint)
+            save_manifest(manifest_path, manifest)
+            return
+
+        self.register_by_manifest(config_list, manifest)
+
+    def register_by_manifest(self, config_list, manifest):
+        """
+        登记组件清单中的组件，但不导入组件模块
+        """
+        for comp_config in config_list:
+            self.path_configs[comp_config["path"]] = comp_config.copy()
+
+        for name, item in manifest["components"].items():
+            self.lazy_components[name] = (item["module"], item["class_name"], config_list[item["group"]])
+
+    def build_manifest(self, config_list, fingerprint):
+        """
+        导入并注册全部组件，生成组件清单
+        """
+        self.register_by_config(config_list)
+
+        group_indexes = {comp_config["path"]: index for index, comp_config in enumerate(config_list)}
+        components = {}
+        for name, comp_class in self.name_component_map.items():
+            components[name] = {
+                "module": comp_class.__module__,
+                "class_name": comp_class.__name__,
+                "group": group_indexes[self.name_path_map[name]],
+            }
+
+        return {"version": MANIFEST_VERSION, "fingerprint": fingerprint, "components": components}
+
+    def load_all(self):
+        """
+        导入全部已登记但尚未导入的组件
+        """
+        for name in list(self.lazy_components.keys()):
+            self._load_lazy_component(name)
+
+    def _load_lazy_component(self, name):
+        module_name, class_name, config = self.lazy_components.pop(name)
+        try:
+            comp_class = getattr(import_module(module_name), class_name)
+        except Exception:
+            logger.exception(
+                "%s Error when register component %s from module %s, skip",
+                bk_error_codes.COMPONENT_REGISTER_ERROR.code,
+                name,
+                module_name,
+            )
+            return None
+
+        self.register(comp_class, config=config)
+        return comp_class
+
     def register_path(self, path):
         """
         Walk down components path to find all valid Component object
@@ -457,6 +513,7 @@ class ComponentsManager(object):
         return
 
     def get_registed_components(self):
+        self.load_all()
         return self.name_component_map
 
 
@@ -470,6 +527,10 @@ def get_components_manager():
     global _components_manager
     if _components_manager is None:
         manager = ComponentsManager()
-        manager.register_by_config(EsbConfigParser().get_component_groups())
+        component_groups = EsbConfigParser().get_component_groups()
+        if settings.ESB_COMPONENTS_LAZY_LOAD:
+            manager.register_lazily(component_groups, settings.ESB_COMPONENTS_MANIFEST_PATH)
+        else:
+            manager.register_by_config(component_groups)
         _components_manager = manager
     return _components_manager
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+组件清单，记录组件名称与组件所在模块的对应关系，使 ComponentsManager 可按需导入组件，
+避免在 worker 启动后的首个请求中遍历并导入全部组件模块
+"""
+import hashlib
+import json
+import os
+
+from common.log import logger
+
+MANIFEST_VERSION = 1
+
+
+def compute_fingerprint(manager, component_groups):
+    """根据各组件目录中组件文件的路径及内容计算指纹，组件文件变更后，指纹随之变化，清单失效"""
+    sha1 = hashlib.sha1()
+    for comp_config in component_groups:
+        path = comp_config["path"]
+        sha1.update(("group:%s\n" % comp_config.get("name_prefix", "")).encode("utf-8"))
+        for current_folder, folders, filenames in os.walk(path):
+            folders.sort()
+            for filename in sorted(filenames):
+                if not manager.should_register(current_folder, filename):
+                    continue
+
+                fpath = os.path.join(current_folder, filename)
+                sha1.update(("file:%s\n" % os.path.relpath(fpath, path)).encode("utf-8"))
+                with open(fpath, "rb") as fp:
+                    sha1.update(fp.read())
+
+    return sha1.hexdigest()
+
+
+def load_manifest(manifest_path, fingerprint):
+    """加载组件清单，清单不存在、格式错误或已失效时，返回 None"""
+    if not os.path.exists(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path) as fp:
+            manifest = json.load(fp)
+    except Exception:
+        logger.warning("load component manifest failed, path=%s", manifest_path, exc_info=True)
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("fingerprint") != fingerprint:
+        return None
+
+    return manifest
+
+
+def save_manifest(manifest_path, manifest):
+    """保存组件清单，先写入临时文件再替换，避免多个进程同时写入时，读取到不完整的清单"""
+    tmp_path = "%s.%s.tmp" % (manifest_path, os.getpid())
+    try:
+        with open(tmp_path, "w") as fp:
+            json.dump(manifest, fp, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    except Exception:
+        logger.warning("save component manifest failed, path=%s", manifest_path, exc_info=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    return True
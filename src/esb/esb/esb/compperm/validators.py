@@ -18,13 +18,14 @@
 #
 from typing import Optional
 
-from cachetools import TTLCache, cached
 from django.conf import settings
 
 from common.base_validators import BaseValidator
+from common.constants import SharedCacheNamespaceEnum
 from common.errors import error_codes
 from esb.bkcore.constants import PermissionLevelEnum
 from esb.bkcore.models import AppComponentPermission
+from esb.utils.shared_cache import shared_cached
 
 
 class ComponentPermValidator(BaseValidator):
@@ -58,11 +59,11 @@ class ComponentPermValidator(BaseValidator):
 
         return True
 
-    @cached(
-        cache=TTLCache(
-            maxsize=getattr(settings, "ESB_COMPONENT_PERMISSION_CACHE_MAXSIZE", 2000),
-            ttl=getattr(settings, "ESB_COMPONENT_PERMISSION_CACHE_TTL_SECONDS", 300),
-        )
+    @shared_cached(
+        SharedCacheNamespaceEnum.COMPONENT_PERMISSION.value,
+        maxsize=getattr(settings, "ESB_COMPONENT_PERMISSION_CACHE_MAXSIZE", 2000),
+        ttl=getattr(settings, "ESB_COMPONENT_PERMISSION_CACHE_TTL_SECONDS", 300),
+        is_negative=lambda has_permission: not has_permission,
     )
     def _has_permission(self, app_code: str, component_id: int) -> bool:
         return AppComponentPermission.objects.has_permission(app_code, component_id)
@@ -18,7 +18,9 @@
 #
 from django.core.management.base import BaseCommand, CommandError
 
+from common.constants import SharedCacheNamespaceEnum
 from esb.bkcore.models import AppComponentPermission, ESBChannel
+from esb.utils.shared_cache import invalidate_shared_cache
 
 
 class Command(BaseCommand):
@@ -47,6 +49,8 @@ class Command(BaseCommand):
                 bk_app_code=app_code,
                 component_id=component["id"],
             )
+            if created:
+                invalidate_shared_cache(SharedCacheNamespaceEnum.COMPONENT_PERMISSION.value, app_code, component["id"])
 
             system_name = component["system__name"]
             component_name = component["name"]
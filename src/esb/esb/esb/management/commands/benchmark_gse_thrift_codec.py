@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+GSE thrift 协议编解码基准测试，对比纯 Python 实现与 fastbinary 加速的编解码吞吐量
+"""
+from __future__ import print_function
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from esb.utils.thrift_codec import deserialize, is_fastbinary_available, serialize
+from lib.gse.cacheApi.ttypes import AgentStatusResponse, CacheUser
+from lib.gse.procServer.ttypes import Proc_Command, Proc_SyncRsp
+
+
+def build_payloads(items):
+    """构造典型的大体积 ProcService/CacheAPI 请求及响应"""
+    ips = ["10.0.%d.%d" % (i // 250, i % 250) for i in range(items)]
+    process_status = {
+        ip: json.dumps({"proc_name": "proc-%d" % i, "pid": 10000 + i, "status": "RUNNING", "cpu": 0.5, "mem": 1024})
+        for i, ip in enumerate(ips)
+    }
+    agent_status = {
+        "0:%s" % ip: json.dumps({"ip": ip, "bk_cloud_id": 0, "bk_agent_alive": 1, "version": "1.7.0"}) for ip in ips
+    }
+
+    return {
+        "ProcService.Proc_Command": Proc_Command(
+            app_id="1",
+            env_id="1",
+            operators="admin",
+            cmd="check",
+            proc_id="proc",
+            params=ips,
+            ipaddr=",".join(ips),
+            ctime=1577808000,
+            session_id="session",
+        ),
+        "ProcService.Proc_SyncRsp": Proc_SyncRsp(
+            error_code=0,
+            error_msg="success",
+            content=process_status,
+            session_id="session",
+        ),
+        "CacheAPI.AgentStatusResponse": AgentStatusResponse(
+            user=CacheUser(user="admin", password=""),
+            result=agent_status,
+            errCode=0,
+            errMsg="success",
+            bzId="1",
+        ),
+    }
+
+
+def benchmark(payload, accelerated, rounds):
+    """返回编码、解码 rounds 次的耗时（秒）及编码后的数据长度"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        data = serialize(payload, accelerated)
+    encode_duration = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decoded = deserialize(payload.__class__(), data, accelerated)
+    decode_duration = time.perf_counter() - started
+
+    if decoded != payload:
+        raise CommandError("decoded payload mismatch, payload=%s" % payload.__class__.__name__)
+
+    return {"encode_duration": encode_duration, "decode_duration": decode_duration, "size": len(data)}
+
+
+class Command(BaseCommand):
+    """GSE thrift 协议编解码基准测试"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000, help="number of hosts/processes in each payload")
+        parser.add_argument("--rounds", type=int, default=100, help="encode/decode rounds for each payload")
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        rounds = options["rounds"]
+
+        codecs = [("python", False)]
+        if is_fastbinary_available():
+            codecs.append(("fastbinary", True))
+        else:
+            print("fastbinary is not available, only benchmark the pure python codec")
+
+        print("items=%s, rounds=%s" % (items, rounds))
+        print(
+            "%-32s %-12s %10s %14s %14s %12s"
+            % ("payload", "codec", "size(KB)", "encode(ops/s)", "decode(ops/s)", "MB/s")
+        )
+        for name, payload in build_payloads(items).items():
+            for codec, accelerated in codecs:
+                result = benchmark(payload, accelerated, rounds)
+                total_duration = result["encode_duration"] + result["decode_duration"]
+                print(
+                    "%-32s %-12s %10.1f %14.1f %14.1f %12.1f"
+                    % (
+                        name,
+                        codec,
+                        result["size"] / 1024,
+                        rounds / result["encode_duration"],
+                        rounds / result["decode_duration"],
+                        result["size"] * rounds * 2 / total_duration / 1024 / 1024,
+                    )
+                )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from __future__ import print_function
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from esb.component.base import ComponentsManager
+from esb.component.manifest import compute_fingerprint, save_manifest
+from esb.utils.esb_config import EsbConfigParser
+
+
+class Command(BaseCommand):
+    """导入全部组件并生成组件清单，可在构建镜像时执行，使 worker 启动时按需导入组件"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.ESB_COMPONENTS_MANIFEST_PATH,
+            help="manifest path, default to settings.ESB_COMPONENTS_MANIFEST_PATH",
+        )
+
+    def handle(self, *args, **options):
+        component_groups = EsbConfigParser().get_component_groups()
+        manager = ComponentsManager()
+        manifest = manager.build_manifest(component_groups, compute_fingerprint(manager, component_groups))
+
+        if not save_manifest(options["output"], manifest):
+            raise CommandError("save component manifest to %s failed" % options["output"])
+
+        print("component manifest saved to %s, components: %s" % (options["output"], len(manifest["components"])))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from __future__ import print_function
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.constants import SharedCacheNamespaceEnum
+from esb.utils.shared_cache import invalidate_shared_cache
+
+
+class Command(BaseCommand):
+    """删除共享缓存数据，并通知各 ESB 进程删除进程内缓存，如应用密钥轮换后，使新密钥立即生效"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--namespace",
+            required=True,
+            choices=[namespace.value for namespace in SharedCacheNamespaceEnum],
+            help="shared cache namespace",
+        )
+        parser.add_argument("key_parts", nargs="+", help="cache key parts, e.g. app_code [component_id]")
+
+    def handle(self, *args, **options):
+        if not settings.ESB_SHARED_CACHE_ENABLED:
+            raise CommandError("shared cache is not enabled, please set BK_ESB_SHARED_CACHE_ENABLED")
+
+        # 导入使用共享缓存的模块，注册缓存命名空间
+        import esb.bkapp.helpers  # noqa
+        import esb.compperm.validators  # noqa
+        import esb.utils.func_ctrl  # noqa
+
+        invalidate_shared_cache(options["namespace"], *options["key_parts"])
+        print(
+            "shared cache invalidated: namespace=%s, key=%s" % (options["namespace"], ":".join(options["key_parts"]))
+        )
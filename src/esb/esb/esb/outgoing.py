@@ -25,6 +25,7 @@ import socket  # noqa: E402
 import time  # noqa: E402
 import urllib.parse  # noqa: E402
 from builtins import object  # noqa: E402
+from http.cookiejar import DefaultCookiePolicy  # noqa: E402
 
 import requests  # noqa: E402
 import urllib3  # noqa: E402
@@ -32,6 +33,7 @@ from django.conf import settings  # noqa: E402
 from django.utils import timezone  # noqa: E402
 from django.utils.encoding import force_bytes, force_text  # noqa: E402
 from past.builtins import basestring  # noqa: E402
+from requests.adapters import HTTPAdapter  # noqa: E402
 from requests.exceptions import ReadTimeout, SSLError  # noqa: E402
 
 from common.base_utils import FancyDict, datetime_format, urljoin  # noqa: E402
@@ -40,7 +42,18 @@ from common.errors import HostNotFoundException, RequestSSLException, RequestThi
 from common.log import logger, logger_api  # noqa: E402
 from esb.bkapp.models import BKApp  # noqa: E402
 from esb.utils.jwt_utils import JWTClient  # noqa: E402
-from .utils import SmartHost, get_ssl_root_dir  # noqa: E402
+from esb.utils.streaming import (  # noqa: E402
+    RESPONSE_MODE_BUFFERED,
+    RESPONSE_MODE_STREAMING,
+    ResponseTooLargeError,
+    check_content_length,
+    is_streaming_component,
+    make_streaming_response,
+    observe_buffered_response,
+    read_content,
+    response_too_large_total,
+)
+from .utils import SmartHost, get_ssl_root_dir, track_host_request  # noqa: E402
 
 """
 All outgoing requests:
@@ -53,6 +66,38 @@ RESP_LIMIT_SIZE = 4096
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class RejectAllCookiePolicy(DefaultCookiePolicy):
+    """不保存第三方系统响应的 cookie，防止 cookie 在不同的组件请求间共享"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+_http_session = None
+
+
+def get_http_session():
+    """
+    获取进程内共享的 requests Session，复用与第三方系统的连接
+
+    gevent worker 中，大量并发的组件请求只占用协程，连接池按主机复用 keep-alive 连接，
+    避免每个请求重新建立 TCP、TLS 连接
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        session.cookies.set_policy(RejectAllCookiePolicy())
+
+        adapter = HTTPAdapter(
+            pool_connections=settings.ESB_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=settings.ESB_HTTP_POOL_MAXSIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+
 class RequestsWrapper(object):
     """
     Wrapper for Requests
@@ -60,16 +105,35 @@ class RequestsWrapper(object):
 
     def request(self, *args, **kwargs):
         response_encoding = kwargs.pop("response_encoding", None)
+        stream = kwargs.pop("stream", False)
         # 设置超时时间
         timeout = kwargs.get("timeout") or REQUEST_TIMEOUT_SECS
         # 默认不验证证书的正确性
         kwargs.update(timeout=timeout, verify=False)
 
-        resp = requests.request(*args, **kwargs)
+        max_size = settings.ESB_STREAMING_RESPONSE_MAX_SIZE if stream else settings.ESB_RESPONSE_MAX_SIZE
+        # 流式转发或需限制响应大小时，延迟读取响应内容
+        resp = get_http_session().request(*args, stream=bool(stream or max_size), **kwargs)
 
         # 如果指定了返回内容的编码格式，使用之
         if response_encoding:
             resp.encoding = response_encoding
+
+        # 流式转发时，仅转发成功的响应，其它响应读取内容，用于错误处理
+        if stream and resp.status_code == STATUS_CODE_OK:
+            check_content_length(resp, max_size)
+            return {
+                "text": "",
+                "status_code": resp.status_code,
+                "headers": resp.headers,
+                "reason": resp.reason,
+                "raw": resp,
+            }
+
+        if max_size:
+            resp._content = read_content(resp, max_size, settings.ESB_STREAMING_RESPONSE_CHUNK_SIZE)
+            resp._content_consumed = True
+
         return {
             "text": resp.text,
             "status_code": resp.status_code,
@@ -136,6 +200,7 @@ class BasicHttpClient(object):
         timeout=None,
         allow_non_200=False,
         files=None,
+        stream=False,
     ):
         """
         Send a request to given destination
@@ -152,9 +217,11 @@ class BasicHttpClient(object):
         :param str/bool verify: 是否校验crt
         :param string/tuple: 传递客户端crt和key
         :param int timtout: 超时时间
+        :param bool stream: 是否流式转发响应，响应成功时，不读取响应内容，结果中的 stream 为第三方系统的响应
         :returns: response
         """
-        url = self.make_url(host, path, use_test_env=use_test_env)
+        host_value = self.get_host_value(host, use_test_env=use_test_env)
+        url = self.make_url(host_value, path, use_test_env=use_test_env)
         request_exception = None
         resp, resp_status_code, resp_text = None, -1, ""
         result = None
@@ -172,18 +239,23 @@ class BasicHttpClient(object):
             logger.debug(
                 "Starting request to url=%s, params=%s, data=%s, headers=%s", url, params, data, json.dumps(headers)
             )
-            resp = client.request(
-                method,
-                url,
-                params=params_to_send,
-                data=data_to_send,
-                headers=headers,
-                response_encoding=response_encoding,
-                verify=verify,
-                cert=cert,
-                timeout=timeout,
-                files=files,
-            )
+            with track_host_request(host, host_value, use_test_env) as tracker:
+                resp = client.request(
+                    method,
+                    url,
+                    params=params_to_send,
+                    data=data_to_send,
+                    headers=headers,
+                    response_encoding=response_encoding,
+                    verify=verify,
+                    cert=cert,
+                    timeout=timeout,
+                    files=files,
+                    stream=stream,
+                )
+                # 5xx 表示主机异常，计入主机的失败次数
+                if resp["status_code"] >= 500:
+                    tracker.fail()
             resp_text = resp["text"]
             resp_status_code = resp["status_code"]
 
@@ -230,9 +302,21 @@ class BasicHttpClient(object):
                     response_encoding,
                     request_encoding,
                     use_test_env,
+                    stream=stream,
                 )
 
         else:
+            if resp.get("raw") is not None:
+                return FancyDict(
+                    url=url,
+                    resp=resp,
+                    resp_status_code=resp_status_code,
+                    resp_text=resp_text,
+                    result=None,
+                    request_exception=None,
+                    stream=resp["raw"],
+                )
+
             try:
                 result = self.format_resp(resp_text, response_type=response_type)
             except Exception as e:
@@ -251,6 +335,7 @@ class BasicHttpClient(object):
             resp_text=resp_text,
             result=result,
             request_exception=request_exception,
+            stream=None,
         )
 
     # GET/POST requests
@@ -262,8 +347,8 @@ class BasicHttpClient(object):
         return self.request("POST", *args, **kwargs)
 
     @staticmethod
-    def make_url(host, path, use_test_env):
-        # Tranform SmartHost object to str type
+    def get_host_value(host, use_test_env):
+        """Tranform SmartHost object to str type"""
         if isinstance(host, SmartHost):
             # 当访问测试环境时，如果Smarthost并没有用于测试环境下的地址，抛出异常
             if use_test_env and not host.has_test_host():
@@ -271,7 +356,13 @@ class BasicHttpClient(object):
                     "Error, the component does not support access third-party test environment"
                 )
 
-            host = host.get_value(use_test_env=use_test_env)
+            return host.get_value(use_test_env=use_test_env)
+
+        return host
+
+    @staticmethod
+    def make_url(host, path, use_test_env):
+        host = BasicHttpClient.get_host_value(host, use_test_env)
 
         if not host:
             raise HostNotFoundException("Error, the component does not configure the api host")
@@ -359,8 +450,14 @@ class HttpClient(BasicHttpClient):
         allow_non_200=False,
         files=None,
         with_jwt_header=False,
+        stream=None,
     ):
-        """Send a request to given destination"""
+        """
+        Send a request to given destination
+
+        :param bool stream: 是否流式转发响应，默认根据配置 ESB_STREAMING_RESPONSE_COMPONENTS 判断；
+            流式转发时，响应成功则返回 django 的 StreamingHttpResponse，组件应将其原样返回
+        """
         datetime_start = timezone.now()
         # 判断component是否被request初始化过，如果没有，默认访问正式环境，而且request_id为None
         if self.component.request:
@@ -382,6 +479,15 @@ class HttpClient(BasicHttpClient):
         if not timeout:
             timeout = timeout_time if timeout_time else REQUEST_TIMEOUT_SECS
 
+        # 仅处理 django 请求的组件可流式转发响应，被其它组件调用时，调用方需要解析响应内容
+        if stream is None:
+            stream = bool(
+                response_type == "json"
+                and self.component.request
+                and self.component.request.wsgi_request is not None
+                and is_streaming_component(system_name, component_name)
+            )
+
         req_headers = self.prepare_bk_header(headers, with_jwt_header=with_jwt_header)
 
         # 调用BasicHttpClient.request来发送请求
@@ -402,8 +508,18 @@ class HttpClient(BasicHttpClient):
             timeout=timeout,
             allow_non_200=allow_non_200,
             files=files,
+            stream=stream,
         )
 
+        if isinstance(r.request_exception, ResponseTooLargeError):
+            response_too_large_total.labels(
+                system_name=system_name,
+                component_name=component_name,
+                mode=RESPONSE_MODE_STREAMING if stream else RESPONSE_MODE_BUFFERED,
+            ).inc()
+        elif r.resp and r.stream is None:
+            observe_buffered_response(system_name, component_name, len(r.resp_text))
+
         if r.resp_status_code == 200 and not r.request_exception:
             response_to_log = r.resp_text[:RESP_LIMIT_SIZE]
         else:
@@ -454,6 +570,9 @@ class HttpClient(BasicHttpClient):
                 raise RequestThirdPartyException(
                     r.request_exception, system_name=system_name, interface_name=component_name
                 )
+
+        if r.stream is not None:
+            return make_streaming_response(r.stream, system_name, component_name)
         return r.result
 
     def request_by_url(self, method, url, *args, **kwargs):
@@ -35,7 +35,6 @@ except Exception:
 
 
 def router_view(channel_type, request, path):
-    components_manager = get_components_manager()
     channel_manager = get_channel_manager()
 
     path = "/%s/" % path.strip("/")
@@ -49,8 +48,34 @@ def router_view(channel_type, request, path):
     if not channel_route.is_active:
         raise error_codes.INACTIVE_CHANNEL
 
+    channel_obj = get_channel_obj(channel_type, channel_conf)
+
+    # 针对本次请求存储timeout和系统名
+    # 系统名用于访问频率控制
+    request.g.timeout = channel_route.timeout
+    request.g.sys_name = channel_obj.comp_class.sys_name
+
+    return channel_obj.handle_request(request)
+
+
+api_router_view = functools.partial(router_view, "api")
+
+
+def get_channel_obj(channel_type, channel_conf):
+    """
+    获取路由对应的 channel 对象
+
+    channel 对象在路由首次被请求时创建，并缓存在路由配置中供后续请求复用；
+    channel 表刷新时会重新生成路由配置，缓存的 channel 对象随之失效
+    """
+    channels = channel_conf["channels"]
+    channel_obj = channels.get(channel_type)
+    if channel_obj is not None:
+        return channel_obj
+
     # Check if channel's component class exists
-    comp_cls = components_manager.get_comp_by_name(channel_route.component_codename)
+    channel_route = channel_conf["channel_route"]
+    comp_cls = get_components_manager().get_comp_by_name(channel_route.component_codename)
     if not comp_cls:
         raise error_codes.COMPONENT_NOT_FOUND.format_prompt(channel_route.component_codename)
 
@@ -58,7 +83,7 @@ def router_view(channel_type, request, path):
     channel_class = channel_conf["classes"][channel_type]
     channel_obj = channel_class(
         comp_cls,
-        path=path,
+        path=channel_conf["path"],
         is_active=True,
         comp_conf=channel_conf.get("comp_conf"),
         channel_conf=channel_conf.get("channel_conf", {}),
@@ -70,15 +95,8 @@ def router_view(channel_type, request, path):
     if getattr(channel_route, "append_request_validators", None) is not None:
         channel_obj.append_request_validators(channel_route.append_request_validators)
 
-    # 针对本次请求存储timeout和系统名
-    # 系统名用于访问频率控制
-    request.g.timeout = channel_route.timeout
-    request.g.sys_name = comp_cls.sys_name
-
-    return channel_obj.handle_request(request)
-
-
-api_router_view = functools.partial(router_view, "api")
+    channels[channel_type] = channel_obj
+    return channel_obj
 
 
 def get_channel_conf(path, request):
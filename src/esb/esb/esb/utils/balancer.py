@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+SmartHost 多主机负载均衡，支持轮询、最少进行中请求及故障主机临时摘除
+"""
+import threading
+import time
+from builtins import object
+
+from django.conf import settings
+
+from common.log import logger
+
+
+class HostStats(object):
+    """单个主机的请求统计"""
+
+    def __init__(self):
+        # 进行中的请求数
+        self.outstanding = 0
+        self.success_count = 0
+        self.failure_count = 0
+        self.consecutive_failures = 0
+        # 已完成请求的累计耗时，单位：秒
+        self.total_latency = 0.0
+        # 主机被摘除的截止时间，0 表示未被摘除
+        self.ejected_until = 0
+
+    def is_ejected(self, now):
+        return self.ejected_until > now
+
+    def as_json(self):
+        finished_count = self.success_count + self.failure_count
+        return {
+            "outstanding": self.outstanding,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "consecutive_failures": self.consecutive_failures,
+            "avg_latency": self.total_latency / finished_count if finished_count else 0,
+            "ejected_until": self.ejected_until,
+        }
+
+
+class BalanceStrategy(object):
+    """负载均衡策略，从可用主机中选择一个主机"""
+
+    name = ""
+
+    def __init__(self):
+        self.index = 0
+
+    def choose(self, hosts, available_hosts, stats):
+        """
+        :param list hosts: 全部主机
+        :param list available_hosts: 未被摘除的主机，保持 hosts 中的顺序
+        :param dict stats: 主机 -> HostStats
+        """
+        raise NotImplementedError
+
+    def shift(self):
+        """请求失败后，切换下一次使用的主机"""
+        self.index += 1
+
+
+class FailoverStrategy(BalanceStrategy):
+    """固定使用一个主机，仅在请求失败后切换到下一个主机"""
+
+    name = "failover"
+
+    def choose(self, hosts, available_hosts, stats):
+        for offset in range(len(hosts)):
+            host = hosts[(self.index + offset) % len(hosts)]
+            if host in available_hosts:
+                return host
+
+        return available_hosts[0]
+
+
+class RoundRobinStrategy(BalanceStrategy):
+    """依次轮询各个可用主机"""
+
+    name = "round_robin"
+
+    def choose(self, hosts, available_hosts, stats):
+        self.index += 1
+        return available_hosts[self.index % len(available_hosts)]
+
+
+class LeastOutstandingStrategy(BalanceStrategy):
+    """选择进行中请求数最少的主机，请求数相同时轮询"""
+
+    name = "least_outstanding"
+
+    def choose(self, hosts, available_hosts, stats):
+        self.index += 1
+        start = self.index % len(available_hosts)
+        candidates = available_hosts[start:] + available_hosts[:start]
+        return min(candidates, key=lambda host: stats[host].outstanding)
+
+
+BALANCE_STRATEGIES = {
+    strategy.name: strategy for strategy in [FailoverStrategy, RoundRobinStrategy, LeastOutstandingStrategy]
+}
+
+
+class HostBalancer(object):
+    """多主机负载均衡器
+
+    - 按策略从可用主机中选择主机
+    - 主机连续失败 max_consecutive_failures 次后，被摘除 ejection_seconds 秒，冷却结束后重新参与选择；
+      max_consecutive_failures 为 0 时，不摘除主机
+    - 全部主机均被摘除时，仍从全部主机中选择，避免无主机可用
+    """
+
+    def __init__(self, hosts, strategy, max_consecutive_failures=5, ejection_seconds=30):
+        self.hosts = list(hosts)
+        self.strategy = strategy
+        self.max_consecutive_failures = max_consecutive_failures
+        self.ejection_seconds = ejection_seconds
+        self.stats = {host: HostStats() for host in self.hosts}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        if len(self.hosts) == 1:
+            return self.hosts[0]
+
+        now = time.time()
+        with self._lock:
+            available_hosts = [host for host in self.hosts if not self.stats[host].is_ejected(now)]
+            return self.strategy.choose(self.hosts, available_hosts or self.hosts, self.stats)
+
+    def shift(self):
+        with self._lock:
+            self.strategy.shift()
+
+    def on_request_start(self, host):
+        stats = self.stats.get(host)
+        if stats is None:
+            return
+
+        with self._lock:
+            stats.outstanding += 1
+
+    def on_request_end(self, host, success, latency):
+        stats = self.stats.get(host)
+        if stats is None:
+            return
+
+        with self._lock:
+            stats.outstanding = max(stats.outstanding - 1, 0)
+            stats.total_latency += latency
+            if success:
+                stats.success_count += 1
+                stats.consecutive_failures = 0
+                return
+
+            self._record_failure(stats)
+
+    def on_failure(self, host):
+        """记录未发出请求的失败，如无法建立连接"""
+        stats = self.stats.get(host)
+        if stats is None:
+            return
+
+        with self._lock:
+            self._record_failure(stats)
+
+    def get_stats(self):
+        with self._lock:
+            return {host: stats.as_json() for host, stats in self.stats.items()}
+
+    def _record_failure(self, stats):
+        stats.failure_count += 1
+        stats.consecutive_failures += 1
+        if self.max_consecutive_failures and stats.consecutive_failures >= self.max_consecutive_failures:
+            stats.ejected_until = time.time() + self.ejection_seconds
+            stats.consecutive_failures = 0
+
+
+class RequestTracker(object):
+    """记录一次请求的结果，请求未抛出异常但结果异常时，可调用 fail 标记为失败"""
+
+    def __init__(self):
+        self.success = True
+
+    def fail(self):
+        self.success = False
+
+
+class HostBalancerRegistry(object):
+    """按主机列表共享负载均衡器，使指向相同主机的 SmartHost 共享主机的健康状态"""
+
+    def __init__(self):
+        self._balancers = {}
+        self._lock = threading.Lock()
+
+    def get(self, hosts):
+        key = tuple(hosts)
+        balancer = self._balancers.get(key)
+        if balancer is not None:
+            return balancer
+
+        with self._lock:
+            if key not in self._balancers:
+                self._balancers[key] = self._make_balancer(hosts)
+            return self._balancers[key]
+
+    def clear(self):
+        with self._lock:
+            self._balancers.clear()
+
+    def _make_balancer(self, hosts):
+        strategy_class = BALANCE_STRATEGIES.get(settings.SMART_HOST_BALANCE_STRATEGY)
+        if strategy_class is None:
+            logger.warning(
+                "unknown smart host balance strategy %s, use failover instead", settings.SMART_HOST_BALANCE_STRATEGY
+            )
+            strategy_class = FailoverStrategy
+        return HostBalancer(
+            hosts,
+            strategy_class(),
+            max_consecutive_failures=settings.SMART_HOST_OUTLIER_CONSECUTIVE_FAILURES,
+            ejection_seconds=settings.SMART_HOST_OUTLIER_EJECTION_SECONDS,
+        )
+
+
+host_balancer_registry = HostBalancerRegistry()
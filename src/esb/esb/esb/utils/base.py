@@ -19,15 +19,19 @@
 
 import os
 import re
+import time
 from builtins import object
+from contextlib import contextmanager
 
 from django.conf import settings
 
+from .balancer import RequestTracker, host_balancer_registry
+
 """
 Utils for ESB
 """
 
-__all__ = ["is_py_file", "fpath_to_module", "SmartHost", "get_ssl_root_dir"]
+__all__ = ["is_py_file", "fpath_to_module", "SmartHost", "track_host_request", "get_ssl_root_dir"]
 
 
 def is_py_file(fname):
@@ -50,6 +54,7 @@ class SmartHost(object):
 
     当对外请求向这个SmartHost发送时，系统会根据当前访问的component对象状态（如
     是否访问测试环境等）来判断请求应该具体被解析到的主机地址。
+    配置多个主机时，按负载均衡策略在主机间分配请求，并临时摘除连续失败的主机。
     """
 
     def __init__(self, host_prod, host_test=None):
@@ -61,11 +66,6 @@ class SmartHost(object):
             self.hosts_test = self.hosts_prod
             self._has_test_host = False
 
-        self.host_index = {
-            "prod": 0,
-            "test": 0,
-        }
-
     @staticmethod
     def make_host_list(host):
         if isinstance(host, (list, tuple)):
@@ -73,16 +73,42 @@ class SmartHost(object):
         else:
             return host.split(";")
 
+    def get_balancer(self, use_test_env):
+        """获取主机列表的负载均衡器，指向相同主机列表的 SmartHost 共享同一个负载均衡器"""
+        return host_balancer_registry.get(self.hosts_test if use_test_env else self.hosts_prod)
+
     def get_value(self, use_test_env):
-        """根据环境获取需要访问host"""
-        key = "test" if use_test_env else "prod"
-        hosts = self.hosts_test if use_test_env else self.hosts_prod
-        return hosts[self.host_index[key] % len(hosts)]
+        """根据环境及负载均衡策略获取需要访问host"""
+        return self.get_balancer(use_test_env).choose()
+
+    def shift_host(self, use_test_env, host=None):
+        """切换下一次使用的主机
 
-    def shift_host(self, use_test_env):
-        """切换下一次使用的主机"""
-        key = "test" if use_test_env else "prod"
-        self.host_index[key] += 1
+        :param host: 请求失败的主机，指定时记录该主机的失败次数
+        """
+        balancer = self.get_balancer(use_test_env)
+        if host is not None:
+            balancer.on_failure(host)
+        balancer.shift()
+
+    @contextmanager
+    def track(self, host, use_test_env):
+        """记录对主机的一次请求，用于统计进行中的请求数、成功率及耗时；请求抛出异常时，记为失败"""
+        balancer = self.get_balancer(use_test_env)
+        tracker = RequestTracker()
+        started = time.time()
+        balancer.on_request_start(host)
+        try:
+            yield tracker
+        except Exception:
+            tracker.fail()
+            raise
+        finally:
+            balancer.on_request_end(host, tracker.success, time.time() - started)
+
+    def get_stats(self, use_test_env):
+        """获取各主机的请求统计"""
+        return self.get_balancer(use_test_env).get_stats()
 
     def has_test_host(self):
         """是否拥有用于测试环境的主机地址"""
@@ -99,6 +125,17 @@ class SmartHost(object):
         return "<SmartHost hosts_test=%s hosts_prod=%s>" % (self.hosts_test, self.hosts_prod)
 
 
+@contextmanager
+def track_host_request(host, host_value, use_test_env):
+    """记录对 SmartHost 中主机的请求；host 不是 SmartHost 时，不做记录"""
+    if not isinstance(host, SmartHost):
+        yield RequestTracker()
+        return
+
+    with host.track(host_value, use_test_env) as tracker:
+        yield tracker
+
+
 class PathVars(object):
     """组件路径匹配中的变量"""
 
@@ -24,8 +24,9 @@ from builtins import object
 from cachetools import TTLCache, cached
 from django.utils.encoding import force_text
 
-from common.constants import CACHE_MAXSIZE, CacheTimeLevel, FunctionControllerCodeEnum
+from common.constants import CACHE_MAXSIZE, CacheTimeLevel, FunctionControllerCodeEnum, SharedCacheNamespaceEnum
 from esb.bkcore.models import FunctionController
+from esb.utils.shared_cache import shared_cached
 
 
 class FunctionControllerClient(object):
@@ -52,7 +53,11 @@ class FunctionControllerClient(object):
             return None, None
 
     @classmethod
-    @cached(cache=TTLCache(maxsize=CACHE_MAXSIZE, ttl=CacheTimeLevel.CACHE_TIME_SHORT.value))
+    @shared_cached(
+        SharedCacheNamespaceEnum.SKIP_USER_AUTH.value,
+        maxsize=CACHE_MAXSIZE,
+        ttl=CacheTimeLevel.CACHE_TIME_SHORT.value,
+    )
     def is_skip_user_auth(cls, app_code):
         """判定APP是否可跳过用户认证，如果功能开放，且APP在白名单内，则可跳过"""
         switch_status, wlist = FunctionControllerClient._get_func_ctrl_by_code(
@@ -71,6 +76,17 @@ class FunctionControllerClient(object):
             return {}
         return wlist
 
+    @classmethod
+    @cached(cache=TTLCache(maxsize=10, ttl=60))
+    def get_rate_limit_rules(cls):
+        """获取频率控制规则，功能未开启或规则格式错误时，返回空规则"""
+        switch_status, wlist = cls._get_func_ctrl_by_code(
+            FunctionControllerCodeEnum.RATE_LIMIT_RULES.value, data_type="json"
+        )
+        if not switch_status or not isinstance(wlist, dict):
+            return {}
+        return wlist
+
     @classmethod
     def save_jwt_key(cls, private_key, public_key):
         private_key = force_text(private_key)
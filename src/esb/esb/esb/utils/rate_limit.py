@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+基于令牌桶的频率控制
+
+规则配置在功能开关 rate_limit::rules 中，格式如下，rate 为每秒生成的令牌数，burst 为令牌桶容量（默认等于 rate）：
+
+    {
+        "app_system": {
+            "<app_code>:<system_name>": {"rate": 100, "burst": 200},
+            "<app_code>:*": {"rate": 100},
+            "*:<system_name>": {"rate": 100}
+        },
+        "component": {
+            "<system_name>.<component_name>": {"rate": 500}
+        }
+    }
+
+- app_system：按 (app_code, system_name) 限制，通配规则对每个应用单独计数，匹配优先级为 app:system > app:* > *:system
+- component：按组件限制，所有应用共享计数
+"""
+import math
+import threading
+import time
+from builtins import object
+
+import redis
+from cachetools import LRUCache
+from django.conf import settings
+from prometheus_client import Counter
+
+from common.errors import error_codes
+from common.log import logger
+from esb.utils.func_ctrl import FunctionControllerClient
+
+throttled_requests_total = Counter(
+    "esb_rate_limit_throttled_requests_total",
+    "requests rejected by the esb rate limiter",
+    ["dimension", "app_code", "system_name"],
+)
+
+
+class TokenBucket(object):
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + max(now - self.updated_at, 0) * self.rate)
+        self.updated_at = now
+
+    def consume(self, now):
+        self.refill(now)
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class LocalRateLimitBackend(object):
+    """进程内令牌桶，仅限制当前进程的请求"""
+
+    def __init__(self, maxsize=10000):
+        self._buckets = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def consume(self, buckets):
+        """
+        检查全部令牌桶，均有可用令牌时，才从各令牌桶中各消耗一个令牌
+
+        :param buckets: 令牌桶列表，元素为 (key, rate, burst)
+        :return: 首个无可用令牌的令牌桶的索引，均有可用令牌时，返回 None
+        """
+        now = time.time()
+        with self._lock:
+            token_buckets = [self._get_bucket(key, rate, burst, now) for key, rate, burst in buckets]
+            for index, bucket in enumerate(token_buckets):
+                bucket.refill(now)
+                if bucket.tokens < 1:
+                    return index
+
+            for bucket in token_buckets:
+                bucket.tokens -= 1
+            return None
+
+    def _get_bucket(self, key, rate, burst, now):
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate != rate or bucket.burst != burst:
+            bucket = self._buckets[key] = TokenBucket(rate, burst, now)
+        return bucket
+
+
+class RedisRateLimitBackend(object):
+    """Redis 令牌桶，多个 ESB 实例共享计数；Redis 异常时放行请求"""
+
+    KEY_PREFIX = "esb:rate_limit:"
+
+    # 令牌桶状态保存在 hash 中，桶装满后的时间作为过期时间；
+    # 先检查全部令牌桶，均有可用令牌时才消耗令牌，返回首个无可用令牌的令牌桶的序号（从 1 开始），均可用时返回 0
+    TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local states = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 3 - 1])
+    local burst = tonumber(ARGV[i * 3])
+    local bucket = redis.call("HMGET", key, "tokens", "updated_at")
+    local tokens = tonumber(bucket[1])
+    local updated_at = tonumber(bucket[2])
+    if tokens == nil then
+        tokens = burst
+        updated_at = now
+    end
+    tokens = math.min(burst, tokens + math.max(now - updated_at, 0) * rate)
+    if tokens < 1 then
+        return i
+    end
+    states[i] = tokens
+end
+for i, key in ipairs(KEYS) do
+    redis.call("HMSET", key, "tokens", states[i] - 1, "updated_at", now)
+    redis.call("EXPIRE", key, tonumber(ARGV[i * 3 + 1]))
+end
+return 0
+"""
+
+    def __init__(self, redis_url):
+        self._client = redis.Redis.from_url(redis_url)
+        self._script = self._client.register_script(self.TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, buckets):
+        """同 LocalRateLimitBackend.consume，使用一个 Lua 脚本原子地检查并消耗全部令牌桶"""
+        keys = []
+        args = [time.time()]
+        for key, rate, burst in buckets:
+            keys.append(self.KEY_PREFIX + key)
+            args.extend([rate, burst, int(math.ceil(burst / rate)) + 1])
+
+        try:
+            rejected = int(self._script(keys=keys, args=args))
+        except Exception:
+            logger.exception("rate limit by redis failed, allow the request, keys=%s", keys)
+            return None
+
+        return rejected - 1 if rejected else None
+
+
+class RateLimiter(object):
+    def __init__(self, backend):
+        self.backend = backend
+
+    def check(self, app_code, system_name, component_name):
+        """请求超出频率限制时，抛出 RATE_LIMIT_RESTRICTION 异常"""
+        rules = FunctionControllerClient.get_rate_limit_rules()
+        if not rules:
+            return
+
+        # 同时检查应用-系统、组件两个维度，均未超出限制时才消耗令牌，避免被一个维度拒绝的请求占用另一个维度的配额
+        dimensions = []
+        buckets = []
+        app_system_rule = self._match_app_system_rule(rules.get("app_system") or {}, app_code, system_name)
+        component_rule = (rules.get("component") or {}).get("%s.%s" % (system_name, component_name))
+        for dimension, key, rule in [
+            ("app_system", "app:%s:%s" % (app_code, system_name), app_system_rule),
+            ("component", "component:%s.%s" % (system_name, component_name), component_rule),
+        ]:
+            bucket = self._make_bucket(key, rule)
+            if bucket:
+                dimensions.append(dimension)
+                buckets.append(bucket)
+
+        if not buckets:
+            return
+
+        rejected = self.backend.consume(buckets)
+        if rejected is not None:
+            self._reject(dimensions[rejected], app_code, system_name)
+
+    def _match_app_system_rule(self, rules, app_code, system_name):
+        for key in ["%s:%s" % (app_code, system_name), "%s:*" % app_code, "*:%s" % system_name]:
+            if key in rules:
+                return rules[key]
+        return None
+
+    def _make_bucket(self, key, rule):
+        """根据规则生成令牌桶 (key, rate, burst)，未配置规则或规则未限制频率时，返回 None"""
+        if not rule:
+            return None
+
+        rate = rule.get("rate")
+        if not rate or rate <= 0:
+            return None
+
+        return key, rate, rule.get("burst") or rate
+
+    def _reject(self, dimension, app_code, system_name):
+        throttled_requests_total.labels(dimension=dimension, app_code=app_code, system_name=system_name).inc()
+        raise error_codes.RATE_LIMIT_RESTRICTION.format_prompt(
+            "app_code=%s, system=%s, dimension=%s" % (app_code, system_name, dimension)
+        )
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """
+    获取当前进程的频率控制器
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(_make_backend())
+    return _rate_limiter
+
+
+def _make_backend():
+    if settings.ESB_RATE_LIMIT_BACKEND == "redis":
+        if settings.ESB_RATE_LIMIT_REDIS_URL:
+            return RedisRateLimitBackend(settings.ESB_RATE_LIMIT_REDIS_URL)
+
+        logger.warning("redis rate limit backend is unavailable, use the local backend instead")
+
+    return LocalRateLimitBackend()
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+多进程共享的查询缓存
+
+- 一级缓存为进程内 TTLCache，二级缓存为 Redis，多个 ESB 进程、实例共享同一份数据
+- 空结果（如应用不存在、无权限）单独缓存，使用较短的过期时间，减少对下游的无效请求
+- 缓存未命中时合并并发请求：进程内同一个 key 只有一个协程加载数据；跨进程通过 Redis 锁，只有一个进程请求下游，
+  其它进程等待其写入结果
+- 通过 Redis 发布订阅广播失效消息，各进程收到消息后删除一级缓存，密钥轮换等变更可立即生效
+- 应用密钥等敏感数据（encrypted），加密后再写入 Redis，避免在 Redis 中明文存储
+
+未开启共享缓存或 Redis 不可用时，仅使用进程内缓存
+"""
+import base64
+import functools
+import hashlib
+import json
+import threading
+import time
+import weakref
+from builtins import object
+
+import redis
+from cachetools import TTLCache
+from cryptography.fernet import Fernet
+from django.conf import settings
+
+from common.log import logger
+
+
+class SharedCache(object):
+    """
+    两级缓存，key 由缓存命名空间及查询参数组成
+    """
+
+    def __init__(self, namespace, maxsize, ttl, negative_ttl=None, is_negative=None, encrypted=False):
+        """
+        :param str namespace: 缓存命名空间，用于区分不同的查询
+        :param int ttl: 缓存过期时间，单位：秒
+        :param int negative_ttl: 空结果的缓存过期时间，默认使用配置 ESB_SHARED_CACHE_NEGATIVE_TTL
+        :param is_negative: 判断查询结果是否为空结果的函数，不指定时，所有结果均使用 ttl
+        :param bool encrypted: 数据加密后再写入 Redis，用于应用密钥等不能明文存储到 Redis 的数据
+        """
+        self.namespace = namespace
+        self.encrypted = encrypted
+        self.ttl = ttl
+        self.negative_ttl = min(ttl, negative_ttl or settings.ESB_SHARED_CACHE_NEGATIVE_TTL)
+        self.is_negative = is_negative
+
+        self._local_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._local_negative_cache = TTLCache(maxsize=maxsize, ttl=self.negative_ttl)
+        self._lock = threading.Lock()
+        self._key_locks = weakref.WeakValueDictionary()
+
+    def __str__(self):
+        return "<SharedCache %s>" % self.namespace
+
+    def make_key(self, key_parts):
+        return ":".join(str(part) for part in key_parts)
+
+    def get_or_load(self, key_parts, loader):
+        """
+        获取缓存数据，未命中时，调用 loader 加载数据并写入缓存；loader 抛出异常时，不缓存
+        """
+        key = self.make_key(key_parts)
+        found, value = self._get_local(key)
+        if found:
+            return value
+
+        # 进程内合并未命中的并发请求
+        with self._get_key_lock(key):
+            found, value = self._get_local(key)
+            if found:
+                return value
+
+            client = get_shared_cache_client()
+            found, value = self._get_shared(client, key)
+            if not found:
+                value = self._load(client, key, loader)
+
+            self._set_local(key, value)
+            return value
+
+    def invalidate(self, *key_parts):
+        """
+        删除缓存数据，并通知其它进程删除进程内缓存
+        """
+        key = self.make_key(key_parts)
+        self.invalidate_local(key)
+
+        client = get_shared_cache_client()
+        if client is None:
+            return
+
+        try:
+            client.delete(self._shared_key(key))
+            client.publish(
+                settings.ESB_SHARED_CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"namespace": self.namespace, "key": key}),
+            )
+        except Exception:
+            logger.exception("invalidate shared cache failed, namespace=%s, key=%s", self.namespace, key)
+
+    def invalidate_local(self, key=None):
+        """删除进程内缓存，key 为空时，清空当前命名空间的全部缓存"""
+        with self._lock:
+            for cache in [self._local_cache, self._local_negative_cache]:
+                if key is None:
+                    cache.clear()
+                else:
+                    cache.pop(key, None)
+
+    def _get_key_lock(self, key):
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _get_local(self, key):
+        with self._lock:
+            for cache in [self._local_cache, self._local_negative_cache]:
+                if key in cache:
+                    return True, cache[key]
+        return False, None
+
+    def _set_local(self, key, value):
+        cache = self._local_negative_cache if self._is_negative(value) else self._local_cache
+        with self._lock:
+            cache[key] = value
+
+    def _is_negative(self, value):
+        return bool(self.is_negative and self.is_negative(value))
+
+    def _shared_key(self, key):
+        return "%s:%s:%s" % (settings.ESB_SHARED_CACHE_KEY_PREFIX, self.namespace, key)
+
+    def _get_shared(self, client, key):
+        if client is None:
+            return False, None
+
+        try:
+            data = client.get(self._shared_key(key))
+        except Exception:
+            logger.exception("get shared cache failed, namespace=%s, key=%s", self.namespace, key)
+            return False, None
+
+        if data is None:
+            return False, None
+
+        try:
+            return True, json.loads(self._decode(data))["value"]
+        except Exception:
+            logger.warning("shared cache data is invalid, ignore it, namespace=%s, key=%s", self.namespace, key)
+            return False, None
+
+    def _set_shared(self, client, key, value):
+        ttl = self.negative_ttl if self._is_negative(value) else self.ttl
+        try:
+            client.set(self._shared_key(key), self._encode(json.dumps({"value": value})), ex=ttl)
+        except Exception:
+            logger.exception("set shared cache failed, namespace=%s, key=%s", self.namespace, key)
+
+    def _encode(self, data):
+        if not self.encrypted:
+            return data
+        return get_shared_cache_fernet().encrypt(data.encode("utf-8"))
+
+    def _decode(self, data):
+        if not self.encrypted:
+            return data
+        # 密钥不一致或数据被篡改时，抛出 InvalidToken，按无效数据处理
+        return get_shared_cache_fernet().decrypt(data).decode("utf-8")
+
+    def _load(self, client, key, loader):
+        if client is None:
+            return loader()
+
+        # 跨进程合并未命中的并发请求，未获取到锁的进程，等待持有锁的进程写入数据，超时后自行加载
+        lock_key = self._shared_key(key) + ":lock"
+        lock_timeout = settings.ESB_SHARED_CACHE_LOCK_TIMEOUT
+        try:
+            acquired = client.set(lock_key, "1", nx=True, px=int(lock_timeout * 1000))
+        except Exception:
+            logger.exception("acquire shared cache lock failed, namespace=%s, key=%s", self.namespace, key)
+            return loader()
+
+        if not acquired:
+            deadline = time.time() + lock_timeout
+            while time.time() < deadline:
+                time.sleep(settings.ESB_SHARED_CACHE_LOCK_POLL_INTERVAL)
+                found, value = self._get_shared(client, key)
+                if found:
+                    return value
+
+        try:
+            value = loader()
+            self._set_shared(client, key, value)
+            return value
+        finally:
+            if acquired:
+                try:
+                    client.delete(lock_key)
+                except Exception:
+                    logger.exception("release shared cache lock failed, namespace=%s, key=%s", self.namespace, key)
+
+
+class SharedCacheRegistry(object):
+    """
+    记录进程内的全部共享缓存，并订阅失效消息，删除对应的进程内缓存
+    """
+
+    def __init__(self):
+        self._caches = {}
+        self._lock = threading.Lock()
+        self._subscriber = None
+
+    def register(self, cache):
+        with self._lock:
+            if cache.namespace in self._caches:
+                raise ValueError("shared cache namespace %s already exists" % cache.namespace)
+            self._caches[cache.namespace] = cache
+
+    def get(self, namespace):
+        return self._caches.get(namespace)
+
+    def invalidate(self, namespace, *key_parts):
+        cache = self.get(namespace)
+        if cache is None:
+            raise ValueError("shared cache namespace %s does not exist" % namespace)
+        cache.invalidate(*key_parts)
+
+    def invalidate_all_local(self):
+        for cache in list(self._caches.values()):
+            cache.invalidate_local()
+
+    def handle_message(self, message):
+        try:
+            data = json.loads(message)
+        except Exception:
+            logger.warning("shared cache invalidation message is invalid, ignore it, message=%s", message)
+            return
+
+        cache = self.get(data.get("namespace"))
+        if cache is not None:
+            cache.invalidate_local(data.get("key"))
+
+    def ensure_subscriber(self, client):
+        if self._subscriber is not None:
+            return
+
+        with self._lock:
+            if self._subscriber is None:
+                self._subscriber = InvalidationSubscriber(client, self)
+                self._subscriber.start()
+
+
+class InvalidationSubscriber(threading.Thread):
+    """订阅缓存失效消息；连接断开期间，可能错过失效消息，因此重新订阅后清空全部进程内缓存"""
+
+    def __init__(self, client, registry):
+        super().__init__(name="shared-cache-invalidation-subscriber")
+        self.daemon = True
+        self.client = client
+        self.registry = registry
+
+    def run(self):
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("subscribe shared cache invalidation channel failed, retry later")
+
+            self.registry.invalidate_all_local()
+            time.sleep(settings.ESB_SHARED_CACHE_RESUBSCRIBE_INTERVAL)
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(settings.ESB_SHARED_CACHE_INVALIDATION_CHANNEL)
+        try:
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    self.registry.handle_message(message["data"])
+        finally:
+            pubsub.close()
+
+
+shared_cache_registry = SharedCacheRegistry()
+
+_shared_cache_client = None
+
+
+def get_shared_cache_client():
+    """
+    获取共享缓存的 Redis 客户端，未开启共享缓存或 Redis 不可用时，返回 None
+    """
+    global _shared_cache_client
+
+    if not settings.ESB_SHARED_CACHE_ENABLED:
+        return None
+
+    if _shared_cache_client is None:
+        if not settings.ESB_SHARED_CACHE_REDIS_URL:
+            logger.warning("shared cache redis is unavailable, use the local cache only")
+            return None
+
+        _shared_cache_client = redis.Redis.from_url(settings.ESB_SHARED_CACHE_REDIS_URL)
+
+    shared_cache_registry.ensure_subscriber(_shared_cache_client)
+    return _shared_cache_client
+
+
+_shared_cache_fernet = None
+
+
+def get_shared_cache_fernet():
+    """
+    获取加密共享缓存数据的 Fernet，密钥由 SECRET_KEY 派生，同一部署的各 ESB 实例可解密彼此写入的数据
+    """
+    global _shared_cache_fernet
+
+    if _shared_cache_fernet is None:
+        key = hashlib.sha256(("esb:shared_cache:" + settings.SECRET_KEY).encode("utf-8")).digest()
+        _shared_cache_fernet = Fernet(base64.urlsafe_b64encode(key))
+    return _shared_cache_fernet
+
+
+def shared_cached(namespace, maxsize, ttl, negative_ttl=None, is_negative=None, encrypted=False):
+    """
+    使用共享缓存缓存方法的返回值，用于类方法、实例方法，缓存 key 不包含第一个参数（cls 或 self）；
+    返回值需可被 JSON 序列化，从 Redis 读取时，tuple 将被转换为 list
+
+    可通过 `func.shared_cache.invalidate(*args)` 删除缓存
+    """
+
+    def decorator(func):
+        cache = SharedCache(
+            namespace, maxsize, ttl, negative_ttl=negative_ttl, is_negative=is_negative, encrypted=encrypted
+        )
+        shared_cache_registry.register(cache)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return cache.get_or_load(args[1:], lambda: func(*args))
+
+        wrapper.shared_cache = cache
+        return wrapper
+
+    return decorator
+
+
+def invalidate_shared_cache(namespace, *key_parts):
+    """删除指定命名空间下的缓存数据，并通知其它进程"""
+    shared_cache_registry.invalidate(namespace, *key_parts)
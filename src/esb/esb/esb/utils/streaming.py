@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+第三方系统响应的大小限制及流式转发
+
+- 缓冲模式：读取完整的响应内容，再由组件解析、处理，可通过 ESB_RESPONSE_MAX_SIZE 限制响应大小
+- 流式模式：第三方系统响应成功时，不解析响应内容，按块转发给调用方，仅在响应异常时读取、解析响应内容，
+  适用于将第三方系统响应原样返回的组件，如日志查询等响应较大的组件
+"""
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from prometheus_client import Counter, Histogram
+
+from common.log import logger
+
+RESPONSE_MODE_BUFFERED = "buffered"
+RESPONSE_MODE_STREAMING = "streaming"
+
+response_size_bytes = Histogram(
+    "esb_component_response_size_bytes",
+    "size of third-party system responses held or forwarded by esb components",
+    ["system_name", "component_name", "mode"],
+    buckets=(1024, 16 * 1024, 128 * 1024, 1024 * 1024, 8 * 1024 * 1024, 64 * 1024 * 1024, float("inf")),
+)
+
+response_too_large_total = Counter(
+    "esb_component_response_too_large_total",
+    "third-party system responses rejected because they exceed the size limit",
+    ["system_name", "component_name", "mode"],
+)
+
+
+class ResponseTooLargeError(Exception):
+    def __init__(self, max_size):
+        self.max_size = max_size
+        super(ResponseTooLargeError, self).__init__(
+            "third-party system interface response size exceeds the limit of %s bytes" % max_size
+        )
+
+
+def is_streaming_component(system_name, component_name):
+    """组件是否配置为流式转发响应，组件标识格式：系统名.组件名，不区分大小写"""
+    if not settings.ESB_STREAMING_RESPONSE_COMPONENTS:
+        return False
+
+    name = ("%s.%s" % (system_name, component_name)).lower()
+    return name in {item.lower() for item in settings.ESB_STREAMING_RESPONSE_COMPONENTS}
+
+
+def check_content_length(resp, max_size):
+    """响应头中的 Content-Length 超出限制时，关闭响应并抛出异常，避免读取响应内容"""
+    if not max_size:
+        return
+
+    try:
+        content_length = int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        return
+
+    if content_length > max_size:
+        resp.close()
+        raise ResponseTooLargeError(max_size)
+
+
+def read_content(resp, max_size, chunk_size):
+    """按块读取响应内容，超出限制时，关闭响应并抛出异常"""
+    check_content_length(resp, max_size)
+
+    chunks = []
+    size = 0
+    for chunk in resp.iter_content(chunk_size):
+        size += len(chunk)
+        if size > max_size:
+            resp.close()
+            raise ResponseTooLargeError(max_size)
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+def iter_content(resp, max_size, chunk_size, system_name, component_name):
+    """
+    按块转发响应内容；响应已开始转发后，不能再修改状态码，因此超出限制时，中断转发，调用方将收到不完整的响应
+    """
+    size = 0
+    try:
+        for chunk in resp.iter_content(chunk_size):
+            size += len(chunk)
+            if max_size and size > max_size:
+                response_too_large_total.labels(
+                    system_name=system_name, component_name=component_name, mode=RESPONSE_MODE_STREAMING
+                ).inc()
+                logger.error(
+                    "streaming response exceeds the limit of %s bytes, abort it, system=%s, component=%s",
+                    max_size,
+                    system_name,
+                    component_name,
+                )
+                raise ResponseTooLargeError(max_size)
+
+            yield chunk
+    finally:
+        resp.close()
+        response_size_bytes.labels(
+            system_name=system_name, component_name=component_name, mode=RESPONSE_MODE_STREAMING
+        ).observe(size)
+
+
+def make_streaming_response(resp, system_name, component_name):
+    """将第三方系统的响应，转换为流式转发的 django 响应"""
+    return StreamingHttpResponse(
+        iter_content(
+            resp,
+            settings.ESB_STREAMING_RESPONSE_MAX_SIZE,
+            settings.ESB_STREAMING_RESPONSE_CHUNK_SIZE,
+            system_name,
+            component_name,
+        ),
+        status=resp.status_code,
+        content_type=resp.headers.get("Content-Type") or "application/json",
+    )
+
+
+def observe_buffered_response(system_name, component_name, size):
+    response_size_bytes.labels(
+        system_name=system_name, component_name=component_name, mode=RESPONSE_MODE_BUFFERED
+    ).observe(size)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+Thrift 协议编解码辅助，优先使用 C 扩展 fastbinary 加速 binary 协议的编解码
+"""
+from thrift.protocol import TBinaryProtocol
+from thrift.transport import TTransport
+
+try:
+    from thrift.protocol import fastbinary
+except ImportError:
+    fastbinary = None
+
+
+def is_fastbinary_available():
+    """thrift 的 C 扩展 fastbinary 是否可用"""
+    return fastbinary is not None
+
+
+def get_binary_protocol_class(accelerated=True):
+    """获取 binary 协议类
+
+    fastbinary 可用时，thrift 生成的 ttypes 会直接调用 C 扩展完成整个结构体的编解码，
+    不可用时回退到纯 Python 实现的 TBinaryProtocol；两者的编码结果一致
+    """
+    if accelerated and is_fastbinary_available():
+        return TBinaryProtocol.TBinaryProtocolAccelerated
+
+    return TBinaryProtocol.TBinaryProtocol
+
+
+def make_binary_protocol(transport, accelerated=True):
+    """
+    :param transport: 需为 TBufferedTransport、TFramedTransport 等支持 C 扩展读取的 transport
+    :param bool accelerated: 是否尝试使用 fastbinary 加速
+    """
+    return get_binary_protocol_class(accelerated)(transport)
+
+
+def serialize(obj, accelerated=True):
+    """将 thrift 结构体编码为 bytes"""
+    transport = TTransport.TMemoryBuffer()
+    obj.write(make_binary_protocol(transport, accelerated))
+    return transport.getvalue()
+
+
+def deserialize(obj, data, accelerated=True):
+    """将 bytes 解码到 thrift 结构体 obj 中，并返回 obj"""
+    obj.read(make_binary_protocol(TTransport.TMemoryBuffer(data), accelerated))
+    return obj
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+Thrift 连接池，复用与后端服务（如 GSE）之间已建立的连接，避免每次请求都重新进行 TLS 握手
+"""
+import select
+import socket
+import threading
+import time
+from builtins import object
+from collections import defaultdict, deque
+
+from django.conf import settings
+from thrift.transport.TTransport import TTransportException
+
+from common.log import logger
+
+# 发送请求前即可确定连接已断开的异常，出现此类异常时，请求未被对端处理，复用连接失败后可重建连接并重试；
+# END_OF_FILE、ConnectionResetError 等读取响应时的异常，对端可能已处理请求，重试可能导致请求被重复执行
+BROKEN_CONNECTION_TRANSPORT_EXCEPTION_TYPES = (TTransportException.NOT_OPEN,)
+
+
+def is_broken_connection_error(exc):
+    """判断异常是否由发送请求前连接已断开导致"""
+    # 对端已关闭连接，写入请求失败
+    if isinstance(exc, BrokenPipeError):
+        return True
+
+    return isinstance(exc, TTransportException) and exc.type in BROKEN_CONNECTION_TRANSPORT_EXCEPTION_TYPES
+
+
+class ThriftConnection(object):
+    """已建立的 thrift 连接"""
+
+    def __init__(self, key, socket, transport, client):
+        """
+        :param key: 连接池中的分组标识，如 (client 类型, ip, port)
+        :param socket: thrift socket，如 TSSLSocket
+        :param transport: 包装 socket 的 transport，如 TBufferedTransport
+        :param client: thrift client
+        """
+        self.key = key
+        self.socket = socket
+        self.transport = transport
+        self.client = client
+        self.last_used_at = time.time()
+        # 是否为从连接池中复用的连接
+        self.reused = False
+
+    def is_alive(self):
+        """检查空闲连接是否可用
+
+        空闲连接上不应有可读数据，若可读，说明对端已关闭连接或数据异常，连接不可复用
+        """
+        handle = getattr(self.socket, "handle", None)
+        if handle is None or not self.transport.isOpen():
+            return False
+
+        try:
+            readable, _, _ = select.select([handle], [], [], 0)
+        except (ValueError, OSError, socket.error):
+            return False
+
+        return not readable
+
+    def close(self):
+        try:
+            self.transport.close()
+        except Exception:
+            logger.warning("close thrift connection failed, key=%s", self.key, exc_info=True)
+
+
+class ThriftConnectionPool(object):
+    """按主机分组的 thrift 空闲连接池
+
+    - 每个分组最多保留 max_idle_per_key 个空闲连接，超出的连接归还时直接关闭
+    - 空闲超过 idle_timeout 秒的连接将被淘汰
+    - 获取连接时检查连接是否存活，已断开的连接将被丢弃
+    """
+
+    def __init__(self, max_idle_per_key=8, idle_timeout=60):
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle_connections = defaultdict(deque)
+
+    def acquire(self, key):
+        """获取一个可复用的空闲连接，没有可用连接时返回 None"""
+        while True:
+            with self._lock:
+                connections = self._idle_connections.get(key)
+                if not connections:
+                    return None
+                # 优先使用最近归还的连接，其存活的可能性更大
+                connection = connections.pop()
+
+            if self._is_expired(connection, time.time()) or not connection.is_alive():
+                connection.close()
+                continue
+
+            connection.reused = True
+            return connection
+
+    def release(self, connection):
+        """归还连接；连接已关闭或空闲连接已达上限时，关闭连接"""
+        now = time.time()
+        connection.last_used_at = now
+
+        to_close = []
+        with self._lock:
+            connections = self._idle_connections[connection.key]
+            while connections and self._is_expired(connections[0], now):
+                to_close.append(connections.popleft())
+
+            if connection.transport.isOpen() and len(connections) < self.max_idle_per_key:
+                connections.append(connection)
+            else:
+                to_close.append(connection)
+
+        for conn in to_close:
+            conn.close()
+
+    def clear(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            connections = [conn for conns in self._idle_connections.values() for conn in conns]
+            self._idle_connections.clear()
+
+        for conn in connections:
+            conn.close()
+
+    def _is_expired(self, connection, now):
+        return now - connection.last_used_at > self.idle_timeout
+
+
+gse_thrift_connection_pool = ThriftConnectionPool(
+    max_idle_per_key=settings.GSE_THRIFT_POOL_MAX_IDLE_PER_HOST,
+    idle_timeout=settings.GSE_THRIFT_POOL_IDLE_TIMEOUT,
+)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+
+import pytest
+
+from common.errors import APIError
+from common.request_payload import RequestPayload
+
+
+class TestRequestPayload:
+    def test_from_request(self, request_factory):
+        request = request_factory.get("", data={"a": "b"})
+        assert RequestPayload.from_request(request) is RequestPayload.from_request(request)
+
+    def test_parse_once(self, request_factory, mocker):
+        request = request_factory.post("", data=json.dumps({"a": "b", "c": {"d": 1}}), content_type="application/json")
+        loads = mocker.spy(json, "loads")
+        payload = RequestPayload.from_request(request)
+
+        assert payload.is_json
+        assert payload.params == {"a": "b", "c": {"d": 1}}
+        assert payload.get_params() == {"a": "b", "c": {"d": 1}}
+        payload.encode_without(["a"], ctype="json")
+        assert loads.call_count == 1
+
+    def test_params_readonly(self, request_factory):
+        payload = RequestPayload.from_request(request_factory.get("", data={"a": "b"}))
+
+        with pytest.raises(TypeError):
+            payload.params["a"] = "c"
+
+        params = payload.get_params()
+        params["a"] = "c"
+        assert payload.params["a"] == "b"
+
+    def test_get_params__nested_copied(self, request_factory):
+        request = request_factory.post("", data=json.dumps({"a": {"b": [1]}}), content_type="application/json")
+        payload = RequestPayload.from_request(request)
+
+        # 修改副本中嵌套的参数，不影响请求参数及其编码
+        params = payload.get_params()
+        params["a"]["b"].append(2)
+        assert payload.params == {"a": {"b": [1]}}
+        assert payload.dumps() == json.dumps({"a": {"b": [1]}})
+
+        params = payload.encode_without([])
+        params["a"]["c"] = 1
+        assert payload.encode_without([]) == {"a": {"b": [1]}}
+
+    def test_dumps__params_modified(self, request_factory):
+        request = request_factory.post("", data=json.dumps({"a": {"b": 1}}), content_type="application/json")
+        payload = RequestPayload.from_request(request)
+
+        params = payload.get_params()
+        assert payload.dumps(params) == json.dumps({"a": {"b": 1}})
+
+        # 参数被修改后，不使用缓存的编码
+        params["a"]["b"] = 2
+        assert payload.dumps(params) == json.dumps({"a": {"b": 2}})
+        assert payload.dumps() == json.dumps({"a": {"b": 1}})
+
+    def test_invalid_json(self, request_factory):
+        request = request_factory.post("", data="{invalid", content_type="application/json")
+
+        with pytest.raises(APIError):
+            RequestPayload.from_request(request).params
+
+    @pytest.mark.parametrize(
+        "method, data, content_type, ctype, expected",
+        [
+            ("get", {"a": "b", "app_secret": "s"}, None, "form", "a=b"),
+            ("get", {"a": "b", "app_secret": "s"}, None, "json", json.dumps({"a": "b"})),
+            ("post", "a=b&app_secret=s", "application/x-www-form-urlencoded", "form", "a=b"),
+            ("post", "a=b&app_secret=s", "application/x-www-form-urlencoded", "json", json.dumps({"a": "b"})),
+            ("post", json.dumps({"a": "b", "app_secret": "s"}), "application/json", "form", {"a": "b"}),
+            ("post", json.dumps({"a": "b", "app_secret": "s"}), "application/json", "json", json.dumps({"a": "b"})),
+        ],
+    )
+    def test_encode_without(self, request_factory, method, data, content_type, ctype, expected):
+        kwargs = {"data": data}
+        if content_type:
+            kwargs["content_type"] = content_type
+        request = getattr(request_factory, method)("", **kwargs)
+        payload = RequestPayload.from_request(request)
+
+        assert payload.encode_without(["app_secret"], ctype=ctype) == expected
+        assert payload.get_params_without(["app_secret"]) == {"a": "b"}
+        assert "app_secret" in payload.params
+
+    def test_dumps(self, request_factory):
+        payload = RequestPayload.from_request(request_factory.get("", data={"a": "b"}))
+
+        assert payload.dumps() == json.dumps({"a": "b"})
+        assert payload.dumps() is payload.dumps()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from thrift.transport.TTransport import TTransportException
+
+from common.errors import RequestThirdPartyException
+from components.bk.apis.gse.toolkit import tools
+from esb.utils.base import SmartHost
+from esb.utils.thrift_pool import ThriftConnection, ThriftConnectionPool
+
+
+class TestGSEProcServerClient(object):
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        self.pool = ThriftConnectionPool()
+        mocker.patch.object(tools, "gse_thrift_connection_pool", self.pool)
+
+        self.opened_connections = []
+
+        def open_thrift_connect(client, ip, port):
+            connection = ThriftConnection(
+                client._get_connection_key(ip, port), mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()
+            )
+            connection.transport.isOpen.return_value = True
+            mocker.patch.object(connection, "is_alive", return_value=True)
+            self.opened_connections.append(connection)
+            return connection
+
+        mocker.patch.object(
+            tools.GSEProcServerClient, "open_thrift_connect", autospec=True, side_effect=open_thrift_connect
+        )
+        self.response = mocker.MagicMock(error_code=0, error_msg="")
+        self.helper_request = mocker.patch.object(tools.RequestHelperClient, "request", return_value=self.response)
+
+    def request(self, command):
+        client = tools.GSEProcServerClient(host=SmartHost("127.0.0.1"), port=9000)
+        client.connect()
+        try:
+            return client.request(command)
+        finally:
+            client.close()
+
+    def test_request__reuse_connection(self):
+        assert self.request("CreateSession")["result"] is True
+        assert self.request("CreateSession")["result"] is True
+
+        assert len(self.opened_connections) == 1
+        self.opened_connections[0].transport.close.assert_not_called()
+
+    def test_request__retry_broken_reused_connection(self):
+        self.request("CreateSession")
+
+        self.helper_request.side_effect = [
+            RequestThirdPartyException(TTransportException(TTransportException.NOT_OPEN), "GSE", "CreateSession"),
+            self.response,
+        ]
+        assert self.request("CreateSession")["result"] is True
+
+        assert len(self.opened_connections) == 2
+        self.opened_connections[0].transport.close.assert_called_once_with()
+
+    def test_request__not_retry_response_error(self):
+        self.request("CreateSession")
+
+        # 读取响应时连接断开，对端可能已处理请求，不再重试
+        self.helper_request.side_effect = RequestThirdPartyException(
+            TTransportException(TTransportException.END_OF_FILE), "GSE", "CreateSession"
+        )
+        with pytest.raises(RequestThirdPartyException):
+            self.request("CreateSession")
+
+        assert len(self.opened_connections) == 1
+        assert self.helper_request.call_count == 2
+
+    def test_request__not_retry_new_connection(self):
+        self.helper_request.side_effect = RequestThirdPartyException(BrokenPipeError(), "GSE", "CreateSession")
+
+        with pytest.raises(RequestThirdPartyException):
+            self.request("CreateSession")
+
+        assert len(self.opened_connections) == 1
+        # 出错的连接不再归还到连接池
+        self.opened_connections[0].transport.close.assert_called_once_with()
+        assert self.pool.acquire(self.opened_connections[0].key) is None
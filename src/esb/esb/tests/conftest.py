@@ -21,6 +21,8 @@ import uuid
 import pytest
 from django.test import RequestFactory
 
+from esb.utils.shared_cache import shared_cache_registry
+
 
 @pytest.fixture(scope="class")
 def request_factory():
@@ -40,3 +42,8 @@ def unique_id():
 @pytest.fixture
 def disable_ttl_cache_tools(mocker):
     mocker.patch("cachetools.ttl.TTLCache.__getitem__", side_effect=KeyError("this is a mock"))
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_cache():
+    shared_cache_registry.invalidate_all_local()
@@ -35,6 +35,19 @@ class TestAppSecureInfo:
         assert AppSecureInfo.get_by_app_code(app1) == {"app_code": app1, "secure_key_list": ["app1-secret"]}
         assert AppSecureInfo.get_by_app_code(app2) is None
 
+    def test_secrets_encrypted(self, mocker, faker):
+        client = mocker.MagicMock()
+        client.get.return_value = None
+        mocker.patch("esb.utils.shared_cache.get_shared_cache_client", return_value=client)
+        app_code = faker.unique.pystr()
+        G(AppAccount, app_code=app_code, app_token="secret")
+
+        # 应用密钥加密后写入 Redis
+        assert AppSecureInfo.get_by_app_code(app_code)["secure_key_list"] == ["secret"]
+        data = client.set.call_args_list[-1][0][1]
+        assert b"secret" not in data
+        assert BKAuthHelper.list_app_secrets.shared_cache.encrypted
+
 
 class TestBKAuthHelper:
     @pytest.mark.parametrize(
@@ -20,12 +20,14 @@ import json
 import re
 
 import pytest
+from django.http import StreamingHttpResponse
 
 from common import errors
 from common.base_utils import FancyDict
 from common.base_validators import ValidationError
 from common.constants import COMPONENT_STATUSES
 from common.errors import error_codes
+from components.component import SetupConfMixin
 from esb.channel.base import ApiChannel, BaseChannel, BaseChannelManager, RequestHandler
 from esb.utils.base import preprocess_path_tmpl
 
@@ -124,7 +126,7 @@ class TestBaseChannel:
         self.channel = BaseChannel(self.comp_class, self.path)
 
     def test_patch_request_common(self):
-        self.channel.patch_request_common(self.request)
+        self.channel.patch_request_common(self.request, self.comp)
 
         for attr in [
             "system_name",
@@ -188,6 +190,15 @@ class TestBaseChannel:
 
             assert self.request.g.component_status == status
 
+    def test_invoke_comp__streaming_response(self):
+        streaming_response = StreamingHttpResponse(iter([b"{}"]))
+        self.comp.invoke.return_value = streaming_response
+
+        response = self.channel.handle_request(self.request)
+
+        assert response is streaming_response
+        assert self.request.g.component_status == COMPONENT_STATUSES.SUCCESS
+
     def test_validate_error(self, mocker):
         request_validator = mocker.MagicMock()
         request_validator.validate.side_effect = ValidationError()
@@ -200,6 +211,71 @@ class TestBaseChannel:
         assert self.request.g.component_status == COMPONENT_STATUSES.ARGUMENT_ERROR
         assert result["code"] == error_codes.COMMON_ERROR.code.code
 
+    def test_get_component(self, mocker):
+        comp_conf = {"host": {"host_prod": "http://example.com"}}
+        channel = BaseChannel(self.comp_class, self.path, comp_conf=comp_conf)
+        comp_conf["host"] = {}
+
+        self.comp_class.side_effect = [mocker.MagicMock(), mocker.MagicMock()]
+        comp_1 = channel.get_component()
+        comp_2 = channel.get_component()
+
+        assert comp_1 is not comp_2
+        comp_1.setup_conf.assert_called_once_with({"host": {"host_prod": "http://example.com"}})
+        comp_2.setup_conf.assert_called_once_with({"host": {"host_prod": "http://example.com"}})
+
+    def test_get_component__conf_not_shared(self):
+        class Comp(SetupConfMixin):
+            pass
+
+        channel = BaseChannel(Comp, self.path, comp_conf={"headers": {"X-Token": "a"}, "names": ["a"]})
+
+        # 组件原地修改嵌套的配置内容，不影响其它请求的组件
+        comp_1 = channel.get_component()
+        comp_1.headers["X-Token"] = "b"
+        comp_1.names.append("b")
+
+        comp_2 = channel.get_component()
+        assert comp_2.headers == {"X-Token": "a"}
+        assert comp_2.names == ["a"]
+
+    def test_request_validators(self, mocker):
+        validator_1, validator_2, validator_3 = mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()
+
+        channel = BaseChannel(self.comp_class, self.path, request_validators=[validator_1])
+        assert channel.request_validators == (validator_1,)
+        assert BaseChannel.request_validators == []
+
+        channel.set_request_validators([validator_2])
+        channel.append_request_validators([validator_3])
+        assert channel.request_validators == (validator_2, validator_3)
+
+    def test_handle_request_reuse_channel(self, mocker):
+        self.comp_class.side_effect = lambda: mocker.MagicMock(invoke=mocker.MagicMock(return_value={"result": True}))
+
+        for _ in range(2):
+            request = mocker.MagicMock(META={"REMOTE_ADDR": "127.0.0.1"}, body="")
+            self.channel.handle_request(request)
+            assert request.g.component_status == COMPONENT_STATUSES.SUCCESS
+
+        assert self.comp_class.call_count == 2
+        assert not hasattr(self.channel, "comp")
+
+    def test_rate_limited(self, settings, mocker):
+        settings.ESB_RATE_LIMIT_ENABLED = True
+        mocker.patch(
+            "esb.channel.base.get_rate_limiter",
+            return_value=mocker.MagicMock(
+                check=mocker.MagicMock(side_effect=error_codes.RATE_LIMIT_RESTRICTION.format_prompt("test"))
+            ),
+        )
+
+        response = self.channel.handle_request(self.request)
+        result = json.loads(response.content)
+
+        assert result["code"] == error_codes.RATE_LIMIT_RESTRICTION.code.code
+        self.comp.invoke.assert_not_called()
+
     @pytest.mark.parametrize(
         "header, expected",
         [
@@ -271,9 +347,8 @@ class TestApiChannel:
         )
 
         channel = ApiChannel(mocker.MagicMock, "")
-        channel.request = request
 
-        channel.before_handle_request()
+        channel.before_handle_request(request)
         assert request.g.app_code == expected
 
 
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+import os
+
+import pytest
+from django.conf import settings
+
+from esb.component.base import ComponentsManager
+from esb.component.manifest import compute_fingerprint, load_manifest, save_manifest
+
+
+@pytest.fixture
+def component_groups():
+    return [
+        {"path": os.path.join(settings.BASE_DIR, "components/bk/apis/bk_login/"), "name_prefix": "generic."},
+    ]
+
+
+class TestComponentsManager:
+    def test_register_lazily(self, tmp_path, component_groups):
+        manifest_path = str(tmp_path / "manifest.json")
+
+        # 清单不存在时，导入全部组件并生成清单
+        manager = ComponentsManager()
+        manager.register_lazily(component_groups, manifest_path)
+        assert manager.name_component_map
+        assert not manager.lazy_components
+        assert os.path.exists(manifest_path)
+
+        # 清单有效时，仅登记组件，首次获取时导入
+        lazy_manager = ComponentsManager()
+        lazy_manager.register_lazily(component_groups, manifest_path)
+        assert not lazy_manager.name_component_map
+        assert set(lazy_manager.lazy_components) == set(manager.name_component_map)
+
+        comp_class = lazy_manager.get_comp_by_name("generic.bk_login.get_user")
+        assert comp_class is manager.get_comp_by_name("generic.bk_login.get_user")
+        assert "generic.bk_login.get_user" not in lazy_manager.lazy_components
+        assert lazy_manager.get_comp_by_name("generic.bk_login.not_exist") is None
+
+        assert lazy_manager.get_registed_components() == manager.name_component_map
+        assert not lazy_manager.lazy_components
+
+    def test_register_lazily__stale_manifest(self, tmp_path, component_groups):
+        manifest_path = str(tmp_path / "manifest.json")
+        save_manifest(manifest_path, {"version": 1, "fingerprint": "stale", "components": {}})
+
+        manager = ComponentsManager()
+        manager.register_lazily(component_groups, manifest_path)
+
+        assert manager.get_comp_by_name("generic.bk_login.get_user")
+        with open(manifest_path) as fp:
+            assert json.load(fp)["fingerprint"] == compute_fingerprint(manager, component_groups)
+
+    def test_load_lazy_component__import_error(self, component_groups):
+        manager = ComponentsManager()
+        manager.register_by_manifest(
+            component_groups,
+            {"components": {"generic.demo.test": {"module": "not_exist_module", "class_name": "Test", "group": 0}}},
+        )
+
+        assert manager.get_comp_by_name("generic.demo.test") is None
+        assert not manager.lazy_components
+
+
+def test_load_manifest(tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    assert load_manifest(manifest_path, "fp") is None
+
+    save_manifest(manifest_path, {"version": 1, "fingerprint": "fp", "components": {}})
+    assert load_manifest(manifest_path, "fp") == {"version": 1, "fingerprint": "fp", "components": {}}
+    assert load_manifest(manifest_path, "other") is None
+
+    with open(manifest_path, "w") as fp:
+        fp.write("invalid")
+    assert load_manifest(manifest_path, "fp") is None
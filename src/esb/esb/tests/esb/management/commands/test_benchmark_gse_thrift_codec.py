@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from django.core.management import call_command
+
+from esb.management.commands.benchmark_gse_thrift_codec import benchmark, build_payloads
+
+
+def test_benchmark():
+    for payload in build_payloads(10).values():
+        result = benchmark(payload, accelerated=True, rounds=2)
+        assert result["size"] > 0
+
+
+def test_command(capsys):
+    call_command("benchmark_gse_thrift_codec", items=10, rounds=2)
+
+    output = capsys.readouterr().out
+    assert "ProcService.Proc_SyncRsp" in output
+    assert "CacheAPI.AgentStatusResponse" in output
@@ -17,10 +17,13 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import pytest
+from django.http import StreamingHttpResponse
 from django.utils.encoding import force_bytes
 
-from esb.outgoing import BasicHttpClient, encode_dict
+from esb import outgoing
+from esb.outgoing import BasicHttpClient, HttpClient, RequestsWrapper, encode_dict, get_http_session
 from esb.utils import SmartHost
+from esb.utils.streaming import ResponseTooLargeError
 
 
 @pytest.mark.parametrize(
@@ -96,3 +99,107 @@ class TestBasicHttpClient(object):
     def test_make_url(self, host, path, use_test_env, expected):
         result = BasicHttpClient.make_url(host, path, use_test_env)
         assert result == expected
+
+
+def test_get_http_session(settings, mocker):
+    settings.ESB_HTTP_POOL_MAXSIZE = 10
+    mocker.patch.object(outgoing, "_http_session", None)
+
+    session = get_http_session()
+
+    assert get_http_session() is session
+    assert session.get_adapter("https://demo.example.com")._pool_maxsize == 10
+
+    # 不保存第三方系统响应的 cookie
+    response = mocker.MagicMock()
+    response.info.return_value.get_all.side_effect = lambda name, default=None: (
+        ["sessionid=abc; Path=/"] if name == "Set-Cookie" else []
+    )
+    request = mocker.MagicMock(
+        get_full_url=mocker.MagicMock(return_value="http://demo.example.com/"),
+        get_host=mocker.MagicMock(return_value="demo.example.com"),
+        host="demo.example.com",
+        type="http",
+        unverifiable=False,
+    )
+    session.cookies.extract_cookies(response, request)
+    assert len(session.cookies) == 0
+
+
+class TestRequestsWrapper(object):
+    @pytest.fixture
+    def mock_request(self, mocker):
+        resp = mocker.MagicMock(status_code=200, headers={}, reason="OK", text="{}")
+        resp.iter_content.return_value = iter([b"{", b"}"])
+        session = mocker.patch("esb.outgoing.get_http_session").return_value
+        session.request.return_value = resp
+        return session.request
+
+    def test_request(self, settings, mock_request):
+        settings.ESB_RESPONSE_MAX_SIZE = 0
+
+        result = RequestsWrapper().request("GET", "http://demo.example.com/")
+
+        assert result["text"] == "{}"
+        assert "raw" not in result
+        assert mock_request.call_args[1]["stream"] is False
+
+    def test_request__max_size(self, settings, mock_request):
+        settings.ESB_RESPONSE_MAX_SIZE = 1
+
+        with pytest.raises(ResponseTooLargeError):
+            RequestsWrapper().request("GET", "http://demo.example.com/")
+
+        assert mock_request.call_args[1]["stream"] is True
+
+    def test_request__stream(self, mock_request):
+        result = RequestsWrapper().request("GET", "http://demo.example.com/", stream=True)
+
+        assert result["text"] == ""
+        assert result["raw"] is mock_request.return_value
+        mock_request.return_value.iter_content.assert_not_called()
+
+    def test_request__stream_error_response(self, mock_request):
+        mock_request.return_value.status_code = 500
+
+        result = RequestsWrapper().request("GET", "http://demo.example.com/", stream=True)
+
+        assert "raw" not in result
+        assert result["status_code"] == 500
+
+
+class TestHttpClient(object):
+    @pytest.fixture
+    def component(self, mocker):
+        return mocker.MagicMock(sys_name="LOG", get_alias_name=mocker.MagicMock(return_value="search"))
+
+    @pytest.mark.parametrize(
+        "components, has_wsgi_request, expected",
+        [
+            (["log.search"], True, True),
+            (["log.search"], False, False),
+            ([], True, False),
+        ],
+    )
+    def test_request__stream(self, settings, mocker, component, components, has_wsgi_request, expected):
+        settings.ESB_STREAMING_RESPONSE_COMPONENTS = components
+        if not has_wsgi_request:
+            component.request.wsgi_request = None
+
+        mocker.patch.object(HttpClient, "prepare_bk_header", return_value={})
+        resp = mocker.MagicMock(status_code=200, headers={})
+        resp.iter_content.return_value = iter([b"{}"])
+        mock_request = mocker.patch(
+            "esb.outgoing.RequestsWrapper.request",
+            return_value={"text": "", "status_code": 200, "headers": {}, "reason": "OK", "raw": resp}
+            if expected
+            else {"text": "{}", "status_code": 200, "headers": {}, "reason": "OK"},
+        )
+
+        result = HttpClient(component).request("GET", "http://demo.example.com", "/search/")
+
+        assert mock_request.call_args[1]["stream"] is expected
+        if expected:
+            assert isinstance(result, StreamingHttpResponse)
+        else:
+            assert result == {}
@@ -77,11 +77,14 @@ class TestRouterView:
         self.channel_manager.get_rewrite_path_by_path.return_value = None
 
     def make_channel_conf(self, mocker):
-        channel_conf = mocker.MagicMock()
-
-        channel_conf["channel_route"].is_active = True
-
-        return channel_conf
+        return {
+            "channel_route": mocker.MagicMock(is_active=True, request_validators=None, append_request_validators=None),
+            "classes": {self.channel_type: mocker.MagicMock()},
+            "comp_conf": None,
+            "channel_conf": {},
+            "path": self.path,
+            "channels": {},
+        }
 
     @pytest.mark.parametrize(
         "path, expected",
@@ -111,6 +114,7 @@ class TestRouterView:
             routers.router_view(self.channel_type, self.request, self.path)
 
         self.components_manager.get_comp_by_name.assert_called_once()
+        assert self.channel_conf["channels"] == {}
 
     def test_set_request_validators(self, mocker):
         channel_obj = self.channel_conf["classes"][self.channel_type].return_value
@@ -132,7 +136,8 @@ class TestRouterView:
 
     def test_timeout_time_from_timeout_handler(self, mocker, faker):
         sys_name = "test"
-        self.components_manager.get_comp_by_name.return_value = mocker.MagicMock(sys_name=sys_name)
+        channel_obj = self.channel_conf["classes"][self.channel_type].return_value
+        channel_obj.comp_class = mocker.MagicMock(sys_name=sys_name)
 
         timeout = faker.pyint(min_value=1)
         esb_channel = self.channel_conf["channel_route"]
@@ -150,6 +155,23 @@ class TestRouterView:
 
         channel_obj.handle_request.assert_called_once_with(self.request)
 
+    def test_reuse_channel_obj(self, mocker):
+        channel_class = self.channel_conf["classes"][self.channel_type]
+        channel_obj = channel_class.return_value
+
+        for _ in range(2):
+            routers.router_view(self.channel_type, mocker.MagicMock(method="GET"), self.path)
+
+        channel_class.assert_called_once_with(
+            self.components_manager.get_comp_by_name.return_value,
+            path=self.path,
+            is_active=True,
+            comp_conf=None,
+            channel_conf={},
+        )
+        assert channel_obj.handle_request.call_count == 2
+        assert self.channel_conf["channels"] == {self.channel_type: channel_obj}
+
 
 def test_buffet_component_view():
     with pytest.raises(APIError) as err:
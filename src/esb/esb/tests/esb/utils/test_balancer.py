@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+
+from esb.utils.balancer import (
+    FailoverStrategy,
+    HostBalancer,
+    LeastOutstandingStrategy,
+    RoundRobinStrategy,
+    host_balancer_registry,
+)
+from esb.utils.base import SmartHost, track_host_request
+
+
+@pytest.fixture(autouse=True)
+def clear_balancers(settings):
+    settings.SMART_HOST_BALANCE_STRATEGY = "round_robin"
+    settings.SMART_HOST_OUTLIER_CONSECUTIVE_FAILURES = 2
+    settings.SMART_HOST_OUTLIER_EJECTION_SECONDS = 30
+
+    host_balancer_registry.clear()
+    yield
+    host_balancer_registry.clear()
+
+
+class TestHostBalancer(object):
+    def test_failover(self):
+        balancer = HostBalancer(["h1", "h2"], FailoverStrategy())
+        assert [balancer.choose() for _ in range(3)] == ["h1", "h1", "h1"]
+
+        balancer.shift()
+        assert balancer.choose() == "h2"
+
+    def test_round_robin(self):
+        balancer = HostBalancer(["h1", "h2", "h3"], RoundRobinStrategy())
+        assert sorted(balancer.choose() for _ in range(6)) == ["h1", "h1", "h2", "h2", "h3", "h3"]
+
+    def test_least_outstanding(self):
+        balancer = HostBalancer(["h1", "h2"], LeastOutstandingStrategy())
+        balancer.on_request_start("h1")
+        assert [balancer.choose() for _ in range(3)] == ["h2", "h2", "h2"]
+
+        balancer.on_request_end("h1", True, 0.1)
+        assert {balancer.choose() for _ in range(2)} == {"h1", "h2"}
+
+    def test_outlier_ejection(self, mocker):
+        mocked_time = mocker.patch("esb.utils.balancer.time.time", return_value=1000)
+        balancer = HostBalancer(["h1", "h2"], RoundRobinStrategy(), max_consecutive_failures=2, ejection_seconds=30)
+
+        balancer.on_request_start("h1")
+        balancer.on_request_end("h1", False, 0.1)
+        balancer.on_failure("h1")
+        assert {balancer.choose() for _ in range(4)} == {"h2"}
+
+        # 冷却结束后，主机重新参与选择
+        mocked_time.return_value = 1031
+        assert {balancer.choose() for _ in range(4)} == {"h1", "h2"}
+
+    def test_all_ejected(self):
+        balancer = HostBalancer(["h1", "h2"], RoundRobinStrategy(), max_consecutive_failures=1)
+        balancer.on_failure("h1")
+        balancer.on_failure("h2")
+
+        assert {balancer.choose() for _ in range(4)} == {"h1", "h2"}
+
+    def test_success_resets_consecutive_failures(self):
+        balancer = HostBalancer(["h1", "h2"], RoundRobinStrategy(), max_consecutive_failures=2)
+        balancer.on_failure("h1")
+        balancer.on_request_end("h1", True, 0.2)
+        balancer.on_failure("h1")
+
+        assert {balancer.choose() for _ in range(4)} == {"h1", "h2"}
+        stats = balancer.get_stats()["h1"]
+        assert stats["failure_count"] == 2
+        assert stats["success_count"] == 1
+        assert stats["avg_latency"] == pytest.approx(0.2 / 3)
+
+
+class TestSmartHost(object):
+    def test_get_value(self):
+        host = SmartHost("h1;h2", host_test="t1")
+
+        assert {host.get_value(use_test_env=False) for _ in range(4)} == {"h1", "h2"}
+        assert host.get_value(use_test_env=True) == "t1"
+
+    @pytest.mark.parametrize(
+        "strategy, expected",
+        [
+            ("round_robin", RoundRobinStrategy),
+            ("failover", FailoverStrategy),
+            # 未知的策略，使用 failover
+            ("not-exist", FailoverStrategy),
+        ],
+    )
+    def test_balance_strategy(self, settings, strategy, expected):
+        settings.SMART_HOST_BALANCE_STRATEGY = strategy
+
+        assert isinstance(SmartHost("h1;h2").get_balancer(False).strategy, expected)
+
+    def test_shared_balancer(self):
+        assert SmartHost("h1;h2").get_balancer(False) is SmartHost(["h1", "h2"]).get_balancer(False)
+
+    def test_shift_host(self):
+        host = SmartHost("h1;h2")
+        host.shift_host(use_test_env=False, host="h1")
+        host.shift_host(use_test_env=False, host="h1")
+
+        assert {host.get_value(use_test_env=False) for _ in range(4)} == {"h2"}
+
+    def test_track(self):
+        host = SmartHost("h1;h2")
+        with host.track("h1", use_test_env=False):
+            assert host.get_stats(use_test_env=False)["h1"]["outstanding"] == 1
+
+        with pytest.raises(ValueError), host.track("h1", use_test_env=False):
+            raise ValueError()
+
+        stats = host.get_stats(use_test_env=False)["h1"]
+        assert stats["outstanding"] == 0
+        assert stats["success_count"] == 1
+        assert stats["failure_count"] == 1
+
+
+def test_track_host_request():
+    host = SmartHost("h1;h2")
+    with track_host_request(host, "h1", use_test_env=False) as tracker:
+        tracker.fail()
+    assert host.get_stats(use_test_env=False)["h1"]["failure_count"] == 1
+
+    with track_host_request("http://h1", "http://h1", use_test_env=False) as tracker:
+        assert tracker.success
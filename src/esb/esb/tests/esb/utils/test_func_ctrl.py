@@ -36,3 +36,22 @@ class TestFunctionControllerClient(object):
         FunctionControllerClient.save_jwt_key(private_key, public_key)
 
         assert FunctionController.objects.filter(func_code=FunctionControllerCodeEnum.JWT_KEY.value).exists()
+
+    @pytest.mark.parametrize(
+        "switch_status, wlist, expected",
+        [
+            (True, '{"app_system": {"*:CC": {"rate": 10}}}', {"app_system": {"*:CC": {"rate": 10}}}),
+            (False, '{"app_system": {"*:CC": {"rate": 10}}}', {}),
+            (True, "not-json", {}),
+        ],
+    )
+    def test_get_rate_limit_rules(self, switch_status, wlist, expected):
+        FunctionController.objects.create(
+            func_code=FunctionControllerCodeEnum.RATE_LIMIT_RULES.value,
+            func_name="rate limit",
+            switch_status=switch_status,
+            wlist=wlist,
+        )
+
+        # 跳过缓存
+        assert FunctionControllerClient.get_rate_limit_rules.__wrapped__(FunctionControllerClient) == expected
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+
+from common.errors import APIError, error_codes
+from esb.utils.func_ctrl import FunctionControllerClient
+from esb.utils.rate_limit import LocalRateLimitBackend, RateLimiter, RedisRateLimitBackend, TokenBucket
+
+
+class TestTokenBucket(object):
+    def test_consume(self):
+        bucket = TokenBucket(rate=1, burst=2, now=100)
+
+        assert bucket.consume(100)
+        assert bucket.consume(100)
+        assert not bucket.consume(100.5)
+        # 1 秒后生成 1 个令牌
+        assert bucket.consume(101)
+        assert not bucket.consume(101)
+
+
+class TestLocalRateLimitBackend(object):
+    def test_consume(self, mocker):
+        mocker.patch("esb.utils.rate_limit.time.time", return_value=100)
+        backend = LocalRateLimitBackend()
+
+        assert [backend.consume([("k1", 1, 2)]) for _ in range(3)] == [None, None, 0]
+        assert backend.consume([("k2", 1, 2)]) is None
+        # 规则变更后，重建令牌桶
+        assert backend.consume([("k1", 1, 3)]) is None
+
+    def test_consume__multiple_buckets(self, mocker):
+        mocker.patch("esb.utils.rate_limit.time.time", return_value=100)
+        backend = LocalRateLimitBackend()
+
+        assert backend.consume([("k1", 1, 2), ("k2", 1, 1)]) is None
+        # k2 无可用令牌，不消耗 k1 的令牌
+        assert backend.consume([("k1", 1, 2), ("k2", 1, 1)]) == 1
+        assert backend.consume([("k1", 1, 2)]) is None
+        assert backend.consume([("k1", 1, 2)]) == 0
+
+
+class TestRedisRateLimitBackend(object):
+    def test_consume(self, mocker):
+        mocker.patch("esb.utils.rate_limit.time.time", return_value=100)
+        backend = RedisRateLimitBackend.__new__(RedisRateLimitBackend)
+        backend._script = mocker.MagicMock(return_value=2)
+
+        assert backend.consume([("k1", 1, 2), ("k2", 2, 2)]) == 1
+        backend._script.assert_called_once_with(
+            keys=["esb:rate_limit:k1", "esb:rate_limit:k2"], args=[100, 1, 2, 3, 2, 2, 2]
+        )
+
+        backend._script.return_value = 0
+        assert backend.consume([("k1", 1, 2)]) is None
+
+    def test_consume__redis_error(self, mocker):
+        backend = RedisRateLimitBackend.__new__(RedisRateLimitBackend)
+        backend._script = mocker.MagicMock(side_effect=Exception())
+
+        assert backend.consume([("k1", 1, 2)]) is None
+
+
+class TestRateLimiter(object):
+    @pytest.fixture(autouse=True)
+    def setup(self, mocker):
+        self.rules = {}
+        mocker.patch.object(FunctionControllerClient, "get_rate_limit_rules", side_effect=lambda: self.rules)
+        mocker.patch("esb.utils.rate_limit.time.time", return_value=100)
+        self.limiter = RateLimiter(LocalRateLimitBackend())
+
+    def test_check__no_rules(self):
+        for _ in range(10):
+            self.limiter.check("app", "CC", "get_host")
+
+    @pytest.mark.parametrize("rule_key", ["app:CC", "app:*", "*:CC"])
+    def test_check__app_system(self, rule_key):
+        self.rules = {"app_system": {rule_key: {"rate": 1, "burst": 2}}}
+
+        self.limiter.check("app", "CC", "get_host")
+        self.limiter.check("app", "CC", "search_host")
+        with pytest.raises(APIError) as err:
+            self.limiter.check("app", "CC", "get_host")
+        assert err.value.code.code == error_codes.RATE_LIMIT_RESTRICTION.code.code
+
+        # 其它系统不受限制
+        self.limiter.check("app", "JOB", "get_host")
+
+    def test_check__wildcard_counted_per_app(self):
+        self.rules = {"app_system": {"*:CC": {"rate": 1}}}
+
+        self.limiter.check("app1", "CC", "get_host")
+        self.limiter.check("app2", "CC", "get_host")
+        with pytest.raises(APIError):
+            self.limiter.check("app1", "CC", "get_host")
+
+    def test_check__component(self):
+        self.rules = {"component": {"CC.get_host": {"rate": 1}}}
+
+        self.limiter.check("app1", "CC", "get_host")
+        self.limiter.check("app1", "CC", "search_host")
+        with pytest.raises(APIError):
+            self.limiter.check("app2", "CC", "get_host")
+
+    def test_check__rejected_not_consume_other_dimension(self):
+        self.rules = {
+            "app_system": {"app:CC": {"rate": 1, "burst": 2}},
+            "component": {"CC.get_host": {"rate": 1}},
+        }
+
+        self.limiter.check("app", "CC", "get_host")
+        # 组件维度超出限制，不消耗应用-系统维度的令牌
+        for _ in range(3):
+            with pytest.raises(APIError):
+                self.limiter.check("app", "CC", "get_host")
+        self.limiter.check("app", "CC", "search_host")
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+
+import pytest
+
+from esb.utils import shared_cache
+from esb.utils.shared_cache import SharedCache, SharedCacheRegistry, shared_cached
+
+
+class FakeRedis(object):
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def raise_value_error():
+    raise ValueError()
+
+
+@pytest.fixture
+def redis_client(mocker):
+    client = FakeRedis()
+    mocker.patch.object(shared_cache, "get_shared_cache_client", return_value=client)
+    return client
+
+
+@pytest.fixture
+def loader(mocker):
+    return mocker.MagicMock(return_value=["s1"])
+
+
+class TestSharedCache(object):
+    def test_get_or_load__local_only(self, mocker, loader):
+        mocker.patch.object(shared_cache, "get_shared_cache_client", return_value=None)
+        cache = SharedCache("test", maxsize=10, ttl=60)
+
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        assert loader.call_count == 1
+
+        cache.invalidate("app1")
+        cache.get_or_load(("app1",), loader)
+        assert loader.call_count == 2
+
+    def test_get_or_load__shared(self, settings, redis_client, loader):
+        cache = SharedCache("test", maxsize=10, ttl=60)
+
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        assert json.loads(redis_client.data[settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1"]) == {"value": ["s1"]}
+        # 锁已释放
+        assert len(redis_client.data) == 1
+
+        # 其它进程直接读取 Redis 中的数据
+        other_cache = SharedCache("test", maxsize=10, ttl=60)
+        assert other_cache.get_or_load(("app1",), loader) == ["s1"]
+        assert loader.call_count == 1
+
+    def test_get_or_load__encrypted(self, settings, redis_client, loader):
+        cache = SharedCache("test", maxsize=10, ttl=60, encrypted=True)
+
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        # 数据加密后写入 Redis，不包含明文
+        data = redis_client.data[settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1"]
+        assert b"s1" not in data
+        assert json.loads(shared_cache.get_shared_cache_fernet().decrypt(data)) == {"value": ["s1"]}
+
+        # 其它进程解密 Redis 中的数据
+        other_cache = SharedCache("test", maxsize=10, ttl=60, encrypted=True)
+        assert other_cache.get_or_load(("app1",), loader) == ["s1"]
+        assert loader.call_count == 1
+
+    def test_get_or_load__encrypted_invalid(self, settings, redis_client, loader):
+        cache = SharedCache("test", maxsize=10, ttl=60, encrypted=True)
+        redis_client.data[settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1"] = json.dumps({"value": ["s2"]})
+
+        # 未加密或无法解密的数据，按无效数据处理，重新加载
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        assert loader.call_count == 1
+
+    def test_get_or_load__negative(self, mocker, redis_client):
+        cache = SharedCache("test", maxsize=10, ttl=60, negative_ttl=5, is_negative=lambda value: value is None)
+        set_shared = mocker.spy(redis_client, "set")
+
+        assert cache.get_or_load(("app1",), lambda: None) is None
+        assert cache.get_or_load(("app1",), lambda: "not-called") is None
+        assert set_shared.call_args_list[-1][1]["ex"] == 5
+        assert "app1" in cache._local_negative_cache
+        assert "app1" not in cache._local_cache
+
+    def test_get_or_load__wait_for_other_process(self, settings, mocker, redis_client, loader):
+        settings.ESB_SHARED_CACHE_LOCK_POLL_INTERVAL = 0
+        cache = SharedCache("test", maxsize=10, ttl=60)
+        key = settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1"
+        redis_client.data[key + ":lock"] = "1"
+
+        # 其它进程持有锁，并在等待期间写入数据
+        def sleep(seconds):
+            redis_client.data[key] = json.dumps({"value": ["s2"]})
+
+        mocker.patch.object(shared_cache.time, "sleep", side_effect=sleep)
+
+        assert cache.get_or_load(("app1",), loader) == ["s2"]
+        loader.assert_not_called()
+
+    def test_get_or_load__wait_timeout(self, settings, mocker, redis_client, loader):
+        settings.ESB_SHARED_CACHE_LOCK_TIMEOUT = 0
+        cache = SharedCache("test", maxsize=10, ttl=60)
+        redis_client.data[settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1:lock"] = "1"
+
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+        loader.assert_called_once_with()
+        # 未持有锁，不能删除其它进程的锁
+        assert settings.ESB_SHARED_CACHE_KEY_PREFIX + ":test:app1:lock" in redis_client.data
+
+    def test_get_or_load__loader_error(self, redis_client):
+        cache = SharedCache("test", maxsize=10, ttl=60)
+
+        with pytest.raises(ValueError):
+            cache.get_or_load(("app1",), raise_value_error)
+
+        assert redis_client.data == {}
+        assert cache.get_or_load(("app1",), lambda: 1) == 1
+
+    def test_get_or_load__redis_error(self, mocker, loader):
+        client = mocker.MagicMock()
+        client.get.side_effect = Exception()
+        client.set.side_effect = Exception()
+        mocker.patch.object(shared_cache, "get_shared_cache_client", return_value=client)
+        cache = SharedCache("test", maxsize=10, ttl=60)
+
+        assert cache.get_or_load(("app1",), loader) == ["s1"]
+
+    def test_invalidate(self, settings, redis_client, loader):
+        cache = SharedCache("test", maxsize=10, ttl=60)
+        cache.get_or_load(("app1", 1), loader)
+
+        cache.invalidate("app1", 1)
+
+        assert redis_client.data == {}
+        assert redis_client.published == [
+            (settings.ESB_SHARED_CACHE_INVALIDATION_CHANNEL, json.dumps({"namespace": "test", "key": "app1:1"}))
+        ]
+        assert "app1:1" not in cache._local_cache
+
+
+class TestSharedCacheRegistry(object):
+    def test_register(self):
+        registry = SharedCacheRegistry()
+        registry.register(SharedCache("test", maxsize=10, ttl=60))
+
+        with pytest.raises(ValueError):
+            registry.register(SharedCache("test", maxsize=10, ttl=60))
+
+    def test_handle_message(self, mocker):
+        mocker.patch.object(shared_cache, "get_shared_cache_client", return_value=None)
+        registry = SharedCacheRegistry()
+        cache = SharedCache("test", maxsize=10, ttl=60)
+        registry.register(cache)
+        cache.get_or_load(("app1",), lambda: 1)
+        cache.get_or_load(("app2",), lambda: 2)
+
+        registry.handle_message(json.dumps({"namespace": "test", "key": "app1"}))
+        registry.handle_message("invalid")
+        registry.handle_message(json.dumps({"namespace": "not-exist", "key": "app2"}))
+
+        assert "app1" not in cache._local_cache
+        assert "app2" in cache._local_cache
+
+
+def test_shared_cached(mocker):
+    mocker.patch.object(shared_cache, "get_shared_cache_client", return_value=None)
+    mocker.patch.object(shared_cache, "shared_cache_registry", SharedCacheRegistry())
+    calls = []
+
+    class Helper(object):
+        @classmethod
+        @shared_cached("test", maxsize=10, ttl=60)
+        def get(cls, app_code):
+            calls.append(app_code)
+            return app_code
+
+    assert Helper.get("app1") == "app1"
+    assert Helper.get("app1") == "app1"
+    assert calls == ["app1"]
+    assert Helper.get.shared_cache.namespace == "test"
+
+
+def test_get_shared_cache_client(settings, mocker):
+    settings.ESB_SHARED_CACHE_ENABLED = False
+    assert shared_cache.get_shared_cache_client() is None
+
+    settings.ESB_SHARED_CACHE_ENABLED = True
+    settings.ESB_SHARED_CACHE_REDIS_URL = ""
+    assert shared_cache.get_shared_cache_client() is None
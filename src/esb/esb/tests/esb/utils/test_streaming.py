@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from django.http import StreamingHttpResponse
+
+from esb.utils import streaming
+from esb.utils.streaming import (
+    ResponseTooLargeError,
+    check_content_length,
+    is_streaming_component,
+    iter_content,
+    make_streaming_response,
+    read_content,
+)
+
+
+@pytest.fixture
+def fake_resp(mocker):
+    def make(chunks, headers=None, status_code=200):
+        return mocker.MagicMock(
+            status_code=status_code,
+            headers=headers or {},
+            iter_content=mocker.MagicMock(return_value=iter(chunks)),
+        )
+
+    return make
+
+
+@pytest.mark.parametrize(
+    "components, system_name, component_name, expected",
+    [
+        ([], "LOG", "search", False),
+        (["log.search"], "LOG", "search", True),
+        (["LOG.Search"], "log", "search", True),
+        (["log.search"], "LOG", "query", False),
+    ],
+)
+def test_is_streaming_component(settings, components, system_name, component_name, expected):
+    settings.ESB_STREAMING_RESPONSE_COMPONENTS = components
+    assert is_streaming_component(system_name, component_name) is expected
+
+
+@pytest.mark.parametrize(
+    "headers, max_size, will_error",
+    [
+        ({}, 10, False),
+        ({"Content-Length": "10"}, 10, False),
+        ({"Content-Length": "11"}, 10, True),
+        ({"Content-Length": "11"}, 0, False),
+        ({"Content-Length": "invalid"}, 10, False),
+    ],
+)
+def test_check_content_length(fake_resp, headers, max_size, will_error):
+    resp = fake_resp([], headers=headers)
+
+    if will_error:
+        with pytest.raises(ResponseTooLargeError):
+            check_content_length(resp, max_size)
+        resp.close.assert_called_once_with()
+        return
+
+    check_content_length(resp, max_size)
+    resp.close.assert_not_called()
+
+
+def test_read_content(fake_resp):
+    assert read_content(fake_resp([b"ab", b"cd"]), 4, 2) == b"abcd"
+
+    resp = fake_resp([b"ab", b"cd", b"e"])
+    with pytest.raises(ResponseTooLargeError):
+        read_content(resp, 4, 2)
+    resp.close.assert_called_once_with()
+
+
+def test_iter_content(mocker, fake_resp):
+    observe = mocker.patch.object(streaming.response_size_bytes, "labels")
+
+    resp = fake_resp([b"ab", b"cd"])
+    assert list(iter_content(resp, 4, 2, "LOG", "search")) == [b"ab", b"cd"]
+    resp.close.assert_called_once_with()
+    observe.assert_called_with(system_name="LOG", component_name="search", mode="streaming")
+    observe.return_value.observe.assert_called_with(4)
+
+    resp = fake_resp([b"ab", b"cd", b"e"])
+    content = iter_content(resp, 4, 2, "LOG", "search")
+    assert next(content) == b"ab"
+    assert next(content) == b"cd"
+    with pytest.raises(ResponseTooLargeError):
+        next(content)
+    resp.close.assert_called_once_with()
+
+
+def test_make_streaming_response(fake_resp):
+    resp = fake_resp([b'{"result": true}'], headers={"Content-Type": "application/json; charset=utf-8"})
+
+    response = make_streaming_response(resp, "LOG", "search")
+
+    assert isinstance(response, StreamingHttpResponse)
+    assert response["Content-Type"] == "application/json; charset=utf-8"
+    assert b"".join(response.streaming_content) == b'{"result": true}'
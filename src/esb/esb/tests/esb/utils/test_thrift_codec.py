@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from thrift.protocol import TBinaryProtocol
+
+from esb.utils import thrift_codec
+from lib.gse.procServer.ttypes import Proc_SyncRsp
+
+
+@pytest.mark.parametrize(
+    "fastbinary_available, accelerated, expected",
+    [
+        (True, True, TBinaryProtocol.TBinaryProtocolAccelerated),
+        (True, False, TBinaryProtocol.TBinaryProtocol),
+        (False, True, TBinaryProtocol.TBinaryProtocol),
+    ],
+)
+def test_get_binary_protocol_class(mocker, fastbinary_available, accelerated, expected):
+    mocker.patch.object(thrift_codec, "is_fastbinary_available", return_value=fastbinary_available)
+
+    assert thrift_codec.get_binary_protocol_class(accelerated) is expected
+
+
+def test_serialize_and_deserialize():
+    rsp = Proc_SyncRsp(error_code=0, error_msg="success", content={"127.0.0.1": "running"}, session_id="s1")
+
+    data = thrift_codec.serialize(rsp, accelerated=False)
+    # 加速与纯 Python 实现编码结果一致，可互相解码
+    assert thrift_codec.serialize(rsp, accelerated=True) == data
+    assert thrift_codec.deserialize(Proc_SyncRsp(), data, accelerated=True) == rsp
+    assert thrift_codec.deserialize(Proc_SyncRsp(), data, accelerated=False) == rsp
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) 2017 THL A29 Limited, a Tencent company. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import socket
+import time
+
+import pytest
+from thrift.transport.TTransport import TTransportException
+
+from esb.utils.thrift_pool import ThriftConnection, ThriftConnectionPool, is_broken_connection_error
+
+
+@pytest.fixture
+def make_connection(mocker):
+    def make(key="key", is_open=True, alive=True):
+        connection = ThriftConnection(key, mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock())
+        connection.transport.isOpen.return_value = is_open
+        mocker.patch.object(connection, "is_alive", return_value=alive)
+        mocker.spy(connection, "close")
+        return connection
+
+    return make
+
+
+class TestThriftConnection(object):
+    def test_is_alive(self, mocker):
+        left, right = socket.socketpair()
+        try:
+            connection = ThriftConnection("key", mocker.MagicMock(handle=left), mocker.MagicMock(), None)
+            connection.transport.isOpen.return_value = True
+            assert connection.is_alive()
+
+            # 对端关闭后，连接可读（EOF），不可复用
+            right.close()
+            assert not connection.is_alive()
+        finally:
+            left.close()
+
+    def test_is_alive__closed(self, mocker):
+        connection = ThriftConnection("key", mocker.MagicMock(handle=None), mocker.MagicMock(), None)
+        assert not connection.is_alive()
+
+
+class TestThriftConnectionPool(object):
+    def test_acquire_and_release(self, make_connection):
+        pool = ThriftConnectionPool(max_idle_per_key=2, idle_timeout=60)
+        assert pool.acquire("key") is None
+
+        connection = make_connection()
+        pool.release(connection)
+
+        assert pool.acquire("other") is None
+        acquired = pool.acquire("key")
+        assert acquired is connection
+        assert acquired.reused
+        assert pool.acquire("key") is None
+
+    def test_release__exceed_max_idle(self, make_connection):
+        pool = ThriftConnectionPool(max_idle_per_key=1, idle_timeout=60)
+        c1 = make_connection()
+        c2 = make_connection()
+
+        pool.release(c1)
+        pool.release(c2)
+
+        c2.close.assert_called_once_with()
+        assert pool.acquire("key") is c1
+
+    def test_release__closed_connection(self, make_connection):
+        pool = ThriftConnectionPool()
+        connection = make_connection(is_open=False)
+
+        pool.release(connection)
+
+        connection.close.assert_called_once_with()
+        assert pool.acquire("key") is None
+
+    def test_acquire__evict_dead_and_expired(self, make_connection):
+        pool = ThriftConnectionPool(max_idle_per_key=3, idle_timeout=60)
+        alive = make_connection()
+        expired = make_connection()
+        dead = make_connection(alive=False)
+        pool.release(alive)
+        pool.release(expired)
+        pool.release(dead)
+        expired.last_used_at = time.time() - 120
+
+        assert pool.acquire("key") is alive
+        dead.close.assert_called_once_with()
+        expired.close.assert_called_once_with()
+
+    def test_clear(self, make_connection):
+        pool = ThriftConnectionPool()
+        connection = make_connection()
+        pool.release(connection)
+
+        pool.clear()
+
+        connection.close.assert_called_once_with()
+        assert pool.acquire("key") is None
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (BrokenPipeError(), True),
+        (TTransportException(TTransportException.NOT_OPEN), True),
+        # 读取响应时出错，对端可能已处理请求，不可重试
+        (ConnectionResetError(), False),
+        (TTransportException(TTransportException.END_OF_FILE), False),
+        (TTransportException(TTransportException.TIMED_OUT), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_broken_connection_error(exc, expected):
+    assert is_broken_connection_error(exc) is expected
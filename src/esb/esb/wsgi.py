@@ -24,3 +24,10 @@ from django.core.wsgi import get_wsgi_application  # noqa
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa
+
+if settings.ESB_COMPONENTS_PREWARM:
+    from esb.component import get_components_manager  # noqa
+
+    get_components_manager().load_all()